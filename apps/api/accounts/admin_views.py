@@ -2,13 +2,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q, Avg
-from django.db.models.functions import TruncHour, TruncDate
+from django.db.models import Count, Q, Avg, F, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import timedelta
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
-from .models import UserBehaviorEvent, User
+from .models import UserBehaviorEvent, UserEventHourlyRollup, User
 from .permissions import IsSuperAdmin
 from django.core.cache import cache
 
@@ -17,6 +17,9 @@ class UserActivityAnalyticsViewSet(viewsets.ViewSet):
     """
     Analytics endpoints for tracking customer (OWNER/TRIAL_ADMIN) user activity.
     Super admin only access for engagement monitoring.
+
+    Aggregates are read from UserEventHourlyRollup (see rollups.py); the
+    recent feed and last-activity timestamp still read raw events.
     """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
@@ -58,69 +61,43 @@ class UserActivityAnalyticsViewSet(viewsets.ViewSet):
         start_date, end_date = self._get_date_range(request)
         customer_users = self._get_customer_users()
 
+        events = UserEventHourlyRollup.objects.filter(user__in=customer_users)
+        period_events = events.filter(hour_start__gte=start_date, hour_start__lte=end_date)
+
         # Daily Active Users (last 24 hours)
         dau_start = timezone.now() - timedelta(days=1)
-        dau = UserBehaviorEvent.objects.filter(
-            user__in=customer_users,
-            timestamp__gte=dau_start
-        ).values('user').distinct().count()
+        dau = events.filter(hour_start__gte=dau_start).values('user').distinct().count()
 
         # Weekly Active Users (last 7 days)
         wau_start = timezone.now() - timedelta(days=7)
-        wau = UserBehaviorEvent.objects.filter(
-            user__in=customer_users,
-            timestamp__gte=wau_start
-        ).values('user').distinct().count()
+        wau = events.filter(hour_start__gte=wau_start).values('user').distinct().count()
 
         # Monthly Active Users (last 30 days)
-        mau = UserBehaviorEvent.objects.filter(
-            user__in=customer_users,
-            timestamp__gte=start_date
-        ).values('user').distinct().count()
+        mau = events.filter(hour_start__gte=start_date).values('user').distinct().count()
 
         # Total events in period
-        total_events = UserBehaviorEvent.objects.filter(
-            user__in=customer_users,
-            timestamp__gte=start_date,
-            timestamp__lte=end_date
-        ).count()
+        total_events = period_events.aggregate(total=Sum('event_count'))['total'] or 0
 
         # Feature adoption (% of users who used each feature category)
         total_users = customer_users.count()
 
+        feature_event_types = {
+            'micro_checks': ['CHECK_CREATED', 'CHECK_STARTED', 'CHECK_COMPLETED'],
+            'employee_voice': ['PULSE_CREATED', 'PULSE_CONFIGURED', 'PULSE_ANALYTICS_VIEWED'],
+            'templates': ['TEMPLATE_VIEWED', 'TEMPLATE_SELECTED', 'AI_GENERATION_USED'],
+            'analytics': ['INSIGHTS_VIEWED', 'DASHBOARD_ACCESSED', 'REPORT_FILTERED'],
+        }
         feature_adoption = {
-            'micro_checks': UserBehaviorEvent.objects.filter(
-                user__in=customer_users,
-                event_type__in=['CHECK_CREATED', 'CHECK_STARTED', 'CHECK_COMPLETED'],
-                timestamp__gte=start_date
-            ).values('user').distinct().count() / max(total_users, 1) * 100,
-
-            'employee_voice': UserBehaviorEvent.objects.filter(
-                user__in=customer_users,
-                event_type__in=['PULSE_CREATED', 'PULSE_CONFIGURED', 'PULSE_ANALYTICS_VIEWED'],
-                timestamp__gte=start_date
-            ).values('user').distinct().count() / max(total_users, 1) * 100,
-
-            'templates': UserBehaviorEvent.objects.filter(
-                user__in=customer_users,
-                event_type__in=['TEMPLATE_VIEWED', 'TEMPLATE_SELECTED', 'AI_GENERATION_USED'],
-                timestamp__gte=start_date
-            ).values('user').distinct().count() / max(total_users, 1) * 100,
-
-            'analytics': UserBehaviorEvent.objects.filter(
-                user__in=customer_users,
-                event_type__in=['INSIGHTS_VIEWED', 'DASHBOARD_ACCESSED', 'REPORT_FILTERED'],
-                timestamp__gte=start_date
-            ).values('user').distinct().count() / max(total_users, 1) * 100,
+            feature: events.filter(
+                event_type__in=event_types,
+                hour_start__gte=start_date
+            ).values('user').distinct().count() / max(total_users, 1) * 100
+            for feature, event_types in feature_event_types.items()
         }
 
         # Most active event types
-        top_events = UserBehaviorEvent.objects.filter(
-            user__in=customer_users,
-            timestamp__gte=start_date,
-            timestamp__lte=end_date
-        ).values('event_type').annotate(
-            count=Count('id')
+        top_events = period_events.values('event_type').annotate(
+            count=Sum('event_count')
         ).order_by('-count')[:10]
 
         # Average events per active user
@@ -164,16 +141,16 @@ class UserActivityAnalyticsViewSet(viewsets.ViewSet):
         start_date = timezone.now() - timedelta(days=days)
         customer_users = self._get_customer_users()
 
-        # Choose aggregation function
-        trunc_function = TruncHour if granularity == 'hour' else TruncDate
+        # Choose aggregation period (rollups are already hourly)
+        period = F('hour_start') if granularity == 'hour' else TruncDate('hour_start')
 
-        timeline_data = UserBehaviorEvent.objects.filter(
+        timeline_data = UserEventHourlyRollup.objects.filter(
             user__in=customer_users,
-            timestamp__gte=start_date
+            hour_start__gte=start_date.replace(minute=0, second=0, microsecond=0)
         ).annotate(
-            period=trunc_function('timestamp')
+            period=period
         ).values('period').annotate(
-            event_count=Count('id'),
+            event_count=Sum('event_count'),
             unique_users=Count('user', distinct=True)
         ).order_by('period')
 
@@ -231,18 +208,18 @@ class UserActivityAnalyticsViewSet(viewsets.ViewSet):
 
         feature_stats = {}
         for category, event_types in feature_categories.items():
-            events = UserBehaviorEvent.objects.filter(
+            events = UserEventHourlyRollup.objects.filter(
                 user__in=customer_users,
                 event_type__in=event_types,
-                timestamp__gte=start_date,
-                timestamp__lte=end_date
+                hour_start__gte=start_date,
+                hour_start__lte=end_date
             )
 
             feature_stats[category] = {
-                'total_events': events.count(),
+                'total_events': events.aggregate(total=Sum('event_count'))['total'] or 0,
                 'unique_users': events.values('user').distinct().count(),
                 'event_breakdown': list(events.values('event_type').annotate(
-                    count=Count('id')
+                    count=Sum('event_count')
                 ).order_by('-count'))
             }
 
@@ -332,23 +309,15 @@ class UserActivityAnalyticsViewSet(viewsets.ViewSet):
             role__in=[User.Role.OWNER, User.Role.TRIAL_ADMIN]
         )
 
-        total_events = UserBehaviorEvent.objects.filter(
-            user__in=account_users,
-            timestamp__gte=start_date,
-            timestamp__lte=end_date
-        ).count()
-
-        active_users = UserBehaviorEvent.objects.filter(
-            user__in=account_users,
-            timestamp__gte=start_date
-        ).values('user').distinct().count()
-
-        top_events = UserBehaviorEvent.objects.filter(
-            user__in=account_users,
-            timestamp__gte=start_date,
-            timestamp__lte=end_date
-        ).values('event_type').annotate(
-            count=Count('id')
+        events = UserEventHourlyRollup.objects.filter(user__in=account_users)
+        period_events = events.filter(hour_start__gte=start_date, hour_start__lte=end_date)
+
+        total_events = period_events.aggregate(total=Sum('event_count'))['total'] or 0
+
+        active_users = events.filter(hour_start__gte=start_date).values('user').distinct().count()
+
+        top_events = period_events.values('event_type').annotate(
+            count=Sum('event_count')
         ).order_by('-count')[:10]
 
         # Last activity timestamp
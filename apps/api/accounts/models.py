@@ -513,6 +513,26 @@ class UserBehaviorEvent(models.Model):
         )
 
 
+class UserEventHourlyRollup(models.Model):
+    """Per-(hour, user, event type) behavior event counts for activity analytics (see rollups.py)"""
+
+    hour_start = models.DateTimeField(help_text="Start of the hour the events fell in")
+    user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='event_hourly_rollups')
+    event_type = models.CharField(max_length=50, choices=UserBehaviorEvent.EventType.choices)
+    event_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'user_event_hourly_rollups'
+        unique_together = [('hour_start', 'user', 'event_type')]
+        indexes = [
+            models.Index(fields=['hour_start', 'event_type']),
+            models.Index(fields=['user', 'hour_start']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.event_type} x{self.event_count} at {self.hour_start}"
+
+
 class SmartNudge(models.Model):
     """Smart nudges shown to users based on behavioral patterns"""
     
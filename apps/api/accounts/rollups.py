@@ -0,0 +1,53 @@
+"""
+Behavior event rollups
+
+UserEventHourlyRollup holds per-(hour, user, event type) counts of
+UserBehaviorEvent so the user activity analytics endpoints aggregate a
+compact table instead of the raw event stream. Hours are recomputed whole
+from the raw events and their rows replaced, so refreshes are idempotent.
+"""
+
+import logging
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+
+from .models import UserBehaviorEvent, UserEventHourlyRollup
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 500
+
+# core.analytics.rollup_rebuild_lock name held while this table is rebuilt
+USER_EVENT_ROLLUP_LOCK = 'user_events'
+
+
+def rebuild_user_event_rollups(start: datetime, end: datetime) -> int:
+    """
+    Recompute event rollups for the hours in [start, end).
+
+    Args:
+        start: Aware datetime; truncated down to the hour
+        end: Aware datetime; should fall on an hour boundary
+
+    Returns:
+        Number of rollup rows written
+    """
+    start = start.replace(minute=0, second=0, microsecond=0)
+
+    rows = UserBehaviorEvent.objects.filter(
+        timestamp__gte=start, timestamp__lt=end
+    ).annotate(hour_start=TruncHour('timestamp')).values(
+        'hour_start', 'user_id', 'event_type'
+    ).annotate(event_count=Count('id')).order_by()
+
+    rollups = [UserEventHourlyRollup(**row) for row in rows]
+
+    with transaction.atomic():
+        UserEventHourlyRollup.objects.filter(hour_start__gte=start, hour_start__lt=end).delete()
+        UserEventHourlyRollup.objects.bulk_create(rollups, batch_size=BULK_CHUNK_SIZE)
+
+    logger.info(f"Rebuilt {len(rollups)} user event rollups for {start.isoformat()}..{end.isoformat()}")
+    return len(rollups)
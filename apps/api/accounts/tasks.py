@@ -0,0 +1,33 @@
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, queue='maintenance', max_retries=10, default_retry_delay=60)
+def refresh_user_event_rollups(self, days=None):
+    """
+    Recompute behavior event rollups for today and the previous days - 1 days
+    (see rollups.py).
+
+    Scheduled intra-day over ANALYTICS_ROLLUP_INTRADAY_DAYS and nightly over
+    ANALYTICS_ROLLUP_NIGHTLY_DAYS. Retries later while another rebuild of the
+    same table is running.
+    """
+    from core.analytics import rollup_rebuild_lock
+    from .rollups import USER_EVENT_ROLLUP_LOCK, rebuild_user_event_rollups
+
+    days = days or settings.ANALYTICS_ROLLUP_INTRADAY_DAYS
+    now = timezone.now()
+    end = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    start = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+
+    with rollup_rebuild_lock(USER_EVENT_ROLLUP_LOCK) as acquired:
+        if not acquired:
+            logger.info("User event rollup rebuild already running, retrying later")
+            raise self.retry()
+        rows = rebuild_user_event_rollups(start, end)
+    return {'rollups_written': rows}
@@ -618,4 +618,61 @@ class TrialExpirationTest(TestCase):
         self.assertTrue(response.data.get('is_trial_user'))
         # Trial status should indicate expiration
         trial_status = response.data.get('trial_status', {})
-        self.assertTrue(trial_status.get('is_expired', False))
\ No newline at end of file
+        self.assertTrue(trial_status.get('is_expired', False))
+
+class UserEventRollupTest(TestCase):
+    """Test behavior event rollups and the activity analytics read from them"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from accounts.models import UserBehaviorEvent
+
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='activity_admin', email='activity_admin@test.com', password='testpass123', role='SUPER_ADMIN'
+        )
+        self.owner = User.objects.create_user(
+            username='activity_owner', email='activity_owner@test.com', password='testpass123', role='OWNER'
+        )
+        for event_type in ['CHECK_COMPLETED', 'CHECK_COMPLETED', 'INSIGHTS_VIEWED']:
+            UserBehaviorEvent.track_event(self.owner, event_type)
+        # Non-customer activity is excluded from the analytics
+        UserBehaviorEvent.track_event(self.admin, 'PAGE_VIEW')
+        self.client.force_authenticate(user=self.admin)
+
+    def _rebuild(self):
+        from accounts.rollups import rebuild_user_event_rollups
+        now = timezone.now()
+        return rebuild_user_event_rollups(now - timedelta(hours=2), now + timedelta(hours=1))
+
+    def test_rebuild_is_idempotent(self):
+        from accounts.models import UserEventHourlyRollup
+
+        self.assertEqual(self._rebuild(), 3)
+        self._rebuild()
+
+        self.assertEqual(UserEventHourlyRollup.objects.get(user=self.owner, event_type='CHECK_COMPLETED').event_count, 2)
+        self.assertEqual(UserEventHourlyRollup.objects.count(), 3)
+
+    def test_overview_reads_rollups(self):
+        self._rebuild()
+
+        response = self.client.get('/api/auth/admin/user-activity/overview/', {'days': 7})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['dau'], 1)
+        self.assertEqual(response.data['total_events'], 3)
+        self.assertEqual(response.data['top_events'][0], {'event_type': 'CHECK_COMPLETED', 'count': 2})
+        self.assertEqual(response.data['feature_adoption']['micro_checks'], 100.0)
+
+    def test_timeline_reads_rollups(self):
+        self._rebuild()
+
+        response = self.client.get('/api/auth/admin/user-activity/timeline/', {'days': 1, 'granularity': 'day'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sum(item['event_count'] for item in response.data['timeline']), 3)
+        self.assertEqual(response.data['timeline'][-1]['unique_users'], 1)
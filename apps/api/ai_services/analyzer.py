@@ -12,8 +12,27 @@ class VideoAnalyzer:
         self.yolo = YOLODetector()
         self.ocr = OCRService()
 
-    def analyze_frame(self, frame_path, frame_image_bytes=None):
-        """Analyze a single video frame for all compliance criteria"""
+    def analyze_frames(self, frames):
+        """Analyze several frames, running YOLO on them as one batch
+
+        ``frames`` is a list of (frame_path, frame_image_bytes, ocr_frame_path)
+        tuples as accepted by analyze_frame. Returns one analysis per frame.
+        """
+        yolo_batch = self.yolo.detect_batch([frame_path for frame_path, _, _ in frames])
+        return [
+            self.analyze_frame(frame_path, frame_image_bytes, ocr_frame_path=ocr_frame_path, yolo_results=yolo_results)
+            for (frame_path, frame_image_bytes, ocr_frame_path), yolo_results in zip(frames, yolo_batch)
+        ]
+
+    def analyze_frame(self, frame_path, frame_image_bytes=None, ocr_frame_path=None, yolo_results=None):
+        """Analyze a single video frame for all compliance criteria
+
+        ``frame_path``/``frame_image_bytes`` may be a downscaled detector
+        variant. OCR reads ``ocr_frame_path`` instead when given, which may be
+        a callable so the full-resolution frame is only fetched if OCR runs.
+        ``yolo_results`` is this frame's (objects, uniform) pair from a batched
+        YOLODetector.detect_batch call; YOLO runs on the frame alone otherwise.
+        """
         results = {
             'ppe_analysis': {},
             'safety_analysis': [],  # List, not dict - for extend() compatibility
@@ -80,16 +99,20 @@ class VideoAnalyzer:
                     logger.warning(f"Rekognition people detection unavailable: {e}")
                     results['warnings'].append(f"People detection unavailable: {str(e)}")
 
+            if yolo_results is not None:
+                object_results, uniform_results = yolo_results
+            else:
+                object_results = self.yolo.detect_objects(frame_path)
+                uniform_results = self.yolo.detect_uniform_compliance(frame_path)
+
             # Enhanced object detection using YOLO
-            yolo_results = self.yolo.detect_objects(frame_path)
-            self._merge_object_detections(results, yolo_results)
+            self._merge_object_detections(results, object_results)
 
             # Uniform compliance using YOLO
-            uniform_results = self.yolo.detect_uniform_compliance(frame_path)
             results['uniform_analysis'] = uniform_results
 
-            # Menu board analysis using OCR
-            menu_results = self.ocr.analyze_menu_board(frame_path)
+            # Menu board analysis using OCR, gated by Rekognition text detections
+            menu_results = self.ocr.analyze_menu_board(ocr_frame_path or frame_path, results['text_analysis'])
             results['menu_board_analysis'] = menu_results
 
             # Calculate overall score (adjusted for available services)
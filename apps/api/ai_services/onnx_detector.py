@@ -0,0 +1,226 @@
+import ast
+import os
+import threading
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# COCO class names used by the stock YOLOv8 export, used when the ONNX file
+# carries no 'names' metadata
+COCO_CLASS_NAMES = [
+    'person', 'bicycle', 'car', 'motorcycle', 'airplane', 'bus', 'train', 'truck', 'boat',
+    'traffic light', 'fire hydrant', 'stop sign', 'parking meter', 'bench', 'bird', 'cat',
+    'dog', 'horse', 'sheep', 'cow', 'elephant', 'bear', 'zebra', 'giraffe', 'backpack',
+    'umbrella', 'handbag', 'tie', 'suitcase', 'frisbee', 'skis', 'snowboard', 'sports ball',
+    'kite', 'baseball bat', 'baseball glove', 'skateboard', 'surfboard', 'tennis racket',
+    'bottle', 'wine glass', 'cup', 'fork', 'knife', 'spoon', 'bowl', 'banana', 'apple',
+    'sandwich', 'orange', 'broccoli', 'carrot', 'hot dog', 'pizza', 'donut', 'cake', 'chair',
+    'couch', 'potted plant', 'bed', 'dining table', 'toilet', 'tv', 'laptop', 'mouse',
+    'remote', 'keyboard', 'cell phone', 'microwave', 'oven', 'toaster', 'sink',
+    'refrigerator', 'book', 'clock', 'vase', 'scissors', 'teddy bear', 'hair drier',
+    'toothbrush',
+]
+
+LETTERBOX_FILL = 114
+
+# One inference session per model path per worker process. Sessions are
+# thread-safe for concurrent run() calls, so they can be shared freely.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(model_path, providers, num_threads):
+    """Load (or reuse) an ONNX Runtime session for this process"""
+    key = (model_path, tuple(providers), num_threads)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            import onnxruntime as ort
+
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            options.inter_op_num_threads = 1
+            if num_threads > 0:
+                options.intra_op_num_threads = num_threads
+
+            available = set(ort.get_available_providers())
+            session_providers = [p for p in providers if p in available] or ['CPUExecutionProvider']
+
+            session = ort.InferenceSession(model_path, sess_options=options, providers=session_providers)
+            _sessions[key] = session
+            logger.info(
+                f"ONNX Runtime session loaded from {model_path} "
+                f"(providers={session_providers}, intra_op_threads={num_threads or 'auto'})"
+            )
+        return session
+
+
+def letterbox(image, size):
+    """Resize a PIL image to fit a size x size square, padding the remainder
+
+    Returns the padded float32 CHW array (0-1), the scale ratio and the
+    (left, top) padding so detections can be mapped back to the source image.
+    """
+    import numpy as np
+    from PIL import Image
+
+    image = image.convert('RGB')
+    width, height = image.size
+    ratio = min(size / width, size / height)
+    new_width, new_height = round(width * ratio), round(height * ratio)
+    pad_left = (size - new_width) // 2
+    pad_top = (size - new_height) // 2
+
+    canvas = Image.new('RGB', (size, size), (LETTERBOX_FILL, LETTERBOX_FILL, LETTERBOX_FILL))
+    canvas.paste(image.resize((new_width, new_height), Image.BILINEAR), (pad_left, pad_top))
+
+    array = np.asarray(canvas, dtype=np.float32) / 255.0
+    return array.transpose(2, 0, 1), ratio, (pad_left, pad_top)
+
+
+def non_max_suppression(boxes, scores, iou_threshold):
+    """Greedy NMS over xyxy boxes, returning the indices to keep"""
+    import numpy as np
+
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1).clip(min=0) * (y2 - y1).clip(min=0)
+    order = scores.argsort()[::-1]
+    keep = []
+
+    while order.size > 0:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        inter_w = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(min=0)
+        inter_h = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(min=0)
+        inter = inter_w * inter_h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+
+    return keep
+
+
+class ONNXYOLOModel:
+    """CPU inference for an exported YOLOv8 model using ONNX Runtime
+
+    Runs without torch/ultralytics. Export once with
+    ``yolo export model=yolov8n.pt format=onnx dynamic=True`` (dynamic axes
+    enable batched inference; fixed-batch exports fall back to one image per run).
+    The OpenVINO execution provider can be selected through YOLO_ONNX_PROVIDERS.
+    """
+
+    def __init__(self, model_path=None, input_size=None, num_threads=None, providers=None,
+                 confidence_threshold=None, iou_threshold=None):
+        self.model_path = model_path or getattr(settings, 'YOLO_ONNX_MODEL_PATH', 'yolov8n.onnx')
+        self.input_size = input_size or getattr(settings, 'YOLO_INPUT_SIZE', 640)
+        self.num_threads = num_threads if num_threads is not None else getattr(settings, 'YOLO_ONNX_THREADS', 0)
+        self.providers = providers or getattr(settings, 'YOLO_ONNX_PROVIDERS', ['CPUExecutionProvider'])
+        self.confidence_threshold = (
+            confidence_threshold if confidence_threshold is not None
+            else getattr(settings, 'YOLO_CONFIDENCE_THRESHOLD', 0.25)
+        )
+        self.iou_threshold = iou_threshold if iou_threshold is not None else getattr(settings, 'YOLO_IOU_THRESHOLD', 0.45)
+
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"ONNX model not found at {self.model_path}")
+
+        self.session = _get_session(self.model_path, self.providers, self.num_threads)
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        batch_dim = model_input.shape[0]
+        self.supports_batching = not isinstance(batch_dim, int)
+        self.names = self._load_class_names()
+
+    def _load_class_names(self):
+        """Read class names from ultralytics export metadata, falling back to COCO"""
+        try:
+            metadata = self.session.get_modelmeta().custom_metadata_map
+            names = ast.literal_eval(metadata['names'])
+            if isinstance(names, dict):
+                return {int(k): v for k, v in names.items()}
+        except (KeyError, ValueError, SyntaxError):
+            pass
+        return dict(enumerate(COCO_CLASS_NAMES))
+
+    def predict(self, image_path):
+        """Detect objects in a single image"""
+        return self.predict_batch([image_path])[0]
+
+    def predict_batch(self, image_paths):
+        """Detect objects in several images, one session run per batch
+
+        Returns one list of detections per input path, in the same format as
+        YOLODetector (class, confidence and an xyxy bounding_box in source pixels).
+        """
+        import numpy as np
+        from PIL import Image
+
+        tensors = []
+        transforms = []
+        for image_path in image_paths:
+            with Image.open(image_path) as image:
+                tensor, ratio, padding = letterbox(image, self.input_size)
+                transforms.append((ratio, padding, image.size))
+            tensors.append(tensor)
+
+        if not tensors:
+            return []
+
+        if self.supports_batching:
+            outputs = self.session.run(None, {self.input_name: np.stack(tensors)})[0]
+        else:
+            outputs = np.concatenate([
+                self.session.run(None, {self.input_name: tensor[np.newaxis]})[0]
+                for tensor in tensors
+            ])
+
+        return [
+            self._postprocess(output, *transform)
+            for output, transform in zip(outputs, transforms)
+        ]
+
+    def _postprocess(self, output, ratio, padding, image_size):
+        """Convert one raw (4 + classes, anchors) YOLOv8 output into detections"""
+        import numpy as np
+
+        predictions = output.T
+        class_scores = predictions[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confidences = class_scores[np.arange(len(class_ids)), class_ids]
+
+        mask = confidences >= self.confidence_threshold
+        if not mask.any():
+            return []
+
+        predictions = predictions[mask]
+        class_ids = class_ids[mask]
+        confidences = confidences[mask]
+
+        # cx, cy, w, h in letterboxed space -> x1, y1, x2, y2 in source space
+        cx, cy, w, h = predictions[:, 0], predictions[:, 1], predictions[:, 2], predictions[:, 3]
+        pad_left, pad_top = padding
+        width, height = image_size
+        boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad_left) / ratio).clip(0, width)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad_top) / ratio).clip(0, height)
+
+        detections = []
+        for class_id in np.unique(class_ids):
+            class_idx = np.where(class_ids == class_id)[0]
+            for i in non_max_suppression(boxes[class_idx], confidences[class_idx], self.iou_threshold):
+                idx = class_idx[i]
+                detections.append({
+                    'class': self.names.get(int(class_id), str(int(class_id))),
+                    'confidence': float(confidences[idx]),
+                    'bounding_box': {
+                        'x1': float(boxes[idx, 0]),
+                        'y1': float(boxes[idx, 1]),
+                        'x2': float(boxes[idx, 2]),
+                        'y2': float(boxes[idx, 3])
+                    }
+                })
+
+        detections.sort(key=lambda d: d['confidence'], reverse=True)
+        return detections
@@ -360,5 +360,198 @@ class VideoAnalyzerTest(TestCase):
         self.assertGreaterEqual(result['overall_score'], 0)
 
 
+    @patch('ai_services.yolo_detector.YOLODetector.detect_objects')
+    @patch('ai_services.yolo_detector.YOLODetector.detect_batch')
+    @patch('ai_services.ocr_service.OCRService.analyze_menu_board')
+    def test_analyze_frames_runs_yolo_once_per_batch(self, mock_ocr, mock_detect_batch, mock_detect_objects):
+        """Test that analyze_frames hands every frame to one batched YOLO call"""
+        detection = {
+            'class': 'fire extinguisher',
+            'confidence': 0.8,
+            'bounding_box': {'x1': 0.0, 'y1': 0.0, 'x2': 10.0, 'y2': 10.0}
+        }
+        empty_objects = {'safety_objects': [], 'cleanliness_objects': [], 'other_objects': [], 'total_detections': 0}
+        mock_detect_batch.return_value = [
+            ({**empty_objects, 'safety_objects': [detection], 'total_detections': 1}, {'compliance_score': 80.0}),
+            (empty_objects, {'compliance_score': 100.0}),
+        ]
+        mock_ocr.return_value = {'compliance_score': 90.0, 'compliance_issues': []}
+
+        analyzer = VideoAnalyzer()
+        results = analyzer.analyze_frames([('/fake/a.jpg', None, None), ('/fake/b.jpg', None, None)])
+
+        mock_detect_batch.assert_called_once_with(['/fake/a.jpg', '/fake/b.jpg'])
+        mock_detect_objects.assert_not_called()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['uniform_analysis'], {'compliance_score': 80.0})
+        self.assertEqual(results[1]['uniform_analysis'], {'compliance_score': 100.0})
+
+
+
+class ONNXYOLOBackendTest(TestCase):
+    """Test the ONNX Runtime YOLO backend pre/post-processing and selection"""
+
+    def _make_model(self):
+        from .onnx_detector import ONNXYOLOModel
+
+        model = ONNXYOLOModel.__new__(ONNXYOLOModel)
+        model.input_size = 640
+        model.confidence_threshold = 0.25
+        model.iou_threshold = 0.45
+        model.names = {0: 'person', 1: 'fire extinguisher'}
+        return model
+
+    @patch('ai_services.onnx_detector.ONNXYOLOModel._load_class_names', return_value={})
+    @patch('ai_services.onnx_detector._get_session')
+    @patch('ai_services.onnx_detector.os.path.exists', return_value=True)
+    def test_explicit_zero_thresholds_are_kept(self, mock_exists, mock_get_session, mock_names):
+        from .onnx_detector import ONNXYOLOModel
+
+        mock_get_session.return_value.get_inputs.return_value = [Mock(shape=['batch', 3, 640, 640])]
+
+        model = ONNXYOLOModel(model_path='model.onnx', confidence_threshold=0.0, iou_threshold=0)
+
+        self.assertEqual(model.confidence_threshold, 0.0)
+        self.assertEqual(model.iou_threshold, 0)
+        self.assertTrue(model.supports_batching)
+
+    def test_letterbox_pads_to_square_input(self):
+        from PIL import Image
+        from .onnx_detector import letterbox
+
+        tensor, ratio, padding = letterbox(Image.new('RGB', (1280, 720)), 640)
+
+        self.assertEqual(tensor.shape, (3, 640, 640))
+        self.assertEqual(ratio, 0.5)
+        self.assertEqual(padding, (0, 140))
+
+    def test_postprocess_maps_boxes_and_suppresses_overlaps(self):
+        import numpy as np
+
+        model = self._make_model()
+        # 4 box coords + 2 class scores, 3 anchors (cx, cy, w, h in letterboxed space)
+        output = np.zeros((6, 3), dtype=np.float32)
+        output[:4, 0] = [320, 340, 100, 100]
+        output[4, 0] = 0.9
+        output[:4, 1] = [322, 342, 100, 100]  # Overlaps anchor 0, lower score
+        output[4, 1] = 0.6
+        output[:4, 2] = [100, 300, 20, 20]
+        output[5, 2] = 0.1  # Below confidence threshold
+
+        detections = model._postprocess(output, 0.5, (0, 140), (1280, 720))
+
+        self.assertEqual(len(detections), 1)
+        self.assertEqual(detections[0]['class'], 'person')
+        box = detections[0]['bounding_box']
+        self.assertAlmostEqual(box['x1'], 540.0)
+        self.assertAlmostEqual(box['y1'], 300.0)
+        self.assertAlmostEqual(box['x2'], 740.0)
+        self.assertAlmostEqual(box['y2'], 500.0)
+
+    @override_settings(ENABLE_YOLO_DETECTION=True, YOLO_INFERENCE_BACKEND='onnx')
+    @patch('ai_services.onnx_detector.ONNXYOLOModel')
+    def test_detector_selects_onnx_backend(self, mock_model_class):
+        from .yolo_detector import YOLODetector
+
+        detection = {
+            'class': 'fire extinguisher',
+            'confidence': 0.8,
+            'bounding_box': {'x1': 0.0, 'y1': 0.0, 'x2': 10.0, 'y2': 10.0}
+        }
+        mock_model_class.return_value.predict.return_value = [detection]
+        mock_model_class.return_value.predict_batch.return_value = [[detection], []]
+
+        detector = YOLODetector()
+
+        self.assertEqual(detector.backend, 'onnx')
+        results = detector.detect_objects('/fake/frame.jpg')
+        self.assertEqual(results['safety_objects'], [detection])
+        self.assertEqual(detector.detect_uniform_compliance('/fake/frame.jpg')['uniform_objects'], [])
+
+        batch_results = detector.detect_objects_batch(['/fake/a.jpg', '/fake/b.jpg'])
+        self.assertEqual(batch_results[0]['total_detections'], 1)
+        self.assertEqual(batch_results[1]['total_detections'], 0)
+
+
+
+@override_settings(OCR_MIN_TEXT_LINES=3, OCR_MIN_TEXT_AREA_RATIO=0.01,
+                   OCR_REGION_PADDING=0.02, OCR_MAX_CROP_AREA_RATIO=0.6)
+class OCRTextGatingTest(TestCase):
+    """Test Rekognition-driven gating of EasyOCR for menu board analysis"""
+
+    def setUp(self):
+        from .ocr_service import OCRService
+
+        self.ocr = OCRService()
+        self.ocr.reader = Mock()
+        self.ocr.reader.readtext.return_value = [
+            ([[0, 0], [40, 0], [40, 10], [0, 10]], 'Burger $5', 0.95)
+        ]
+
+    def _line(self, left, top, width=0.2, height=0.05):
+        return {
+            'text': 'text',
+            'type': 'LINE',
+            'bounding_box': {'Left': left, 'Top': top, 'Width': width, 'Height': height}
+        }
+
+    def test_skips_ocr_below_text_density_threshold(self):
+        text_analysis = {'lines': [self._line(0.1, 0.1)], 'words': [], 'all_text': 'text'}
+
+        result = self.ocr.analyze_menu_board('/fake/frame.jpg', text_analysis)
+
+        self.ocr.reader.readtext.assert_not_called()
+        self.assertTrue(result['ocr_gate']['skipped'])
+        self.assertEqual(result['ocr_gate']['text_lines'], 1)
+        self.assertEqual(result['compliance_issues'], [])
+        self.assertEqual(result['compliance_score'], 100.0)
+
+    def test_crops_to_text_dense_regions(self):
+        import os
+        import tempfile
+        from PIL import Image
+
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
+            Image.new('RGB', (1000, 500)).save(tmp_file, format='JPEG')
+            image_path = tmp_file.name
+        self.addCleanup(os.remove, image_path)
+
+        # Three stacked lines form one menu region in the top-left corner
+        text_analysis = {
+            'lines': [self._line(0.1, 0.1), self._line(0.1, 0.16), self._line(0.1, 0.22)],
+            'words': [],
+            'all_text': 'text text text'
+        }
+
+        result = self.ocr.analyze_menu_board(image_path, text_analysis)
+
+        self.assertEqual(self.ocr.reader.readtext.call_count, 1)
+        crop = self.ocr.reader.readtext.call_args[0][0]
+        self.assertEqual(crop.shape[:2], (105, 240))
+        gate = result['ocr_gate']
+        self.assertFalse(gate['skipped'])
+        self.assertEqual(gate['region_count'], 1)
+        self.assertLess(gate['cropped_area_ratio'], 0.1)
+        detection = result['detected_text']['text_detections'][0]
+        self.assertEqual(detection['bounding_box']['x1'], 80)
+        self.assertEqual(detection['bounding_box']['y1'], 40)
+
+    def test_deferred_image_is_only_fetched_when_ocr_runs(self):
+        fetch_original = Mock(return_value='/fake/original.jpg')
+
+        self.ocr.analyze_menu_board(fetch_original, {'lines': [], 'words': [], 'all_text': ''})
+        fetch_original.assert_not_called()
+
+        self.ocr.analyze_menu_board(fetch_original)
+        fetch_original.assert_called_once()
+        self.ocr.reader.readtext.assert_called_once_with('/fake/original.jpg')
+
+    def test_full_frame_ocr_without_rekognition_hints(self):
+        result = self.ocr.analyze_menu_board('/fake/frame.jpg')
+
+        self.ocr.reader.readtext.assert_called_once_with('/fake/frame.jpg')
+        self.assertEqual(result['ocr_gate']['reason'], 'no_text_hints')
+
+
 # Re-enable logging after tests
 logging.disable(logging.NOTSET)
@@ -7,16 +7,37 @@ logger = logging.getLogger(__name__)
 class YOLODetector:
     def __init__(self):
         self.model = None
+        self.backend = None
         if settings.ENABLE_YOLO_DETECTION:
-            try:
-                # Import ultralytics only if YOLO is enabled
-                from ultralytics import YOLO
-                self.model = YOLO('yolov8n.pt')  # Use nano model for speed
-                logger.info("YOLO model loaded successfully")
-            except ImportError:
-                logger.warning("Ultralytics not available, using mock detection")
-            except Exception as e:
-                logger.error(f"Failed to load YOLO model: {e}")
+            backend = getattr(settings, 'YOLO_INFERENCE_BACKEND', 'ultralytics').lower()
+            if backend == 'onnx':
+                self._load_onnx_model()
+            else:
+                self._load_ultralytics_model()
+
+    def _load_ultralytics_model(self):
+        try:
+            # Import ultralytics only if YOLO is enabled
+            from ultralytics import YOLO
+            self.model = YOLO('yolov8n.pt')  # Use nano model for speed
+            self.backend = 'ultralytics'
+            logger.info("YOLO model loaded successfully")
+        except ImportError:
+            logger.warning("Ultralytics not available, using mock detection")
+        except Exception as e:
+            logger.error(f"Failed to load YOLO model: {e}")
+
+    def _load_onnx_model(self):
+        try:
+            # ONNX Runtime backend runs on CPU without loading torch
+            from .onnx_detector import ONNXYOLOModel
+            self.model = ONNXYOLOModel()
+            self.backend = 'onnx'
+            logger.info("YOLO ONNX model loaded successfully")
+        except ImportError:
+            logger.warning("ONNX Runtime not available, using mock detection")
+        except Exception as e:
+            logger.error(f"Failed to load YOLO ONNX model: {e}")
 
     def detect_objects(self, image_path):
         """Detect objects using YOLOv8"""
@@ -24,26 +45,58 @@ class YOLODetector:
             return self._mock_detection()
 
         try:
-            results = self.model(image_path)
-            return self._process_yolo_results(results)
+            return self._categorize_detections(self._run_inference(image_path))
         except Exception as e:
             logger.error(f"YOLO detection error: {e}")
             return self._mock_detection()
 
+    def detect_objects_batch(self, image_paths):
+        """Detect objects in several frames, batching inference where supported"""
+        return [objects for objects, _ in self.detect_batch(image_paths)]
+
+    def detect_batch(self, image_paths):
+        """Object and uniform results for several frames from one inference pass
+
+        Returns one (detect_objects, detect_uniform_compliance) result pair per
+        path. The ONNX backend runs the whole batch in a single session call.
+        """
+        if not self.model:
+            return [(self._mock_detection(), self._mock_uniform_detection()) for _ in image_paths]
+        if not image_paths:
+            return []
+
+        try:
+            if self.backend == 'onnx':
+                batch_detections = self.model.predict_batch(image_paths)
+            else:
+                batch_detections = [self._run_inference(path) for path in image_paths]
+            return [
+                (self._categorize_detections(detections), self._summarize_uniform_detections(detections))
+                for detections in batch_detections
+            ]
+        except Exception as e:
+            logger.error(f"YOLO batch detection error: {e}")
+            return [(self._mock_detection(), self._mock_uniform_detection()) for _ in image_paths]
+
     def detect_uniform_compliance(self, image_path):
         """Detect uniform-related objects"""
         if not self.model:
             return self._mock_uniform_detection()
 
         try:
-            results = self.model(image_path)
-            return self._process_uniform_results(results)
+            return self._summarize_uniform_detections(self._run_inference(image_path))
         except Exception as e:
             logger.error(f"YOLO uniform detection error: {e}")
             return self._mock_uniform_detection()
 
-    def _process_yolo_results(self, results):
-        """Process YOLO detection results"""
+    def _run_inference(self, image_path):
+        """Run the configured backend and return a flat list of detections"""
+        if self.backend == 'onnx':
+            return self.model.predict(image_path)
+        return self._extract_detections(self.model(image_path))
+
+    def _extract_detections(self, results):
+        """Convert ultralytics results into a flat list of detections"""
         detections = []
         
         for result in results:
@@ -62,30 +115,27 @@ class YOLODetector:
                     }
                     detections.append(detection)
         
-        return self._categorize_detections(detections)
+        return detections
+
+    def _process_yolo_results(self, results):
+        """Process YOLO detection results"""
+        return self._categorize_detections(self._extract_detections(results))
 
     def _process_uniform_results(self, results):
         """Process YOLO results specifically for uniform compliance"""
+        return self._summarize_uniform_detections(self._extract_detections(results))
+
+    def _summarize_uniform_detections(self, detections):
+        """Filter detections down to uniform-related objects and score them"""
         uniform_objects = []
         
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for box in boxes:
-                    class_name = self.model.names[int(box.cls)]
-                    if self._is_uniform_related(class_name):
-                        detection = {
-                            'class': class_name,
-                            'confidence': float(box.conf),
-                            'bounding_box': {
-                                'x1': float(box.xyxy[0][0]),
-                                'y1': float(box.xyxy[0][1]),
-                                'x2': float(box.xyxy[0][2]),
-                                'y2': float(box.xyxy[0][3])
-                            },
-                            'compliance_status': self._check_uniform_compliance(class_name)
-                        }
-                        uniform_objects.append(detection)
+        for detection in detections:
+            class_name = detection['class']
+            if self._is_uniform_related(class_name):
+                uniform_objects.append({
+                    **detection,
+                    'compliance_status': self._check_uniform_compliance(class_name)
+                })
         
         return {
             'uniform_objects': uniform_objects,
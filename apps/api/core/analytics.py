@@ -0,0 +1,108 @@
+"""
+Local-time analytics queries for PeakOps.
+
+Stores span timezones, so "what hour do checks happen" only makes sense in
+each store's local time. These helpers build Extract expressions that
+convert a timestamp to the timezone of the row's store inside the database
+(one CASE branch per distinct timezone), so histograms and heatmaps group in
+SQL and return one row per bucket instead of raw rows folded in Python.
+
+rollup_rebuild_lock serializes rebuilds of the analytics rollup tables.
+"""
+import uuid
+from contextlib import contextmanager
+from typing import Iterable, Optional, Sequence
+
+import pytz
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, When
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay
+
+# Supported time parts: hour (0-23) and ISO weekday (1=Monday .. 7=Sunday)
+TIME_PARTS = {
+    'hour': ExtractHour,
+    'weekday': ExtractIsoWeekDay,
+}
+
+
+def store_timezones(stores=None) -> list:
+    """Distinct timezone names of the given Store queryset (all stores by default)"""
+    from brands.models import Store
+
+    stores = Store.objects.all() if stores is None else stores
+    return sorted(set(stores.order_by().values_list('timezone', flat=True).distinct()))
+
+
+def local_time_part(field: str, part: str, timezones: Iterable[str], tz_path: str = 'store__timezone'):
+    """
+    Extract an hour or weekday from ``field`` in the local timezone of each row.
+
+    Args:
+        field: Datetime field to extract from (e.g. 'completed_at')
+        part: 'hour' or 'weekday'
+        timezones: Timezone names that can occur on the rows
+        tz_path: Lookup path from the queryset model to its timezone name
+
+    Returns:
+        Case expression usable in annotate()/values()
+    """
+    extract = TIME_PARTS[part]
+    return Case(
+        *[
+            When(**{tz_path: tz_name}, then=extract(field, tzinfo=pytz.timezone(tz_name)))
+            for tz_name in timezones
+        ],
+        default=extract(field),
+        output_field=IntegerField(),
+    )
+
+
+def local_time_histogram(queryset, field: str, parts: Sequence[str] = ('hour',),
+                         group_by: Sequence[str] = (), timezones: Optional[Iterable[str]] = None,
+                         tz_path: str = 'store__timezone', value=None) -> list:
+    """
+    Count rows per local-time bucket in one grouped query.
+
+    Args:
+        queryset: Rows to bucket (e.g. MicroCheckResponse.objects.filter(...))
+        field: Datetime field to bucket on
+        parts: Time parts to group by, e.g. ('hour',) or ('weekday', 'hour')
+        group_by: Extra fields to group by (e.g. ('store__brand_id',) for per-brand heatmaps)
+        timezones: Timezone names on the rows (defaults to all store timezones)
+        tz_path: Lookup path from the queryset model to its timezone name
+        value: Aggregate per bucket (defaults to Count('id'))
+
+    Returns:
+        List of dicts with each part, each group_by field and 'count'
+    """
+    timezones = store_timezones() if timezones is None else list(timezones)
+    buckets = {part: local_time_part(field, part, timezones, tz_path) for part in parts}
+
+    return list(
+        queryset.annotate(**buckets)
+        .values(*group_by, *parts)
+        .annotate(count=value if value is not None else Count('id'))
+        .order_by(*group_by, *parts)
+    )
+
+
+ROLLUP_LOCK_KEY = 'analytics_rollups:lock:{name}'
+
+
+@contextmanager
+def rollup_rebuild_lock(name: str, timeout: int = 3600):
+    """
+    Cache lock held while one family of rollup tables is rebuilt.
+
+    Rebuilds delete and re-insert whole days, so two overlapping ones would
+    collide on the rollups' unique keys. Yields whether the lock was taken;
+    it is released only if still held with this caller's token.
+    """
+    key = ROLLUP_LOCK_KEY.format(name=name)
+    token = uuid.uuid4().hex
+    acquired = cache.add(key, token, timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
@@ -0,0 +1,75 @@
+"""
+Management command to rebuild the analytics rollup tables from raw data.
+
+Backfills the micro-check rollups (StoreDailyRollup, CategoryDailyRollup,
+HourlyActivityRollup) and the behavior event rollups (UserEventHourlyRollup)
+that the super admin analytics endpoints read. The scheduled refreshes only
+cover the last few days, so run this after deploying the rollups and
+whenever older days need recomputing.
+
+Usage:
+    python manage.py rebuild_analytics_rollups
+    python manage.py rebuild_analytics_rollups --days 365 --only micro_checks
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.rollups import USER_EVENT_ROLLUP_LOCK, rebuild_user_event_rollups
+from core.analytics import rollup_rebuild_lock
+from micro_checks.rollups import MICRO_CHECK_ROLLUP_LOCK, day_bounds, rebuild_micro_check_rollups
+
+CHUNK_DAYS = 7
+LOCK_WAIT_SECONDS = 300
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the analytics rollup tables from raw runs, responses and behavior events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Number of most recent days to rebuild (default: 90; endpoints default to 30-day windows)',
+        )
+        parser.add_argument(
+            '--only',
+            choices=[MICRO_CHECK_ROLLUP_LOCK, USER_EVENT_ROLLUP_LOCK],
+            help='Only rebuild one family of rollups',
+        )
+
+    def handle(self, *args, **options):
+        last_day = timezone.localdate()
+        first_day = last_day - timedelta(days=options['days'] - 1)
+
+        families = {
+            MICRO_CHECK_ROLLUP_LOCK: rebuild_micro_check_rollups,
+            USER_EVENT_ROLLUP_LOCK: lambda first, last: rebuild_user_event_rollups(*day_bounds(first, last)),
+        }
+        if options['only']:
+            families = {options['only']: families[options['only']]}
+
+        # Oldest chunk first, each in its own transaction under the rebuild lock
+        for name, rebuild in families.items():
+            chunk_start = first_day
+            while chunk_start <= last_day:
+                chunk_end = min(chunk_start + timedelta(days=CHUNK_DAYS - 1), last_day)
+                result = self._rebuild_locked(name, rebuild, chunk_start, chunk_end)
+                self.stdout.write(f'{name} {chunk_start}..{chunk_end}: {result}')
+                chunk_start = chunk_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt analytics rollups for {first_day}..{last_day}'))
+
+    def _rebuild_locked(self, name, rebuild, first, last):
+        """Run one chunk once no scheduled refresh of the same tables is running"""
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while True:
+            with rollup_rebuild_lock(name) as acquired:
+                if acquired:
+                    return rebuild(first, last)
+            if time.monotonic() > deadline:
+                raise CommandError(f'Timed out waiting for the {name} rollup rebuild lock')
+            time.sleep(5)
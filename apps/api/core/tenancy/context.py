@@ -0,0 +1,90 @@
+"""
+Request-scoped tenant context.
+
+TenantContext bundles a user's scope with their brand, account and store.
+It is loaded with a single select_related query and memoized on the user
+instance, which lives for one request, so the mixins and permissions that
+check the same request.user share it. None of them walk
+user.store.account.brand through lazy FK loads or re-fetch tenant rows by ID.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .utils import TenantScope, determine_scope
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """A user's tenant scope and the brand/account/store instances behind it"""
+
+    user_id: Optional[int]
+    scope: TenantScope
+    brand: Optional[object] = None
+    account: Optional[object] = None
+    store: Optional[object] = None
+
+    @property
+    def brand_id(self) -> Optional[int]:
+        return self.brand.id if self.brand else None
+
+    @property
+    def account_id(self) -> Optional[int]:
+        return self.account.id if self.account else None
+
+    @property
+    def store_id(self) -> Optional[int]:
+        return self.store.id if self.store else None
+
+    def ids(self) -> Dict[str, Optional[int]]:
+        """brand_id, account_id and store_id, as returned by tenant_ids()"""
+        return {
+            'brand_id': self.brand_id,
+            'account_id': self.account_id,
+            'store_id': self.store_id,
+        }
+
+    @classmethod
+    def load(cls, user) -> 'TenantContext':
+        """
+        Resolve a user's tenant with at most one query.
+
+        A store-level user's account and brand are those of their store
+        (falling back to the store's own brand); otherwise the user's account
+        and its brand.
+        """
+        scope = determine_scope(user)
+        store = account = brand = None
+
+        if user.store_id:
+            from brands.models import Store
+
+            store = Store.objects.select_related('account__brand', 'brand').filter(pk=user.store_id).first()
+            if store:
+                account = store.account
+                brand = account.brand if account and account.brand_id else None
+                if brand is None and store.brand_id:
+                    brand = store.brand
+        elif user.account_id:
+            from accounts.models import Account
+
+            account = Account.objects.select_related('brand').filter(pk=user.account_id).first()
+            brand = account.brand if account and account.brand_id else None
+
+        return cls(user_id=user.pk, scope=scope, brand=brand, account=account, store=store)
+
+
+def get_tenant_context(user) -> TenantContext:
+    """
+    Tenant context for a user, memoized on the user instance.
+
+    The memo is keyed on the user's role, store and account, so it is
+    reloaded if any of them change on the same instance.
+    """
+    key = (user.pk, user.role, user.store_id, user.account_id)
+    memo = getattr(user, '_tenant_context', None)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    context = TenantContext.load(user)
+    user._tenant_context = (key, context)
+    return context
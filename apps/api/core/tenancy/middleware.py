@@ -4,15 +4,21 @@ Tenant context middleware.
 Attaches tenant context to each request and sets Sentry tags for observability.
 """
 from accounts.jwt_utils import get_impersonation_context_from_request
-from .utils import tenant_ids, determine_scope
+from .context import get_tenant_context
 
 
 class TenantContextMiddleware:
     """
     Middleware to attach tenant context to each request.
     
-    Sets request.tenant with brand_id, account_id, store_id, and scope.
+    Sets request.tenant with brand_id, account_id, store_id, and scope, and
+    request.tenant_context with the TenantContext it came from.
     Handles impersonation by using the impersonated user's tenant.
+
+    Only session-authenticated users (e.g. the Django admin) are known here:
+    DRF authenticates JWT requests later, inside the view, so for API
+    requests both attributes are None. Views, mixins and permissions call
+    get_tenant_context(request.user) instead, which is memoized on the user.
     """
     
     def __init__(self, get_response):
@@ -23,10 +29,12 @@ class TenantContextMiddleware:
             impersonation_ctx = get_impersonation_context_from_request(request)
             
             effective_user = request.user
+            context = get_tenant_context(effective_user)
             
+            request.tenant_context = context
             request.tenant = {
-                **tenant_ids(effective_user),
-                'scope': determine_scope(effective_user),
+                **context.ids(),
+                'scope': context.scope,
                 'is_impersonating': bool(impersonation_ctx),
                 'original_user_id': impersonation_ctx['original_user_id'] if impersonation_ctx else None
             }
@@ -42,6 +50,7 @@ class TenantContextMiddleware:
             except ImportError:
                 pass
         else:
+            request.tenant_context = None
             request.tenant = None
         
         response = self.get_response(request)
@@ -5,7 +5,8 @@ Provides mixins to automatically scope querysets and validate tenant ownership
 on create/update operations.
 """
 from rest_framework.exceptions import PermissionDenied
-from .utils import build_tenant_filter, tenant_ids
+from .context import get_tenant_context
+from .utils import build_tenant_filter
 
 
 class ScopedQuerysetMixin:
@@ -86,22 +87,18 @@ class ScopedCreateMixin:
         is_unrestricted = user.role in unrestricted_roles if unrestricted_roles else False
 
         if not is_unrestricted:
-            ids = tenant_ids(user)
-            from .utils import determine_scope
-            user_scope = determine_scope(user)
+            context = get_tenant_context(user)
+            user_scope = context.scope
 
+            # Tenant instances come from the request's tenant context (no extra queries)
             tenant_data = {}
             for scope_level, field_name in self.tenant_create_fields.items():
-                if scope_level == 'account' and ids['account_id']:
-                    # Import here to avoid circular dependency
-                    from accounts.models import Account
-                    tenant_data[field_name] = Account.objects.get(id=ids['account_id'])
-                elif scope_level == 'store' and ids['store_id']:
-                    from brands.models import Store
-                    tenant_data[field_name] = Store.objects.get(id=ids['store_id'])
-                elif scope_level == 'brand' and ids['brand_id']:
-                    from brands.models import Brand
-                    tenant_data[field_name] = Brand.objects.get(id=ids['brand_id'])
+                if scope_level == 'account' and context.account:
+                    tenant_data[field_name] = context.account
+                elif scope_level == 'store' and context.store:
+                    tenant_data[field_name] = context.store
+                elif scope_level == 'brand' and context.brand:
+                    tenant_data[field_name] = context.brand
 
             validated_data = serializer.validated_data
 
@@ -120,13 +117,14 @@ class ScopedCreateMixin:
             if user_scope == 'account' and 'store' in validated_data:
                 from brands.models import Store
                 provided_store = validated_data['store']
-                store_id = provided_store.id if hasattr(provided_store, 'id') else provided_store
-                try:
-                    store = Store.objects.get(id=store_id)
-                    if store.account_id != ids['account_id']:
-                        raise PermissionDenied("Cannot create resource for another tenant's store")
-                except Store.DoesNotExist:
-                    raise PermissionDenied("Invalid store")
+                if isinstance(provided_store, Store):
+                    store_account_id = provided_store.account_id
+                else:
+                    store_account_id = Store.objects.filter(id=provided_store).values_list('account_id', flat=True).first()
+                    if store_account_id is None:
+                        raise PermissionDenied("Invalid store")
+                if store_account_id != context.account_id:
+                    raise PermissionDenied("Cannot create resource for another tenant's store")
 
             serializer.save(**tenant_data)
         else:
@@ -4,7 +4,7 @@ Tenant isolation permission classes.
 Provides permission classes to enforce tenant boundaries on object-level operations.
 """
 from rest_framework.permissions import BasePermission
-from .utils import determine_scope, tenant_ids
+from .context import get_tenant_context
 
 
 class TenantObjectPermission(BasePermission):
@@ -40,8 +40,9 @@ class TenantObjectPermission(BasePermission):
         if user.role == 'SUPER_ADMIN':
             return True
 
-        user_scope = determine_scope(user)
-        ids = tenant_ids(user)
+        context = get_tenant_context(user)
+        user_scope = context.scope
+        ids = context.ids()
 
         paths = getattr(view, 'tenant_object_paths', self.tenant_object_paths)
 
@@ -55,13 +56,9 @@ class TenantObjectPermission(BasePermission):
             # Fallback: Check if object's store belongs to user's brand
             if 'store' in paths:
                 obj_store_id = self._get_nested_attr(obj, paths['store'])
-                from brands.models import Store
-                try:
-                    store = Store.objects.get(id=obj_store_id)
-                    if store.brand_id == ids['brand_id']:
-                        return True
-                except Store.DoesNotExist:
-                    pass
+                store = self._get_store(context, obj_store_id)
+                if store and store.brand_id == ids['brand_id']:
+                    return True
             return False
 
         elif user_scope == 'account':
@@ -74,13 +71,9 @@ class TenantObjectPermission(BasePermission):
             if 'store' in paths:
                 obj_store_id = self._get_nested_attr(obj, paths['store'])
                 # Need to check if this store belongs to their account
-                from brands.models import Store
-                try:
-                    store = Store.objects.get(id=obj_store_id)
-                    if store.account_id == ids['account_id']:
-                        return True
-                except Store.DoesNotExist:
-                    pass
+                store = self._get_store(context, obj_store_id)
+                if store and store.account_id == ids['account_id']:
+                    return True
             # Or if the object belongs to their brand (for brand-level objects like templates)
             if 'brand' in paths:
                 obj_brand_id = self._get_nested_attr(obj, paths['brand'])
@@ -108,6 +101,16 @@ class TenantObjectPermission(BasePermission):
 
         return False
     
+    def _get_store(self, context, store_id):
+        """The user's own store from the tenant context, else the store's tenant IDs"""
+        if store_id is None:
+            return None
+        if store_id == context.store_id:
+            return context.store
+
+        from brands.models import Store
+        return Store.objects.filter(id=store_id).only('id', 'account_id', 'brand_id').first()
+
     def _get_nested_attr(self, obj, path):
         """Get nested attribute using dot notation (e.g., 'pulse.account.id')"""
         parts = path.split('.')
@@ -45,28 +45,9 @@ def tenant_ids(user) -> Dict[str, Optional[int]]:
         Dict with brand_id, account_id, store_id.
         Handles cases where user.account or user.store may be None.
     """
-    brand_id = None
-    account_id = None
-    store_id = None
-    
-    if user.store:
-        store_id = user.store.id
-        if user.store.account:
-            account_id = user.store.account.id
-            if user.store.account.brand:
-                brand_id = user.store.account.brand.id
-        if not brand_id and hasattr(user.store, 'brand') and user.store.brand:
-            brand_id = user.store.brand.id
-    elif user.account:
-        account_id = user.account.id
-        if user.account.brand:
-            brand_id = user.account.brand.id
-    
-    return {
-        'brand_id': brand_id,
-        'account_id': account_id,
-        'store_id': store_id
-    }
+    from .context import get_tenant_context
+
+    return get_tenant_context(user).ids()
 
 
 def build_tenant_filter(user, model_scope: TenantScope, 
@@ -89,13 +70,14 @@ def build_tenant_filter(user, model_scope: TenantScope,
     if user_scope == 'super_admin':
         return Q()  # No filtering
     
-    ids = tenant_ids(user)
+    from .context import get_tenant_context
+    context = get_tenant_context(user)
     
-    if user_scope == 'brand' and 'brand' in field_paths and ids['brand_id']:
-        return Q(**{field_paths['brand']: ids['brand_id']})
-    elif user_scope == 'account' and 'account' in field_paths and ids['account_id']:
-        return Q(**{field_paths['account']: ids['account_id']})
-    elif user_scope == 'store' and 'store' in field_paths and ids['store_id']:
-        return Q(**{field_paths['store']: ids['store_id']})
+    if user_scope == 'brand' and 'brand' in field_paths and context.brand_id:
+        return Q(**{field_paths['brand']: context.brand_id})
+    elif user_scope == 'account' and 'account' in field_paths and context.account_id:
+        return Q(**{field_paths['account']: context.account_id})
+    elif user_scope == 'store' and 'store' in field_paths and context.store_id:
+        return Q(**{field_paths['store']: context.store_id})
     
     return Q(pk__in=[])
@@ -0,0 +1,207 @@
+"""
+Employee voice pulse aggregates
+
+Counters behind EmployeeVoicePulseViewSet.insights, so the endpoint reads a
+few rows per day instead of rescanning raw responses on every request:
+
+- EmployeeVoiceDailyAggregate: per (pulse, store, day) response count, mood
+  sum and per-value mood / confidence / bottleneck counts
+- EmployeeVoiceDailyRespondent: exact per (pulse, store, day) set of
+  anonymous hashes, so distinct respondents over any window of days is a
+  COUNT(DISTINCT) over a small indexed table
+
+record_response updates both as a response is submitted.
+rebuild_pulse_aggregates recomputes them from the raw responses (backfills,
+or after responses are edited or deleted). Days are calendar days in
+settings.TIME_ZONE, and stores are the response's denormalized store (see
+attributed_store_id).
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    EmployeeVoiceDailyAggregate,
+    EmployeeVoiceDailyRespondent,
+    EmployeeVoiceResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 500
+
+
+def window_start(days: int, today: Optional[date] = None) -> date:
+    """First day of the last ``days`` calendar days, today included"""
+    today = today or timezone.localdate()
+    return today - timedelta(days=days - 1)
+
+
+def day_start(day: date) -> datetime:
+    """Aware datetime for midnight at the start of ``day``"""
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def employee_store_ids(account_id) -> dict:
+    """Map of 7shifts employee phone -> store id for an account"""
+    from integrations.models import SevenShiftsEmployee
+
+    employees = SevenShiftsEmployee.objects.filter(
+        account_id=account_id, store__isnull=False
+    ).exclude(phone='').values_list('phone', 'store_id')
+    return {phone: store_id for phone, store_id in employees}
+
+
+def attributed_store_id(pulse, invitation=None):
+    """
+    Store an invitation (and the response submitted through it) belongs to.
+
+    The invitation's own store when it was set at creation, else the store of
+    the 7shifts employee with the recipient phone, else the pulse's store.
+    """
+    if invitation is not None and invitation.store_id:
+        return invitation.store_id
+
+    phone = getattr(invitation, 'recipient_phone', '')
+    if phone:
+        from integrations.models import SevenShiftsEmployee
+
+        store_id = SevenShiftsEmployee.objects.filter(
+            account_id=pulse.account_id, phone=phone, store__isnull=False
+        ).values_list('store_id', flat=True).first()
+        if store_id:
+            return store_id
+    return pulse.store_id
+
+
+def _add_response(counters: dict, mood, confidence, bottlenecks):
+    counters['responses'] += 1
+    counters['mood_sum'] += mood
+    counters['mood_counts'][str(mood)] += 1
+    counters['confidence_counts'][str(confidence)] += 1
+    if isinstance(bottlenecks, list):
+        counters['bottleneck_counts'].update(bottlenecks)
+
+
+def _empty_counters() -> dict:
+    return {
+        'responses': 0,
+        'mood_sum': 0,
+        'mood_counts': Counter(),
+        'confidence_counts': Counter(),
+        'bottleneck_counts': Counter(),
+    }
+
+
+def record_response(response: EmployeeVoiceResponse):
+    """
+    Add a newly submitted response to its day's aggregates.
+
+    The aggregate row is locked while its counters are updated, so concurrent
+    submissions for the same pulse, store and day don't lose increments. A
+    race to create the day's row is settled by the unique constraints
+    (including the store-less one), which get_or_create retries on.
+    """
+    day = timezone.localdate(response.completed_at)
+    store_id = response.store_id
+
+    with transaction.atomic():
+        aggregate, _ = EmployeeVoiceDailyAggregate.objects.select_for_update().get_or_create(
+            pulse_id=response.pulse_id, store_id=store_id, day=day
+        )
+        counters = {
+            'responses': aggregate.responses,
+            'mood_sum': aggregate.mood_sum,
+            'mood_counts': Counter(aggregate.mood_counts),
+            'confidence_counts': Counter(aggregate.confidence_counts),
+            'bottleneck_counts': Counter(aggregate.bottleneck_counts),
+        }
+        _add_response(counters, response.mood, response.confidence, response.bottlenecks)
+        for field, value in counters.items():
+            setattr(aggregate, field, dict(value) if isinstance(value, Counter) else value)
+        aggregate.save()
+
+        EmployeeVoiceDailyRespondent.objects.bulk_create([
+            EmployeeVoiceDailyRespondent(
+                pulse_id=response.pulse_id, store_id=store_id, day=day,
+                anonymous_hash=response.anonymous_hash
+            )
+        ], ignore_conflicts=True)
+
+
+def rebuild_pulse_aggregates(pulse, first_day: date, last_day: date) -> int:
+    """
+    Recompute a pulse's aggregates for an inclusive range of days.
+
+    Returns:
+        Number of aggregate rows written
+    """
+    start, end = day_start(first_day), day_start(last_day + timedelta(days=1))
+    counters = defaultdict(_empty_counters)
+    respondents = set()
+    responses = EmployeeVoiceResponse.objects.filter(
+        pulse=pulse, completed_at__gte=start, completed_at__lt=end
+    ).values_list('store_id', 'completed_at', 'anonymous_hash',
+                  'mood', 'confidence', 'bottlenecks').order_by()
+    for store_id, completed_at, anonymous_hash, mood, confidence, bottlenecks in responses:
+        key = (store_id, timezone.localdate(completed_at))
+        _add_response(counters[key], mood, confidence, bottlenecks)
+        respondents.add(key + (anonymous_hash,))
+
+    aggregates = [
+        EmployeeVoiceDailyAggregate(
+            pulse=pulse, store_id=store_id, day=day,
+            **{field: dict(value) if isinstance(value, Counter) else value for field, value in values.items()}
+        )
+        for (store_id, day), values in counters.items()
+    ]
+
+    with transaction.atomic():
+        for model in (EmployeeVoiceDailyAggregate, EmployeeVoiceDailyRespondent):
+            model.objects.filter(pulse=pulse, day__gte=first_day, day__lte=last_day).delete()
+        EmployeeVoiceDailyAggregate.objects.bulk_create(aggregates, batch_size=BULK_CHUNK_SIZE)
+        EmployeeVoiceDailyRespondent.objects.bulk_create([
+            EmployeeVoiceDailyRespondent(pulse=pulse, store_id=store_id, day=day, anonymous_hash=anonymous_hash)
+            for store_id, day, anonymous_hash in respondents
+        ], batch_size=BULK_CHUNK_SIZE)
+
+    logger.info(f"Rebuilt {len(aggregates)} employee voice aggregates for pulse {pulse.id} ({first_day}..{last_day})")
+    return len(aggregates)
+
+
+def unique_respondents(pulse, first_day: date, last_day: Optional[date] = None, store_id=None) -> int:
+    """Distinct anonymous respondents to a pulse between two days (inclusive)"""
+    rows = EmployeeVoiceDailyRespondent.objects.filter(pulse=pulse, day__gte=first_day)
+    if last_day is not None:
+        rows = rows.filter(day__lte=last_day)
+    if store_id is not None:
+        rows = rows.filter(store_id=store_id)
+    return rows.values('anonymous_hash').distinct().count()
+
+
+def period_totals(pulse, first_day: date, last_day: Optional[date] = None, store_id=None) -> dict:
+    """
+    Summed counters for a pulse between two days (inclusive).
+
+    Returns:
+        Dict with 'responses', 'mood_sum' and Counters 'mood_counts',
+        'confidence_counts' and 'bottleneck_counts' keyed by stringified value
+    """
+    rows = EmployeeVoiceDailyAggregate.objects.filter(pulse=pulse, day__gte=first_day)
+    if last_day is not None:
+        rows = rows.filter(day__lte=last_day)
+    if store_id is not None:
+        rows = rows.filter(store_id=store_id)
+
+    totals = _empty_counters()
+    for row in rows.values('responses', 'mood_sum', 'mood_counts', 'confidence_counts', 'bottleneck_counts'):
+        totals['responses'] += row['responses']
+        totals['mood_sum'] += row['mood_sum']
+        for field in ('mood_counts', 'confidence_counts', 'bottleneck_counts'):
+            totals[field].update(row[field])
+    return totals
@@ -0,0 +1,76 @@
+"""
+Management command to backfill store attribution on employee voice invitations and responses.
+
+Invitations get the store of the 7shifts employee with the recipient phone
+(falling back to the pulse's store); responses copy their invitation's
+store. Run rebuild_employee_voice_aggregates afterwards so the pulse
+insights aggregates pick up the new attribution.
+
+Usage:
+    python manage.py backfill_employee_voice_stores
+    python manage.py backfill_employee_voice_stores --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+
+from employee_voice.aggregates import employee_store_ids
+from employee_voice.models import EmployeeVoiceInvitation, EmployeeVoicePulse, EmployeeVoiceResponse
+
+BULK_CHUNK_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Backfill store attribution on employee voice invitations and responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be done without making changes',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
+
+        invitations = list(
+            EmployeeVoiceInvitation.objects.filter(store__isnull=True)
+            .select_related('pulse').only('id', 'recipient_phone', 'store', 'pulse__account_id', 'pulse__store_id')
+        )
+        phone_maps = {}
+        to_update = []
+        for invitation in invitations:
+            account_id = invitation.pulse.account_id
+            if account_id not in phone_maps:
+                phone_maps[account_id] = employee_store_ids(account_id)
+            store_id = phone_maps[account_id].get(invitation.recipient_phone) or invitation.pulse.store_id
+            if store_id:
+                invitation.store_id = store_id
+                to_update.append(invitation)
+
+        self.stdout.write(f'Invitations: {len(to_update)} of {len(invitations)} unattributed can be attributed')
+        if not dry_run:
+            EmployeeVoiceInvitation.objects.bulk_update(to_update, ['store'], batch_size=BULK_CHUNK_SIZE)
+
+        responses = EmployeeVoiceResponse.objects.filter(store__isnull=True)
+        if dry_run:
+            self.stdout.write(f'Responses: {responses.count()} unattributed')
+            return
+
+        from_invitation = responses.filter(invitation__store__isnull=False).update(
+            store=Subquery(
+                EmployeeVoiceInvitation.objects.filter(pk=OuterRef('invitation_id')).values('store_id')[:1]
+            )
+        )
+        from_pulse = responses.filter(pulse__store__isnull=False).update(
+            store=Subquery(
+                EmployeeVoicePulse.objects.filter(pk=OuterRef('pulse_id')).values('store_id')[:1]
+            )
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Attributed {len(to_update)} invitations and {from_invitation + from_pulse} responses '
+            f'({from_invitation} from invitations, {from_pulse} from pulse stores)'
+        ))
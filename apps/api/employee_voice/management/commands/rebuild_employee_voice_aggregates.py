@@ -0,0 +1,44 @@
+"""
+Management command to rebuild employee voice pulse aggregates from raw responses.
+
+Usage:
+    python manage.py rebuild_employee_voice_aggregates
+    python manage.py rebuild_employee_voice_aggregates --days 30 --pulse <pulse_id>
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employee_voice.aggregates import rebuild_pulse_aggregates, window_start
+from employee_voice.models import EmployeeVoicePulse
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-day employee voice pulse aggregates from raw responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=60,
+            help='Number of most recent days to rebuild (default: 60, enough for 30-day trends)',
+        )
+        parser.add_argument(
+            '--pulse',
+            help='Only rebuild this pulse ID',
+        )
+
+    def handle(self, *args, **options):
+        pulses = EmployeeVoicePulse.objects.all()
+        if options['pulse']:
+            pulses = pulses.filter(id=options['pulse'])
+
+        last_day = timezone.localdate()
+        first_day = window_start(options['days'], today=last_day)
+
+        total = 0
+        for pulse in pulses.iterator():
+            total += rebuild_pulse_aggregates(pulse, first_day, last_day)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {total} aggregate rows for {first_day}..{last_day}'
+        ))
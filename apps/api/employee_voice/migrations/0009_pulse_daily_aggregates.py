@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0010_add_store_template_stats'),
+        ('employee_voice', '0008_add_unique_constraint_account_pulse'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeVoiceDailyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Calendar day of completion in settings.TIME_ZONE')),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('mood_sum', models.PositiveIntegerField(default=0)),
+                ('mood_counts', models.JSONField(default=dict, help_text="Responses per mood value ('1'..'5')")),
+                ('confidence_counts', models.JSONField(default=dict, help_text="Responses per confidence value ('1'..'3')")),
+                ('bottleneck_counts', models.JSONField(default=dict, help_text='Mentions per bottleneck type')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('pulse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_aggregates', to='employee_voice.employeevoicepulse')),
+                ('store', models.ForeignKey(blank=True, help_text='Store the responses are attributed to (null = unattributed)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='employee_voice_daily_aggregates', to='brands.store')),
+            ],
+            options={
+                'db_table': 'employee_voice_daily_aggregates',
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeVoiceDailyRespondent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('anonymous_hash', models.CharField(max_length=64)),
+                ('pulse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_respondents', to='employee_voice.employeevoicepulse')),
+                ('store', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='employee_voice_daily_respondents', to='brands.store')),
+            ],
+            options={
+                'db_table': 'employee_voice_daily_respondents',
+                'indexes': [models.Index(fields=['pulse', 'day'], name='employee_vo_pulse_i_5024e7_idx'), models.Index(fields=['store', 'day'], name='employee_vo_store_i_7ef1c5_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='employeevoicedailyrespondent',
+            constraint=models.UniqueConstraint(fields=('pulse', 'store', 'day', 'anonymous_hash'), name='unique_pulse_store_day_respondent'),
+        ),
+        migrations.AddIndex(
+            model_name='employeevoicedailyaggregate',
+            index=models.Index(fields=['pulse', 'day'], name='employee_vo_pulse_i_65c483_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeevoicedailyaggregate',
+            index=models.Index(fields=['store', 'day'], name='employee_vo_store_i_3cfa54_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeevoicedailyaggregate',
+            constraint=models.UniqueConstraint(fields=('pulse', 'store', 'day'), name='unique_pulse_store_day_aggregate'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0010_add_store_template_stats'),
+        ('employee_voice', '0009_pulse_daily_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeevoiceinvitation',
+            name='store',
+            field=models.ForeignKey(blank=True, help_text='Store of the invited employee (set at creation; pulse store as fallback)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee_voice_invitations', to='brands.store'),
+        ),
+        migrations.AddField(
+            model_name='employeevoiceresponse',
+            name='store',
+            field=models.ForeignKey(blank=True, help_text='Store the response is attributed to (copied from the invitation)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='employee_voice_responses', to='brands.store'),
+        ),
+        migrations.AddIndex(
+            model_name='employeevoiceinvitation',
+            index=models.Index(fields=['store', 'created_at'], name='employee_vo_store_i_2d0098_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeevoiceresponse',
+            index=models.Index(fields=['store', 'completed_at'], name='employee_vo_store_i_8459ce_idx'),
+        ),
+    ]
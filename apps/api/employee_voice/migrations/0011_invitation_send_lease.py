@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 22:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_voice', '0010_invitation_response_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employeevoiceinvitation',
+            name='send_lease_until',
+            field=models.DateTimeField(blank=True, help_text='Set while a worker is sending this invitation; others skip it until then', null=True),
+        ),
+    ]
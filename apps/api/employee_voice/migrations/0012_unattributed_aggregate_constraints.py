@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 23:12
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_unattributed_rows(apps, schema_editor):
+    """
+    Fold duplicate store-less aggregate rows for a pulse and day into one and
+    drop duplicate store-less respondent rows, so the constraints can be added.
+    """
+    Aggregate = apps.get_model('employee_voice', 'EmployeeVoiceDailyAggregate')
+    Respondent = apps.get_model('employee_voice', 'EmployeeVoiceDailyRespondent')
+
+    duplicates = Aggregate.objects.filter(store__isnull=True).values('pulse_id', 'day').annotate(
+        rows=Count('id')
+    ).filter(rows__gt=1)
+    for duplicate in duplicates:
+        rows = list(Aggregate.objects.filter(
+            store__isnull=True, pulse_id=duplicate['pulse_id'], day=duplicate['day']
+        ).order_by('id'))
+        keep = rows[0]
+        for field in ('mood_counts', 'confidence_counts', 'bottleneck_counts'):
+            total = Counter()
+            for row in rows:
+                total.update(getattr(row, field) or {})
+            setattr(keep, field, dict(total))
+        keep.responses = sum(row.responses for row in rows)
+        keep.mood_sum = sum(row.mood_sum for row in rows)
+        keep.save()
+        Aggregate.objects.filter(id__in=[row.id for row in rows[1:]]).delete()
+
+    duplicates = Respondent.objects.filter(store__isnull=True).values('pulse_id', 'day', 'anonymous_hash').annotate(
+        rows=Count('id')
+    ).filter(rows__gt=1)
+    for duplicate in duplicates:
+        ids = list(Respondent.objects.filter(
+            store__isnull=True, pulse_id=duplicate['pulse_id'], day=duplicate['day'],
+            anonymous_hash=duplicate['anonymous_hash']
+        ).order_by('id').values_list('id', flat=True))
+        Respondent.objects.filter(id__in=ids[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee_voice', '0011_invitation_send_lease'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_unattributed_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='employeevoicedailyaggregate',
+            constraint=models.UniqueConstraint(condition=models.Q(('store__isnull', True)), fields=('pulse', 'day'), name='unique_pulse_unattributed_day_aggregate'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeevoicedailyrespondent',
+            constraint=models.UniqueConstraint(condition=models.Q(('store__isnull', True)), fields=('pulse', 'day', 'anonymous_hash'), name='unique_pulse_unattributed_day_respondent'),
+        ),
+    ]
@@ -227,6 +227,14 @@ class EmployeeVoiceInvitation(models.Model):
         on_delete=models.CASCADE,
         related_name='invitations'
     )
+    store = models.ForeignKey(
+        'brands.Store',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='employee_voice_invitations',
+        help_text="Store of the invited employee (set at creation; pulse store as fallback)"
+    )
 
     # Magic link authentication
     token = models.CharField(
@@ -256,6 +264,11 @@ class EmployeeVoiceInvitation(models.Model):
         blank=True,
         help_text="Randomized time to send this invitation (for staggered delivery)"
     )
+    send_lease_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Set while a worker is sending this invitation; others skip it until then"
+    )
     sent_at = models.DateTimeField(null=True, blank=True)
     opened_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
@@ -272,6 +285,7 @@ class EmployeeVoiceInvitation(models.Model):
             models.Index(fields=['pulse', 'status']),
             models.Index(fields=['expires_at', 'status']),
             models.Index(fields=['scheduled_send_at', 'status']),
+            models.Index(fields=['store', 'created_at']),
         ]
         ordering = ['-created_at']
 
@@ -339,6 +353,14 @@ class EmployeeVoiceResponse(models.Model):
         blank=True,
         related_name='responses'
     )
+    store = models.ForeignKey(
+        'brands.Store',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='employee_voice_responses',
+        help_text="Store the response is attributed to (copied from the invitation)"
+    )
 
     # Privacy: anonymous hash for deduplication (device + IP + date)
     anonymous_hash = models.CharField(
@@ -378,6 +400,7 @@ class EmployeeVoiceResponse(models.Model):
         indexes = [
             models.Index(fields=['pulse', 'completed_at']),
             models.Index(fields=['anonymous_hash', 'completed_at']),
+            models.Index(fields=['store', 'completed_at']),
             # Note: bottlenecks is now a JSONField (multi-select), so no direct index
         ]
         ordering = ['-completed_at']
@@ -386,6 +409,98 @@ class EmployeeVoiceResponse(models.Model):
         return f"Response {self.id} - {self.pulse.title} (Mood: {self.get_mood_display()})"
 
 
+class EmployeeVoiceDailyAggregate(models.Model):
+    """
+    Per (pulse, store, day) response counters behind the pulse insights endpoint.
+    Updated as responses are submitted (see employee_voice.aggregates).
+    """
+
+    pulse = models.ForeignKey(
+        EmployeeVoicePulse,
+        on_delete=models.CASCADE,
+        related_name='daily_aggregates'
+    )
+    store = models.ForeignKey(
+        'brands.Store',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='employee_voice_daily_aggregates',
+        help_text="Store the responses are attributed to (null = unattributed)"
+    )
+    day = models.DateField(help_text="Calendar day of completion in settings.TIME_ZONE")
+
+    responses = models.PositiveIntegerField(default=0)
+    mood_sum = models.PositiveIntegerField(default=0)
+    mood_counts = models.JSONField(default=dict, help_text="Responses per mood value ('1'..'5')")
+    confidence_counts = models.JSONField(default=dict, help_text="Responses per confidence value ('1'..'3')")
+    bottleneck_counts = models.JSONField(default=dict, help_text="Mentions per bottleneck type")
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'employee_voice_daily_aggregates'
+        constraints = [
+            models.UniqueConstraint(fields=['pulse', 'store', 'day'], name='unique_pulse_store_day_aggregate'),
+            # NULLs never collide in the constraint above, so unattributed rows need their own
+            models.UniqueConstraint(
+                fields=['pulse', 'day'],
+                condition=models.Q(store__isnull=True),
+                name='unique_pulse_unattributed_day_aggregate'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['pulse', 'day']),
+            models.Index(fields=['store', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.pulse_id} / {self.store_id} / {self.day}: {self.responses} responses"
+
+
+class EmployeeVoiceDailyRespondent(models.Model):
+    """
+    Exact per-day set of anonymous respondent hashes for a pulse and store,
+    used for distinct-respondent counts and the n ≥ 5 privacy gate.
+    """
+
+    pulse = models.ForeignKey(
+        EmployeeVoicePulse,
+        on_delete=models.CASCADE,
+        related_name='daily_respondents'
+    )
+    store = models.ForeignKey(
+        'brands.Store',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='employee_voice_daily_respondents'
+    )
+    day = models.DateField()
+    anonymous_hash = models.CharField(max_length=64)
+
+    class Meta:
+        db_table = 'employee_voice_daily_respondents'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['pulse', 'store', 'day', 'anonymous_hash'],
+                name='unique_pulse_store_day_respondent'
+            ),
+            models.UniqueConstraint(
+                fields=['pulse', 'day', 'anonymous_hash'],
+                condition=models.Q(store__isnull=True),
+                name='unique_pulse_unattributed_day_respondent'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['pulse', 'day']),
+            models.Index(fields=['store', 'day']),
+        ]
+
+    def __str__(self):
+        return f"{self.pulse_id} / {self.store_id} / {self.day}"
+
+
 class CrossVoiceCorrelation(models.Model):
     """
     Links employee voice pulse trends with micro-check failures.
@@ -0,0 +1,183 @@
+"""
+Employee voice SMS dispatch
+
+Sends ready pulse invitations through Twilio from a bounded thread pool:
+
+- One Twilio client per worker process, reused across sends and threads
+- A process-wide rate limiter spacing sends to the sending number's
+  throughput (EMPLOYEE_VOICE_SMS_PER_SECOND)
+- Batches claimed in a short transaction: rows are picked with
+  select_for_update(skip_locked=True) and leased (send_lease_until) before
+  it commits, so several workers can drain the queue without sending the
+  same invitation twice and no row lock is held during the Twilio calls
+- One UPDATE per batch for the invitations that went out and one releasing
+  the lease on the rest
+
+Invitations whose send fails stay SCHEDULED and are retried on the next run
+(until they expire). A batch whose worker died mid-send is picked up again
+once its lease runs out (EMPLOYEE_VOICE_SMS_LEASE_SECONDS).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EmployeeVoiceInvitation
+
+logger = logging.getLogger(__name__)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_twilio_client():
+    """Twilio client for the configured credentials (None if not configured)"""
+    if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN:
+        return None
+
+    key = (settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from twilio.rest import Client
+
+            client = Client(*key)
+            _clients[key] = client
+        return client
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads"""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def invitation_message(invitation) -> str:
+    """SMS body with the invitation's magic link"""
+    magic_link = f"{settings.FRONTEND_URL}/pulse-survey/{invitation.token}"
+    return (
+        f"Quick team check-in 📋\n\n"
+        f"{invitation.pulse.title}\n"
+        f"Takes <30 seconds, anonymous.\n\n"
+        f"{magic_link}\n\n"
+        f"Expires in 24h."
+    )
+
+
+def send_invitation_sms(client, invitation, phone_number) -> bool:
+    """Send one invitation; False (and logged) on any Twilio error"""
+    try:
+        message = client.messages.create(
+            body=invitation_message(invitation),
+            from_=settings.TWILIO_PHONE_NUMBER,
+            to=phone_number
+        )
+        logger.info(f"SMS sent to {phone_number}: {message.sid}")
+        return True
+    except Exception as e:
+        logger.error(f"Error sending SMS to {phone_number}: {str(e)}")
+        return False
+
+
+def _claim_batch(now, exclude_ids, batch_size):
+    """
+    Lease up to batch_size ready invitations no other worker holds.
+
+    The rows are locked only while the lease is written; the transaction
+    commits before anything is sent.
+    """
+    claimed_at = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            EmployeeVoiceInvitation.objects.select_for_update(skip_locked=True, of=('self',))
+            .filter(
+                Q(send_lease_until__isnull=True) | Q(send_lease_until__lte=claimed_at),
+                status=EmployeeVoiceInvitation.Status.SCHEDULED,
+                scheduled_send_at__lte=now,
+                expires_at__gt=now
+            )
+            .exclude(id__in=exclude_ids)
+            .select_related('pulse')
+            .order_by('scheduled_send_at')[:batch_size]
+        )
+        if batch:
+            EmployeeVoiceInvitation.objects.filter(id__in=[invitation.id for invitation in batch]).update(
+                send_lease_until=claimed_at + timedelta(seconds=settings.EMPLOYEE_VOICE_SMS_LEASE_SECONDS)
+            )
+    return batch
+
+
+def dispatch_scheduled_invitations(now=None) -> dict:
+    """
+    Send every invitation whose scheduled time has come.
+
+    Returns:
+        Dict with 'sent' and 'failed' counts
+    """
+    now = now or timezone.now()
+    client = get_twilio_client()
+    if client is None:
+        logger.warning("Twilio credentials not configured")
+        failed = EmployeeVoiceInvitation.objects.filter(
+            status=EmployeeVoiceInvitation.Status.SCHEDULED,
+            scheduled_send_at__lte=now,
+            expires_at__gt=now
+        ).count()
+        return {'sent': 0, 'failed': failed}
+
+    limiter = RateLimiter(settings.EMPLOYEE_VOICE_SMS_PER_SECOND)
+
+    def send(invitation):
+        limiter.wait()
+        return send_invitation_sms(client, invitation, invitation.recipient_phone)
+
+    sent_count = 0
+    failed_ids = set()
+
+    with ThreadPoolExecutor(max_workers=max(settings.EMPLOYEE_VOICE_SMS_CONCURRENCY, 1)) as executor:
+        while True:
+            batch = _claim_batch(now, failed_ids, settings.EMPLOYEE_VOICE_SMS_BATCH_SIZE)
+            if not batch:
+                break
+
+            results = list(executor.map(send, batch))
+            sent_ids = [invitation.id for invitation, ok in zip(batch, results) if ok]
+            batch_failed_ids = [invitation.id for invitation, ok in zip(batch, results) if not ok]
+
+            finished_at = timezone.now()
+            if sent_ids:
+                EmployeeVoiceInvitation.objects.filter(id__in=sent_ids).update(
+                    status=EmployeeVoiceInvitation.Status.SENT,
+                    sent_at=finished_at,
+                    send_lease_until=None,
+                    updated_at=finished_at
+                )
+            if batch_failed_ids:
+                # Release the lease so the next run retries them
+                EmployeeVoiceInvitation.objects.filter(id__in=batch_failed_ids).update(
+                    send_lease_until=None,
+                    updated_at=finished_at
+                )
+
+            sent_count += len(sent_ids)
+            failed_ids.update(batch_failed_ids)
+
+    return {'sent': sent_count, 'failed': len(failed_ids)}
@@ -9,6 +9,7 @@ import hashlib
 import uuid
 import pytz
 import random
+from collections import defaultdict
 
 from .models import (
     EmployeeVoicePulse,
@@ -16,12 +17,23 @@ from .models import (
     EmployeeVoiceResponse,
     CrossVoiceCorrelation
 )
+from .sms import dispatch_scheduled_invitations, get_twilio_client, send_invitation_sms
 from inspections.models import ActionItem, Finding
 from micro_checks.models import MicroCheckResponse
 
 logger = logging.getLogger(__name__)
 
 
+# Chance that an eligible employee is invited on a given day
+DELIVERY_PROBABILITY = {
+    EmployeeVoicePulse.DeliveryFrequency.LOW: 0.25,      # 25% chance
+    EmployeeVoicePulse.DeliveryFrequency.MEDIUM: 0.40,   # 40% chance
+    EmployeeVoicePulse.DeliveryFrequency.HIGH: 0.55,     # 55% chance
+}
+
+BULK_CHUNK_SIZE = 500
+
+
 @shared_task(queue='default')
 def schedule_pulse_invitations():
     """
@@ -39,105 +51,114 @@ def schedule_pulse_invitations():
 
     Invitations are created with status=SCHEDULED and will be sent by
     send_scheduled_invitations task when scheduled_send_at is reached.
+
+    Set-based: eligible employees, account timezones and today's existing
+    invitations are loaded once for all pulses, and each pulse's invitations
+    are inserted with bulk_create.
     """
     from brands.models import Store
+    from integrations.models import SevenShiftsEmployee
 
     current_utc = timezone.now()
-    active_pulses = EmployeeVoicePulse.objects.filter(
+    active_pulses = list(EmployeeVoicePulse.objects.filter(
         is_active=True,
         status__in=[EmployeeVoicePulse.Status.ACTIVE, EmployeeVoicePulse.Status.LOCKED]
-    ).select_related('store', 'account')
+    ).select_related('store', 'account'))
 
     scheduled_count = 0
     skipped_count = 0
 
+    if not active_pulses:
+        logger.info("Pulse invitations scheduled: no active pulses")
+        return {'scheduled': scheduled_count, 'skipped': skipped_count}
+
+    account_ids = {pulse.account_id for pulse in active_pulses}
+    store_ids = {pulse.store_id for pulse in active_pulses if pulse.store_id}
+
+    # Account-wide pulses use the timezone of the account's first store
+    account_timezones = {}
+    for account_id, tz_name in Store.objects.filter(account_id__in=account_ids).values_list('account_id', 'timezone'):
+        account_timezones.setdefault(account_id, tz_name)
+
+    local_times = {}
     for pulse in active_pulses:
+        tz_name = pulse.store.timezone if pulse.store else account_timezones.get(pulse.account_id, 'America/New_York')
         try:
-            # Handle both store-specific and account-wide pulses
-            if pulse.store:
-                # Store-specific pulse
-                store = pulse.store
-                store_tz = pytz.timezone(store.timezone)
-                store_local_time = current_utc.astimezone(store_tz)
-            else:
-                # Account-wide pulse - use UTC or first store's timezone
-                # For account-wide pulses, we'll use America/New_York as default
-                try:
-                    first_store = Store.objects.filter(account=pulse.account).first()
-                    if first_store:
-                        store_tz = pytz.timezone(first_store.timezone)
-                    else:
-                        store_tz = pytz.timezone('America/New_York')
-                except Exception:
-                    store_tz = pytz.timezone('America/New_York')
-                store_local_time = current_utc.astimezone(store_tz)
-
-            today_start = store_local_time.replace(hour=0, minute=0, second=0, microsecond=0)
-
-            # Check if we already scheduled invitations for today
-            already_scheduled = EmployeeVoiceInvitation.objects.filter(
-                pulse=pulse,
-                created_at__gte=today_start
-            ).exists()
+            store_tz = pytz.timezone(tz_name)
+        except pytz.UnknownTimeZoneError:
+            logger.error(f"Error scheduling invitations for pulse {pulse.id}: unknown timezone {tz_name}")
+            continue
+        local_times[pulse.id] = current_utc.astimezone(store_tz)
+
+    # Phones already invited today (store-local day) per pulse
+    day_starts = {
+        pulse_id: local_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        for pulse_id, local_time in local_times.items()
+    }
+    scheduled_phones = defaultdict(set)
+    if day_starts:
+        today_invitations = EmployeeVoiceInvitation.objects.filter(
+            pulse_id__in=list(day_starts),
+            created_at__gte=min(day_starts.values())
+        ).values_list('pulse_id', 'recipient_phone', 'created_at')
+        for pulse_id, phone, created_at in today_invitations:
+            if created_at >= day_starts[pulse_id]:
+                scheduled_phones[pulse_id].add(phone)
+
+    # Eligible employees: store-specific pulses use the store's employees,
+    # account-wide pulses all employees in the account
+    employees_by_store = defaultdict(list)
+    employees_by_account = defaultdict(list)
+    employees = SevenShiftsEmployee.objects.filter(
+        Q(account_id__in=account_ids) | Q(store_id__in=store_ids),
+        is_active=True
+    ).exclude(phone__isnull=True).exclude(phone='').values_list('account_id', 'store_id', 'phone')
+    for account_id, store_id, phone in employees:
+        employees_by_account[account_id].append((store_id, phone))
+        if store_id:
+            employees_by_store[store_id].append((store_id, phone))
 
-            if already_scheduled:
-                skipped_count += 1
-                continue
-
-            # Get employees from 7shifts integration
-            try:
-                from integrations.models import SevenShiftsEmployee
-
-                # For account-wide pulses, get all employees in the account
-                # For store-specific pulses, get employees for that store
-                if pulse.store:
-                    employees = SevenShiftsEmployee.objects.filter(
-                        store=pulse.store,
-                        is_active=True
-                    ).exclude(phone__isnull=True).exclude(phone='')
-                else:
-                    # Account-wide: get all employees in the account
-                    employees = SevenShiftsEmployee.objects.filter(
-                        account=pulse.account,
-                        is_active=True
-                    ).exclude(phone__isnull=True).exclude(phone='')
-
-                # Get delivery frequency probability
-                frequency_map = {
-                    EmployeeVoicePulse.DeliveryFrequency.LOW: 0.25,      # 25% chance
-                    EmployeeVoicePulse.DeliveryFrequency.MEDIUM: 0.40,   # 40% chance
-                    EmployeeVoicePulse.DeliveryFrequency.HIGH: 0.55,     # 55% chance
-                }
-                send_probability = frequency_map.get(
-                    pulse.delivery_frequency,
-                    0.40  # Default to MEDIUM
-                )
+    for pulse in active_pulses:
+        store_local_time = local_times.get(pulse.id)
+        if store_local_time is None:
+            continue
+
+        # Already scheduled for today
+        if scheduled_phones[pulse.id]:
+            skipped_count += 1
+            continue
 
-                for employee in employees:
-                    # Random day selection - each employee has random chance
-                    if random.random() > send_probability:
-                        continue  # Skip this employee today
-
-                    # Calculate randomized send time
-                    scheduled_time = _calculate_randomized_send_time(
-                        pulse,
-                        store_local_time,
-                        store_tz
-                    )
-
-                    if scheduled_time:
-                        invitation = _create_scheduled_invitation(
-                            pulse,
-                            employee.phone,
-                            scheduled_time
-                        )
-                        if invitation:
-                            scheduled_count += 1
-
-            except ImportError:
-                location_desc = f"store {pulse.store.id}" if pulse.store else f"account {pulse.account.id}"
-                logger.warning(f"7shifts integration not available for {location_desc}")
-                continue
+        try:
+            candidates = employees_by_store[pulse.store_id] if pulse.store_id else employees_by_account[pulse.account_id]
+            send_probability = DELIVERY_PROBABILITY.get(pulse.delivery_frequency, 0.40)  # Default to MEDIUM
+            send_times = _send_time_slots(pulse, store_local_time)
+
+            invitations = []
+            invited_phones = set()
+            for store_id, phone in candidates:
+                if phone in invited_phones:
+                    continue
+                invited_phones.add(phone)
+
+                # Random day selection - each employee has random chance
+                if random.random() > send_probability:
+                    continue
+
+                # Random send time within the randomization window
+                scheduled_send_at = random.choice(send_times)
+                invitations.append(EmployeeVoiceInvitation(
+                    pulse=pulse,
+                    token=_new_invitation_token(),
+                    delivery_method=EmployeeVoiceInvitation.DeliveryMethod.SMS,
+                    recipient_phone=phone,
+                    store_id=store_id or pulse.store_id,
+                    scheduled_send_at=scheduled_send_at,
+                    status=EmployeeVoiceInvitation.Status.SCHEDULED,
+                    expires_at=scheduled_send_at + timedelta(hours=24)
+                ))
+
+            EmployeeVoiceInvitation.objects.bulk_create(invitations, batch_size=BULK_CHUNK_SIZE)
+            scheduled_count += len(invitations)
 
         except Exception as e:
             logger.error(f"Error scheduling invitations for pulse {pulse.id}: {str(e)}")
@@ -156,40 +177,14 @@ def send_scheduled_invitations():
     - status = SCHEDULED
     - scheduled_send_at <= current time
 
-    Updates status to SENT after successful SMS delivery.
+    Updates status to SENT after successful SMS delivery. Sends run
+    concurrently and rate-limited, in batches claimed with SKIP LOCKED so
+    overlapping workers split the queue (see employee_voice.sms).
     """
-    current_utc = timezone.now()
-
-    # Get invitations ready to send
-    ready_invitations = EmployeeVoiceInvitation.objects.filter(
-        status=EmployeeVoiceInvitation.Status.SCHEDULED,
-        scheduled_send_at__lte=current_utc,
-        expires_at__gt=current_utc
-    ).select_related('pulse', 'pulse__store')
-
-    sent_count = 0
-    failed_count = 0
+    result = dispatch_scheduled_invitations()
 
-    for invitation in ready_invitations:
-        try:
-            # Send SMS via Twilio
-            success = _send_sms_invitation(invitation, invitation.recipient_phone)
-
-            if success:
-                invitation.status = EmployeeVoiceInvitation.Status.SENT
-                invitation.sent_at = timezone.now()
-                invitation.save(update_fields=['status', 'sent_at', 'updated_at'])
-                sent_count += 1
-            else:
-                failed_count += 1
-
-        except Exception as e:
-            logger.error(f"Error sending scheduled invitation {invitation.id}: {str(e)}")
-            failed_count += 1
-            continue
-
-    logger.info(f"Scheduled invitations sent: {sent_count} sent, {failed_count} failed")
-    return {'sent': sent_count, 'failed': failed_count}
+    logger.info(f"Scheduled invitations sent: {result['sent']} sent, {result['failed']} failed")
+    return result
 
 
 def _is_shift_window_hour(shift_window, store_local_time):
@@ -217,92 +212,60 @@ def _get_shift_window_start_hour(shift_window):
     return 12  # Default to MID
 
 
-def _calculate_randomized_send_time(pulse, store_local_time, store_tz):
-    """
-    Calculate a randomized send time for an invitation.
 
-    Returns a timezone-aware datetime within the first N minutes of the shift window,
-    where N = pulse.randomization_window_minutes.
+def _send_time_slots(pulse, store_local_time):
+    """
+    Candidate send times (UTC) for a pulse's invitations, one per minute of
+    the first N minutes of the shift window, where N =
+    pulse.randomization_window_minutes. Invitations pick one at random.
 
-    If the shift window for today has already passed, schedules for tomorrow.
+    Slots for today that have already passed move to tomorrow.
 
     Example: If shift is MID (12pm-2pm) and randomization_window = 60 minutes,
-    returns a random time between 12:00 PM and 1:00 PM.
+    returns the minutes between 12:00 PM and 12:59 PM.
     """
-    try:
-        # Get shift window start hour
-        start_hour = _get_shift_window_start_hour(pulse.shift_window)
-
-        # Create datetime for start of shift window today
-        shift_start = store_local_time.replace(
-            hour=start_hour,
-            minute=0,
-            second=0,
-            microsecond=0
-        )
+    # Create datetime for start of shift window today
+    start_hour = _get_shift_window_start_hour(pulse.shift_window)
+    shift_start = store_local_time.replace(
+        hour=start_hour,
+        minute=0,
+        second=0,
+        microsecond=0
+    )
 
-        # Randomize within the specified window (default 60 minutes)
-        randomization_window = pulse.randomization_window_minutes or 60
-        random_minutes = random.randint(0, randomization_window - 1)
+    # Randomize within the specified window (default 60 minutes)
+    randomization_window = pulse.randomization_window_minutes or 60
 
-        # Calculate scheduled time
-        scheduled_local = shift_start + timedelta(minutes=random_minutes)
+    slots = []
+    for minute in range(randomization_window):
+        scheduled_local = shift_start + timedelta(minutes=minute)
 
         # If the scheduled time is in the past, schedule for tomorrow
         if scheduled_local <= store_local_time:
             scheduled_local = scheduled_local + timedelta(days=1)
 
         # Convert to UTC for storage
-        scheduled_utc = scheduled_local.astimezone(pytz.UTC)
-
-        return scheduled_utc
+        slots.append(scheduled_local.astimezone(pytz.UTC))
 
-    except Exception as e:
-        logger.error(f"Error calculating randomized send time for pulse {pulse.id}: {str(e)}")
-        return None
+    return slots
 
 
-def _create_scheduled_invitation(pulse, phone_number, scheduled_send_at):
-    """Create a scheduled invitation (not sent immediately)"""
-    try:
-        # Generate secure token
-        token = hashlib.sha256(f"{uuid.uuid4()}{timezone.now()}".encode()).hexdigest()
-
-        # Create invitation with SCHEDULED status
-        invitation = EmployeeVoiceInvitation.objects.create(
-            pulse=pulse,
-            token=token,
-            delivery_method=EmployeeVoiceInvitation.DeliveryMethod.SMS,
-            recipient_phone=phone_number,
-            scheduled_send_at=scheduled_send_at,
-            status=EmployeeVoiceInvitation.Status.SCHEDULED,
-            expires_at=scheduled_send_at + timedelta(hours=24)
-        )
+def _new_invitation_token():
+    """Secure magic link token"""
+    return hashlib.sha256(f"{uuid.uuid4()}{timezone.now()}".encode()).hexdigest()
 
-        logger.debug(
-            f"Scheduled invitation {invitation.id} for {phone_number} "
-            f"at {scheduled_send_at.strftime('%Y-%m-%d %H:%M %Z')}"
-        )
 
-        return invitation
 
-    except Exception as e:
-        logger.error(f"Error creating scheduled invitation for pulse {pulse.id}: {str(e)}")
-        return None
-
-
-def _create_and_send_invitation(pulse, phone_number):
+def _create_and_send_invitation(pulse, phone_number, store_id=None):
     """Create invitation and send SMS via Twilio"""
     try:
-        # Generate secure token
-        token = hashlib.sha256(f"{uuid.uuid4()}{timezone.now()}".encode()).hexdigest()
-
         # Create invitation
         invitation = EmployeeVoiceInvitation.objects.create(
             pulse=pulse,
-            token=token,
+            token=_new_invitation_token(),
             delivery_method=EmployeeVoiceInvitation.DeliveryMethod.SMS,
             recipient_phone=phone_number,
+            store_id=store_id or pulse.store_id,
             expires_at=timezone.now() + timedelta(hours=24)
         )
 
@@ -324,40 +287,13 @@ def _create_and_send_invitation(pulse, phone_number):
 
 def _send_sms_invitation(invitation, phone_number):
     """Send SMS via Twilio"""
-    try:
-        from twilio.rest import Client
-
-        if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN:
-            logger.warning("Twilio credentials not configured")
-            return False
-
-        client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-
-        # Build magic link URL
-        magic_link = f"{settings.FRONTEND_URL}/pulse-survey/{invitation.token}"
-
-        # Construct message
-        message_body = (
-            f"Quick team check-in 📋\n\n"
-            f"{invitation.pulse.title}\n"
-            f"Takes <30 seconds, anonymous.\n\n"
-            f"{magic_link}\n\n"
-            f"Expires in 24h."
-        )
-
-        message = client.messages.create(
-            body=message_body,
-            from_=settings.TWILIO_PHONE_NUMBER,
-            to=phone_number
-        )
-
-        logger.info(f"SMS sent to {phone_number}: {message.sid}")
-        return True
-
-    except Exception as e:
-        logger.error(f"Error sending SMS to {phone_number}: {str(e)}")
+    client = get_twilio_client()
+    if client is None:
+        logger.warning("Twilio credentials not configured")
         return False
 
+    return send_invitation_sms(client, invitation, phone_number)
+
 
 @shared_task(queue='default')
 def check_pulse_unlock_status():
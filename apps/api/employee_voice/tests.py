@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from datetime import timedelta
 from unittest.mock import patch, MagicMock
@@ -7,15 +7,26 @@ from accounts.models import User, Account
 from brands.models import Brand, Store
 from employee_voice.models import (
     EmployeeVoicePulse,
+    EmployeeVoiceInvitation,
     EmployeeVoiceResponse,
+    EmployeeVoiceDailyAggregate,
+    EmployeeVoiceDailyRespondent,
     CrossVoiceCorrelation
 )
+from employee_voice.aggregates import rebuild_pulse_aggregates
 from employee_voice.tasks import (
     _analyze_bottleneck_correlations,
-    _analyze_confidence_correlations
+    _analyze_confidence_correlations,
+    schedule_pulse_invitations,
+    send_scheduled_invitations
 )
+from integrations.models import SevenShiftsEmployee
 from micro_checks.models import MicroCheckTemplate, MicroCheckRun, MicroCheckResponse, MicroCheckRunItem, MicroCheckAssignment
 import hashlib
+import pytz
+from django.core.management import call_command
+from io import StringIO
+from rest_framework.test import APIClient
 
 
 class BottleneckCorrelationTests(TestCase):
@@ -337,3 +348,376 @@ class ConfidenceCorrelationTests(TestCase):
             self.assertGreaterEqual(correlations_created, 0)
         except Exception as e:
             self.fail(f"Confidence correlation raised exception: {e}")
+
+
+class PulseInsightsAggregateTests(TestCase):
+    """Pulse insights are served from per-day aggregates updated on submit"""
+
+    def setUp(self):
+        self.brand = Brand.objects.create(name="Test Brand")
+        self.owner = User.objects.create(email="owner@example.com", role=User.Role.OWNER)
+        self.account = Account.objects.create(name="Test Account", brand=self.brand, owner=self.owner)
+        self.owner.account = self.account
+        self.owner.save()
+
+        self.store = Store.objects.create(name="Store A", code="EVA", account=self.account, brand=self.brand)
+        self.other_store = Store.objects.create(name="Store B", code="EVB", account=self.account, brand=self.brand)
+        self.pulse = EmployeeVoicePulse.objects.create(
+            store=None,
+            account=self.account,
+            title="Account Pulse",
+            status=EmployeeVoicePulse.Status.ACTIVE,
+            created_by=self.owner
+        )
+        SevenShiftsEmployee.objects.create(
+            account=self.account, store=self.other_store, seven_shifts_id='7s-1',
+            email='crew@example.com', phone='+15550001111', first_name='Crew', last_name='Member'
+        )
+
+        self.client = APIClient()
+        self.url = f'/api/employee-voice/pulses/{self.pulse.id}/insights/'
+
+    def _submit(self, n, mood=4, confidence=3, bottlenecks=None, phone='', store=None):
+        invitation = EmployeeVoiceInvitation.objects.create(
+            pulse=self.pulse,
+            token=f'token-{n}',
+            recipient_phone=phone,
+            store=store,
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+        with patch('insights.snapshots.schedule_snapshot_refresh') as mock_refresh:
+            response = self.client.post('/api/employee-voice/submit/', {
+                'token': invitation.token,
+                'mood': mood,
+                'confidence': confidence,
+                'bottlenecks': bottlenecks or [],
+                'device_fingerprint': f'device-{n}',
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return mock_refresh
+
+    def test_submit_updates_daily_aggregate_and_respondents(self):
+        self._submit(1, mood=5, confidence=3, bottlenecks=['STAFFING', 'EQUIPMENT'])
+        self._submit(2, mood=2, confidence=1, bottlenecks=['STAFFING'])
+
+        aggregate = EmployeeVoiceDailyAggregate.objects.get(pulse=self.pulse, store=None)
+        self.assertEqual(aggregate.day, timezone.localdate())
+        self.assertEqual(aggregate.responses, 2)
+        self.assertEqual(aggregate.mood_sum, 7)
+        self.assertEqual(aggregate.mood_counts, {'5': 1, '2': 1})
+        self.assertEqual(aggregate.confidence_counts, {'3': 1, '1': 1})
+        self.assertEqual(aggregate.bottleneck_counts, {'STAFFING': 2, 'EQUIPMENT': 1})
+        self.assertEqual(EmployeeVoiceDailyRespondent.objects.filter(pulse=self.pulse).count(), 2)
+
+    def test_submit_attributes_store_from_employee_phone(self):
+        mock_refresh = self._submit(1, phone='+15550001111')
+
+        aggregate = EmployeeVoiceDailyAggregate.objects.get(pulse=self.pulse)
+        self.assertEqual(aggregate.store_id, self.other_store.id)
+        # The attributed store's snapshot is refreshed, not the account pulse's (empty) store
+        mock_refresh.assert_called_once_with(self.other_store.id)
+
+    def test_unattributed_responses_share_one_aggregate_row(self):
+        from django.db import IntegrityError, transaction
+
+        # Account-wide pulse and a phone that matches no 7shifts employee
+        self._submit(1, phone='+15559999999')
+        self._submit(2, phone='+15559999998')
+
+        aggregate = EmployeeVoiceDailyAggregate.objects.get(pulse=self.pulse)
+        self.assertIsNone(aggregate.store_id)
+        self.assertEqual(aggregate.responses, 2)
+
+        # A concurrent first-of-the-day insert can't add a second store-less row
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            EmployeeVoiceDailyAggregate.objects.create(pulse=self.pulse, store=None, day=aggregate.day)
+
+    def test_insights_locked_below_min_respondents(self):
+        for n in range(4):
+            self._submit(n)
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['can_display'])
+        self.assertEqual(response.data['unique_respondents'], 4)
+
+    def test_insights_served_from_aggregates(self):
+        for n in range(4):
+            self._submit(n, mood=4, confidence=3, bottlenecks=['STAFFING'])
+        self._submit(4, mood=2, confidence=1, bottlenecks=['EQUIPMENT'], phone='+15550001111')
+
+        self.client.force_authenticate(user=self.owner)
+        # pulse, tenant context, 30-day gate, two periods, respondents, comments, correlations
+        with self.assertNumQueries(8):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['can_display'])
+        self.assertEqual(response.data['total_responses'], 5)
+        self.assertEqual(response.data['unique_respondents'], 5)
+        self.assertEqual(response.data['avg_mood'], 3.6)
+        self.assertEqual(response.data['mood_distribution']['good'], 4)
+        self.assertEqual(response.data['confidence_high_pct'], 80.0)
+        self.assertEqual(response.data['top_bottlenecks'][0], {'type': 'STAFFING', 'count': 4, 'percentage': 80.0})
+
+        store_response = self.client.get(self.url, {'store_id': str(self.other_store.id)})
+        self.assertEqual(store_response.data['total_responses'], 1)
+        self.assertEqual(store_response.data['avg_mood'], 2.0)
+
+    def test_previous_period_trend(self):
+        for n in range(5):
+            self._submit(n, mood=4)
+        EmployeeVoiceDailyAggregate.objects.create(
+            pulse=self.pulse, day=timezone.localdate() - timedelta(days=8),
+            responses=2, mood_sum=4, mood_counts={'2': 2}, confidence_counts={'1': 2}
+        )
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['mood_trend'], 2.0)
+        self.assertEqual(response.data['confidence_trend'], 100.0)
+
+    def test_rebuild_matches_incremental_aggregates(self):
+        self._submit(1, mood=5, bottlenecks=['STAFFING'])
+        self._submit(2, mood=3, phone='+15550001111')
+        expected = sorted(
+            EmployeeVoiceDailyAggregate.objects.values_list('store_id', 'responses', 'mood_sum', 'bottleneck_counts'),
+            key=str
+        )
+
+        EmployeeVoiceDailyAggregate.objects.all().delete()
+        EmployeeVoiceDailyRespondent.objects.all().delete()
+        today = timezone.localdate()
+        self.assertEqual(rebuild_pulse_aggregates(self.pulse, today, today), 2)
+
+        rebuilt = sorted(
+            EmployeeVoiceDailyAggregate.objects.values_list('store_id', 'responses', 'mood_sum', 'bottleneck_counts'),
+            key=str
+        )
+        self.assertEqual(rebuilt, expected)
+        self.assertEqual(EmployeeVoiceDailyRespondent.objects.count(), 2)
+
+    def test_response_copies_invitation_store(self):
+        self._submit(1, store=self.store)
+
+        response = EmployeeVoiceResponse.objects.get(pulse=self.pulse)
+        self.assertEqual(response.store_id, self.store.id)
+        self.assertEqual(EmployeeVoiceDailyAggregate.objects.get(pulse=self.pulse).store_id, self.store.id)
+
+    def test_backfill_command_attributes_invitations_and_responses(self):
+        self._submit(1, phone='+15550001111')
+        self._submit(2, phone='+15559999999')
+        EmployeeVoiceInvitation.objects.update(store=None)
+        EmployeeVoiceResponse.objects.update(store=None)
+
+        call_command('backfill_employee_voice_stores', stdout=StringIO())
+
+        self.assertEqual(
+            EmployeeVoiceInvitation.objects.get(recipient_phone='+15550001111').store_id, self.other_store.id
+        )
+        self.assertIsNone(EmployeeVoiceInvitation.objects.get(recipient_phone='+15559999999').store_id)
+        self.assertEqual(
+            sorted(EmployeeVoiceResponse.objects.values_list('store_id', flat=True), key=str),
+            sorted([self.other_store.id, None], key=str)
+        )
+
+
+class SchedulePulseInvitationsTests(TestCase):
+    """Daily invitation scheduling is set-based"""
+
+    def setUp(self):
+        self.brand = Brand.objects.create(name="Test Brand")
+        self.owner = User.objects.create(email="owner@example.com", role=User.Role.OWNER)
+        self.account = Account.objects.create(name="Test Account", brand=self.brand, owner=self.owner)
+        self.store = Store.objects.create(
+            name="Store A", code="SCHA", account=self.account, brand=self.brand, timezone='America/Chicago'
+        )
+        self.other_store = Store.objects.create(
+            name="Store B", code="SCHB", account=self.account, brand=self.brand, timezone='America/Chicago'
+        )
+        self.pulse = EmployeeVoicePulse.objects.create(
+            store=self.store,
+            account=self.account,
+            status=EmployeeVoicePulse.Status.ACTIVE,
+            shift_window=EmployeeVoicePulse.ShiftWindow.MID,
+            randomization_window_minutes=30,
+            created_by=self.owner
+        )
+
+    def _employees(self, store, count, prefix):
+        SevenShiftsEmployee.objects.bulk_create([
+            SevenShiftsEmployee(
+                account=self.account, store=store, seven_shifts_id=f'{prefix}-{n}',
+                email=f'{prefix}{n}@example.com', phone=f'+1555{prefix}{n:04d}',
+                first_name='Crew', last_name=str(n)
+            )
+            for n in range(count)
+        ])
+
+    @patch('employee_voice.tasks.random.random', return_value=0.0)
+    def test_schedules_store_employees_in_bulk(self, _random):
+        self._employees(self.store, 40, '1')
+        self._employees(self.other_store, 5, '2')
+
+        # pulses, store timezones, today's invitations, employees, one insert
+        with self.assertNumQueries(5):
+            result = schedule_pulse_invitations()
+
+        self.assertEqual(result, {'scheduled': 40, 'skipped': 0})
+        invitations = EmployeeVoiceInvitation.objects.filter(pulse=self.pulse)
+        self.assertEqual(invitations.count(), 40)
+        self.assertEqual(set(invitations.values_list('store_id', flat=True)), {self.store.id})
+        self.assertEqual(invitations.values('token').distinct().count(), 40)
+
+        chicago = pytz.timezone('America/Chicago')
+        for invitation in invitations:
+            local = invitation.scheduled_send_at.astimezone(chicago)
+            self.assertEqual(invitation.status, EmployeeVoiceInvitation.Status.SCHEDULED)
+            self.assertEqual(local.hour, 12)
+            self.assertLess(local.minute, 30)
+            self.assertGreater(invitation.scheduled_send_at, timezone.now())
+
+    @patch('employee_voice.tasks.random.random', return_value=0.0)
+    def test_skips_pulses_already_scheduled_today(self, _random):
+        self._employees(self.store, 3, '1')
+
+        schedule_pulse_invitations()
+        result = schedule_pulse_invitations()
+
+        self.assertEqual(result, {'scheduled': 0, 'skipped': 1})
+        self.assertEqual(EmployeeVoiceInvitation.objects.count(), 3)
+
+    @patch('employee_voice.tasks.random.random', return_value=0.0)
+    def test_account_wide_pulse_invites_each_phone_once(self, _random):
+        self.pulse.is_active = False
+        self.pulse.save()
+        account_pulse = EmployeeVoicePulse.objects.create(
+            store=None, account=self.account, status=EmployeeVoicePulse.Status.ACTIVE, created_by=self.owner
+        )
+        self._employees(self.store, 2, '1')
+        self._employees(self.other_store, 2, '2')
+        SevenShiftsEmployee.objects.create(
+            account=self.account, store=self.other_store, seven_shifts_id='dup',
+            email='dup@example.com', phone='+155510000', first_name='Crew', last_name='Dup'
+        )
+
+        result = schedule_pulse_invitations()
+
+        self.assertEqual(result['scheduled'], 4)
+        self.assertEqual(
+            sorted(account_pulse.invitations.values_list('store_id', flat=True)),
+            sorted([self.store.id, self.store.id, self.other_store.id, self.other_store.id])
+        )
+
+
+@override_settings(EMPLOYEE_VOICE_SMS_PER_SECOND=0, EMPLOYEE_VOICE_SMS_CONCURRENCY=4, EMPLOYEE_VOICE_SMS_BATCH_SIZE=3)
+class SendScheduledInvitationsTests(TestCase):
+    """Ready invitations are sent concurrently in claimed batches"""
+
+    def setUp(self):
+        self.brand = Brand.objects.create(name="Test Brand")
+        self.owner = User.objects.create(email="owner@example.com", role=User.Role.OWNER)
+        self.account = Account.objects.create(name="Test Account", brand=self.brand, owner=self.owner)
+        self.store = Store.objects.create(name="Store A", code="SNDA", account=self.account, brand=self.brand)
+        self.pulse = EmployeeVoicePulse.objects.create(
+            store=self.store, account=self.account, status=EmployeeVoicePulse.Status.ACTIVE, created_by=self.owner
+        )
+        now = timezone.now()
+        self.ready = [
+            EmployeeVoiceInvitation.objects.create(
+                pulse=self.pulse, token=f'ready-{n}', recipient_phone=f'+1555000{n:04d}',
+                status=EmployeeVoiceInvitation.Status.SCHEDULED,
+                scheduled_send_at=now - timedelta(minutes=5), expires_at=now + timedelta(hours=20)
+            )
+            for n in range(7)
+        ]
+        self.later = EmployeeVoiceInvitation.objects.create(
+            pulse=self.pulse, token='later', recipient_phone='+15559990000',
+            status=EmployeeVoiceInvitation.Status.SCHEDULED,
+            scheduled_send_at=now + timedelta(hours=2), expires_at=now + timedelta(hours=26)
+        )
+
+    @patch('employee_voice.sms.get_twilio_client')
+    def test_sends_ready_invitations_with_shared_client(self, get_client):
+        client = get_client.return_value
+
+        result = send_scheduled_invitations()
+
+        self.assertEqual(result, {'sent': 7, 'failed': 0})
+        get_client.assert_called_once()
+        self.assertEqual(client.messages.create.call_count, 7)
+        self.assertEqual(
+            EmployeeVoiceInvitation.objects.filter(status=EmployeeVoiceInvitation.Status.SENT, sent_at__isnull=False).count(),
+            7
+        )
+        self.later.refresh_from_db()
+        self.assertEqual(self.later.status, EmployeeVoiceInvitation.Status.SCHEDULED)
+
+    @patch('employee_voice.sms.get_twilio_client')
+    def test_failed_sends_stay_scheduled_and_are_not_retried_in_the_same_run(self, get_client):
+        failing = self.ready[2].recipient_phone
+
+        def create(body, from_, to):
+            if to == failing:
+                raise Exception("Twilio error")
+            return MagicMock(sid='SM123')
+
+        get_client.return_value.messages.create.side_effect = create
+
+        result = send_scheduled_invitations()
+
+        self.assertEqual(result, {'sent': 6, 'failed': 1})
+        self.assertEqual(get_client.return_value.messages.create.call_count, 7)
+        self.ready[2].refresh_from_db()
+        self.assertEqual(self.ready[2].status, EmployeeVoiceInvitation.Status.SCHEDULED)
+
+    @patch('employee_voice.sms.get_twilio_client')
+    def test_invitations_are_leased_before_sending_and_released_after(self, get_client):
+        from employee_voice import sms
+
+        claim_batch = sms._claim_batch
+        leased = []
+
+        def claim(*args):
+            batch = claim_batch(*args)
+            leased.append(EmployeeVoiceInvitation.objects.filter(
+                id__in=[invitation.id for invitation in batch], send_lease_until__isnull=False
+            ).count())
+            return batch
+
+        failing = self.ready[0].recipient_phone
+
+        def create(body, from_, to):
+            if to == failing:
+                raise Exception("Twilio error")
+            return MagicMock(sid='SM123')
+
+        get_client.return_value.messages.create.side_effect = create
+
+        with patch('employee_voice.sms._claim_batch', side_effect=claim):
+            result = send_scheduled_invitations()
+
+        self.assertEqual(result, {'sent': 6, 'failed': 1})
+        self.assertEqual(leased, [3, 3, 1, 0])
+        self.assertFalse(EmployeeVoiceInvitation.objects.filter(send_lease_until__isnull=False).exists())
+
+    @patch('employee_voice.sms.get_twilio_client')
+    def test_skips_invitations_leased_by_another_worker_until_the_lease_expires(self, get_client):
+        now = timezone.now()
+        EmployeeVoiceInvitation.objects.filter(id=self.ready[0].id).update(send_lease_until=now + timedelta(minutes=5))
+        EmployeeVoiceInvitation.objects.filter(id=self.ready[1].id).update(send_lease_until=now - timedelta(minutes=5))
+
+        result = send_scheduled_invitations()
+
+        self.assertEqual(result, {'sent': 6, 'failed': 0})
+        self.ready[0].refresh_from_db()
+        self.assertEqual(self.ready[0].status, EmployeeVoiceInvitation.Status.SCHEDULED)
+        self.ready[1].refresh_from_db()
+        self.assertEqual(self.ready[1].status, EmployeeVoiceInvitation.Status.SENT)
+
+    @patch('employee_voice.sms.get_twilio_client', return_value=None)
+    def test_reports_ready_invitations_as_failed_without_credentials(self, _get_client):
+        self.assertEqual(send_scheduled_invitations(), {'sent': 0, 'failed': 7})
@@ -27,6 +27,14 @@ from .serializers import (
     EmployeeVoiceInsightsSerializer,
     CrossVoiceCorrelationSerializer
 )
+from .aggregates import (
+    attributed_store_id,
+    day_start,
+    period_totals,
+    record_response,
+    unique_respondents,
+    window_start,
+)
 from .utils import generate_anonymous_hash_from_request
 from accounts.models import User
 
@@ -183,44 +191,13 @@ class EmployeeVoicePulseViewSet(ScopedQuerysetMixin, ScopedCreateMixin, viewsets
         except (ValueError, TypeError):
             days = 7
 
-        # Calculate metrics for specified time period
-        now = timezone.now()
-        time_ago = now - timedelta(days=days)
-
-        # Get current period responses
-        responses = EmployeeVoiceResponse.objects.filter(
-            pulse=pulse,
-            completed_at__gte=time_ago
-        )
-
-        # Filter by store if specified
-        if store_id and store_id != 'all':
-            # Filter to responses from invitations sent to employees at this store
-            from integrations.models import SevenShiftsEmployee
-
-            # Get employee IDs at this store
-            store_employee_ids = SevenShiftsEmployee.objects.filter(
-                account=pulse.account,
-                store_id=store_id
-            ).values_list('id', flat=True)
-
-            # Filter responses to those from invitations linked to these employees
-            responses = responses.filter(
-                invitation__recipient_phone__in=SevenShiftsEmployee.objects.filter(
-                    id__in=store_employee_ids
-                ).values_list('phone', flat=True)
-            )
-
-        total_responses = responses.count()
-        unique_respondents = responses.values('anonymous_hash').distinct().count()
+        # Served from the per-day aggregates maintained by submit_survey_response
+        filter_store_id = store_id if store_id and store_id != 'all' else None
+        current_start = window_start(days)
+        previous_start = current_start - timedelta(days=days)
 
         # Check n ≥ 5 requirement (check last 30 days for unlock, but display current week)
-        thirty_days_ago = now - timedelta(days=30)
-        all_recent_responses = EmployeeVoiceResponse.objects.filter(
-            pulse=pulse,
-            completed_at__gte=thirty_days_ago
-        )
-        total_unique_respondents = all_recent_responses.values('anonymous_hash').distinct().count()
+        total_unique_respondents = unique_respondents(pulse, window_start(30))
 
         if total_unique_respondents < pulse.min_respondents_for_display:
             return Response({
@@ -232,94 +209,70 @@ class EmployeeVoicePulseViewSet(ScopedQuerysetMixin, ScopedCreateMixin, viewsets
                 'message': f"Insights will unlock after {pulse.min_respondents_for_display - total_unique_respondents} more unique team members participate."
             }, status=status.HTTP_200_OK)
 
-        # Calculate period-over-period trends
-        previous_period_ago = now - timedelta(days=days * 2)
-
-        # Current period responses (already filtered above)
-        current_period_responses = responses
-        # Previous period responses (previous N days)
-        previous_period_responses = EmployeeVoiceResponse.objects.filter(
-            pulse=pulse,
-            completed_at__gte=previous_period_ago,
-            completed_at__lt=time_ago
+        current = period_totals(pulse, current_start, store_id=filter_store_id)
+        previous = period_totals(
+            pulse, previous_start, current_start - timedelta(days=1), store_id=filter_store_id
         )
+        unique_respondents_count = unique_respondents(pulse, current_start, store_id=filter_store_id)
 
-        # Apply same store filter to previous period if specified
-        if store_id and store_id != 'all':
-            from integrations.models import SevenShiftsEmployee
-            store_employee_ids = SevenShiftsEmployee.objects.filter(
-                account=pulse.account,
-                store_id=store_id
-            ).values_list('id', flat=True)
-
-            previous_period_responses = previous_period_responses.filter(
-                invitation__recipient_phone__in=SevenShiftsEmployee.objects.filter(
-                    id__in=store_employee_ids
-                ).values_list('phone', flat=True)
-            )
+        def _avg_mood(totals):
+            return totals['mood_sum'] / totals['responses'] if totals['responses'] else 0
 
-        # Current period metrics
-        current_period_mood = current_period_responses.aggregate(avg_mood=Avg('mood'))['avg_mood'] or 0
-        current_period_confidence_high = current_period_responses.filter(confidence=3).count()
-        current_period_total = current_period_responses.count()
-        current_period_confidence_pct = (current_period_confidence_high / current_period_total * 100) if current_period_total > 0 else 0
+        def _confidence_pct(totals, value):
+            if not totals['responses']:
+                return 0
+            return totals['confidence_counts'][str(value)] / totals['responses'] * 100
 
-        # Previous period metrics
-        previous_period_mood = previous_period_responses.aggregate(avg_mood=Avg('mood'))['avg_mood'] or 0
-        previous_period_confidence_high = previous_period_responses.filter(confidence=3).count()
-        previous_period_total = previous_period_responses.count()
-        previous_period_confidence_pct = (previous_period_confidence_high / previous_period_total * 100) if previous_period_total > 0 else 0
+        total_responses = current['responses']
 
-        # Calculate trends (difference from previous period)
+        # Calculate period-over-period trends
+        current_period_mood = _avg_mood(current)
+        previous_period_mood = _avg_mood(previous)
         mood_trend = round(current_period_mood - previous_period_mood, 2) if previous_period_mood > 0 else None
-        confidence_trend = round(current_period_confidence_pct - previous_period_confidence_pct, 1) if previous_period_total > 0 else None
+        confidence_trend = (
+            round(_confidence_pct(current, 3) - _confidence_pct(previous, 3), 1)
+            if previous['responses'] > 0 else None
+        )
 
         # Calculate mood metrics
-        mood_stats = responses.aggregate(avg_mood=Avg('mood'))
         mood_distribution = {
-            'very_bad': responses.filter(mood=1).count(),
-            'bad': responses.filter(mood=2).count(),
-            'neutral': responses.filter(mood=3).count(),
-            'good': responses.filter(mood=4).count(),
-            'very_good': responses.filter(mood=5).count(),
+            'very_bad': current['mood_counts']['1'],
+            'bad': current['mood_counts']['2'],
+            'neutral': current['mood_counts']['3'],
+            'good': current['mood_counts']['4'],
+            'very_good': current['mood_counts']['5'],
         }
 
-        # Calculate confidence metrics (now using integer values: 3=Yes, 2=Mostly, 1=No)
-        total = responses.count()
-        confidence_stats = {
-            'high': responses.filter(confidence=3).count(),  # "Yes, I'm all set"
-            'medium': responses.filter(confidence=2).count(),  # "Mostly, a few things missing"
-            'low': responses.filter(confidence=1).count(),  # "No, we're short or disorganized"
-        }
-        confidence_high_pct = (confidence_stats['high'] / total * 100) if total > 0 else 0
-        confidence_medium_pct = (confidence_stats['medium'] / total * 100) if total > 0 else 0
-        confidence_low_pct = (confidence_stats['low'] / total * 100) if total > 0 else 0
-
-        # Calculate top bottlenecks (bottlenecks is now a JSONField array)
-        from collections import Counter
-        all_bottlenecks = []
-        for response in responses:
-            if response.bottlenecks and isinstance(response.bottlenecks, list):
-                all_bottlenecks.extend(response.bottlenecks)
-
-        bottleneck_counter = Counter(all_bottlenecks)
+        # Calculate confidence metrics (3=Yes, 2=Mostly, 1=No)
+        confidence_high_pct = _confidence_pct(current, 3)
+        confidence_medium_pct = _confidence_pct(current, 2)
+        confidence_low_pct = _confidence_pct(current, 1)
+
+        # Calculate top bottlenecks
         top_bottlenecks = [
             {
                 'type': bottleneck_type,
                 'count': count,
-                'percentage': round((count / len(responses) * 100), 1) if len(responses) > 0 else 0
+                'percentage': round((count / total_responses * 100), 1) if total_responses > 0 else 0
             }
-            for bottleneck_type, count in bottleneck_counter.most_common(5)
+            for bottleneck_type, count in current['bottleneck_counts'].most_common(5)
         ]
 
-        # Get all comments for the week with timestamps (role-gated, already filtered by serializer)
-        recent_comments = responses.exclude(comment='').order_by('-completed_at')
+        # Get all comments for the period with timestamps (role-gated, already filtered by serializer)
+        recent_comments = EmployeeVoiceResponse.objects.filter(
+            pulse=pulse,
+            completed_at__gte=day_start(current_start)
+        ).exclude(comment='')
+
+        if filter_store_id:
+            recent_comments = recent_comments.filter(store_id=filter_store_id)
+
         comments = [
             {
-                'text': r.comment,
-                'completed_at': r.completed_at.isoformat() if r.completed_at else None
+                'text': comment,
+                'completed_at': completed_at.isoformat() if completed_at else None
             }
-            for r in recent_comments if r.comment
+            for comment, completed_at in recent_comments.order_by('-completed_at').values_list('comment', 'completed_at')
         ]
 
         # Get active correlations
@@ -332,17 +285,17 @@ class EmployeeVoicePulseViewSet(ScopedQuerysetMixin, ScopedCreateMixin, viewsets
 
         # Calculate engagement score (would need team size from store)
         # For now, use unique respondents as a proxy
-        engagement_score = (unique_respondents / max(unique_respondents, 5) * 100)
+        engagement_score = (unique_respondents_count / max(unique_respondents_count, 5) * 100)
 
         insights_data = {
             'pulse_id': pulse.id,
             'pulse_title': pulse.title,
             'time_window': f'Last {days} days',
             'total_responses': total_responses,
-            'unique_respondents': unique_respondents,
+            'unique_respondents': unique_respondents_count,
             'can_display': True,
             'engagement_score': round(engagement_score, 1),
-            'avg_mood': round(mood_stats['avg_mood'], 2) if mood_stats['avg_mood'] else 0,
+            'avg_mood': round(current_period_mood, 2),
             'mood_distribution': mood_distribution,
             'mood_trend': mood_trend,
             'confidence_high_pct': round(confidence_high_pct, 1),
@@ -410,17 +363,7 @@ class EmployeeVoicePulseViewSet(ScopedQuerysetMixin, ScopedCreateMixin, viewsets
         # Get store filter if specified
         store_id = request.query_params.get('store_id')
         if store_id and store_id != 'all':
-            from integrations.models import SevenShiftsEmployee
-            store_employee_ids = SevenShiftsEmployee.objects.filter(
-                account=pulse.account,
-                store_id=store_id
-            ).values_list('id', flat=True)
-
-            responses = responses.filter(
-                invitation__recipient_phone__in=SevenShiftsEmployee.objects.filter(
-                    id__in=store_employee_ids
-                ).values_list('phone', flat=True)
-            )
+            responses = responses.filter(store_id=store_id)
 
         # Extract comment texts
         comments = [r.comment for r in responses if r.comment]
@@ -582,6 +525,7 @@ class EmployeeVoicePulseViewSet(ScopedQuerysetMixin, ScopedCreateMixin, viewsets
         """
         Get distribution statistics for specified time period (7 or 30 days).
         Shows daily breakdown of scheduled/sent/opened/completed.
+        Supports optional store_id filter for account-wide pulses.
         """
         pulse = self.get_object()
 
@@ -603,6 +547,11 @@ class EmployeeVoicePulseViewSet(ScopedQuerysetMixin, ScopedCreateMixin, viewsets
             created_at__gte=time_ago
         )
 
+        # Filter by store if specified
+        store_id = request.query_params.get('store_id')
+        if store_id and store_id != 'all':
+            invitations = invitations.filter(store_id=store_id)
+
         # Group by date
         from django.db.models.functions import TruncDate
         daily_stats = invitations.annotate(
@@ -741,6 +690,7 @@ def submit_survey_response(request):
     response = EmployeeVoiceResponse.objects.create(
         pulse=pulse,
         invitation=invitation,
+        store_id=attributed_store_id(pulse, invitation),
         anonymous_hash=anonymous_hash,
         mood=serializer.validated_data['mood'],
         confidence=serializer.validated_data['confidence'],
@@ -750,12 +700,19 @@ def submit_survey_response(request):
         user_agent=request.META.get('HTTP_USER_AGENT', '')
     )
 
+    # Count it towards the pulse insights aggregates
+    record_response(response)
+
     # Mark invitation as completed
     invitation.mark_completed()
 
     # Check if pulse should be unlocked
     pulse.check_unlock_status()
 
+    # Refresh the employee voice of the store the response is attributed to
+    from insights.snapshots import schedule_snapshot_refresh
+    schedule_snapshot_refresh(response.store_id)
+
     # Return created response
     response_serializer = EmployeeVoiceResponseSerializer(response, context={'request': request})
     return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insights', '0005_reviewanalysis_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storeinsightsstate',
+            name='snapshot',
+            field=models.JSONField(blank=True, default=dict, help_text='Precomputed insights summary payload (see insights.snapshots)'),
+        ),
+        migrations.AddField(
+            model_name='storeinsightsstate',
+            name='snapshot_built_at',
+            field=models.DateTimeField(blank=True, help_text='When the snapshot was last rebuilt', null=True),
+        ),
+        migrations.AddField(
+            model_name='storeinsightsstate',
+            name='snapshot_version',
+            field=models.PositiveIntegerField(default=0, help_text='Incremented on every snapshot rebuild; used as the ETag'),
+        ),
+    ]
@@ -491,6 +491,7 @@ Respond in JSON format:
             store: Optional Store instance to link the GoogleLocation to
         """
         from integrations.models import GoogleLocation, GoogleReview, GoogleReviewAnalysis as IntegrationAnalysis
+        from integrations.topic_counters import apply_analysis_to_counters
         from ai_services.bedrock_service import BedrockRecommendationService
         import logging
 
@@ -579,6 +580,10 @@ Respond in JSON format:
                                 confidence=analysis_result.get('confidence', 0.5),
                                 model_used='bedrock' if bedrock_service.enabled else 'fallback'
                             )
+                            apply_analysis_to_counters(
+                                review,
+                                current=(analysis_result['topics'], analysis_result['sentiment_score'])
+                            )
 
                             review.needs_analysis = False
                             review.analyzed_at = timezone.now()
@@ -716,6 +721,22 @@ class StoreInsightsState(models.Model):
         help_text='Previous health score for delta calculation'
     )
 
+    # Materialized insights summary served by the 360° endpoint
+    snapshot = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Precomputed insights summary payload (see insights.snapshots)'
+    )
+    snapshot_version = models.PositiveIntegerField(
+        default=0,
+        help_text='Incremented on every snapshot rebuild; used as the ETag'
+    )
+    snapshot_built_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When the snapshot was last rebuilt'
+    )
+
     class Meta:
         db_table = 'store_insights_state'
         verbose_name = 'Store Insights State'
@@ -789,7 +810,7 @@ class StoreInsightsState(models.Model):
             # Get pulse responses from last 30 days
             thirty_days_ago = timezone.now() - timedelta(days=30)
             recent_responses = EmployeeVoiceResponse.objects.filter(
-                pulse__store=self.store,
+                store=self.store,
                 completed_at__gte=thirty_days_ago
             )
 
@@ -833,7 +854,7 @@ class StoreInsightsState(models.Model):
             "delta": delta
         }
 
-    def update_voices_active(self):
+    def update_voices_active(self, save=True):
         """Update voices_active based on current data availability"""
         # Customer voice: Always active if store has Google location
         customer_active = hasattr(self.store, 'google_location') and self.store.google_location is not None
@@ -849,4 +870,5 @@ class StoreInsightsState(models.Model):
             'employee': employee_active,
             'operational': operational_active
         }
-        self.save()
+        if save:
+            self.save()
@@ -0,0 +1,126 @@
+"""
+Store 360° insights snapshots
+
+The insights summary (customer, employee and operational voices, store health
+and cross-voice correlations) is expensive to compose, so it is materialized
+on StoreInsightsState.snapshot and served from there. Events that change the
+inputs (micro-check responses, Google reviews, pulse submissions) call
+schedule_snapshot_refresh, which coalesces bursts into one rebuild per store
+per debounce window. snapshot_version is bumped on every rebuild and doubles
+as the endpoint's ETag.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import StoreInsightsState
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_REFRESH_KEY = 'insights:snapshot-refresh:{store_id}'
+
+
+def snapshot_etag(insights_state) -> str:
+    """Strong ETag for the state's current snapshot"""
+    return f'"{insights_state.store_id}-{insights_state.snapshot_version}"'
+
+
+def snapshot_is_stale(insights_state) -> bool:
+    """True if the snapshot has never been built or is past its max age"""
+    if not insights_state.snapshot_version or not insights_state.snapshot_built_at:
+        return True
+    age = timezone.now() - insights_state.snapshot_built_at
+    return age.total_seconds() > settings.INSIGHTS_SNAPSHOT_MAX_AGE_SECONDS
+
+
+def build_store_snapshot(store, insights_state) -> dict:
+    """Compose the insights summary payload for a store"""
+    from .views import (
+        _compute_correlations,
+        _get_customer_voice,
+        _get_employee_voice,
+        _get_operational_voice,
+    )
+
+    snapshot = {
+        "store_health": insights_state.store_health_score,
+        "voices": {
+            "customer": _get_customer_voice(store),
+            "employee": _get_employee_voice(store, insights_state),
+            "operational": _get_operational_voice(store)
+        },
+        "unlock": {
+            "employee_voice_unlocked": insights_state.employee_voice_unlocked,
+            "cross_voice_unlocked": insights_state.cross_voice_unlocked
+        },
+    }
+
+    # Add correlations if cross-voice is unlocked
+    if insights_state.cross_voice_unlocked:
+        snapshot["correlations"] = _compute_correlations(store)
+
+    return snapshot
+
+
+def refresh_store_snapshot(store) -> StoreInsightsState:
+    """
+    Rebuild and save a store's insights snapshot.
+
+    Args:
+        store: Store instance
+
+    Returns:
+        StoreInsightsState with the new snapshot and version
+    """
+    insights_state, _ = StoreInsightsState.objects.select_related(
+        'store__google_location'
+    ).get_or_create(store=store)
+    insights_state.update_voices_active(save=False)
+
+    built_at = timezone.now()
+    snapshot = build_store_snapshot(store, insights_state)
+    snapshot["last_updated"] = built_at.isoformat()
+
+    insights_state.snapshot = snapshot
+    insights_state.snapshot_built_at = built_at
+    insights_state.snapshot_version = F('snapshot_version') + 1
+    insights_state.save(update_fields=[
+        'voices_active', 'snapshot', 'snapshot_built_at', 'snapshot_version', 'last_updated'
+    ])
+    insights_state.refresh_from_db(fields=['snapshot_version'])
+
+    logger.info(f"Rebuilt insights snapshot v{insights_state.snapshot_version} for store {store.id}")
+    return insights_state
+
+
+def schedule_snapshot_refresh(store_id):
+    """
+    Queue a debounced snapshot rebuild for a store once the current
+    transaction commits.
+
+    Only the first call in each INSIGHTS_SNAPSHOT_DEBOUNCE_SECONDS window
+    queues a task; it runs at the end of the window so later events in the
+    same burst are picked up by the same rebuild.
+    """
+    if not store_id:
+        return
+
+    def _enqueue():
+        debounce = settings.INSIGHTS_SNAPSHOT_DEBOUNCE_SECONDS
+        if not cache.add(SNAPSHOT_REFRESH_KEY.format(store_id=store_id), True, timeout=debounce * 2):
+            return
+
+        from .tasks import refresh_store_insights_snapshot
+        try:
+            refresh_store_insights_snapshot.apply_async(args=[store_id], countdown=debounce)
+        except Exception as e:
+            # Reads past INSIGHTS_SNAPSHOT_MAX_AGE_SECONDS schedule it again
+            cache.delete(SNAPSHOT_REFRESH_KEY.format(store_id=store_id))
+            logger.warning(f"Could not queue insights snapshot refresh for store {store_id}: {e}")
+
+    transaction.on_commit(_enqueue)
@@ -624,6 +624,30 @@ def aggregate_store_review_analysis(self, analysis_id):
         raise
 
 
+@shared_task
+def refresh_store_insights_snapshot(store_id):
+    """
+    Rebuild a store's 360° insights snapshot (queued by schedule_snapshot_refresh).
+
+    Clears the debounce key first so events arriving during the rebuild
+    schedule a follow-up refresh instead of being dropped.
+    """
+    from django.core.cache import cache
+    from brands.models import Store
+    from .snapshots import SNAPSHOT_REFRESH_KEY, refresh_store_snapshot
+
+    cache.delete(SNAPSHOT_REFRESH_KEY.format(store_id=store_id))
+
+    try:
+        store = Store.objects.get(id=store_id)
+    except Store.DoesNotExist:
+        logger.warning(f"Store {store_id} not found, skipping insights snapshot refresh")
+        return {'success': False, 'error': 'Store not found'}
+
+    insights_state = refresh_store_snapshot(store)
+    return {'success': True, 'version': insights_state.snapshot_version}
+
+
 class MockStdout:
     """Mock stdout for management command"""
     def write(self, msg, **kwargs):
@@ -448,3 +448,96 @@ class AggregateStoreReviewAnalysisTests(TestCase):
         # Oldest should be earliest (days=4)
         # Newest should be most recent (days=0)
         self.assertTrue(self.analysis.oldest_review_date < self.analysis.newest_review_date)
+
+
+class InsightsSnapshotTests(TestCase):
+    """Test the summary endpoint serves a versioned snapshot refreshed off the read path"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.client = APIClient()
+        self.brand = Brand.objects.create(name='Snapshot Brand')
+        self.owner = User.objects.create_user(
+            username='snapshot_owner', email='snapshot_owner@test.com', password='password123', role='OWNER'
+        )
+        self.account = Account.objects.create(name='Snapshot Account', brand=self.brand, owner=self.owner)
+        self.owner.account = self.account
+        self.owner.save()
+        self.store = Store.objects.create(
+            brand=self.brand, account=self.account, name='Snapshot Store', code='SNAP-001',
+            timezone='America/New_York'
+        )
+        self.url = f'/api/insights/store/{self.store.id}/summary/'
+        self.client.force_authenticate(user=self.owner)
+
+    def test_first_view_builds_snapshot_and_later_views_reuse_it(self):
+        from insights.models import StoreInsightsState
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], f'"{self.store.id}-1"')
+        self.assertIn('operational', response.data['voices'])
+
+        with patch('insights.snapshots.build_store_snapshot') as mock_build:
+            response = self.client.get(self.url)
+        mock_build.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(StoreInsightsState.objects.get(store=self.store).snapshot_version, 1)
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{self.store.id}-0"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stale_snapshot_is_served_and_refreshed_in_background(self):
+        from datetime import timedelta
+        from insights.models import StoreInsightsState
+
+        self.client.get(self.url)
+        StoreInsightsState.objects.filter(store=self.store).update(
+            snapshot_built_at=timezone.now() - timedelta(days=1)
+        )
+
+        with patch('insights.snapshots.schedule_snapshot_refresh') as mock_schedule:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], f'"{self.store.id}-1"')
+        mock_schedule.assert_called_once_with(self.store.id)
+
+    def test_refreshes_are_debounced_per_store(self):
+        from insights.snapshots import schedule_snapshot_refresh
+
+        with patch('insights.tasks.refresh_store_insights_snapshot.apply_async') as mock_apply:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_snapshot_refresh(self.store.id)
+                schedule_snapshot_refresh(self.store.id)
+
+        mock_apply.assert_called_once()
+        self.assertEqual(mock_apply.call_args.kwargs['args'], [self.store.id])
+
+    def test_refresh_task_bumps_version_and_reopens_debounce(self):
+        from insights.models import StoreInsightsState
+        from insights.tasks import refresh_store_insights_snapshot
+        from insights.snapshots import schedule_snapshot_refresh
+
+        self.client.get(self.url)
+
+        with patch('insights.tasks.refresh_store_insights_snapshot.apply_async') as mock_apply:
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_snapshot_refresh(self.store.id)
+            refresh_store_insights_snapshot(self.store.id)
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_snapshot_refresh(self.store.id)
+
+        self.assertEqual(mock_apply.call_count, 2)
+        self.assertEqual(StoreInsightsState.objects.get(store=self.store).snapshot_version, 2)
+        self.assertEqual(self.client.get(self.url)['ETag'], f'"{self.store.id}-2"')
@@ -296,52 +296,49 @@ def insights_summary(request, store_id):
     Get aggregate insights for a store (360° operational intelligence).
     Composes Customer, Employee, and Operational voices in one response.
 
+    Served from the store's precomputed snapshot (see insights.snapshots).
+    Responses carry an ETag; a matching If-None-Match returns 304.
+
     GET /api/insights/store/{store_id}/summary/
     """
-    from rest_framework.permissions import IsAuthenticated
+    from django.utils.http import parse_etags
     from brands.models import Store
     from .models import StoreInsightsState
+    from .snapshots import refresh_store_snapshot, schedule_snapshot_refresh, snapshot_etag, snapshot_is_stale
 
     # Check permissions
     if not request.user.is_authenticated:
         return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
 
     # Get store and verify access
-    store = get_object_or_404(Store, id=store_id)
+    store = get_object_or_404(Store.objects.select_related('account', 'brand'), id=store_id)
 
     # Verify user has access to this store
     if not _user_can_access_store(request.user, store):
         return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
 
-    # Get or create insights state
-    insights_state, created = StoreInsightsState.objects.get_or_create(store=store)
+    insights_state = StoreInsightsState.objects.filter(store=store).first()
 
-    # Update voices active status
-    insights_state.update_voices_active()
+    if insights_state is None or not insights_state.snapshot_version:
+        # First view: build synchronously so there is something to serve
+        insights_state = refresh_store_snapshot(store)
+    elif snapshot_is_stale(insights_state):
+        # Serve what we have; time-windowed figures catch up in the background
+        schedule_snapshot_refresh(store.id)
 
     # Track analytics
     _track_event('insights_viewed', request.user, store)
 
-    # Compose response
-    response_data = {
-        "store_health": insights_state.store_health_score,
-        "voices": {
-            "customer": _get_customer_voice(store),
-            "employee": _get_employee_voice(store, insights_state),
-            "operational": _get_operational_voice(store)
-        },
-        "unlock": {
-            "employee_voice_unlocked": insights_state.employee_voice_unlocked,
-            "cross_voice_unlocked": insights_state.cross_voice_unlocked
-        },
-        "last_updated": insights_state.last_updated.isoformat()
-    }
-
-    # Add correlations if cross-voice is unlocked
-    if insights_state.cross_voice_unlocked:
-        response_data["correlations"] = _compute_correlations(store)
+    etag = snapshot_etag(insights_state)
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match)):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(insights_state.snapshot)
 
-    return Response(response_data)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 def _user_can_access_store(user, store):
@@ -436,9 +433,9 @@ def _get_employee_voice(store, insights_state):
     thirty_days_ago = timezone.now() - timedelta(days=30)
     fourteen_days_ago = timezone.now() - timedelta(days=14)
 
-    # Get active pulses for this store
+    # Get active pulses covering this store (its own, or its account's account-wide pulse)
     active_pulses = EmployeeVoicePulse.objects.filter(
-        store=store,
+        Q(store=store) | Q(store__isnull=True, account_id=store.account_id),
         is_active=True
     )
 
@@ -451,7 +448,7 @@ def _get_employee_voice(store, insights_state):
 
     # Get all responses (n ≥ 5 already validated by unlock status)
     recent_responses = EmployeeVoiceResponse.objects.filter(
-        pulse__store=store,
+        store=store,
         completed_at__gte=thirty_days_ago
     )
 
@@ -579,6 +576,7 @@ def _get_operational_voice(store):
     Returns: completion rate, avg score, streak, top categories
     """
     from micro_checks.models import MicroCheckRun, MicroCheckResponse
+    from micro_checks.streaks import get_store_streak
     from django.db.models import Avg, Count, Case, When, IntegerField, Q
     from datetime import timedelta
     from django.utils import timezone
@@ -615,8 +613,8 @@ def _get_operational_voice(store):
     else:
         avg_score = 0
 
-    # Calculate streak
-    streak = _calculate_streak(store)
+    # Current streak from the incrementally maintained StoreStreak
+    streak = get_store_streak(store)['current_streak']
 
     # Top improving categories
     # TODO: Implement category trend analysis
@@ -640,37 +638,6 @@ def _get_operational_voice(store):
     }
 
 
-def _calculate_streak(store):
-    """Calculate current micro-check streak for store"""
-    from micro_checks.models import MicroCheckRun
-    from django.utils import timezone
-    from datetime import timedelta
-
-    today = timezone.now().date()
-    streak = 0
-    check_date = today
-
-    # Count consecutive days with completed checks
-    while True:
-        has_check = MicroCheckRun.objects.filter(
-            store=store,
-            created_at__date=check_date,
-            completed_at__isnull=False
-        ).exists()
-
-        if not has_check:
-            break
-
-        streak += 1
-        check_date -= timedelta(days=1)
-
-        # Cap at 365 days for performance
-        if streak >= 365:
-            break
-
-    return streak
-
-
 def _compute_correlations(store):
     """
     Compute cross-voice correlations using real Employee Voice and operational data.
@@ -706,7 +673,7 @@ def _compute_correlations(store):
 
     # Add mood-based correlation if we have employee voice data
     recent_responses = EmployeeVoiceResponse.objects.filter(
-        pulse__store=store,
+        store=store,
         completed_at__gte=thirty_days_ago
     )
 
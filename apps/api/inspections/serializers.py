@@ -4,6 +4,7 @@ from .models import Inspection, Finding, ActionItem
 
 class FindingSerializer(serializers.ModelSerializer):
     frame_image = serializers.SerializerMethodField()
+    frame_thumbnail = serializers.SerializerMethodField()
     frame_timestamp = serializers.SerializerMethodField()
 
     class Meta:
@@ -16,6 +17,12 @@ class FindingSerializer(serializers.ModelSerializer):
             return obj.frame.image.url
         return None
 
+    def get_frame_thumbnail(self, obj):
+        """Thumbnail variant URL for previews (falls back to the full frame)"""
+        if obj.frame and obj.frame.image:
+            return obj.frame.get_variant('thumbnail').url
+        return None
+
     def get_frame_timestamp(self, obj):
         """Safely get frame timestamp"""
         if obj.frame:
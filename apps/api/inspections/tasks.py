@@ -1,6 +1,7 @@
 import os
 import tempfile
 from celery import shared_task
+from django.db import transaction
 from django.utils import timezone
 from django.conf import settings
 from django.core.files.storage import default_storage
@@ -28,42 +29,29 @@ def analyze_video(self, inspection_id):
         analyzer = VideoAnalyzer()
 
         # Get video frames
-        frames = video.frames.all().order_by('timestamp')
-        if not frames.exists():
+        frames = list(video.frames.all().order_by('timestamp'))
+        if not frames:
             raise Exception("No frames found for video analysis")
 
         all_analyses = []
         all_findings = []
         
-        # Analyze each frame
-        for frame in frames:
-            temp_frame_path = None
-            try:
-                # Download frame from S3 to temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                    # Read from S3
-                    with default_storage.open(frame.image.name, 'rb') as s3_file:
-                        frame_bytes = s3_file.read()
-                        tmp_file.write(frame_bytes)
-                        temp_frame_path = tmp_file.name
-
-                # Analyze frame
-                frame_analysis = analyzer.analyze_frame(temp_frame_path, frame_bytes)
-                all_analyses.append(frame_analysis)
+        # Analyze frames in batches so YOLO runs once per batch
+        batch_size = max(getattr(settings, 'YOLO_BATCH_SIZE', 8), 1)
+        for start in range(0, len(frames), batch_size):
+            for frame, frame_analysis in analyze_frame_batch(analyzer, frames[start:start + batch_size]):
+                try:
+                    all_analyses.append(frame_analysis)
 
-                # Generate findings for this frame
-                findings = analyzer.generate_findings(frame_analysis, frame)
-                all_findings.extend(findings)
+                    # Generate findings for this frame
+                    findings = analyzer.generate_findings(frame_analysis, frame)
+                    all_findings.extend(findings)
 
-                logger.info(f"Analyzed frame {frame.frame_number} with score {frame_analysis.get('overall_score', 0)}")
+                    logger.info(f"Analyzed frame {frame.frame_number} with score {frame_analysis.get('overall_score', 0)}")
 
-            except Exception as e:
-                logger.error(f"Error analyzing frame {frame.frame_number}: {e}")
-                continue
-            finally:
-                # Clean up temp file
-                if temp_frame_path and os.path.exists(temp_frame_path):
-                    os.remove(temp_frame_path)
+                except Exception as e:
+                    logger.error(f"Error analyzing frame {frame.frame_number}: {e}")
+                    continue
 
         # Calculate overall scores
         scores = calculate_inspection_scores(all_analyses)
@@ -84,6 +72,7 @@ def analyze_video(self, inspection_id):
             'frame_analyses': all_analyses,
             'analysis_summary': {
                 'total_frames_analyzed': len(all_analyses),
+                'ocr_gate': summarize_ocr_gate(all_analyses),
                 'analysis_timestamp': timezone.now().isoformat(),
                 'analyzer_version': '1.0.0'
             }
@@ -95,11 +84,8 @@ def analyze_video(self, inspection_id):
         video.status = 'COMPLETED'
         video.save()
 
-        # Create findings
-        create_findings_from_analysis(inspection, all_findings)
-        
-        # Generate action items
-        generate_action_items(inspection)
+        # Create findings and their action items in bulk
+        create_findings_and_action_items(inspection, all_findings)
 
         logger.info(f"Inspection {inspection_id} completed with overall score {inspection.overall_score}")
         return f"Inspection {inspection_id} analyzed successfully"
@@ -120,6 +106,57 @@ def analyze_video(self, inspection_id):
         raise self.retry(exc=exc, countdown=60, max_retries=3)
 
 
+def analyze_frame_batch(analyzer, frames):
+    """Analyze a batch of frames with one batched YOLO call
+
+    Detectors read each frame's downscaled variant; OCR fetches the original
+    only if its text gate lets it run. Frames that fail to download are
+    logged and skipped. Returns (frame, analysis) pairs; temp files are
+    removed before returning.
+    """
+    temp_paths = []
+    batch = []
+    try:
+        for frame in frames:
+            try:
+                frame_bytes, temp_frame_path = download_frame_variant(frame, 'detector')
+            except Exception as e:
+                logger.error(f"Error downloading frame {frame.frame_number}: {e}")
+                continue
+            temp_paths.append(temp_frame_path)
+
+            if frame.detector_image:
+                def fetch_original(frame=frame):
+                    _, original_path = download_frame_variant(frame, 'original')
+                    temp_paths.append(original_path)
+                    return original_path
+            else:
+                fetch_original = None
+
+            batch.append((frame, (temp_frame_path, frame_bytes, fetch_original)))
+
+        analyses = analyzer.analyze_frames([frame_input for _, frame_input in batch])
+        return [(frame, analysis) for (frame, _), analysis in zip(batch, analyses)]
+    finally:
+        # Clean up temp files
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def download_frame_variant(frame, variant):
+    """Download a frame variant from storage into a temp file
+
+    Returns the image bytes and the temp file path (caller removes it).
+    """
+    image = frame.get_variant(variant)
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
+        with default_storage.open(image.name, 'rb') as s3_file:
+            frame_bytes = s3_file.read()
+        tmp_file.write(frame_bytes)
+        return frame_bytes, tmp_file.name
+
+
 def calculate_inspection_scores(frame_analyses):
     """Calculate overall inspection scores from frame analyses"""
     if not frame_analyses:
@@ -272,10 +309,26 @@ def calculate_inspection_scores(frame_analyses):
     }
 
 
-def create_findings_from_analysis(inspection, findings_data):
-    """Create consolidated Finding objects from analysis results with AI-generated recommendations"""
+def summarize_ocr_gate(frame_analyses):
+    """Count frames where menu-board OCR was skipped, cropped or run on the full frame"""
+    summary = {'frames_skipped': 0, 'frames_cropped': 0, 'frames_full': 0}
+    for analysis in frame_analyses:
+        gate = analysis.get('menu_board_analysis', {}).get('ocr_gate')
+        if not gate:
+            continue
+        if gate.get('skipped'):
+            summary['frames_skipped'] += 1
+        elif gate.get('region_count'):
+            summary['frames_cropped'] += 1
+        else:
+            summary['frames_full'] += 1
+    return summary
+
+
+def build_findings_from_analysis(inspection, findings_data):
+    """Build unsaved, consolidated Finding objects from analysis results"""
     if not findings_data:
-        return
+        return []
 
     # Initialize Bedrock service for generating recommendations
     bedrock_service = BedrockRecommendationService()
@@ -296,11 +349,12 @@ def create_findings_from_analysis(inspection, findings_data):
 
         grouped_findings[key].append(finding_data)
 
-    # Create one consolidated finding per group
+    findings = []
+
+    # Build one consolidated finding per group
     for (category, severity, title), group_findings in grouped_findings.items():
         try:
             # Extract data from all findings in this group
-            frames = [f.get('frame') for f in group_findings if f.get('frame')]
             confidences = [f.get('confidence', 0.0) for f in group_findings]
             timestamps = [f.get('frame').timestamp for f in group_findings if f.get('frame')]
 
@@ -334,8 +388,7 @@ def create_findings_from_analysis(inspection, findings_data):
             recommended_action = recommendation['recommended_action']
             estimated_minutes = recommendation['estimated_minutes']
 
-            # Create consolidated finding with AI-generated recommendations
-            Finding.objects.create(
+            findings.append(Finding(
                 inspection=inspection,
                 frame=representative_frame,
                 category=category,
@@ -350,7 +403,7 @@ def create_findings_from_analysis(inspection, findings_data):
                 first_timestamp=first_timestamp,
                 last_timestamp=last_timestamp,
                 average_confidence=average_confidence
-            )
+            ))
 
             logger.info(
                 f"Consolidated {affected_frame_count} findings for '{title}' "
@@ -361,54 +414,70 @@ def create_findings_from_analysis(inspection, findings_data):
         except Exception as e:
             logger.error(f"Error creating consolidated finding for '{title}': {e}")
 
+    return findings
 
-def generate_action_items(inspection):
-    """Generate action items based on findings"""
-    findings = inspection.findings.all()
-    
-    # Group findings by category and severity
-    critical_findings = findings.filter(severity='CRITICAL')
-    high_findings = findings.filter(severity='HIGH')
-    
-    # Create action items for critical findings
-    for finding in critical_findings:
-        ActionItem.objects.create(
-            inspection=inspection,
-            finding=finding,
-            title=f"Address Critical Issue: {finding.title}",
-            description=finding.recommended_action or finding.description,
-            priority=ActionItem.Priority.URGENT,
-            due_date=timezone.now() + timezone.timedelta(hours=4)  # 4 hours for critical
-        )
-    
-    # Create action items for high priority findings
-    for finding in high_findings:
-        ActionItem.objects.create(
-            inspection=inspection,
-            finding=finding,
-            title=f"Address High Priority Issue: {finding.title}",
-            description=finding.recommended_action or finding.description,
-            priority=ActionItem.Priority.HIGH,
-            due_date=timezone.now() + timezone.timedelta(days=1)  # 1 day for high
-        )
-    
-    # Create summary action items for categories with multiple medium findings
+
+def build_action_items(inspection, findings):
+    """Build unsaved ActionItem objects for a list of saved findings"""
+    now = timezone.now()
+    action_items = []
     medium_findings_by_category = {}
-    for finding in findings.filter(severity='MEDIUM'):
-        category = finding.category
-        if category not in medium_findings_by_category:
-            medium_findings_by_category[category] = []
-        medium_findings_by_category[category].append(finding)
-    
+
+    for finding in findings:
+        if finding.severity == Finding.Severity.CRITICAL:
+            action_items.append(ActionItem(
+                inspection=inspection,
+                finding=finding,
+                title=f"Address Critical Issue: {finding.title}",
+                description=finding.recommended_action or finding.description,
+                priority=ActionItem.Priority.URGENT,
+                due_date=now + timezone.timedelta(hours=4)  # 4 hours for critical
+            ))
+        elif finding.severity == Finding.Severity.HIGH:
+            action_items.append(ActionItem(
+                inspection=inspection,
+                finding=finding,
+                title=f"Address High Priority Issue: {finding.title}",
+                description=finding.recommended_action or finding.description,
+                priority=ActionItem.Priority.HIGH,
+                due_date=now + timezone.timedelta(days=1)  # 1 day for high
+            ))
+        elif finding.severity == Finding.Severity.MEDIUM:
+            medium_findings_by_category.setdefault(finding.category, []).append(finding)
+
+    # Create summary action items for categories with multiple medium findings
     for category, category_findings in medium_findings_by_category.items():
         if len(category_findings) >= 3:  # Create summary action for 3+ medium findings
-            ActionItem.objects.create(
+            action_items.append(ActionItem(
                 inspection=inspection,
                 title=f"Review {category} Compliance",
                 description=f"Multiple {category.lower()} issues detected. Review and address all findings in this category.",
                 priority=ActionItem.Priority.MEDIUM,
-                due_date=timezone.now() + timezone.timedelta(days=3)  # 3 days for medium
-            )
+                due_date=now + timezone.timedelta(days=3)  # 3 days for medium
+            ))
+
+    return action_items
+
+
+def create_findings_and_action_items(inspection, findings_data):
+    """Bulk findings-to-actions pipeline
+
+    Recommendations are generated before opening the transaction so no
+    external calls happen while it is held. Findings and action items are then
+    each written with one bulk insert, linked through the returned primary keys.
+    """
+    findings = build_findings_from_analysis(inspection, findings_data)
+
+    with transaction.atomic():
+        created_findings = Finding.objects.bulk_create(findings) if findings else []
+        action_items = build_action_items(inspection, created_findings)
+        created_action_items = ActionItem.objects.bulk_create(action_items) if action_items else []
+
+    logger.info(
+        f"Inspection {inspection.id}: created {len(created_findings)} findings "
+        f"and {len(created_action_items)} action items"
+    )
+    return created_findings, created_action_items
 
 
 @shared_task
@@ -425,8 +494,9 @@ def cleanup_expired_inspections():
             # Delete associated video frames and files if they exist
             video = inspection.video
             for frame in video.frames.all():
-                if frame.image and os.path.exists(frame.image.path):
-                    os.remove(frame.image.path)
+                for image in (frame.image, frame.detector_image, frame.thumbnail):
+                    if image and os.path.exists(image.path):
+                        os.remove(image.path)
             
             # Delete video file and thumbnail
             if video.file and os.path.exists(video.file.path):
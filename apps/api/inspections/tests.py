@@ -558,6 +558,95 @@ class RekognitionIntegrationTest(TestCase):
         self.assertIn('face cover', ppe_findings[0]['title'].lower())
 
 
+class FindingsToActionsPipelineTest(TestCase):
+    """Test bulk creation of findings and action items from analysis results"""
+
+    def setUp(self):
+        self.brand = Brand.objects.create(name="Test Brand")
+        self.store = Store.objects.create(
+            brand=self.brand, name="Test Store", code="TS001",
+            address="123 Test St", city="Test City", state="TS", zip_code="12345"
+        )
+        self.user = User.objects.create_user(
+            username="testuser", store=self.store
+        )
+        self.video = Video.objects.create(
+            uploaded_by=self.user, store=self.store,
+            title="Test Video", file="test.mp4"
+        )
+        self.inspection = create_inspection_with_video(self.video)
+
+    def _finding_data(self, category, severity, title, confidence=0.9):
+        return {
+            'category': category,
+            'severity': severity,
+            'title': title,
+            'description': f"{title} detected",
+            'confidence': confidence,
+        }
+
+    @override_settings(ENABLE_BEDROCK_RECOMMENDATIONS=False)
+    def test_pipeline_creates_findings_and_linked_action_items(self):
+        from .tasks import create_findings_and_action_items
+
+        findings_data = [
+            self._finding_data('SAFETY', 'CRITICAL', 'Blocked Exit', 0.8),
+            self._finding_data('SAFETY', 'CRITICAL', 'Blocked Exit', 0.95),
+            self._finding_data('PPE', 'HIGH', 'Missing Gloves'),
+            self._finding_data('CLEANLINESS', 'MEDIUM', 'Spill A'),
+            self._finding_data('CLEANLINESS', 'MEDIUM', 'Spill B'),
+            self._finding_data('CLEANLINESS', 'MEDIUM', 'Spill C'),
+            self._finding_data('OTHER', 'LOW', 'Minor Issue'),
+        ]
+
+        # One insert each for findings and action items, plus savepoint/release
+        with self.assertNumQueries(4):
+            findings, action_items = create_findings_and_action_items(self.inspection, findings_data)
+
+        self.assertEqual(len(findings), 6)
+        self.assertTrue(all(f.pk for f in findings))
+
+        blocked_exit = Finding.objects.get(inspection=self.inspection, title='Blocked Exit')
+        self.assertEqual(blocked_exit.affected_frame_count, 2)
+        self.assertEqual(blocked_exit.confidence, 0.95)
+
+        self.assertEqual(len(action_items), 3)
+        urgent = ActionItem.objects.get(inspection=self.inspection, priority=ActionItem.Priority.URGENT)
+        self.assertEqual(urgent.finding_id, blocked_exit.id)
+        high = ActionItem.objects.get(inspection=self.inspection, priority=ActionItem.Priority.HIGH)
+        self.assertEqual(high.finding.title, 'Missing Gloves')
+        summary = ActionItem.objects.get(inspection=self.inspection, priority=ActionItem.Priority.MEDIUM)
+        self.assertIsNone(summary.finding)
+        self.assertEqual(summary.title, 'Review CLEANLINESS Compliance')
+
+    def test_build_action_items_from_saved_findings(self):
+        from .tasks import build_action_items
+
+        Finding.objects.create(
+            inspection=self.inspection, category='SAFETY', severity='CRITICAL',
+            title='Blocked Exit', description='Exit blocked', confidence=0.9
+        )
+        Finding.objects.create(
+            inspection=self.inspection, category='OTHER', severity='LOW',
+            title='Minor Issue', description='Minor', confidence=0.6
+        )
+
+        action_items = build_action_items(self.inspection, list(self.inspection.findings.all()))
+
+        self.assertEqual(len(action_items), 1)
+        self.assertEqual(action_items[0].priority, ActionItem.Priority.URGENT)
+        self.assertIsNone(action_items[0].pk)
+
+    def test_pipeline_with_no_findings(self):
+        from .tasks import create_findings_and_action_items
+
+        findings, action_items = create_findings_and_action_items(self.inspection, [])
+
+        self.assertEqual(findings, [])
+        self.assertEqual(action_items, [])
+        self.assertFalse(self.inspection.findings.exists())
+
+
 class InspectionAnalyticsTest(TestCase):
     """Test inspection analytics and reporting"""
 
@@ -9,9 +9,12 @@ This client handles:
 """
 
 import logging
+import threading
+import time
 from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 import requests
 from requests.adapters import HTTPAdapter
@@ -21,6 +24,42 @@ import base64
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_QUOTA_KEY = 'google_reviews:quota:{window}'
+
+
+def wait_for_quota():
+    """
+    Block until the shared Google API request budget allows another call.
+
+    Requests are counted per minute in the Django cache (Redis in production),
+    so the budget is shared by every thread and worker syncing reviews. Set
+    GOOGLE_REVIEWS_REQUESTS_PER_MINUTE to 0 to disable. A cache outage never
+    blocks a sync; requests then go out unthrottled.
+    """
+    limit = getattr(settings, 'GOOGLE_REVIEWS_REQUESTS_PER_MINUTE', 300)
+    if limit <= 0:
+        return
+
+    while True:
+        now = time.time()
+        key = GOOGLE_QUOTA_KEY.format(window=int(now // 60))
+        try:
+            cache.add(key, 0, 120)
+            count = cache.incr(key)
+        except ValueError:
+            # Window key expired between add and incr
+            continue
+        except Exception as e:
+            logger.warning(f"Google quota limiter unavailable, not throttling: {e}")
+            return
+
+        if count <= limit:
+            return
+
+        delay = 60 - now % 60
+        logger.info(f"Google API request budget used up, waiting {delay:.1f}s")
+        time.sleep(delay)
+
 
 class GoogleReviewsClient:
     """Client for interacting with Google Business Profile API"""
@@ -39,6 +78,10 @@ class GoogleReviewsClient:
         self.refresh_token = refresh_token
         self.session = self._create_session()
 
+        # requests.Session is not thread-safe; concurrent location fetches get their own
+        self._local = threading.local()
+        self._local.session = self.session
+
     @staticmethod
     def get_oauth_authorization_url() -> str:
         """Generate Google OAuth authorization URL
@@ -168,6 +211,19 @@ class GoogleReviewsClient:
 
         return session
 
+    def _get_session(self) -> requests.Session:
+        """Session for the current thread, with the same retry adapter"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+        return session
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """Authorized GET within the shared request budget"""
+        wait_for_quota()
+        return self._get_session().get(url, headers=self._get_headers(), params=params)
+
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authorization"""
         return {
@@ -219,7 +275,7 @@ class GoogleReviewsClient:
         url = f"{self.BASE_URL}/accounts"
 
         try:
-            response = self.session.get(url, headers=self._get_headers())
+            response = self._get(url)
             response.raise_for_status()
             data = response.json()
 
@@ -251,7 +307,7 @@ class GoogleReviewsClient:
                 if page_token:
                     params['pageToken'] = page_token
 
-                response = self.session.get(url, headers=self._get_headers(), params=params)
+                response = self._get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
 
@@ -267,12 +323,16 @@ class GoogleReviewsClient:
             logger.error(f"Failed to list locations for {account_name}: {e}")
             raise
 
-    def list_reviews(self, location_name: str, page_size: int = 50) -> List[Dict[str, Any]]:
-        """List all reviews for a specific location
+    def list_reviews(self, location_name: str, page_size: int = 50,
+                     updated_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """List reviews for a specific location
 
         Args:
             location_name: Location name (e.g., 'accounts/12345/locations/67890')
             page_size: Number of reviews per page (max 50)
+            updated_after: If set, reviews are fetched newest update first and
+                paging stops after the first page holding only reviews updated
+                at or before this time (incremental sync)
 
         Returns:
             List of review dictionaries with reviewId, reviewer, starRating, comment, etc.
@@ -282,6 +342,8 @@ class GoogleReviewsClient:
         params = {
             'pageSize': min(page_size, 50)
         }
+        if updated_after is not None:
+            params['orderBy'] = 'updateTime desc'
 
         reviews = []
         page_token = None
@@ -291,11 +353,18 @@ class GoogleReviewsClient:
                 if page_token:
                     params['pageToken'] = page_token
 
-                response = self.session.get(url, headers=self._get_headers(), params=params)
+                response = self._get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
 
-                reviews.extend(data.get('reviews', []))
+                page = data.get('reviews', [])
+                reviews.extend(page)
+
+                # Everything past a fully known page is older still
+                if updated_after is not None and all(
+                    review_update_time(review) <= updated_after for review in page
+                ):
+                    break
 
                 page_token = data.get('nextPageToken')
                 if not page_token:
@@ -324,7 +393,7 @@ class GoogleReviewsClient:
         url = f"{self.REVIEW_URL}/{review_name}"
 
         try:
-            response = self.session.get(url, headers=self._get_headers())
+            response = self._get(url)
             response.raise_for_status()
             return response.json()
 
@@ -348,7 +417,8 @@ class GoogleReviewsClient:
         }
 
         try:
-            response = self.session.put(
+            wait_for_quota()
+            response = self._get_session().put(
                 url,
                 headers=self._get_headers(),
                 json=payload
@@ -361,6 +431,27 @@ class GoogleReviewsClient:
             raise
 
 
+def _parse_rfc3339(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Google RFC3339 timestamp, returning None if missing or invalid"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
+
+def review_update_time(review_data: Dict[str, Any]) -> datetime:
+    """When a raw Google review was last updated (falls back to its create time)
+
+    Returns:
+        Timezone-aware datetime, or the epoch if neither time can be parsed
+    """
+    return (
+        _parse_rfc3339(review_data.get('updateTime'))
+        or _parse_rfc3339(review_data.get('createTime'))
+        or datetime.fromtimestamp(0, tz=dt_timezone.utc)
+    )
+
+
 def parse_google_review(review_data: Dict[str, Any]) -> Dict[str, Any]:
     """Parse Google review data into simplified format
 
@@ -393,11 +484,7 @@ def parse_google_review(review_data: Dict[str, Any]) -> Dict[str, Any]:
     review_reply = review_reply_data.get('comment', '')
 
     # Parse create time (RFC3339 format)
-    create_time_str = review_data.get('createTime', '')
-    try:
-        create_time = datetime.fromisoformat(create_time_str.replace('Z', '+00:00'))
-    except (ValueError, AttributeError):
-        create_time = timezone.now()
+    create_time = _parse_rfc3339(review_data.get('createTime', '')) or timezone.now()
 
     # Extract review ID from name (e.g., 'accounts/123/locations/456/reviews/789' -> '789')
     review_name = review_data.get('name', '')
@@ -409,7 +496,8 @@ def parse_google_review(review_data: Dict[str, Any]) -> Dict[str, Any]:
         'rating': rating,
         'review_text': comment,
         'review_reply': review_reply,
-        'review_created_at': create_time
+        'review_created_at': create_time,
+        'review_updated_at': _parse_rfc3339(review_data.get('updateTime')) or create_time
     }
 
 
@@ -5,9 +5,15 @@ Handles syncing of Google Business Profile locations and reviews.
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from django.utils import timezone
+from decimal import Decimal
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count
+from django.utils import timezone
+import requests
 
 from .models import (
     GoogleReviewsConfig,
@@ -18,7 +24,8 @@ from .models import (
 from .google_reviews_client import (
     GoogleReviewsClient,
     parse_google_location,
-    parse_google_review
+    parse_google_review,
+    review_update_time
 )
 
 logger = logging.getLogger(__name__)
@@ -27,6 +34,15 @@ logger = logging.getLogger(__name__)
 class GoogleReviewsSyncService:
     """Service for syncing Google Reviews data"""
 
+    # Rows per bulk write / IN-clause lookup
+    BULK_CHUNK_SIZE = 500
+
+    # Refresh tokens expiring within this margin before a sync starts
+    TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+    # Review fields taken from the Google API on every sync
+    REVIEW_FIELDS = ['reviewer_name', 'rating', 'review_text', 'review_reply', 'review_created_at']
+
     def __init__(self, config: GoogleReviewsConfig):
         """
         Initialize sync service with a Google Reviews configuration.
@@ -44,39 +60,75 @@ class GoogleReviewsSyncService:
         # Initialize API client
         self.client = GoogleReviewsClient(access_token, refresh_token)
 
-        # Check if token needs refresh
-        if config.token_expires_at <= timezone.now():
+        # Guards the one token refresh shared by concurrent location fetches
+        self._token_lock = threading.Lock()
+        self._refreshed_token = None
+
+        # Refresh up front (once per account) if the token expires mid-sync
+        if config.token_expires_at <= timezone.now() + self.TOKEN_REFRESH_MARGIN:
             self._refresh_token()
 
     def _refresh_token(self):
-        """Refresh the OAuth access token"""
+        """Refresh the OAuth access token and save it"""
+        token_data = self._request_new_token()
+        if token_data:
+            self._save_access_token(token_data)
+
+    def _request_new_token(self):
+        """
+        Get a new access token from Google, updating the client in place.
+
+        Touches no database state, so it is safe from fetch threads.
+
+        Returns:
+            Token dict, or None if OAuth credentials are not configured
+        """
         try:
             client_id = getattr(settings, 'GOOGLE_OAUTH_CLIENT_ID', '')
             client_secret = getattr(settings, 'GOOGLE_OAUTH_CLIENT_SECRET', '')
 
             if not client_id or not client_secret:
                 logger.error("Google OAuth credentials not configured in settings")
-                return
-
-            token_data = self.client.refresh_access_token(client_id, client_secret)
+                return None
 
-            # Encrypt and save new token using the proper method
-            encrypted_access_token = GoogleReviewsClient.encrypt_token(token_data['access_token']).encode()
-
-            self.config.access_token_encrypted = encrypted_access_token
-            self.config.token_expires_at = timezone.now() + timedelta(seconds=token_data['expires_in'])
-            self.config.save(update_fields=['access_token_encrypted', 'token_expires_at'])
-
-            logger.info(f"Refreshed access token for account {self.account.name}")
+            return self.client.refresh_access_token(client_id, client_secret)
 
         except Exception as e:
             logger.error(f"Failed to refresh access token: {e}")
             raise
 
-    def sync_all(self):
+    def _save_access_token(self, token_data: dict):
+        """Encrypt and save a refreshed access token"""
+        encrypted_access_token = GoogleReviewsClient.encrypt_token(token_data['access_token']).encode()
+
+        self.config.access_token_encrypted = encrypted_access_token
+        self.config.token_expires_at = timezone.now() + timedelta(seconds=token_data['expires_in'])
+        self.config.save(update_fields=['access_token_encrypted', 'token_expires_at'])
+
+        logger.info(f"Refreshed access token for account {self.account.name}")
+
+    def _refresh_token_once(self, stale_token: str):
+        """
+        Refresh a token rejected mid-sync, once for all locations.
+
+        Threads that saw the same stale token wait on the lock and then reuse
+        the token the first one fetched. Saving is left to the main thread.
+        """
+        with self._token_lock:
+            if self.client.access_token != stale_token:
+                return
+            token_data = self._request_new_token()
+            if token_data:
+                self._refreshed_token = token_data
+
+    def sync_all(self, full: bool = False):
         """
         Sync both locations and reviews.
 
+        Args:
+            full: Re-fetch every review in the days_back window instead of
+                only those updated since each location's high-water mark
+
         Returns:
             dict with sync results
         """
@@ -97,7 +149,7 @@ class GoogleReviewsSyncService:
             total_locations = locations_result['locations_synced']
 
             # Sync reviews for each location
-            reviews_result = self.sync_reviews()
+            reviews_result = self.sync_reviews(full=full)
             total_reviews = reviews_result['reviews_synced']
 
             # Update sync log
@@ -186,106 +238,271 @@ class GoogleReviewsSyncService:
             logger.error(f"Failed to sync locations for {self.account.name}: {e}")
             raise
 
-    def sync_reviews(self, days_back: int = 90):
+    def sync_reviews(self, days_back: int = 90, full: bool = False):
         """
         Sync reviews for all locations.
 
+        Reviews are fetched newest update first and paging stops at the
+        location's high-water mark (reviews_updated_through) or the days_back
+        cutoff, whichever is later, so a nightly sync costs a page or two per
+        location. The mark only advances once the location's reviews are stored.
+
+        Locations are fetched concurrently (GOOGLE_REVIEWS_FETCH_WORKERS
+        threads, HTTP only) and stored on the calling thread as each fetch
+        completes, so database work stays on one connection.
+
         Args:
             days_back: How many days of reviews to fetch (default: 90)
+            full: Ignore the high-water mark and fetch the whole days_back window
 
         Returns:
             dict with reviews_synced count
         """
         logger.info(f"Syncing reviews for account {self.account.name}")
 
-        locations = GoogleLocation.objects.filter(
+        locations = list(GoogleLocation.objects.filter(
             account=self.account,
             is_active=True
-        )
+        ))
 
         total_reviews = 0
+        totals = {'inserted': 0, 'updated': 0, 'upgraded': 0, 'unchanged': 0}
+        cutoff = timezone.now() - timedelta(days=days_back)
+        max_workers = max(1, min(getattr(settings, 'GOOGLE_REVIEWS_FETCH_WORKERS', 4), len(locations)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for location in locations:
+                updated_after = cutoff
+                if not full and location.reviews_updated_through:
+                    updated_after = max(cutoff, location.reviews_updated_through)
+                futures[executor.submit(self._fetch_location_reviews, location, updated_after)] = location
+
+            for future in as_completed(futures):
+                location = futures[future]
+                try:
+                    google_reviews = future.result()
 
-        for location in locations:
-            try:
-                # Get reviews from Google
-                google_reviews = self.client.list_reviews(
-                    location_name=f"accounts/{self.config.google_account_id}/locations/{location.google_location_id}"
-                )
-
-                for review_data in google_reviews:
-                    try:
-                        parsed_review = parse_google_review(review_data)
-
-                        # Only sync recent reviews (within days_back)
-                        if (timezone.now() - parsed_review['review_created_at']).days > days_back:
-                            continue
-
-                        # Check if a scraped version exists (deduplication)
-                        # Try to find by exact google_review_id or by content match
-                        existing_scraped = GoogleReview.objects.filter(
-                            account=self.account,
-                            location=location,
-                            source='scraped',
-                            reviewer_name=parsed_review['reviewer_name'],
-                            rating=parsed_review['rating'],
-                            review_text__icontains=parsed_review['review_text'][:50]  # Match first 50 chars
-                        ).first()
-
-                        # Create or update review
-                        review, created = GoogleReview.objects.update_or_create(
-                            google_review_id=parsed_review['google_review_id'],
-                            defaults={
-                                'location': location,
-                                'account': self.account,
-                                'reviewer_name': parsed_review['reviewer_name'],
-                                'rating': parsed_review['rating'],
-                                'review_text': parsed_review['review_text'],
-                                'review_reply': parsed_review['review_reply'],
-                                'review_created_at': parsed_review['review_created_at'],
-                                # Mark as OAuth source (verified) - upgrades scraped reviews
-                                'source': 'oauth',
-                                'is_verified': True,
-                                # Mark as needing analysis if newly created or text changed
-                                'needs_analysis': created or (
-                                    not created and
-                                    review.review_text != parsed_review['review_text']
-                                )
-                            }
-                        )
-
-                        # If we upgraded a scraped review, log it
-                        if not created and existing_scraped:
-                            logger.info(f"Upgraded scraped review to verified: {review.google_review_id}")
-
-                        total_reviews += 1
-                        if created:
-                            logger.info(f"New review for {location.google_location_name}: {review.rating}★")
-
-                    except Exception as e:
-                        logger.error(f"Failed to sync review: {e}")
-                        continue
-
-                # Update location stats
-                location_reviews = GoogleReview.objects.filter(location=location)
-                if location_reviews.exists():
-                    avg_rating = sum(r.rating for r in location_reviews) / location_reviews.count()
-                    location.average_rating = round(avg_rating, 2)
-                    location.total_review_count = location_reviews.count()
-                    location.save(update_fields=['average_rating', 'total_review_count'])
-
-                # Generate review analysis for this location's store if needed
-                self._generate_analysis_for_location(location)
+                    result = self._bulk_sync_location_reviews(location, google_reviews, days_back)
+                    for key in totals:
+                        totals[key] += result[key]
+                    total_reviews += sum(result[key] for key in totals)
 
-            except Exception as e:
-                logger.error(f"Failed to sync reviews for location {location.google_location_name}: {e}")
-                continue
+                    self._update_location_stats(location)
+                    self._advance_high_water_mark(location, google_reviews)
+
+                    # New or edited reviews change the store's customer voice
+                    if location.store_id and (result['inserted'] or result['updated'] or result['upgraded']):
+                        from insights.snapshots import schedule_snapshot_refresh
+                        schedule_snapshot_refresh(location.store_id)
+
+                    # Generate review analysis for this location's store if needed
+                    self._generate_analysis_for_location(location)
 
-        logger.info(f"Synced {total_reviews} reviews for {self.account.name}")
+                except Exception as e:
+                    logger.error(f"Failed to sync reviews for location {location.google_location_name}: {e}")
+                    continue
+
+        if self._refreshed_token:
+            self._save_access_token(self._refreshed_token)
+            self._refreshed_token = None
+
+        logger.info(f"Synced {total_reviews} reviews for {self.account.name} using {max_workers} worker(s)")
 
         return {
-            'reviews_synced': total_reviews
+            'reviews_synced': total_reviews,
+            'reviews_created': totals['inserted'],
+            'reviews_updated': totals['updated'],
+            'reviews_upgraded': totals['upgraded'],
+            'reviews_unchanged': totals['unchanged'],
         }
 
+    def _fetch_location_reviews(self, location: GoogleLocation, updated_after: datetime) -> list:
+        """Fetch one location's reviews, refreshing a rejected token once (runs in a fetch thread)"""
+        location_name = f"accounts/{self.config.google_account_id}/locations/{location.google_location_id}"
+        token = self.client.access_token
+
+        try:
+            return self.client.list_reviews(location_name=location_name, updated_after=updated_after)
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != 401:
+                raise
+            self._refresh_token_once(token)
+            return self.client.list_reviews(location_name=location_name, updated_after=updated_after)
+
+    def _bulk_sync_location_reviews(self, location: GoogleLocation, google_reviews: list,
+                                    days_back: int) -> dict:
+        """
+        Upsert one location's reviews with a constant number of queries.
+
+        Existing reviews and the location's scraped reviews are preloaded,
+        scraped reviews matching an incoming review (same reviewer and rating,
+        text starting alike) are upgraded in place to verified OAuth reviews,
+        and only new or changed rows are written.
+
+        Args:
+            location: GoogleLocation the reviews belong to
+            google_reviews: Raw review dicts from the Google API
+            days_back: Reviews older than this many days are ignored
+
+        Returns:
+            dict with inserted/updated/upgraded/unchanged/skipped counts
+        """
+        result = {'inserted': 0, 'updated': 0, 'upgraded': 0, 'unchanged': 0, 'skipped': 0}
+        now = timezone.now()
+
+        # Last occurrence wins if Google returns the same review twice
+        parsed_by_id = {}
+        for review_data in google_reviews:
+            try:
+                parsed_review = parse_google_review(review_data)
+            except Exception as e:
+                logger.error(f"Failed to parse review: {e}")
+                result['skipped'] += 1
+                continue
+
+            # Only sync recent reviews (within days_back)
+            if (now - parsed_review['review_created_at']).days > days_back:
+                continue
+            parsed_by_id[parsed_review['google_review_id']] = parsed_review
+
+        if not parsed_by_id:
+            return result
+
+        existing = {}
+        review_ids = list(parsed_by_id)
+        for i in range(0, len(review_ids), self.BULK_CHUNK_SIZE):
+            existing.update({
+                review.google_review_id: review
+                for review in GoogleReview.objects.filter(
+                    google_review_id__in=review_ids[i:i + self.BULK_CHUNK_SIZE]
+                ).only(*self.REVIEW_FIELDS, 'google_review_id', 'location', 'needs_analysis')
+            })
+
+        # Scraped reviews this sync may upgrade, keyed by what a scrape captures
+        scraped = {}
+        for review in GoogleReview.objects.filter(location=location, source='scraped'):
+            scraped.setdefault((review.reviewer_name, review.rating), []).append(review)
+
+        to_write = []
+        to_upgrade = []
+
+        for google_review_id, parsed_review in parsed_by_id.items():
+            values = {field: parsed_review[field] for field in self.REVIEW_FIELDS}
+            current = existing.get(google_review_id)
+
+            if current is None:
+                match = self._match_scraped_review(scraped, parsed_review)
+                if match is not None:
+                    text_changed = match.review_text != values['review_text']
+                    for field, value in values.items():
+                        setattr(match, field, value)
+                    match.google_review_id = google_review_id
+                    match.source = 'oauth'
+                    match.is_verified = True
+                    match.needs_analysis = match.needs_analysis or text_changed
+                    match.synced_at = now
+                    to_upgrade.append(match)
+                    result['upgraded'] += 1
+                    logger.info(f"Upgraded scraped review to verified: {google_review_id}")
+                    continue
+
+                to_write.append(GoogleReview(
+                    google_review_id=google_review_id,
+                    location=location,
+                    account=self.account,
+                    source='oauth',
+                    is_verified=True,
+                    needs_analysis=True,
+                    synced_at=now,
+                    **values
+                ))
+                result['inserted'] += 1
+
+            elif (
+                current.location_id != location.id
+                or any(getattr(current, field) != value for field, value in values.items())
+            ):
+                to_write.append(GoogleReview(
+                    google_review_id=google_review_id,
+                    location=location,
+                    account=self.account,
+                    source='oauth',
+                    is_verified=True,
+                    # Keep a pending analysis pending; re-analyze if the text changed
+                    needs_analysis=current.needs_analysis or current.review_text != values['review_text'],
+                    synced_at=now,
+                    **values
+                ))
+                result['updated'] += 1
+
+            else:
+                result['unchanged'] += 1
+
+        with transaction.atomic():
+            GoogleReview.objects.bulk_update(
+                to_upgrade,
+                self.REVIEW_FIELDS + ['google_review_id', 'source', 'is_verified', 'needs_analysis', 'synced_at'],
+                batch_size=self.BULK_CHUNK_SIZE,
+            )
+            GoogleReview.objects.bulk_create(
+                to_write,
+                batch_size=self.BULK_CHUNK_SIZE,
+                update_conflicts=True,
+                unique_fields=['google_review_id'],
+                update_fields=self.REVIEW_FIELDS + [
+                    'location', 'account', 'source', 'is_verified', 'needs_analysis', 'synced_at'
+                ],
+            )
+
+        logger.info(
+            f"Review sync for {location.google_location_name}: {result['inserted']} inserted, "
+            f"{result['updated']} updated, {result['upgraded']} upgraded from scrape, "
+            f"{result['unchanged']} unchanged"
+        )
+
+        return result
+
+    @staticmethod
+    def _match_scraped_review(scraped: dict, parsed_review: dict):
+        """Pop the first unclaimed scraped review matching an OAuth review, if any"""
+        candidates = scraped.get((parsed_review['reviewer_name'], parsed_review['rating']))
+        if not candidates:
+            return None
+
+        # Match first 50 chars, as scraped text may be truncated
+        prefix = parsed_review['review_text'][:50].lower()
+        for i, review in enumerate(candidates):
+            if prefix in review.review_text.lower():
+                return candidates.pop(i)
+        return None
+
+    @staticmethod
+    def _advance_high_water_mark(location: GoogleLocation, google_reviews: list):
+        """Move the location's high-water mark to the newest review update fetched"""
+        if not google_reviews:
+            return
+
+        latest = max(review_update_time(review) for review in google_reviews)
+        if location.reviews_updated_through and latest <= location.reviews_updated_through:
+            return
+
+        location.reviews_updated_through = latest
+        location.save(update_fields=['reviews_updated_through'])
+
+    def _update_location_stats(self, location: GoogleLocation):
+        """Recompute a location's average rating and review count in one aggregate"""
+        stats = GoogleReview.objects.filter(location=location).aggregate(
+            average_rating=Avg('rating'),
+            total_review_count=Count('id'),
+        )
+        if not stats['total_review_count']:
+            return
+
+        location.average_rating = round(Decimal(str(stats['average_rating'])), 2)
+        location.total_review_count = stats['total_review_count']
+        location.save(update_fields=['average_rating', 'total_review_count'])
+
     def _generate_analysis_for_location(self, location: GoogleLocation):
         """
         Generate or update review analysis for a location's store.
@@ -3,24 +3,31 @@ Service for generating review insights and trending topics analysis (Phase 3)
 """
 import logging
 from datetime import datetime, timedelta
-from collections import Counter, defaultdict
+from collections import Counter
 from typing import Dict, List, Optional
-from django.db.models import Count, Avg, Q
+from django.db import transaction
+from django.db.models import Count, Avg, Q, Sum
 from django.utils import timezone
 
 from .models import (
     GoogleReview, ReviewTopicSnapshot,
-    TopicTrend, GoogleLocation
+    TopicTrend, GoogleLocation, ReviewTopicCounter
 )
+from .topic_counters import window_range
 
 logger = logging.getLogger(__name__)
 
 
 class ReviewInsightsService:
     """Service for generating insights and trends from review data"""
-    
+
+    TREND_FIELDS = [
+        'trend_direction', 'trend_velocity', 'current_mentions', 'previous_mentions',
+        'percent_change', 'overall_sentiment', 'category', 'is_active', 'last_updated',
+    ]
+
     def generate_topic_snapshots(
-        self, 
+        self,
         account_id: int,
         location_id: Optional[str] = None,
         window_type: str = 'weekly',
@@ -28,101 +35,88 @@ class ReviewInsightsService:
     ) -> List[ReviewTopicSnapshot]:
         """
         Generate topic snapshots for a time window.
-        
+
+        Reads the running topic counters (see topic_counters) for the window
+        instead of rescanning analyzed reviews, and upserts every topic's
+        snapshot with one bulk write. Snapshots are dated by the window's
+        first day.
+
         Args:
             account_id: Account to generate snapshots for
             location_id: Optional specific location (None = all locations)
             window_type: 'daily', 'weekly', or 'monthly'
             snapshot_date: Date to generate snapshot for (defaults to today)
-        
+
         Returns:
-            List of created ReviewTopicSnapshot objects
+            List of created or updated ReviewTopicSnapshot objects
         """
         if snapshot_date is None:
             snapshot_date = timezone.now().date()
-        
-        # Calculate date range based on window type
-        if window_type == 'daily':
-            start_date = snapshot_date
-            end_date = snapshot_date + timedelta(days=1)
-        elif window_type == 'weekly':
-            start_date = snapshot_date - timedelta(days=snapshot_date.weekday())
-            end_date = start_date + timedelta(days=7)
-        else:  # monthly
-            start_date = snapshot_date.replace(day=1)
-            next_month = start_date + timedelta(days=32)
-            end_date = next_month.replace(day=1)
-        
+
+        start_date, end_date = window_range(window_type, snapshot_date)
+
         logger.info(f"Generating {window_type} snapshots for {account_id} from {start_date} to {end_date}")
-        
-        # Query reviews in this time window
-        reviews_query = GoogleReview.objects.filter(
-            account_id=account_id,
-            review_created_at__gte=start_date,
-            review_created_at__lt=end_date
-        )
-        
-        if location_id:
-            reviews_query = reviews_query.filter(location_id=location_id)
-        
-        # Get reviews with analysis
-        reviews_with_analysis = reviews_query.filter(
-            analysis__isnull=False
-        ).prefetch_related('analysis')
-        
-        # Aggregate topic data
-        topic_data = defaultdict(lambda: {
-            'total': 0,
-            'positive': 0,
-            'negative': 0,
-            'sentiments': []
-        })
-        
-        for review in reviews_with_analysis:
-            try:
-                analysis = review.analysis
-                topics = analysis.topics or []
-                sentiment = analysis.sentiment_score or 0
-                is_positive = review.rating >= 4
-                
-                for topic in topics:
-                    topic_data[topic]['total'] += 1
-                    topic_data[topic]['sentiments'].append(sentiment)
-                    
-                    if is_positive:
-                        topic_data[topic]['positive'] += 1
-                    else:
-                        topic_data[topic]['negative'] += 1
-                        
-            except Exception as e:
-                logger.warning(f"Error processing review {review.id}: {e}")
-                continue
-        
-        # Create snapshots
-        snapshots = []
+
+        counters = self._counters(account_id, location_id).filter(
+            window_type=window_type,
+            period_start=start_date
+        ).values('topic').annotate(
+            mentions=Sum('mention_count'),
+            positive=Sum('positive_mentions'),
+            negative=Sum('negative_mentions'),
+            sentiment_sum=Sum('sentiment_sum'),
+        ).filter(mentions__gt=0)
+
         location = GoogleLocation.objects.get(id=location_id) if location_id else None
-        
-        for topic, data in topic_data.items():
-            avg_sentiment = sum(data['sentiments']) / len(data['sentiments']) if data['sentiments'] else None
-            
-            snapshot, created = ReviewTopicSnapshot.objects.update_or_create(
+
+        # Preloaded rather than bulk_create(update_conflicts=True): a null
+        # location never conflicts in the unique index
+        existing = {
+            snapshot.topic: snapshot
+            for snapshot in ReviewTopicSnapshot.objects.filter(
                 account_id=account_id,
                 location=location,
-                topic=topic,
-                snapshot_date=snapshot_date,
-                window_type=window_type,
-                defaults={
-                    'mention_count': data['total'],
-                    'positive_mentions': data['positive'],
-                    'negative_mentions': data['negative'],
-                    'avg_sentiment': avg_sentiment,
-                }
+                snapshot_date=start_date,
+                window_type=window_type
             )
-            snapshots.append(snapshot)
-        
-        logger.info(f"Created {len(snapshots)} topic snapshots")
+        }
+
+        to_create = []
+        to_update = []
+        for data in counters:
+            values = {
+                'mention_count': data['mentions'],
+                'positive_mentions': data['positive'],
+                'negative_mentions': data['negative'],
+                'avg_sentiment': data['sentiment_sum'] / data['mentions'],
+            }
+            snapshot = existing.get(data['topic'])
+            if snapshot is None:
+                to_create.append(ReviewTopicSnapshot(
+                    account_id=account_id,
+                    location=location,
+                    topic=data['topic'],
+                    snapshot_date=start_date,
+                    window_type=window_type,
+                    **values
+                ))
+            else:
+                for field, value in values.items():
+                    setattr(snapshot, field, value)
+                to_update.append(snapshot)
+
+        with transaction.atomic():
+            ReviewTopicSnapshot.objects.bulk_create(to_create, batch_size=500)
+            ReviewTopicSnapshot.objects.bulk_update(
+                to_update,
+                ['mention_count', 'positive_mentions', 'negative_mentions', 'avg_sentiment'],
+                batch_size=500
+            )
+
+        snapshots = to_create + to_update
+        logger.info(f"Created {len(to_create)} and updated {len(to_update)} topic snapshots")
         return snapshots
-    
+
     def calculate_trends(
         self,
         account_id: int,
@@ -130,56 +124,54 @@ class ReviewInsightsService:
         lookback_weeks: int = 4
     ) -> List[TopicTrend]:
         """
-        Calculate trending topics based on historical snapshots.
-        
+        Calculate trending topics from this week's and last week's counters.
+
+        Both weeks are read in one aggregate over the weekly topic counters and
+        all trends are upserted with one bulk write.
+
         Args:
             account_id: Account to calculate trends for
             location_id: Optional specific location
             lookback_weeks: Number of weeks to look back for trend calculation
-        
+
         Returns:
             List of updated TopicTrend objects
         """
         today = timezone.now().date()
         current_week_start = today - timedelta(days=today.weekday())
         previous_week_start = current_week_start - timedelta(days=7)
-        
+
         logger.info(f"Calculating trends for account {account_id}")
-        
-        # Get current week snapshots
-        current_snapshots_query = ReviewTopicSnapshot.objects.filter(
-            account_id=account_id,
-            snapshot_date=current_week_start,
-            window_type='weekly'
-        )
-        
-        # Get previous week snapshots  
-        previous_snapshots_query = ReviewTopicSnapshot.objects.filter(
-            account_id=account_id,
-            snapshot_date=previous_week_start,
-            window_type='weekly'
+
+        weekly = self._counters(account_id, location_id).filter(
+            window_type='weekly',
+            period_start__in=[current_week_start, previous_week_start]
+        ).values('topic', 'period_start').annotate(
+            mentions=Sum('mention_count'),
+            sentiment_sum=Sum('sentiment_sum'),
         )
-        
-        if location_id:
-            current_snapshots_query = current_snapshots_query.filter(location_id=location_id)
-            previous_snapshots_query = previous_snapshots_query.filter(location_id=location_id)
-        
-        # Build topic maps
-        current_topics = {s.topic: s for s in current_snapshots_query}
-        previous_topics = {s.topic: s for s in previous_snapshots_query}
-        
-        all_topics = set(current_topics.keys()) | set(previous_topics.keys())
-        
-        trends = []
+
+        current_topics = {}
+        previous_topics = {}
+        for row in weekly:
+            week = current_topics if row['period_start'] == current_week_start else previous_topics
+            week[row['topic']] = row
+
         location = GoogleLocation.objects.get(id=location_id) if location_id else None
-        
-        for topic in all_topics:
+        existing = {
+            trend.topic: trend
+            for trend in TopicTrend.objects.filter(account_id=account_id, location=location)
+        }
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+
+        for topic in set(current_topics) | set(previous_topics):
             current = current_topics.get(topic)
-            previous = previous_topics.get(topic)
-            
-            current_count = current.mention_count if current else 0
-            previous_count = previous.mention_count if previous else 0
-            
+            current_count = current['mentions'] if current else 0
+            previous_count = previous_topics[topic]['mentions'] if topic in previous_topics else 0
+
             # Determine trend direction
             if previous_count == 0:
                 if current_count > 0:
@@ -189,20 +181,20 @@ class ReviewInsightsService:
                     continue  # Skip if no mentions in either period
             else:
                 percent_change = ((current_count - previous_count) / previous_count) * 100
-                
+
                 if percent_change > 20:
                     direction = TopicTrend.TrendDirection.INCREASING
                 elif percent_change < -20:
                     direction = TopicTrend.TrendDirection.DECREASING
                 else:
                     direction = TopicTrend.TrendDirection.STABLE
-            
+
             # Calculate velocity (mentions per week)
             velocity = current_count - previous_count
-            
+
             # Determine overall sentiment
-            if current:
-                sentiment_score = current.avg_sentiment or 0
+            if current_count:
+                sentiment_score = current['sentiment_sum'] / current_count
                 if sentiment_score > 0.2:
                     sentiment = TopicTrend.Sentiment.POSITIVE
                 elif sentiment_score < -0.2:
@@ -211,31 +203,44 @@ class ReviewInsightsService:
                     sentiment = TopicTrend.Sentiment.NEUTRAL
             else:
                 sentiment = TopicTrend.Sentiment.NEUTRAL
-            
-            # Determine category (could be enhanced with ML)
-            category = self._infer_category(topic)
-            
-            # Update or create trend
-            trend, created = TopicTrend.objects.update_or_create(
-                account_id=account_id,
-                location=location,
-                topic=topic,
-                defaults={
-                    'trend_direction': direction,
-                    'trend_velocity': velocity,
-                    'current_mentions': current_count,
-                    'previous_mentions': previous_count,
-                    'percent_change': percent_change,
-                    'overall_sentiment': sentiment,
-                    'category': category,
-                    'is_active': current_count > 0,
-                }
-            )
-            trends.append(trend)
-        
+
+            values = {
+                'trend_direction': direction,
+                'trend_velocity': velocity,
+                'current_mentions': current_count,
+                'previous_mentions': previous_count,
+                'percent_change': percent_change,
+                'overall_sentiment': sentiment,
+                # Determine category (could be enhanced with ML)
+                'category': self._infer_category(topic),
+                'is_active': current_count > 0,
+                'last_updated': now,
+            }
+
+            trend = existing.get(topic)
+            if trend is None:
+                to_create.append(TopicTrend(account_id=account_id, location=location, topic=topic, **values))
+            else:
+                for field, value in values.items():
+                    setattr(trend, field, value)
+                to_update.append(trend)
+
+        with transaction.atomic():
+            TopicTrend.objects.bulk_create(to_create, batch_size=500)
+            TopicTrend.objects.bulk_update(to_update, self.TREND_FIELDS, batch_size=500)
+
+        trends = to_create + to_update
         logger.info(f"Calculated {len(trends)} topic trends")
         return trends
-    
+
+    @staticmethod
+    def _counters(account_id: int, location_id: Optional[str] = None):
+        """Topic counters for an account, optionally narrowed to one location"""
+        counters = ReviewTopicCounter.objects.filter(account_id=account_id)
+        if location_id:
+            counters = counters.filter(location_id=location_id)
+        return counters
+
     def _infer_category(self, topic: str) -> str:
         """Infer category from topic text using keyword matching"""
         topic_lower = topic.lower()
@@ -5,6 +5,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from accounts.models import Account
 from integrations.insights_service import ReviewInsightsService
+from integrations.topic_counters import rebuild_topic_counters
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,12 +37,18 @@ class Command(BaseCommand):
             action='store_true',
             help='Skip trend calculation, only generate snapshots'
         )
+        parser.add_argument(
+            '--rebuild-counters',
+            action='store_true',
+            help='Recompute topic counters from stored review analyses first (backfill)'
+        )
 
     def handle(self, *args, **options):
         account_id = options.get('account_id')
         window_type = options.get('window_type')
         skip_snapshots = options.get('skip_snapshots')
         skip_trends = options.get('skip_trends')
+        rebuild_counters = options.get('rebuild_counters')
         
         service = ReviewInsightsService()
         
@@ -64,6 +71,13 @@ class Command(BaseCommand):
             self.stdout.write(f'\nProcessing account: {account.name} (ID: {account.id})')
             
             try:
+                if rebuild_counters:
+                    self.stdout.write('  Rebuilding topic counters...')
+                    counters = rebuild_topic_counters(account.id)
+                    self.stdout.write(
+                        self.style.SUCCESS(f'    ✓ Rebuilt {counters} counters')
+                    )
+
                 # Generate snapshots
                 if not skip_snapshots:
                     self.stdout.write(f'  Generating {window_type} snapshots...')
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0015_googlereviewanalysis_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sevenshiftsconfig',
+            name='employees_modified_since',
+            field=models.DateTimeField(blank=True, help_text='Fetch only users modified after this time on the next incremental sync', null=True),
+        ),
+        migrations.AddField(
+            model_name='sevenshiftsconfig',
+            name='last_full_employee_sync_at',
+            field=models.DateTimeField(blank=True, help_text='Last full employee reconciliation', null=True),
+        ),
+        migrations.AddField(
+            model_name='sevenshiftsconfig',
+            name='last_full_shift_sync_at',
+            field=models.DateTimeField(blank=True, help_text='Last full shift reconciliation', null=True),
+        ),
+        migrations.AddField(
+            model_name='sevenshiftsconfig',
+            name='shifts_modified_since',
+            field=models.DateTimeField(blank=True, help_text='Fetch only shifts modified after this time on the next incremental sync', null=True),
+        ),
+        migrations.AddField(
+            model_name='sevenshiftsemployee',
+            name='payload_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the last synced 7shifts user payload', max_length=64),
+        ),
+    ]
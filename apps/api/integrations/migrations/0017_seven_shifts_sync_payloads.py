@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0016_seven_shifts_incremental_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SevenShiftsSyncPayload',
+            fields=[
+                ('digest', models.CharField(help_text='SHA-256 of the uncompressed JSON payload', max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField(help_text='zlib-compressed JSON payload')),
+                ('size_bytes', models.PositiveIntegerField(help_text='Uncompressed payload size')),
+                ('compressed_size_bytes', models.PositiveIntegerField(help_text='Stored payload size')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True, help_text='Deleted by cleanup after this time')),
+            ],
+            options={
+                'verbose_name': '7shifts Sync Payload',
+                'verbose_name_plural': '7shifts Sync Payloads',
+                'db_table': 'seven_shifts_sync_payloads',
+            },
+        ),
+    ]
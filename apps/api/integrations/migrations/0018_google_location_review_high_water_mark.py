@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0017_seven_shifts_sync_payloads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='googlelocation',
+            name='reviews_updated_through',
+            field=models.DateTimeField(blank=True, help_text='Latest review update time synced; older reviews are not re-fetched', null=True),
+        ),
+    ]
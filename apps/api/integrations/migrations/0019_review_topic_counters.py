@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_add_user_behavior_event_types'),
+        ('integrations', '0018_google_location_review_high_water_mark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewTopicCounter',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('topic', models.CharField(help_text='Topic/theme being counted', max_length=200)),
+                ('window_type', models.CharField(choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('monthly', 'Monthly')], help_text='Aggregation window type', max_length=20)),
+                ('period_start', models.DateField(help_text='First day of the window (review post date)')),
+                ('mention_count', models.IntegerField(default=0, help_text='Reviews mentioning the topic')),
+                ('positive_mentions', models.IntegerField(default=0, help_text='Mentions in 4-5 star reviews')),
+                ('negative_mentions', models.IntegerField(default=0, help_text='Mentions in 1-3 star reviews')),
+                ('sentiment_sum', models.FloatField(default=0.0, help_text='Sum of review sentiment scores')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('account', models.ForeignKey(help_text='Account this counter belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='topic_counters', to='accounts.account')),
+                ('location', models.ForeignKey(help_text='Location the reviews belong to', on_delete=django.db.models.deletion.CASCADE, related_name='topic_counters', to='integrations.googlelocation')),
+            ],
+            options={
+                'verbose_name': 'Review Topic Counter',
+                'verbose_name_plural': 'Review Topic Counters',
+                'db_table': 'review_topic_counters',
+                'indexes': [models.Index(fields=['account', 'window_type', 'period_start'], name='review_topi_account_d83852_idx')],
+                'unique_together': {('location', 'topic', 'window_type', 'period_start')},
+            },
+        ),
+    ]
@@ -46,6 +46,22 @@ class SevenShiftsConfig(models.Model):
         help_text="Create user accounts for employees without email addresses using temporary emails"
     )
 
+    # Incremental sync high-water marks
+    employees_modified_since = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Fetch only users modified after this time on the next incremental sync"
+    )
+    shifts_modified_since = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Fetch only shifts modified after this time on the next incremental sync"
+    )
+    last_full_employee_sync_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last full employee reconciliation"
+    )
+    last_full_shift_sync_at = models.DateTimeField(
+        null=True, blank=True, help_text="Last full shift reconciliation"
+    )
+
     # Audit fields
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -100,6 +116,10 @@ class SevenShiftsEmployee(models.Model):
     # Roles from 7shifts
     roles = models.JSONField(default=list, blank=True, help_text="List of role names from 7shifts")
 
+    # Change detection
+    payload_hash = models.CharField(max_length=64, blank=True,
+                                    help_text="SHA-256 of the last synced 7shifts user payload")
+
     # Sync tracking
     synced_at = models.DateTimeField(auto_now=True, help_text="Last sync from 7shifts")
 
@@ -201,6 +221,32 @@ class SevenShiftsSyncLog(models.Model):
         return f"{self.sync_type} sync for {self.account.name} - {self.status}"
 
 
+class SevenShiftsSyncPayload(models.Model):
+    """Compressed raw 7shifts payload referenced from sync logs
+
+    Sync logs keep counts and a small sample inline and point at these blobs
+    (by SHA-256 of the JSON) for the full payload. Identical payloads from
+    repeated syncs are stored once. Blobs expire on their own schedule,
+    independently of the logs that reference them.
+    """
+
+    digest = models.CharField(max_length=64, primary_key=True,
+                              help_text="SHA-256 of the uncompressed JSON payload")
+    data = models.BinaryField(help_text="zlib-compressed JSON payload")
+    size_bytes = models.PositiveIntegerField(help_text="Uncompressed payload size")
+    compressed_size_bytes = models.PositiveIntegerField(help_text="Stored payload size")
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True, help_text="Deleted by cleanup after this time")
+
+    class Meta:
+        db_table = 'seven_shifts_sync_payloads'
+        verbose_name = '7shifts Sync Payload'
+        verbose_name_plural = '7shifts Sync Payloads'
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.compressed_size_bytes} bytes)"
+
+
 class SevenShiftsLocationMapping(models.Model):
     """Manual mapping between 7shifts locations and PeakOps stores
 
@@ -338,6 +384,12 @@ class GoogleLocation(models.Model):
                                         help_text="Current average rating from Google")
     total_review_count = models.IntegerField(default=0, help_text="Total reviews on Google")
 
+    # Incremental review sync
+    reviews_updated_through = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Latest review update time synced; older reviews are not re-fetched"
+    )
+
     # Audit fields
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -702,6 +754,64 @@ class ReviewTopicSnapshot(models.Model):
         return f'{self.topic}{loc_str} on {self.snapshot_date}'
 
 
+class ReviewTopicCounter(models.Model):
+    """Running topic mention counters per location and period
+
+    Bumped atomically whenever a review's AI analysis is saved, so topic
+    snapshots and trends are read from these rows instead of rescanning
+    every analyzed review. One row per (location, topic, window, period).
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    account = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.CASCADE,
+        related_name='topic_counters',
+        help_text='Account this counter belongs to'
+    )
+    location = models.ForeignKey(
+        GoogleLocation,
+        on_delete=models.CASCADE,
+        related_name='topic_counters',
+        help_text='Location the reviews belong to'
+    )
+    topic = models.CharField(
+        max_length=200,
+        help_text='Topic/theme being counted'
+    )
+    window_type = models.CharField(
+        max_length=20,
+        choices=[
+            ('daily', 'Daily'),
+            ('weekly', 'Weekly'),
+            ('monthly', 'Monthly'),
+        ],
+        help_text='Aggregation window type'
+    )
+    period_start = models.DateField(
+        help_text='First day of the window (review post date)'
+    )
+
+    mention_count = models.IntegerField(default=0, help_text='Reviews mentioning the topic')
+    positive_mentions = models.IntegerField(default=0, help_text='Mentions in 4-5 star reviews')
+    negative_mentions = models.IntegerField(default=0, help_text='Mentions in 1-3 star reviews')
+    sentiment_sum = models.FloatField(default=0.0, help_text='Sum of review sentiment scores')
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'review_topic_counters'
+        verbose_name = 'Review Topic Counter'
+        verbose_name_plural = 'Review Topic Counters'
+        indexes = [
+            models.Index(fields=['account', 'window_type', 'period_start']),
+        ]
+        unique_together = [['location', 'topic', 'window_type', 'period_start']]
+
+    def __str__(self):
+        return f'{self.topic} at {self.location_id} ({self.window_type} {self.period_start}): {self.mention_count}'
+
+
 class TopicTrend(models.Model):
     """Calculated trend for a topic (Phase 3)
     
@@ -7,6 +7,7 @@ Centralized logic for analyzing reviews to avoid code duplication.
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
+from django.db import transaction
 from django.utils import timezone
 from ai_services.bedrock_service import BedrockRecommendationService
 
@@ -35,24 +36,42 @@ def create_or_update_analysis(review, analysis_result: Dict[str, Any],
     Returns:
         GoogleReviewAnalysis instance
     """
-    from .models import GoogleReviewAnalysis
+    from .models import GoogleReview, GoogleReviewAnalysis
+    from .topic_counters import apply_analysis_to_counters
 
     # Map suggested_category to categories list for database compatibility
     categories = [analysis_result['suggested_category']] if analysis_result.get('suggested_category') else []
 
-    analysis, created = GoogleReviewAnalysis.objects.update_or_create(
-        review=review,
-        defaults={
-            'topics': analysis_result.get('topics', []),
-            'sentiment_score': analysis_result.get('sentiment_score', 0.0),
-            'actionable_issues': analysis_result.get('actionable_issues', []),
-            'suggested_category': analysis_result.get('suggested_category', ''),
-            'categories': categories,
-            'confidence': analysis_result.get('confidence', 0.5),
-            'model_used': model_used,
-            'processing_time_ms': processing_time_ms
-        }
-    )
+    with transaction.atomic():
+        # Lock the stored analysis so concurrent re-analyses of one review take
+        # turns, and each subtracts the contribution the other one left behind
+        stored = GoogleReviewAnalysis.objects.select_for_update().filter(review=review).values_list(
+            'topics', 'sentiment_score'
+        )
+        previous = stored.first()
+        if previous is None:
+            # Nothing to lock yet: serialize first analyses on the review row instead
+            GoogleReview.objects.select_for_update().filter(pk=review.pk).values_list('pk').first()
+            previous = stored.first()
+
+        analysis, created = GoogleReviewAnalysis.objects.update_or_create(
+            review=review,
+            defaults={
+                'topics': analysis_result.get('topics', []),
+                'sentiment_score': analysis_result.get('sentiment_score', 0.0),
+                'actionable_issues': analysis_result.get('actionable_issues', []),
+                'suggested_category': analysis_result.get('suggested_category', ''),
+                'categories': categories,
+                'confidence': analysis_result.get('confidence', 0.5),
+                'model_used': model_used,
+                'processing_time_ms': processing_time_ms
+            }
+        )
+
+        # Keep the insights topic counters in step with the stored analysis
+        apply_analysis_to_counters(
+            review, previous=previous, current=(analysis.topics, analysis.sentiment_score)
+        )
 
     return analysis
 
@@ -7,6 +7,9 @@ Documentation: https://developers.7shifts.com/
 
 import requests
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from django.conf import settings
@@ -23,6 +26,9 @@ class SevenShiftsClient:
 
     BASE_URL = "https://api.7shifts.com/v2"
 
+    # Retries for 429 Too Many Requests before giving up
+    RATE_LIMIT_RETRIES = 3
+
     def __init__(self, access_token: str, company_id: Optional[str] = None):
         """
         Initialize 7shifts client with access token.
@@ -40,6 +46,19 @@ class SevenShiftsClient:
             'Accept': 'application/json'
         })
 
+        # requests.Session is not thread-safe; prefetch threads get their own
+        self._local = threading.local()
+        self._local.session = self.session
+
+    def _get_session(self) -> requests.Session:
+        """Session for the current thread, sharing this client's headers"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.session.headers)
+            self._local.session = session
+        return session
+
     @staticmethod
     def encrypt_token(token: str) -> bytes:
         """Encrypt access token for secure storage"""
@@ -77,7 +96,17 @@ class SevenShiftsClient:
         url = f"{self.BASE_URL}{endpoint}"
 
         try:
-            response = self.session.request(method, url, **kwargs)
+            session = self._get_session()
+            response = session.request(method, url, **kwargs)
+
+            retries = 0
+            while response.status_code == 429 and retries < self.RATE_LIMIT_RETRIES:
+                retries += 1
+                delay = _retry_after_seconds(response.headers.get('Retry-After'), retries)
+                logger.warning(f"7shifts rate limit hit on {endpoint}, retrying in {delay}s")
+                time.sleep(delay)
+                response = session.request(method, url, **kwargs)
+
             response.raise_for_status()
             return response.json()
         except requests.HTTPError as e:
@@ -120,7 +149,8 @@ class SevenShiftsClient:
 
     def list_users(self, location_id: Optional[str] = None,
                    active_only: bool = True,
-                   limit: int = 100) -> List[Dict[str, Any]]:
+                   limit: int = 100,
+                   modified_since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         List ALL users (employees) from 7shifts with pagination support.
 
@@ -128,6 +158,7 @@ class SevenShiftsClient:
             location_id: Filter by specific location (optional)
             active_only: Only return active employees
             limit: Number of results per page (1-500, default 100 for balanced performance)
+            modified_since: Only return users modified on or after this date (optional)
 
         Returns:
             List of ALL user dictionaries (handles pagination automatically)
@@ -141,6 +172,8 @@ class SevenShiftsClient:
             params['location_id'] = location_id
         if active_only:
             params['active'] = 1
+        if modified_since:
+            params['modified_since'] = modified_since.strftime('%Y-%m-%d')
 
         all_users = []
         cursor = None
@@ -223,16 +256,24 @@ class SevenShiftsClient:
     def list_shifts(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
                     location_id: Optional[str] = None,
                     user_id: Optional[str] = None,
-                    limit: int = 250) -> List[Dict[str, Any]]:
+                    limit: int = 250,
+                    modified_since: Optional[datetime] = None,
+                    max_workers: int = 1) -> List[Dict[str, Any]]:
         """
         List ALL shifts within a date range with pagination support.
 
+        Cursor pages have to be fetched one after another, so with max_workers > 1
+        a multi-day range is split into one-day chunks that are paginated
+        concurrently and concatenated in date order.
+
         Args:
             start_date: Start of date range (inclusive) - optional, fetches all if not provided
             end_date: End of date range (inclusive) - optional, fetches all if not provided
             location_id: Filter by location (optional)
             user_id: Filter by user (optional)
             limit: Number of results per page (1-500, default 250 for optimal performance)
+            modified_since: Only return shifts modified on or after this date (optional)
+            max_workers: Day chunks fetched concurrently (default 1, serial)
 
         Returns:
             List of ALL shift dictionaries (handles pagination automatically)
@@ -240,6 +281,26 @@ class SevenShiftsClient:
         if not self.company_id:
             raise ValueError("company_id is required to list shifts")
 
+        if max_workers > 1 and start_date and end_date and end_date.date() > start_date.date():
+            days = [
+                start_date + timedelta(days=offset)
+                for offset in range((end_date.date() - start_date.date()).days + 1)
+            ]
+
+            def fetch_day(day):
+                return self.list_shifts(day, day, location_id=location_id, user_id=user_id,
+                                        limit=limit, modified_since=modified_since)
+
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(days))) as executor:
+                day_results = list(executor.map(fetch_day, days))
+
+            all_shifts = [shift for day_shifts in day_results for shift in day_shifts]
+            logger.info(
+                f"7shifts list_shifts: Completed fetching {len(all_shifts)} total shifts "
+                f"across {len(days)} day(s) with {min(max_workers, len(days))} worker(s)"
+            )
+            return all_shifts
+
         params = {
             'limit': min(max(limit, 1), 500)  # Clamp between 1-500
         }
@@ -255,6 +316,8 @@ class SevenShiftsClient:
             params['location_id'] = location_id
         if user_id:
             params['user_id'] = user_id
+        if modified_since:
+            params['modified_since'] = modified_since.strftime('%Y-%m-%d')
 
         all_shifts = []
         cursor = None
@@ -369,3 +432,11 @@ class SevenShiftsClient:
                         continue
 
         return employees_on_shift
+
+
+def _retry_after_seconds(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait after a 429, honouring Retry-After when it is numeric"""
+    try:
+        return min(float(retry_after), 60.0)
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
@@ -2,6 +2,10 @@
 Shift Checker Service
 
 Helper functions to check if employees are on shift before sending micro-checks.
+
+Lookups are answered from the cached per-account ShiftIntervalIndex when it
+is available, falling back to range queries on SevenShiftsShift (served by
+the (store, start_time, end_time) and (employee, start_time) indexes).
 """
 
 from typing import Optional, Dict
@@ -11,6 +15,7 @@ import logging
 
 from brands.models import Store
 from .models import SevenShiftsConfig, SevenShiftsEmployee, SevenShiftsShift
+from .shift_index import EMAIL, SHIFT_ID, get_shift_index
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,16 @@ logger = logging.getLogger(__name__)
 class ShiftChecker:
     """Service for checking if employees are currently on shift"""
 
+    @staticmethod
+    def _get_index(account_id, check_time: datetime):
+        """Shift index for the account if it can answer queries at check_time"""
+        if not account_id:
+            return None
+        index = get_shift_index(account_id)
+        if index is None or not index.covers(check_time):
+            return None
+        return index
+
     @staticmethod
     def is_shift_enforcement_enabled(store: Store) -> bool:
         """
@@ -81,6 +96,10 @@ class ShiftChecker:
         if check_time is None:
             check_time = timezone.now()
 
+        index = ShiftChecker._get_index(employee.account_id, check_time)
+        if index is not None:
+            return bool(index.shifts_for_employee(employee.id, check_time))
+
         # Query for shifts that overlap with check_time
         active_shift = SevenShiftsShift.objects.filter(
             employee=employee,
@@ -106,6 +125,13 @@ class ShiftChecker:
         if check_time is None:
             check_time = timezone.now()
 
+        index = ShiftChecker._get_index(employee.account_id, check_time)
+        if index is not None:
+            intervals = index.shifts_for_employee(employee.id, check_time)
+            if not intervals:
+                return None
+            return SevenShiftsShift.objects.filter(id=intervals[0][SHIFT_ID]).first()
+
         return SevenShiftsShift.objects.filter(
             employee=employee,
             start_time__lte=check_time,
@@ -197,12 +223,19 @@ class ShiftChecker:
         if not store.account:
             return []
 
-        # Get all active shifts at this store overlapping with check_time
-        active_shifts = SevenShiftsShift.objects.filter(
-            store=store,
-            start_time__lte=check_time,
-            end_time__gte=check_time
-        ).select_related('employee')
+        index = ShiftChecker._get_index(store.account_id, check_time)
+        if index is not None:
+            shift_ids = [interval[SHIFT_ID] for interval in index.shifts_at_store(store.id, check_time)]
+            if not shift_ids:
+                return []
+            active_shifts = SevenShiftsShift.objects.filter(id__in=shift_ids).select_related('employee')
+        else:
+            # Get all active shifts at this store overlapping with check_time
+            active_shifts = SevenShiftsShift.objects.filter(
+                store=store,
+                start_time__lte=check_time,
+                end_time__gte=check_time
+            ).select_related('employee')
 
         return [
             {
@@ -214,3 +247,42 @@ class ShiftChecker:
             }
             for shift in active_shifts
         ]
+
+    @staticmethod
+    def get_on_shift_emails(store: Store, check_time: Optional[datetime] = None,
+                            window_end: Optional[datetime] = None) -> set:
+        """
+        Get lowercased emails of employees on shift at a store.
+
+        Answered from the shift index without touching the database when
+        possible.
+
+        Args:
+            store: Store instance
+            check_time: Time to check (defaults to now)
+            window_end: If given, include anyone on shift at any point in
+                        [check_time, window_end]
+
+        Returns:
+            Set of lowercased email addresses
+        """
+        if check_time is None:
+            check_time = timezone.now()
+
+        if not store.account_id:
+            return set()
+
+        index = ShiftChecker._get_index(store.account_id, check_time)
+        if index is not None:
+            return {
+                interval[EMAIL].lower()
+                for interval in index.shifts_at_store(store.id, check_time, window_end)
+                if interval[EMAIL]
+            }
+
+        emails = SevenShiftsShift.objects.filter(
+            store=store,
+            start_time__lte=window_end or check_time,
+            end_time__gte=check_time
+        ).values_list('employee__email', flat=True)
+        return {email.lower() for email in emails if email}
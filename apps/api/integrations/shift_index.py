@@ -0,0 +1,202 @@
+"""
+Shift Interval Index
+
+Per-account, in-memory index of upcoming 7shifts shifts used to answer
+"who is on shift" questions without a range query per store or employee.
+
+Intervals are kept sorted by start time per store and per employee. Since
+no shift in a bucket is longer than that bucket's ``max_duration``, every
+interval overlapping [start, end] starts within
+[start - max_duration, end], so a query is two bisects plus a scan of the
+(few) candidates: O(log n + k).
+
+The index is rebuilt after each shift sync and cached in the Django cache
+(Redis in production) next to a small version stamp. Each process keeps the
+built index it last loaded per account and only refetches and rebuilds it
+when the stamp changes, so a lookup costs one small cache read. Callers fall
+back to the database when the index is unavailable or does not cover the
+requested time.
+"""
+
+import logging
+import threading
+import uuid
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import SevenShiftsShift
+
+logger = logging.getLogger(__name__)
+
+SHIFT_INDEX_CACHE_KEY = 'seven_shifts:shift_index:{account_id}'
+SHIFT_INDEX_VERSION_KEY = 'seven_shifts:shift_index_version:{account_id}'
+
+# Built indexes per account in this process: account_id -> (version, index)
+SHIFT_INDEX_MEMO_SIZE = 256
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+# Entry tuple layout
+START, END, SHIFT_ID, EMPLOYEE_ID, EMAIL, NAME, ROLE = range(7)
+
+
+class ShiftIntervalIndex:
+    """Sorted shift intervals for one account, bucketed by store and employee"""
+
+    def __init__(self, account_id, coverage_start: float, entries: list, version: str = ''):
+        """
+        Args:
+            account_id: Account the shifts belong to
+            coverage_start: Epoch seconds; shifts ending before this were not loaded
+            entries: (start, end, shift_id, employee_id, email, name, role, store_id)
+                     tuples with epoch-second start/end
+            version: Stamp identifying this build of the index
+        """
+        self.account_id = account_id
+        self.coverage_start = coverage_start
+        self.version = version
+        self.by_store = {}
+        self.by_employee = {}
+
+        for entry in sorted(entries, key=lambda e: e[START]):
+            interval = tuple(entry[:7])
+            self._add(self.by_store, str(entry[7]), interval)
+            self._add(self.by_employee, str(entry[EMPLOYEE_ID]), interval)
+
+    @staticmethod
+    def _add(buckets: dict, key: str, interval: tuple):
+        bucket = buckets.setdefault(key, {'starts': [], 'intervals': [], 'max_duration': 0.0})
+        bucket['starts'].append(interval[START])
+        bucket['intervals'].append(interval)
+        bucket['max_duration'] = max(bucket['max_duration'], interval[END] - interval[START])
+
+    @staticmethod
+    def _overlapping(bucket: Optional[dict], start: float, end: float) -> list:
+        if not bucket:
+            return []
+        lo = bisect_left(bucket['starts'], start - bucket['max_duration'])
+        hi = bisect_right(bucket['starts'], end)
+        return [interval for interval in bucket['intervals'][lo:hi] if interval[END] >= start]
+
+    def covers(self, start: datetime) -> bool:
+        """Whether queries from this time onwards can be answered from the index"""
+        return start.timestamp() >= self.coverage_start
+
+    def shifts_at_store(self, store_id, start: datetime, end: Optional[datetime] = None) -> list:
+        """Intervals at a store active at ``start`` (or overlapping [start, end])"""
+        return self._overlapping(
+            self.by_store.get(str(store_id)), start.timestamp(), (end or start).timestamp()
+        )
+
+    def shifts_for_employee(self, employee_id, start: datetime, end: Optional[datetime] = None) -> list:
+        """Intervals for an employee active at ``start`` (or overlapping [start, end])"""
+        return self._overlapping(
+            self.by_employee.get(str(employee_id)), start.timestamp(), (end or start).timestamp()
+        )
+
+    def to_cache(self) -> dict:
+        entries = []
+        for store_id, bucket in self.by_store.items():
+            entries.extend(list(interval) + [store_id] for interval in bucket['intervals'])
+        return {
+            'account_id': self.account_id,
+            'coverage_start': self.coverage_start,
+            'version': self.version,
+            'entries': entries,
+        }
+
+    @classmethod
+    def from_cache(cls, data: dict) -> 'ShiftIntervalIndex':
+        return cls(data['account_id'], data['coverage_start'], data['entries'], data.get('version', ''))
+
+
+def _remember(account_id, index: ShiftIntervalIndex):
+    with _memo_lock:
+        _memo[account_id] = (index.version, index)
+        _memo.move_to_end(account_id)
+        while len(_memo) > SHIFT_INDEX_MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def _remembered(account_id, version) -> Optional[ShiftIntervalIndex]:
+    with _memo_lock:
+        memo = _memo.get(account_id)
+        if memo is None or memo[0] != version:
+            return None
+        _memo.move_to_end(account_id)
+        return memo[1]
+
+
+def build_shift_index(account_id) -> ShiftIntervalIndex:
+    """
+    Load an account's current and upcoming shifts and cache the index.
+
+    Shifts that ended more than SHIFT_INDEX_LOOKBACK_HOURS ago are left out;
+    queries before that point fall back to the database.
+    """
+    lookback = getattr(settings, 'SHIFT_INDEX_LOOKBACK_HOURS', 24)
+    coverage_start = timezone.now() - timedelta(hours=lookback)
+
+    rows = SevenShiftsShift.objects.filter(
+        account_id=account_id,
+        end_time__gte=coverage_start,
+    ).values_list(
+        'start_time', 'end_time', 'id', 'employee_id', 'employee__email',
+        'employee__first_name', 'employee__last_name', 'role', 'store_id',
+    )
+
+    entries = [
+        (start.timestamp(), end.timestamp(), str(shift_id), str(employee_id), email or '',
+         f"{first_name} {last_name}", role, str(store_id))
+        for start, end, shift_id, employee_id, email, first_name, last_name, role, store_id in rows
+    ]
+    index = ShiftIntervalIndex(account_id, coverage_start.timestamp(), entries, version=uuid.uuid4().hex)
+
+    try:
+        ttl = getattr(settings, 'SHIFT_INDEX_TTL_SECONDS', 12 * 3600)
+        # Data first, so a process that sees the new stamp finds the new index
+        cache.set(SHIFT_INDEX_CACHE_KEY.format(account_id=account_id), index.to_cache(), ttl)
+        cache.set(SHIFT_INDEX_VERSION_KEY.format(account_id=account_id), index.version, ttl)
+    except Exception as e:
+        logger.warning(f"Failed to cache shift index for account {account_id}: {str(e)}")
+
+    _remember(account_id, index)
+
+    logger.info(f"Built shift index for account {account_id} with {len(entries)} shifts")
+    return index
+
+
+def get_shift_index(account_id) -> Optional[ShiftIntervalIndex]:
+    """
+    Get an account's shift index, building it on a cache miss.
+
+    Only the version stamp is read from the cache while this process's built
+    index is current; the full index is refetched when the stamp changes.
+
+    Returns:
+        ShiftIntervalIndex, or None if it could not be loaded (use the database)
+    """
+    try:
+        version = cache.get(SHIFT_INDEX_VERSION_KEY.format(account_id=account_id))
+        if version is None:
+            return build_shift_index(account_id)
+
+        index = _remembered(account_id, version)
+        if index is not None:
+            return index
+
+        data = cache.get(SHIFT_INDEX_CACHE_KEY.format(account_id=account_id))
+        if data is None:
+            return build_shift_index(account_id)
+        index = ShiftIntervalIndex.from_cache(data)
+        _remember(account_id, index)
+        return index
+    except Exception as e:
+        logger.warning(f"Shift index unavailable for account {account_id}, using database: {str(e)}")
+        return None
@@ -0,0 +1,118 @@
+"""
+7shifts sync audit storage
+
+Keeps SevenShiftsSyncLog rows small: counts and a few sample items stay
+inline in error_details, while full raw payloads are written once to
+compressed, content-addressed SevenShiftsSyncPayload blobs and fetched on
+demand.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import SevenShiftsSyncPayload
+
+
+logger = logging.getLogger(__name__)
+
+
+def store_payload(payload) -> str:
+    """
+    Store a JSON-serializable payload as a compressed blob.
+
+    Re-storing an identical payload only extends its retention.
+
+    Returns:
+        SHA-256 digest referencing the blob
+    """
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    digest = hashlib.sha256(encoded).hexdigest()
+    expires_at = timezone.now() + timedelta(
+        days=getattr(settings, 'SEVEN_SHIFTS_SYNC_PAYLOAD_RETENTION_DAYS', 7)
+    )
+
+    updated = SevenShiftsSyncPayload.objects.filter(digest=digest).update(expires_at=expires_at)
+    if not updated:
+        compressed = zlib.compress(encoded, 6)
+        SevenShiftsSyncPayload.objects.get_or_create(
+            digest=digest,
+            defaults={
+                'data': compressed,
+                'size_bytes': len(encoded),
+                'compressed_size_bytes': len(compressed),
+                'expires_at': expires_at,
+            }
+        )
+
+    return digest
+
+
+def load_payload(digest: str):
+    """
+    Load a stored payload.
+
+    Returns:
+        The decoded payload, or None if it has expired or never existed
+    """
+    blob = SevenShiftsSyncPayload.objects.filter(
+        digest=digest, expires_at__gt=timezone.now()
+    ).first()
+    if blob is None:
+        return None
+    return json.loads(zlib.decompress(bytes(blob.data)))
+
+
+def compact_sync_details(details: dict, payload_keys: list) -> dict:
+    """
+    Move large item lists out of a sync log's error_details.
+
+    Each list named in payload_keys is stored as a blob and replaced with a
+    sample of its first items (without their raw 'data'), plus
+    '<key>_count' and a digest under 'payload_refs'. The error list is
+    truncated to the same sample size; errors_count keeps the total.
+
+    Args:
+        details: error_details dict as built by the sync service
+        payload_keys: Keys of lists to offload
+
+    Returns:
+        New details dict suitable for SevenShiftsSyncLog.error_details
+    """
+    sample_size = getattr(settings, 'SEVEN_SHIFTS_SYNC_LOG_SAMPLE_SIZE', 10)
+    compact = dict(details)
+    payload_refs = {}
+
+    for key in payload_keys:
+        items = details.get(key) or []
+        compact[f'{key}_count'] = len(items)
+        compact[key] = [_without_raw_data(item) for item in items[:sample_size]]
+        if items:
+            try:
+                payload_refs[key] = store_payload(items)
+            except Exception as e:
+                # Audit storage must never fail the sync itself
+                logger.error(f"Failed to store 7shifts sync payload '{key}': {str(e)}")
+
+    if 'errors' in details:
+        compact['errors'] = details['errors'][:sample_size]
+
+    compact['payload_refs'] = payload_refs
+    return compact
+
+
+def cleanup_expired_payloads() -> int:
+    """Delete payload blobs past their retention, returning the number deleted"""
+    deleted_count, _ = SevenShiftsSyncPayload.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted_count
+
+
+def _without_raw_data(item):
+    if isinstance(item, dict) and 'data' in item:
+        return {k: v for k, v in item.items() if k != 'data'}
+    return item
@@ -4,8 +4,11 @@
 Handles synchronization of employees and shifts from 7shifts to local database.
 """
 
+import hashlib
+import json
 import logging
 from datetime import datetime, timedelta
+from django.conf import settings
 from django.utils import timezone
 from django.db import transaction
 
@@ -15,14 +18,22 @@ from .models import (
     SevenShiftsSyncLog
 )
 from .seven_shifts_client import SevenShiftsClient
+from .sync_audit import compact_sync_details
 
 
 logger = logging.getLogger(__name__)
 
 
+class EmployeeFilteredOut(Exception):
+    """Employee skipped by the configured role filter (not a sync failure)"""
+
+
 class SevenShiftsSyncService:
     """Service for syncing 7shifts data to local database"""
 
+    # Rows per bulk write / IN-clause lookup
+    BULK_CHUNK_SIZE = 500
+
     def __init__(self, config: SevenShiftsConfig):
         """
         Initialize sync service with a 7shifts configuration.
@@ -37,27 +48,53 @@ class SevenShiftsSyncService:
         access_token = SevenShiftsClient.decrypt_token(config.access_token_encrypted)
         self.client = SevenShiftsClient(access_token, company_id=config.company_id)
 
-    def sync_all(self) -> dict:
+    def sync_all(self, full: bool = None) -> dict:
         """
         Sync both employees and shifts.
 
+        Args:
+            full: Force a full (True) or incremental (False) sync; None decides
+                  per sync type from the last full reconciliation
+
         Returns:
             dict with sync results
         """
         results = {}
 
         if self.config.sync_employees_enabled:
-            results['employees'] = self.sync_employees()
+            results['employees'] = self.sync_employees(full=full)
 
         if self.config.sync_shifts_enabled:
-            results['shifts'] = self.sync_shifts()
+            results['shifts'] = self.sync_shifts(full=full)
 
         return results
 
-    def sync_employees(self) -> dict:
+    def _is_full_sync_due(self, last_full_sync_at, modified_since, interval_days: int) -> bool:
+        """Whether an incremental sync should be upgraded to a full reconciliation"""
+        if last_full_sync_at is None or modified_since is None:
+            return True
+        return timezone.now() - last_full_sync_at >= timedelta(days=interval_days)
+
+    def _next_high_water_mark(self, sync_started_at: datetime) -> datetime:
+        """High-water mark for the next incremental sync, overlapping to absorb clock skew"""
+        overlap = getattr(settings, 'SEVEN_SHIFTS_SYNC_OVERLAP_MINUTES', 5)
+        return sync_started_at - timedelta(minutes=overlap)
+
+    def sync_employees(self, full: bool = None) -> dict:
         """
         Sync employees from 7shifts.
 
+        Incremental syncs only fetch users modified since the last successful
+        sync. Users whose payload is unchanged are not rewritten, but their
+        assignments (which are not part of the payload) are still checked for
+        location/role changes. Full syncs refetch everyone and remove employees
+        that are gone from 7shifts or no longer match the role filter. The
+        high-water mark only advances when no employee failed to sync.
+
+        Args:
+            full: Force a full (True) or incremental (False) sync; None runs a
+                  full sync every SEVEN_SHIFTS_FULL_EMPLOYEE_SYNC_DAYS
+
         Returns:
             dict with sync statistics
         """
@@ -69,14 +106,34 @@ class SevenShiftsSyncService:
 
         start_time = timezone.now()
         employees_synced = 0
+        unchanged_count = 0
         errors = []
+        failed_count = 0
         synced_employees = []
         failed_employees = []
 
+        if full is None:
+            full = self._is_full_sync_due(
+                self.config.last_full_employee_sync_at,
+                self.config.employees_modified_since,
+                getattr(settings, 'SEVEN_SHIFTS_FULL_EMPLOYEE_SYNC_DAYS', 7),
+            )
+        modified_since = None if full else self.config.employees_modified_since
+
         try:
-            # Fetch all users from 7shifts
-            users = self.client.list_users(active_only=False)
-            logger.info(f"Fetched {len(users)} users from 7shifts")
+            # Fetch changed (or, for full syncs, all) users from 7shifts
+            users = self.client.list_users(active_only=False, modified_since=modified_since)
+            logger.info(
+                f"Fetched {len(users)} users from 7shifts "
+                f"({'full' if full else f'modified since {modified_since.isoformat()}'})"
+            )
+
+            existing_employees = {
+                row[0]: row[1:]
+                for row in SevenShiftsEmployee.objects.filter(account=self.account).values_list(
+                    'seven_shifts_id', 'payload_hash', 'seven_shifts_location_id', 'roles', 'store_id'
+                )
+            }
 
             # Try to fetch locations to map employees to stores
             # If this fails, we'll still sync employees without location mapping
@@ -93,8 +150,18 @@ class SevenShiftsSyncService:
 
             synced_seven_shifts_ids = []
             for user in users:
+                payload_hash = _payload_hash(user)
+                existing = existing_employees.get(str(user.get('id')))
+                assignments = None
+                if not full and existing and existing[0] == payload_hash:
+                    # Assignments live outside the payload, so check them before skipping
+                    assignments = self._fetch_assignments(str(user.get('id')))
+                    if assignments is None or not self._assignments_changed(existing[1:], assignments, location_map):
+                        unchanged_count += 1
+                        continue
+
                 try:
-                    employee, employee_roles = self._sync_employee(user, location_map)
+                    employee, employee_roles = self._sync_employee(user, location_map, payload_hash, assignments)
                     employees_synced += 1
                     synced_seven_shifts_ids.append(employee.seven_shifts_id)
 
@@ -121,6 +188,8 @@ class SevenShiftsSyncService:
                     error_msg = f"Failed to sync employee {user.get('id')}: {str(e)}"
                     logger.error(error_msg)
                     errors.append(error_msg)
+                    if not isinstance(e, EmployeeFilteredOut):
+                        failed_count += 1
                     failed_employees.append({
                         'id': user.get('id'),
                         'name': f"{user.get('first_name', '')} {user.get('last_name', '')}",
@@ -129,20 +198,29 @@ class SevenShiftsSyncService:
                         'data': user  # Store complete raw user data even on failure
                     })
 
-            # Remove employees that are no longer in 7shifts or don't match role filter
-            removed_count = self._remove_unsynced_employees(synced_seven_shifts_ids)
+            # Remove employees that are no longer in 7shifts or don't match role filter.
+            # Only a full listing tells us who is gone.
+            removed_count = self._remove_unsynced_employees(synced_seven_shifts_ids) if full else 0
 
-            # Update config last sync time
+            # Update config last sync time; advance the high-water mark only if
+            # every employee synced, so failed ones are refetched next time
             self.config.last_sync_at = timezone.now()
+            if not failed_count:
+                self.config.employees_modified_since = self._next_high_water_mark(start_time)
+                if full:
+                    self.config.last_full_employee_sync_at = start_time
             self.config.save()
 
             # Auto-map or create users for employees
             user_mapping_results = self.map_or_create_users()
 
+            # Employee emails/removals are part of the shift index
+            self._rebuild_shift_index()
+
             # Update sync log with comprehensive data
             sync_log.items_synced = employees_synced
             sync_log.errors_count = len(errors)
-            sync_log.error_details = {
+            sync_log.error_details = compact_sync_details({
                 'errors': errors,
                 'synced_employees': synced_employees,
                 'failed_employees': failed_employees,
@@ -151,13 +229,15 @@ class SevenShiftsSyncService:
                 'user_mapping': user_mapping_results,
                 'removed_count': removed_count,
                 'summary': {
+                    'mode': 'full' if full else 'incremental',
                     'total_fetched': len(users),
                     'successfully_synced': employees_synced,
+                    'unchanged': unchanged_count,
                     'failed': len(failed_employees),
                     'removed': removed_count,
                     'locations_count': len(locations_data)
                 }
-            }
+            }, payload_keys=['synced_employees', 'failed_employees', 'locations'])
             sync_log.status = (SevenShiftsSyncLog.Status.PARTIAL
                              if errors else SevenShiftsSyncLog.Status.SUCCESS)
             sync_log.completed_at = timezone.now()
@@ -165,7 +245,10 @@ class SevenShiftsSyncService:
             sync_log.save()
 
             return {
+                'mode': 'full' if full else 'incremental',
                 'employees_synced': employees_synced,
+                'unchanged': unchanged_count,
+                'removed': removed_count,
                 'errors_count': len(errors),
                 'errors': errors[:5],  # Return first 5 errors
                 'user_mapping': user_mapping_results
@@ -183,12 +266,19 @@ class SevenShiftsSyncService:
 
             raise
 
-    def sync_shifts(self, days_ahead: int = 14) -> dict:
+    def sync_shifts(self, days_ahead: int = 14, full: bool = None) -> dict:
         """
         Sync shifts from 7shifts for the next N days.
 
+        Incremental syncs only fetch shifts in the window modified since the
+        last successful sync. Full syncs refetch the whole window and delete
+        local shifts in it that 7shifts no longer returns. The high-water mark
+        only advances when no shift failed to sync.
+
         Args:
             days_ahead: Number of days to sync ahead (default: 14)
+            full: Force a full (True) or incremental (False) sync; None runs a
+                  full sync every SEVEN_SHIFTS_FULL_SHIFT_SYNC_DAYS
 
         Returns:
             dict with sync statistics
@@ -200,51 +290,60 @@ class SevenShiftsSyncService:
         )
 
         start_time = timezone.now()
-        shifts_synced = 0
-        errors = []
-        synced_shifts = []
-        failed_shifts = []
+
+        if full is None:
+            full = self._is_full_sync_due(
+                self.config.last_full_shift_sync_at,
+                self.config.shifts_modified_since,
+                getattr(settings, 'SEVEN_SHIFTS_FULL_SHIFT_SYNC_DAYS', 1),
+            )
+        modified_since = None if full else self.config.shifts_modified_since
 
         try:
             # Define date range
             start_date = timezone.now()
             end_date = start_date + timedelta(days=days_ahead)
 
-            # Fetch shifts from 7shifts
-            shifts = self.client.list_shifts(start_date, end_date)
-            logger.info(f"Fetched {len(shifts)} shifts from 7shifts for {start_date.date()} to {end_date.date()}")
+            # Fetch changed (or, for full syncs, all) shifts from 7shifts
+            shifts = self.client.list_shifts(
+                start_date, end_date, modified_since=modified_since,
+                max_workers=getattr(settings, 'SEVEN_SHIFTS_FETCH_WORKERS', 4),
+            )
+            logger.info(
+                f"Fetched {len(shifts)} shifts from 7shifts for {start_date.date()} to {end_date.date()} "
+                f"({'full' if full else f'modified since {modified_since.isoformat()}'})"
+            )
 
-            for shift in shifts:
-                try:
-                    self._sync_shift(shift)
-                    shifts_synced += 1
-                    synced_shifts.append({
-                        'id': shift.get('id'),
-                        'user_id': shift.get('user', {}).get('id') or shift.get('user_id'),
-                        'start': shift.get('start'),
-                        'end': shift.get('end'),
-                        'role': shift.get('role', {}).get('name', ''),
-                        'data': shift  # Store complete raw shift data
-                    })
-                except Exception as e:
-                    error_msg = f"Failed to sync shift {shift.get('id')}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    failed_shifts.append({
-                        'id': shift.get('id'),
-                        'user_id': shift.get('user', {}).get('id') or shift.get('user_id'),
-                        'error': str(e),
-                        'data': shift  # Store complete raw shift data even on failure
-                    })
+            # Diff against existing rows and write in bulk
+            bulk_result = self._bulk_sync_shifts(shifts)
+            shifts_synced = bulk_result['inserted'] + bulk_result['updated'] + bulk_result['unchanged']
+            errors = bulk_result['errors']
+            synced_shifts = bulk_result['synced_shifts']
+            failed_shifts = bulk_result['failed_shifts']
+
+            # Only a full listing of the window tells us which shifts were deleted
+            deleted_count = 0
+            if full:
+                deleted_count = self._delete_missing_shifts(
+                    {str(shift.get('id')) for shift in shifts}, start_date, end_date
+                )
 
-            # Update config last sync time
+            # Refresh the cached "who is on shift" index used by ShiftChecker
+            self._rebuild_shift_index()
+
+            # Update config last sync time; advance the high-water mark only if
+            # every shift synced, so failed ones are refetched next time
             self.config.last_sync_at = timezone.now()
+            if not errors:
+                self.config.shifts_modified_since = self._next_high_water_mark(start_time)
+                if full:
+                    self.config.last_full_shift_sync_at = start_time
             self.config.save()
 
             # Update sync log with comprehensive data
             sync_log.items_synced = shifts_synced
             sync_log.errors_count = len(errors)
-            sync_log.error_details = {
+            sync_log.error_details = compact_sync_details({
                 'errors': errors,
                 'synced_shifts': synced_shifts,
                 'failed_shifts': failed_shifts,
@@ -253,12 +352,18 @@ class SevenShiftsSyncService:
                     'end': end_date.isoformat()
                 },
                 'summary': {
+                    'mode': 'full' if full else 'incremental',
                     'total_fetched': len(shifts),
                     'successfully_synced': shifts_synced,
+                    'inserted': bulk_result['inserted'],
+                    'updated': bulk_result['updated'],
+                    'unchanged': bulk_result['unchanged'],
+                    'skipped': bulk_result['skipped'],
+                    'deleted': deleted_count,
                     'failed': len(failed_shifts),
                     'days_ahead': days_ahead
                 }
-            }
+            }, payload_keys=['synced_shifts', 'failed_shifts'])
             sync_log.status = (SevenShiftsSyncLog.Status.PARTIAL
                              if errors else SevenShiftsSyncLog.Status.SUCCESS)
             sync_log.completed_at = timezone.now()
@@ -266,7 +371,13 @@ class SevenShiftsSyncService:
             sync_log.save()
 
             return {
+                'mode': 'full' if full else 'incremental',
                 'shifts_synced': shifts_synced,
+                'inserted': bulk_result['inserted'],
+                'updated': bulk_result['updated'],
+                'unchanged': bulk_result['unchanged'],
+                'skipped': bulk_result['skipped'],
+                'deleted': deleted_count,
                 'errors_count': len(errors),
                 'errors': errors[:5]
             }
@@ -285,17 +396,20 @@ class SevenShiftsSyncService:
 
     def map_or_create_users(self) -> dict:
         """
-        Auto-map employees to existing users by email, or create new users.
+        Auto-map employees to existing users by email or phone, or create new users.
 
-        Looks for SevenShiftsEmployee records without a user mapping,
-        tries to match by email to existing users, and creates new users
-        for employees without a match.
+        Looks for SevenShiftsEmployee records without a user mapping and
+        resolves them in one set-based pass: candidate users (by email, or by
+        phone for employees without email) and taken usernames are loaded in
+        single queries, missing users are created with bulk_create and
+        employees are linked with bulk_update.
 
         Returns:
             dict with mapping/creation statistics
         """
         from django.contrib.auth import get_user_model
-        from django.db.models import Count
+        from django.contrib.auth.hashers import make_password
+        from django.db.models import Exists, OuterRef, Q
         User = get_user_model()
 
         # First, update employee stores from their shifts if they don't have one
@@ -305,157 +419,153 @@ class SevenShiftsSyncService:
         self._sync_stores_to_mapped_users()
 
         # Find all employees without a user mapping
-        unmapped_employees = SevenShiftsEmployee.objects.filter(
-            account=self.account,
-            user__isnull=True
+        unmapped_employees = list(
+            SevenShiftsEmployee.objects.filter(
+                account=self.account,
+                user__isnull=True
+            ).select_related('store')
         )
 
-        mapped_count = 0
-        created_count = 0
-        skipped_count = 0
-        temp_email_count = 0
         mapped_details = []
         created_details = []
         skipped_details = []
         temp_email_details = []
 
+        def skip(employee, reason):
+            skipped_details.append({
+                'employee_id': str(employee.id),
+                'name': f"{employee.first_name} {employee.last_name}",
+                'email': employee.email,
+                'reason': reason
+            })
+
+        # Existing account users matching any unmapped employee, in one query
+        emails = {employee.email for employee in unmapped_employees if employee.email}
+        phones = {employee.phone for employee in unmapped_employees if not employee.email and employee.phone}
+        users_by_email = {}
+        users_by_phone = {}
+        linked_user_ids = set()
+        if emails or phones:
+            candidates = User.objects.filter(account=self.account).filter(
+                Q(email__in=emails) | Q(phone__in=phones)
+            ).annotate(
+                is_linked=Exists(SevenShiftsEmployee.objects.filter(user=OuterRef('pk')))
+            ).order_by('id')
+            for user in candidates:
+                if user.is_linked:
+                    linked_user_ids.add(user.id)
+                if user.email in emails:
+                    users_by_email.setdefault(user.email, user)
+                if user.phone in phones:
+                    users_by_phone.setdefault(user.phone, []).append(user)
+
+        # Plan: map to an existing user, create a new one, or skip
+        to_link = []
+        to_create = []  # (employee, user, is_temp_email)
         for employee in unmapped_employees:
-            # Handle employees without email
-            if not employee.email:
-                # If config allows, create with temporary email
-                if self.config.create_users_without_email:
-                    # Generate temporary email: temp_7shifts_{seven_shifts_id}@{account_id}.temp.local
-                    temp_email = f"temp_7shifts_{employee.seven_shifts_id}@{str(self.account.id)}.temp.local"
-
-                    try:
-                        # Create user with temporary email
-                        username = f"7shifts_{employee.seven_shifts_id}"
-
-                        # Determine role based on 7shifts roles
-                        user_role = self._map_seven_shifts_role_to_peakops(employee.roles or [])
-
-                        user = User.objects.create(
-                            username=username,
-                            email=temp_email,
-                            first_name=employee.first_name,
-                            last_name=employee.last_name,
-                            phone=employee.phone,
-                            account=self.account,
-                            store=employee.store,
-                            role=user_role,
-                            is_active=employee.is_active
-                        )
-                        user.set_unusable_password()
-                        user.save()
-
-                        employee.user = user
-                        employee.save()
-
-                        created_count += 1
-                        temp_email_count += 1
-                        temp_email_details.append({
-                            'employee_id': str(employee.id),
-                            'employee_name': f"{employee.first_name} {employee.last_name}",
-                            'user_id': str(user.id),
-                            'username': username,
-                            'temp_email': temp_email,
-                            'phone': employee.phone or 'No phone',
-                            'store': employee.store.name if employee.store else None
-                        })
-                        logger.info(f"Created user with temporary email for employee {employee.seven_shifts_id}")
-                    except Exception as e:
-                        skipped_count += 1
-                        skipped_details.append({
-                            'employee_id': str(employee.id),
-                            'name': f"{employee.first_name} {employee.last_name}",
-                            'reason': f'Failed to create with temp email: {str(e)}'
-                        })
-                        logger.error(f"Failed to create user with temp email for {employee.seven_shifts_id}: {str(e)}")
-                    continue
-                else:
-                    skipped_count += 1
-                    skipped_details.append({
-                        'employee_id': str(employee.id),
-                        'name': f"{employee.first_name} {employee.last_name}",
-                        'reason': 'No email address (temp email creation disabled)'
-                    })
+            existing_user = users_by_email.get(employee.email) if employee.email else None
+            if not employee.email and employee.phone:
+                phone_matches = users_by_phone.get(employee.phone, [])
+                # Only trust a phone match when it is unambiguous
+                if len(phone_matches) == 1:
+                    existing_user = phone_matches[0]
+
+            if existing_user:
+                if existing_user.id in linked_user_ids:
+                    skip(employee, f'User {existing_user.id} is already linked to another 7shifts employee')
                     continue
+                linked_user_ids.add(existing_user.id)
+                employee.user = existing_user
+                to_link.append(employee)
+                mapped_details.append({
+                    'employee_id': str(employee.id),
+                    'employee_name': f"{employee.first_name} {employee.last_name}",
+                    'user_id': str(existing_user.id),
+                    'user_email': existing_user.email,
+                    'user_name': existing_user.get_full_name()
+                })
+                continue
 
-            try:
-                # Try to find existing user by email in same account
-                existing_user = User.objects.filter(
-                    email=employee.email,
-                    account=self.account
-                ).first()
-
-                if existing_user:
-                    # Map to existing user
-                    employee.user = existing_user
-                    employee.save()
-                    mapped_count += 1
-                    mapped_details.append({
-                        'employee_id': str(employee.id),
-                        'employee_name': f"{employee.first_name} {employee.last_name}",
-                        'user_id': str(existing_user.id),
-                        'user_email': existing_user.email,
-                        'user_name': existing_user.get_full_name()
-                    })
-                    logger.info(f"Mapped employee {employee.email} to existing user {existing_user.id}")
-                else:
-                    # Create new user
-                    # Use email as username so they can login with their email
-                    username = employee.email
-
-                    # Determine role based on 7shifts roles
-                    user_role = self._map_seven_shifts_role_to_peakops(employee.roles or [])
-
-                    user = User.objects.create(
-                        username=username,
-                        email=employee.email,
-                        first_name=employee.first_name,
-                        last_name=employee.last_name,
-                        phone=employee.phone,  # Sync phone number from 7shifts
-                        account=self.account,
-                        store=employee.store,  # Assign to same store as employee
-                        role=user_role,
-                        is_active=employee.is_active
-                    )
-
-                    # Set unusable password - user will need to reset via email
-                    user.set_unusable_password()
-                    user.save()
-
-                    # Link employee to new user
-                    employee.user = user
-                    employee.save()
-
-                    created_count += 1
-                    created_details.append({
-                        'employee_id': str(employee.id),
-                        'employee_name': f"{employee.first_name} {employee.last_name}",
-                        'user_id': str(user.id),
-                        'username': user.username,
-                        'email': user.email,
-                        'store': employee.store.name if employee.store else None
-                    })
-                    logger.info(f"Created new user {user.username} for employee {employee.email}")
+            if employee.email:
+                # Use email as username so they can login with their email
+                username, email, is_temp_email = employee.email, employee.email, False
+            elif self.config.create_users_without_email:
+                # Generate temporary email: temp_7shifts_{seven_shifts_id}@{account_id}.temp.local
+                username = f"7shifts_{employee.seven_shifts_id}"
+                email = f"temp_7shifts_{employee.seven_shifts_id}@{str(self.account.id)}.temp.local"
+                is_temp_email = True
+            else:
+                skip(employee, 'No email address (temp email creation disabled)')
+                continue
 
-            except Exception as e:
-                skipped_count += 1
-                skipped_details.append({
+            to_create.append((employee, User(
+                username=username,
+                email=email,
+                first_name=employee.first_name,
+                last_name=employee.last_name,
+                phone=employee.phone,  # Sync phone number from 7shifts
+                account=self.account,
+                store=employee.store,  # Assign to same store as employee
+                role=self._map_seven_shifts_role_to_peakops(employee.roles or []),
+                is_active=employee.is_active,
+                # Unusable password - user will need to reset via email
+                password=make_password(None),
+            ), is_temp_email))
+
+        # Usernames are globally unique; drop any that already exist or repeat
+        taken_usernames = set(
+            User.objects.filter(
+                username__in=[user.username for _, user, _ in to_create]
+            ).values_list('username', flat=True)
+        ) if to_create else set()
+        creatable = []
+        for employee, user, is_temp_email in to_create:
+            if user.username in taken_usernames:
+                skip(employee, f'Username {user.username} already exists')
+                continue
+            taken_usernames.add(user.username)
+            creatable.append((employee, user, is_temp_email))
+
+        with transaction.atomic():
+            User.objects.bulk_create([user for _, user, _ in creatable], batch_size=self.BULK_CHUNK_SIZE)
+            for employee, user, _ in creatable:
+                employee.user = user
+                to_link.append(employee)
+            SevenShiftsEmployee.objects.bulk_update(to_link, ['user'], batch_size=self.BULK_CHUNK_SIZE)
+
+        for employee, user, is_temp_email in creatable:
+            if is_temp_email:
+                temp_email_details.append({
                     'employee_id': str(employee.id),
-                    'name': f"{employee.first_name} {employee.last_name}",
-                    'email': employee.email,
-                    'reason': str(e)
+                    'employee_name': f"{employee.first_name} {employee.last_name}",
+                    'user_id': str(user.id),
+                    'username': user.username,
+                    'temp_email': user.email,
+                    'phone': employee.phone or 'No phone',
+                    'store': employee.store.name if employee.store else None
                 })
-                logger.error(f"Failed to map/create user for employee {employee.email}: {str(e)}")
+            else:
+                created_details.append({
+                    'employee_id': str(employee.id),
+                    'employee_name': f"{employee.first_name} {employee.last_name}",
+                    'user_id': str(user.id),
+                    'username': user.username,
+                    'email': user.email,
+                    'store': employee.store.name if employee.store else None
+                })
+
+        logger.info(
+            f"User provisioning for account {self.account.id}: {len(mapped_details)} mapped, "
+            f"{len(creatable)} created ({len(temp_email_details)} with temp email), "
+            f"{len(skipped_details)} skipped"
+        )
 
         return {
-            'total_unmapped': unmapped_employees.count(),
-            'mapped': mapped_count,
-            'created': created_count,
-            'skipped': skipped_count,
-            'temp_email_count': temp_email_count,
+            'total_unmapped': len(unmapped_employees),
+            'mapped': len(mapped_details),
+            'created': len(creatable),
+            'skipped': len(skipped_details),
+            'temp_email_count': len(temp_email_details),
             'mapped_details': mapped_details,
             'created_details': created_details,
             'skipped_details': skipped_details,
@@ -467,38 +577,32 @@ class SevenShiftsSyncService:
         Update employee store assignments based on their shift history.
 
         For employees without a store, find their most common shift location
-        and assign them to that store.
+        and assign them to that store. Uses one aggregate query over shifts.
         """
         from django.db.models import Count
 
-        # Get all employees without a store in this account
-        employees_without_store = SevenShiftsEmployee.objects.filter(
-            account=self.account,
-            store__isnull=True
-        )
+        store_counts = SevenShiftsShift.objects.filter(
+            employee__account=self.account,
+            employee__store__isnull=True
+        ).values('employee_id', 'store_id').annotate(
+            count=Count('id')
+        ).order_by('employee_id', '-count', 'store_id')
 
-        updated_count = 0
-        for employee in employees_without_store:
-            # Get shifts for this employee
-            shifts = SevenShiftsShift.objects.filter(employee=employee)
-
-            if not shifts.exists():
-                continue
+        # Rows are ordered by count within each employee; keep the first
+        most_common_store = {}
+        for row in store_counts:
+            if row['store_id']:
+                most_common_store.setdefault(row['employee_id'], row['store_id'])
 
-            # Find the most common store from shifts
-            store_counts = shifts.values('store').annotate(
-                count=Count('id')
-            ).order_by('-count')
+        if not most_common_store:
+            return
 
-            if store_counts and store_counts[0]['store']:
-                store_id = store_counts[0]['store']
-                employee.store_id = store_id
-                employee.save()
-                updated_count += 1
-                logger.info(f"Assigned store {store_id} to employee {employee.email} based on {store_counts[0]['count']} shifts")
+        employees = list(SevenShiftsEmployee.objects.filter(id__in=list(most_common_store)))
+        for employee in employees:
+            employee.store_id = most_common_store[employee.id]
+        SevenShiftsEmployee.objects.bulk_update(employees, ['store'], batch_size=self.BULK_CHUNK_SIZE)
 
-        if updated_count > 0:
-            logger.info(f"Updated {updated_count} employees with stores from their shift history")
+        logger.info(f"Updated {len(employees)} employees with stores from their shift history")
 
     def _sync_stores_to_mapped_users(self):
         """
@@ -506,34 +610,35 @@ class SevenShiftsSyncService:
 
         Updates users to match their employee's store assignment and phone number.
         """
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+
         # Get all employees with a user mapping
         mapped_employees = SevenShiftsEmployee.objects.filter(
             account=self.account,
             user__isnull=False
-        ).select_related('user', 'store')
+        ).select_related('user')
 
-        updated_count = 0
+        users_to_update = []
         for employee in mapped_employees:
             needs_update = False
 
             # Update user store if it doesn't match employee store
-            if employee.store and employee.user.store_id != employee.store_id:
-                employee.user.store = employee.store
+            if employee.store_id and employee.user.store_id != employee.store_id:
+                employee.user.store_id = employee.store_id
                 needs_update = True
-                logger.info(f"Updated user {employee.user.username} store to {employee.store.name}")
 
             # Update user phone if it doesn't match employee phone
             if employee.phone and employee.user.phone != employee.phone:
                 employee.user.phone = employee.phone
                 needs_update = True
-                logger.info(f"Updated user {employee.user.username} phone to {employee.phone}")
 
             if needs_update:
-                employee.user.save()
-                updated_count += 1
+                users_to_update.append(employee.user)
 
-        if updated_count > 0:
-            logger.info(f"Synced {updated_count} user records from employees (store/phone)")
+        if users_to_update:
+            User.objects.bulk_update(users_to_update, ['store', 'phone'], batch_size=self.BULK_CHUNK_SIZE)
+            logger.info(f"Synced {len(users_to_update)} user records from employees (store/phone)")
 
     def _map_seven_shifts_role_to_peakops(self, seven_shifts_roles: list) -> str:
         """
@@ -654,14 +759,52 @@ class SevenShiftsSyncService:
 
         return location_map
 
-    @transaction.atomic
-    def _sync_employee(self, user_data: dict, location_map: dict) -> tuple[SevenShiftsEmployee, list]:
+    def _fetch_assignments(self, seven_shifts_id: str):
+        """
+        Primary location and role names from a user's 7shifts assignments.
+
+        Returns:
+            Tuple of (location_id or None, list of role names), or None if the
+            assignments could not be fetched
+        """
+        try:
+            assignments = self.client.get_user_assignments(seven_shifts_id)
+        except Exception as e:
+            logger.warning(f"Failed to fetch assignments for user {seven_shifts_id}: {str(e)}")
+            return None
+
+        location_id = None
+        locations = assignments.get('locations', [])
+        # Use the first location as primary (users can have multiple locations)
+        if locations:
+            location_id = str(locations[0].get('id'))
+            logger.debug(f"User {seven_shifts_id} assigned to location {location_id}")
+
+        # Extract role names from assignments
+        roles = assignments.get('roles', [])
+        return location_id, [role.get('name') for role in roles if role.get('name')]
+
+    def _assignments_changed(self, stored: tuple, assignments: tuple, location_map: dict) -> bool:
+        """Whether fetched assignments differ from an employee's stored location, roles and store"""
+        stored_location_id, stored_roles, stored_store_id = stored
+        location_id, user_roles = assignments
+        store_id = location_map.get(location_id) if location_id else None
+        return (
+            (location_id or '') != stored_location_id
+            or user_roles != (stored_roles or [])
+            or (store_id is not None and store_id != stored_store_id)
+        )
+
+    def _sync_employee(self, user_data: dict, location_map: dict,
+                       payload_hash: str = '', assignments: tuple = None) -> tuple[SevenShiftsEmployee, list]:
         """
         Sync a single employee from 7shifts data.
 
         Args:
             user_data: User dict from 7shifts API
             location_map: Mapping of location_id to store_id
+            payload_hash: Hash of user_data, stored for change detection
+            assignments: Already fetched (location_id, roles), see _fetch_assignments
 
         Returns:
             Tuple of (SevenShiftsEmployee instance, list of role names)
@@ -669,32 +812,21 @@ class SevenShiftsSyncService:
         seven_shifts_id = str(user_data.get('id'))
 
         # Fetch user assignments to get location/department/role data
-        location_id = None
-        user_roles = []
-        try:
-            assignments = self.client.get_user_assignments(seven_shifts_id)
-            locations = assignments.get('locations', [])
-            # Use the first location as primary (users can have multiple locations)
-            if locations:
-                location_id = str(locations[0].get('id'))
-                logger.debug(f"User {seven_shifts_id} assigned to location {location_id}")
-
-            # Extract role names from assignments
-            roles = assignments.get('roles', [])
-            user_roles = [role.get('name') for role in roles if role.get('name')]
-
-        except Exception as e:
-            logger.warning(f"Failed to fetch assignments for user {seven_shifts_id}: {str(e)}")
+        if assignments is None:
+            assignments = self._fetch_assignments(seven_shifts_id)
+        location_id, user_roles = assignments or (None, [])
 
         # Check role filtering if configured
         if self.config.sync_role_names:  # If list is not empty
             if not user_roles:
                 # Employee has no roles assigned, skip if role filtering is enabled
-                raise Exception(f"Employee has no roles assigned and role filtering is enabled")
+                raise EmployeeFilteredOut(f"Employee has no roles assigned and role filtering is enabled")
 
             # Check if any of the employee's roles match the configured sync list
             if not any(role in self.config.sync_role_names for role in user_roles):
-                raise Exception(f"Employee roles {user_roles} not in configured sync list {self.config.sync_role_names}")
+                raise EmployeeFilteredOut(
+                    f"Employee roles {user_roles} not in configured sync list {self.config.sync_role_names}"
+                )
 
         # Map location to store
         store_id = location_map.get(str(location_id)) if location_id else None
@@ -710,6 +842,7 @@ class SevenShiftsSyncService:
             'last_name': user_data.get('last_name', ''),
             'is_active': user_data.get('active', True),
             'roles': user_roles,  # Store 7shifts roles
+            'payload_hash': payload_hash,
         }
 
         # Add store if we found a mapping
@@ -724,64 +857,210 @@ class SevenShiftsSyncService:
 
         return employee, user_roles
 
-    @transaction.atomic
-    def _sync_shift(self, shift_data: dict):
+    def _bulk_sync_shifts(self, shifts: list) -> dict:
         """
-        Sync a single shift from 7shifts data.
+        Upsert a batch of 7shifts shifts with a constant number of queries.
+
+        Employees, location mappings and existing shifts are preloaded into
+        dicts, each incoming shift is diffed against its stored row by
+        seven_shifts_shift_id, and only new or changed rows are written
+        (bulk_create with update_conflicts / bulk_update, in chunks).
 
         Args:
-            shift_data: Shift dict from 7shifts API
+            shifts: List of shift dicts from 7shifts API
+
+        Returns:
+            dict with inserted/updated/unchanged/skipped counts, errors and
+            per-shift details for the sync log
         """
-        seven_shifts_shift_id = str(shift_data.get('id'))
+        from .models import SevenShiftsLocationMapping
 
-        # Get employee - try both user.id (nested) and user_id (top-level)
-        user_id = shift_data.get('user', {}).get('id') or shift_data.get('user_id')
-        if not user_id:
-            logger.warning(f"Shift {seven_shifts_shift_id} has no user_id, skipping")
-            return
+        result = {
+            'inserted': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'skipped': 0,
+            'errors': [],
+            'synced_shifts': [],
+            'failed_shifts': [],
+        }
 
-        try:
-            employee = SevenShiftsEmployee.objects.get(
-                seven_shifts_id=str(user_id),
-                account=self.account
+        # Last occurrence wins if 7shifts returns the same shift twice
+        shifts_by_id = {}
+        for shift in shifts:
+            shifts_by_id[str(shift.get('id'))] = shift
+
+        user_ids = {
+            str(shift.get('user', {}).get('id') or shift.get('user_id'))
+            for shift in shifts_by_id.values()
+            if shift.get('user', {}).get('id') or shift.get('user_id')
+        }
+
+        employees = {}
+        for chunk in _chunks(list(user_ids), self.BULK_CHUNK_SIZE):
+            employees.update({
+                employee.seven_shifts_id: employee
+                for employee in SevenShiftsEmployee.objects.filter(
+                    account=self.account, seven_shifts_id__in=chunk
+                )
+            })
+
+        location_stores = dict(
+            SevenShiftsLocationMapping.objects.filter(account=self.account)
+            .values_list('seven_shifts_location_id', 'store_id')
+        )
+
+        existing = {}
+        for chunk in _chunks(list(shifts_by_id), self.BULK_CHUNK_SIZE):
+            existing.update({
+                shift.seven_shifts_shift_id: shift
+                for shift in SevenShiftsShift.objects.filter(seven_shifts_shift_id__in=chunk)
+            })
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+
+        for seven_shifts_shift_id, shift_data in shifts_by_id.items():
+            user_id = shift_data.get('user', {}).get('id') or shift_data.get('user_id')
+            try:
+                if not user_id:
+                    logger.warning(f"Shift {seven_shifts_shift_id} has no user_id, skipping")
+                    result['skipped'] += 1
+                    continue
+
+                employee = employees.get(str(user_id))
+                if not employee:
+                    logger.warning(f"Employee {user_id} not found, skipping shift {seven_shifts_shift_id}")
+                    result['skipped'] += 1
+                    continue
+
+                # Parse dates
+                start_time = datetime.fromisoformat(shift_data['start'].replace('Z', '+00:00'))
+                end_time = datetime.fromisoformat(shift_data['end'].replace('Z', '+00:00'))
+
+                # Get store from employee or shift location mapping
+                store_id = employee.store_id
+                if not store_id:
+                    shift_location_id = str(shift_data.get('location_id', ''))
+                    if not shift_location_id:
+                        logger.warning(f"No store for employee {employee.id} and no location_id in shift, skipping")
+                        result['skipped'] += 1
+                        continue
+                    store_id = location_stores.get(shift_location_id)
+                    if not store_id:
+                        logger.warning(f"No location mapping found for location {shift_location_id}, skipping shift")
+                        result['skipped'] += 1
+                        continue
+
+                values = {
+                    'employee_id': employee.id,
+                    'account_id': self.account.id,
+                    'store_id': store_id,
+                    'start_time': start_time,
+                    'end_time': end_time,
+                    'role': shift_data.get('role', {}).get('name', ''),
+                }
+
+                current = existing.get(seven_shifts_shift_id)
+                if current is None:
+                    to_create.append(SevenShiftsShift(
+                        seven_shifts_shift_id=seven_shifts_shift_id, synced_at=now, **values
+                    ))
+                    result['inserted'] += 1
+                elif any(getattr(current, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(current, field, value)
+                    current.synced_at = now
+                    to_update.append(current)
+                    result['updated'] += 1
+                else:
+                    result['unchanged'] += 1
+
+                result['synced_shifts'].append({
+                    'id': shift_data.get('id'),
+                    'user_id': user_id,
+                    'start': shift_data.get('start'),
+                    'end': shift_data.get('end'),
+                    'role': shift_data.get('role', {}).get('name', ''),
+                    'data': shift_data  # Store complete raw shift data
+                })
+
+            except Exception as e:
+                error_msg = f"Failed to sync shift {shift_data.get('id')}: {str(e)}"
+                logger.error(error_msg)
+                result['errors'].append(error_msg)
+                result['failed_shifts'].append({
+                    'id': shift_data.get('id'),
+                    'user_id': user_id,
+                    'error': str(e),
+                    'data': shift_data  # Store complete raw shift data even on failure
+                })
+
+        write_fields = ['employee', 'account', 'store', 'start_time', 'end_time', 'role', 'synced_at']
+        with transaction.atomic():
+            # update_conflicts covers rows inserted by a concurrent sync since preload
+            SevenShiftsShift.objects.bulk_create(
+                to_create,
+                batch_size=self.BULK_CHUNK_SIZE,
+                update_conflicts=True,
+                unique_fields=['seven_shifts_shift_id'],
+                update_fields=write_fields,
             )
-        except SevenShiftsEmployee.DoesNotExist:
-            logger.warning(f"Employee {user_id} not found, skipping shift {seven_shifts_shift_id}")
-            return
+            SevenShiftsShift.objects.bulk_update(to_update, write_fields, batch_size=self.BULK_CHUNK_SIZE)
 
-        # Parse dates
-        start_time = datetime.fromisoformat(shift_data['start'].replace('Z', '+00:00'))
-        end_time = datetime.fromisoformat(shift_data['end'].replace('Z', '+00:00'))
-
-        # Get store from shift location or employee
-        store = employee.store
-        if not store:
-            # Try to get store from shift's location_id
-            shift_location_id = str(shift_data.get('location_id', ''))
-            if shift_location_id:
-                from .models import SevenShiftsLocationMapping
-                try:
-                    mapping = SevenShiftsLocationMapping.objects.get(
-                        account=self.account,
-                        seven_shifts_location_id=shift_location_id
-                    )
-                    store = mapping.store
-                except SevenShiftsLocationMapping.DoesNotExist:
-                    logger.warning(f"No location mapping found for location {shift_location_id}, skipping shift")
-                    return
-            else:
-                logger.warning(f"No store for employee {employee.id} and no location_id in shift, skipping")
-                return
-
-        # Create or update shift
-        SevenShiftsShift.objects.update_or_create(
-            seven_shifts_shift_id=seven_shifts_shift_id,
-            defaults={
-                'employee': employee,
-                'account': self.account,
-                'store': store,
-                'start_time': start_time,
-                'end_time': end_time,
-                'role': shift_data.get('role', {}).get('name', ''),
-            }
+        logger.info(
+            f"Shift sync for account {self.account.id}: {result['inserted']} inserted, "
+            f"{result['updated']} updated, {result['unchanged']} unchanged, {result['skipped']} skipped"
         )
+
+        return result
+
+    def _rebuild_shift_index(self):
+        """Rebuild the cached shift index; a failure only costs a DB fallback"""
+        from .shift_index import build_shift_index
+
+        try:
+            build_shift_index(self.account.id)
+        except Exception as e:
+            logger.warning(f"Failed to rebuild shift index for account {self.account.id}: {str(e)}")
+
+    def _delete_missing_shifts(self, fetched_ids: set, start_date: datetime, end_date: datetime) -> int:
+        """
+        Delete local shifts in the synced window that 7shifts no longer returns.
+
+        Uses the same day-aligned bounds as SevenShiftsClient.list_shifts.
+
+        Returns:
+            Number of shifts deleted
+        """
+        window_start = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        window_end = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+        local_ids = SevenShiftsShift.objects.filter(
+            account=self.account,
+            start_time__gte=window_start,
+            start_time__lte=window_end,
+        ).values_list('seven_shifts_shift_id', flat=True)
+        missing_ids = [shift_id for shift_id in local_ids if shift_id not in fetched_ids]
+
+        deleted_count = 0
+        for chunk in _chunks(missing_ids, self.BULK_CHUNK_SIZE):
+            deleted_count += SevenShiftsShift.objects.filter(seven_shifts_shift_id__in=chunk).delete()[0]
+
+        if deleted_count:
+            logger.info(f"Deleted {deleted_count} shifts no longer in 7shifts for account {self.account.id}")
+
+        return deleted_count
+
+
+def _payload_hash(payload: dict) -> str:
+    """Stable SHA-256 of a 7shifts payload, used to skip unchanged records"""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _chunks(items: list, size: int):
+    """Yield successive slices of at most ``size`` items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
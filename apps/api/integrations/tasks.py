@@ -5,9 +5,13 @@ Automated syncing of employees and shifts from 7shifts to keep local data fresh.
 """
 
 from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from datetime import timedelta
 import logging
+import random
+import uuid
 
 from .models import SevenShiftsConfig
 from .sync_service import SevenShiftsSyncService
@@ -15,44 +19,150 @@ from .sync_service import SevenShiftsSyncService
 logger = logging.getLogger(__name__)
 
 
-@shared_task(name='integrations.sync_all_seven_shifts_accounts')
-def sync_all_seven_shifts_accounts():
-    """
-    Sync all active 7shifts accounts.
+# ==================== 7shifts Sync Orchestration ====================
+#
+# Beat tasks fan out one sync_seven_shifts_account_data subtask per account.
+# Each subtask holds a per-account lock (so overlapping runs never sync the same
+# account twice) and one of SEVEN_SHIFTS_SYNC_CONCURRENCY global slots (so the
+# fleet never hammers 7shifts or the database with every account at once).
+# Locks live in the Django cache, which must be shared (Redis) across workers.
+# Each lock stores a random token and is only released by its holder, so a
+# sync that outlives the lock timeout can't free a lock someone else re-took.
 
-    Run daily via Celery Beat to keep employee and shift data fresh.
-    """
-    logger.info("Starting sync for all 7shifts accounts")
+SEVEN_SHIFTS_ACCOUNT_LOCK_KEY = 'seven_shifts_sync:account:{account_id}'
+SEVEN_SHIFTS_SLOT_LOCK_KEY = 'seven_shifts_sync:slot:{slot}'
 
-    # Get all active 7shifts configurations
-    configs = SevenShiftsConfig.objects.filter(is_active=True)
 
-    total_synced = 0
-    total_failed = 0
+def _acquire_cache_lock(key, timeout):
+    """Claim a cache lock, returning its token (None if already held)"""
+    token = uuid.uuid4().hex
+    return token if cache.add(key, token, timeout) else None
 
-    for config in configs:
-        try:
-            logger.info(f"Syncing 7shifts for account: {config.account.name}")
 
-            sync_service = SevenShiftsSyncService(config)
-            result = sync_service.sync_all()
+def _release_cache_lock(key, token):
+    """Release a cache lock only if it still holds our token"""
+    if token and cache.get(key) == token:
+        cache.delete(key)
 
-            total_synced += 1
-            logger.info(f"Successfully synced account {config.account.name}: {result}")
 
-        except Exception as e:
-            total_failed += 1
-            logger.error(f"Failed to sync account {config.account.name}: {str(e)}")
+def _acquire_account_lock(account_id):
+    """Claim the per-account sync lock, returning its token (None if another sync holds it)"""
+    timeout = getattr(settings, 'SEVEN_SHIFTS_SYNC_LOCK_TIMEOUT', 1800)
+    return _acquire_cache_lock(SEVEN_SHIFTS_ACCOUNT_LOCK_KEY.format(account_id=account_id), timeout)
+
+
+def _release_account_lock(account_id, token):
+    _release_cache_lock(SEVEN_SHIFTS_ACCOUNT_LOCK_KEY.format(account_id=account_id), token)
+
+
+def _acquire_sync_slot():
+    """Claim one of the global concurrency slots, returning (key, token) or None"""
+    timeout = getattr(settings, 'SEVEN_SHIFTS_SYNC_LOCK_TIMEOUT', 1800)
+    for slot in range(getattr(settings, 'SEVEN_SHIFTS_SYNC_CONCURRENCY', 4)):
+        key = SEVEN_SHIFTS_SLOT_LOCK_KEY.format(slot=slot)
+        token = _acquire_cache_lock(key, timeout)
+        if token:
+            return key, token
+    return None
+
 
-    logger.info(f"7shifts sync completed. Success: {total_synced}, Failed: {total_failed}")
+def _slot_retry_countdown(retries: int) -> int:
+    """Exponential backoff with jitter while every sync slot is busy"""
+    base = getattr(settings, 'SEVEN_SHIFTS_SYNC_RETRY_DELAY', 20)
+    ceiling = getattr(settings, 'SEVEN_SHIFTS_SYNC_RETRY_MAX_DELAY', 600)
+    delay = min(base * 2 ** min(retries, 10), ceiling)
+    return delay + random.randint(0, base)
+
+
+def _run_account_sync(config: SevenShiftsConfig, sync_type: str, days_ahead: int) -> dict:
+    """Run one sync type for a single account"""
+    sync_service = SevenShiftsSyncService(config)
+    if sync_type == 'employees':
+        return sync_service.sync_employees()
+    if sync_type == 'shifts':
+        return sync_service.sync_shifts(days_ahead=days_ahead)
+    return sync_service.sync_all()
+
+
+def _dispatch_account_syncs(configs, sync_type: str, days_ahead: int = 14) -> dict:
+    """Queue one sync subtask per account"""
+    account_ids = list(configs.values_list('account_id', flat=True))
+
+    for account_id in account_ids:
+        sync_seven_shifts_account_data.delay(account_id, sync_type, days_ahead)
+
+    logger.info(f"Dispatched 7shifts {sync_type} sync for {len(account_ids)} account(s)")
 
     return {
-        'total_accounts': configs.count(),
-        'synced': total_synced,
-        'failed': total_failed
+        'sync_type': sync_type,
+        'accounts_dispatched': len(account_ids),
     }
 
 
+@shared_task(
+    bind=True,
+    name='integrations.sync_seven_shifts_account_data',
+    max_retries=None,
+)
+def sync_seven_shifts_account_data(self, account_id: int, sync_type: str = 'all', days_ahead: int = 14):
+    """
+    Sync one 7shifts account under the per-account lock and global concurrency cap.
+
+    Retries with backoff (and no retry cap) while all global slots are busy,
+    so a long backlog delays an account's sync instead of dropping it. Skips
+    if a sync for the same account is already running.
+
+    Args:
+        account_id: ID of the account to sync
+        sync_type: 'employees', 'shifts' or 'all'
+        days_ahead: Number of days of shifts to sync
+    """
+    try:
+        config = SevenShiftsConfig.objects.select_related('account').get(account_id=account_id, is_active=True)
+    except SevenShiftsConfig.DoesNotExist:
+        logger.warning(f"No active 7shifts config found for account {account_id}, skipping sync")
+        return {'account_id': account_id, 'skipped': True, 'reason': 'inactive'}
+
+    lock_token = _acquire_account_lock(account_id)
+    if lock_token is None:
+        logger.info(f"7shifts sync already running for account {account_id}, skipping")
+        return {'account_id': account_id, 'skipped': True, 'reason': 'already_running'}
+
+    slot = _acquire_sync_slot()
+    if slot is None:
+        _release_account_lock(account_id, lock_token)
+        countdown = _slot_retry_countdown(self.request.retries)
+        logger.info(f"All 7shifts sync slots busy, retrying account {account_id} in {countdown}s")
+        raise self.retry(countdown=countdown)
+
+    try:
+        logger.info(f"Syncing 7shifts {sync_type} for account: {config.account.name}")
+        result = _run_account_sync(config, sync_type, days_ahead)
+        logger.info(f"Successfully synced 7shifts {sync_type} for {config.account.name}: {result}")
+        return {'account_id': account_id, 'sync_type': sync_type, 'result': result}
+
+    except Exception as e:
+        logger.error(f"Failed to sync 7shifts {sync_type} for {config.account.name}: {str(e)}")
+        raise
+
+    finally:
+        _release_cache_lock(*slot)
+        _release_account_lock(account_id, lock_token)
+
+
+@shared_task(name='integrations.sync_all_seven_shifts_accounts')
+def sync_all_seven_shifts_accounts():
+    """
+    Sync all active 7shifts accounts.
+
+    Dispatches one subtask per account; see sync_seven_shifts_account_data.
+    """
+    logger.info("Starting sync for all 7shifts accounts")
+
+    configs = SevenShiftsConfig.objects.filter(is_active=True)
+    return _dispatch_account_syncs(configs, 'all')
+
+
 @shared_task(name='integrations.sync_seven_shifts_employees')
 def sync_seven_shifts_employees():
     """
@@ -66,33 +176,7 @@ def sync_seven_shifts_employees():
         is_active=True,
         sync_employees_enabled=True
     )
-
-    total_synced = 0
-    total_employees = 0
-    total_failed = 0
-
-    for config in configs:
-        try:
-            logger.info(f"Syncing employees for account: {config.account.name}")
-
-            sync_service = SevenShiftsSyncService(config)
-            result = sync_service.sync_employees()
-
-            total_synced += 1
-            total_employees += result.get('employees_synced', 0)
-            logger.info(f"Synced {result.get('employees_synced', 0)} employees for {config.account.name}")
-
-        except Exception as e:
-            total_failed += 1
-            logger.error(f"Failed to sync employees for {config.account.name}: {str(e)}")
-
-    logger.info(f"Employee sync completed. Accounts: {total_synced}, Total employees: {total_employees}, Failed: {total_failed}")
-
-    return {
-        'accounts_synced': total_synced,
-        'total_employees': total_employees,
-        'failed': total_failed
-    }
+    return _dispatch_account_syncs(configs, 'employees')
 
 
 @shared_task(name='integrations.sync_seven_shifts_shifts')
@@ -111,33 +195,7 @@ def sync_seven_shifts_shifts(days_ahead: int = 14):
         is_active=True,
         sync_shifts_enabled=True
     )
-
-    total_synced = 0
-    total_shifts = 0
-    total_failed = 0
-
-    for config in configs:
-        try:
-            logger.info(f"Syncing shifts for account: {config.account.name}")
-
-            sync_service = SevenShiftsSyncService(config)
-            result = sync_service.sync_shifts(days_ahead=days_ahead)
-
-            total_synced += 1
-            total_shifts += result.get('shifts_synced', 0)
-            logger.info(f"Synced {result.get('shifts_synced', 0)} shifts for {config.account.name}")
-
-        except Exception as e:
-            total_failed += 1
-            logger.error(f"Failed to sync shifts for {config.account.name}: {str(e)}")
-
-    logger.info(f"Shift sync completed. Accounts: {total_synced}, Total shifts: {total_shifts}, Failed: {total_failed}")
-
-    return {
-        'accounts_synced': total_synced,
-        'total_shifts': total_shifts,
-        'failed': total_failed
-    }
+    return _dispatch_account_syncs(configs, 'shifts', days_ahead)
 
 
 @shared_task(name='integrations.sync_seven_shifts_account')
@@ -145,7 +203,8 @@ def sync_seven_shifts_account(account_id: int):
     """
     Sync a specific 7shifts account (employees and shifts).
 
-    Used for manual sync triggers from the UI.
+    Used for manual sync triggers from the UI. Bypasses the global concurrency
+    cap but still refuses to run alongside another sync of the same account.
 
     Args:
         account_id: ID of the account to sync
@@ -156,6 +215,11 @@ def sync_seven_shifts_account(account_id: int):
         logger.error(f"No active 7shifts config found for account {account_id}")
         return {'error': 'No active 7shifts configuration found'}
 
+    lock_token = _acquire_account_lock(account_id)
+    if lock_token is None:
+        logger.info(f"7shifts sync already running for account {account_id}, skipping")
+        return {'error': 'A sync is already running for this account'}
+
     logger.info(f"Syncing 7shifts for account: {config.account.name}")
 
     try:
@@ -169,6 +233,9 @@ def sync_seven_shifts_account(account_id: int):
         logger.error(f"Failed to sync account {config.account.name}: {str(e)}")
         raise
 
+    finally:
+        _release_account_lock(account_id, lock_token)
+
 
 @shared_task(name='integrations.cleanup_old_shifts')
 def cleanup_old_shifts(days_to_keep: int = 30):
@@ -226,7 +293,40 @@ def cleanup_old_sync_logs(days_to_keep: int = 90):
     }
 
 
+@shared_task(name='integrations.cleanup_expired_sync_payloads')
+def cleanup_expired_sync_payloads():
+    """
+    Delete raw 7shifts sync payloads past their retention period.
+
+    Run daily; sync logs keep their inline counts and samples.
+    """
+    from .sync_audit import cleanup_expired_payloads
+
+    deleted_count = cleanup_expired_payloads()
+
+    logger.info(f"Deleted {deleted_count} expired 7shifts sync payloads")
+
+    return {'deleted_count': deleted_count}
+
+
 # ==================== Google Reviews Integration Tasks ====================
+#
+# The nightly task fans out one sync_google_reviews_account_data subtask per
+# account, each holding a per-account lock. Within an account, locations are
+# fetched concurrently and all Google calls share one request budget (see
+# google_reviews_client.wait_for_quota).
+
+GOOGLE_REVIEWS_ACCOUNT_LOCK_KEY = 'google_reviews_sync:account:{account_id}'
+
+
+def _acquire_google_account_lock(account_id):
+    """Claim the per-account Google review sync lock, returning its token (None if another sync holds it)"""
+    timeout = getattr(settings, 'GOOGLE_REVIEWS_SYNC_LOCK_TIMEOUT', 1800)
+    return _acquire_cache_lock(GOOGLE_REVIEWS_ACCOUNT_LOCK_KEY.format(account_id=account_id), timeout)
+
+
+def _release_google_account_lock(account_id, token):
+    _release_cache_lock(GOOGLE_REVIEWS_ACCOUNT_LOCK_KEY.format(account_id=account_id), token)
 
 
 @shared_task(name='integrations.sync_all_google_reviews')
@@ -234,43 +334,64 @@ def sync_all_google_reviews():
     """
     Sync reviews for all active Google Reviews integrations.
 
-    Run daily via Celery Beat to keep review data fresh.
+    Run daily via Celery Beat to keep review data fresh. Dispatches one
+    subtask per account; see sync_google_reviews_account_data.
     """
     from .models import GoogleReviewsConfig
-    from .google_reviews_sync import GoogleReviewsSyncService
 
     logger.info("Starting sync for all Google Reviews accounts")
 
-    # Get all active Google Reviews configurations
-    configs = GoogleReviewsConfig.objects.filter(is_active=True)
+    account_ids = list(
+        GoogleReviewsConfig.objects.filter(is_active=True).values_list('account_id', flat=True)
+    )
 
-    total_synced = 0
-    total_reviews = 0
-    total_failed = 0
+    for account_id in account_ids:
+        sync_google_reviews_account_data.delay(account_id)
 
-    for config in configs:
-        try:
-            logger.info(f"Syncing Google Reviews for account: {config.account.name}")
+    logger.info(f"Dispatched Google Reviews sync for {len(account_ids)} account(s)")
 
-            sync_service = GoogleReviewsSyncService(config)
-            result = sync_service.sync_all()
+    return {
+        'total_accounts': len(account_ids),
+        'accounts_dispatched': len(account_ids),
+    }
 
-            total_synced += 1
-            total_reviews += result.get('reviews_synced', 0)
-            logger.info(f"Successfully synced {result.get('reviews_synced', 0)} reviews for {config.account.name}")
 
-        except Exception as e:
-            total_failed += 1
-            logger.error(f"Failed to sync Google Reviews for {config.account.name}: {str(e)}")
+@shared_task(name='integrations.sync_google_reviews_account_data')
+def sync_google_reviews_account_data(account_id: int):
+    """
+    Sync one Google Reviews account under the per-account lock.
 
-    logger.info(f"Google Reviews sync completed. Success: {total_synced}, Total reviews: {total_reviews}, Failed: {total_failed}")
+    Skips if a sync for the same account is already running.
 
-    return {
-        'total_accounts': configs.count(),
-        'synced': total_synced,
-        'total_reviews': total_reviews,
-        'failed': total_failed
-    }
+    Args:
+        account_id: ID of the account to sync
+    """
+    from .models import GoogleReviewsConfig
+    from .google_reviews_sync import GoogleReviewsSyncService
+
+    try:
+        config = GoogleReviewsConfig.objects.select_related('account').get(account_id=account_id, is_active=True)
+    except GoogleReviewsConfig.DoesNotExist:
+        logger.warning(f"No active Google Reviews config found for account {account_id}, skipping sync")
+        return {'account_id': account_id, 'skipped': True, 'reason': 'inactive'}
+
+    lock_token = _acquire_google_account_lock(account_id)
+    if lock_token is None:
+        logger.info(f"Google Reviews sync already running for account {account_id}, skipping")
+        return {'account_id': account_id, 'skipped': True, 'reason': 'already_running'}
+
+    try:
+        logger.info(f"Syncing Google Reviews for account: {config.account.name}")
+        result = GoogleReviewsSyncService(config).sync_all()
+        logger.info(f"Successfully synced {result.get('reviews_synced', 0)} reviews for {config.account.name}")
+        return {'account_id': account_id, 'result': result}
+
+    except Exception as e:
+        logger.error(f"Failed to sync Google Reviews for {config.account.name}: {str(e)}")
+        raise
+
+    finally:
+        _release_google_account_lock(account_id, lock_token)
 
 
 @shared_task(name='integrations.analyze_pending_reviews')
@@ -341,7 +462,8 @@ def sync_google_reviews_account(account_id: int):
     """
     Sync Google Reviews for a specific account.
 
-    Used for manual sync triggers from the UI.
+    Used for manual sync triggers from the UI. Refuses to run alongside
+    another sync of the same account.
 
     Args:
         account_id: ID of the account to sync
@@ -355,6 +477,11 @@ def sync_google_reviews_account(account_id: int):
         logger.error(f"No active Google Reviews config found for account {account_id}")
         return {'error': 'No active Google Reviews configuration found'}
 
+    lock_token = _acquire_google_account_lock(account_id)
+    if lock_token is None:
+        logger.info(f"Google Reviews sync already running for account {account_id}, skipping")
+        return {'error': 'A sync is already running for this account'}
+
     logger.info(f"Syncing Google Reviews for account: {config.account.name}")
 
     try:
@@ -368,6 +495,9 @@ def sync_google_reviews_account(account_id: int):
         logger.error(f"Failed to sync Google Reviews for {config.account.name}: {str(e)}")
         raise
 
+    finally:
+        _release_google_account_lock(account_id, lock_token)
+
 
 @shared_task(name='integrations.cleanup_old_reviews')
 def cleanup_old_reviews(days_to_keep: int = 90):
@@ -0,0 +1,350 @@
+"""
+Tests for the Google Reviews sync service
+
+Covers the bulk review ingestion path used by
+GoogleReviewsSyncService.sync_reviews, incremental review fetching
+against a per-location high-water mark, and the concurrent per-location
+sync with its shared request budget and single token refresh.
+"""
+
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Account, User
+from brands.models import Brand
+from integrations.google_reviews_client import GoogleReviewsClient, wait_for_quota
+from integrations.google_reviews_sync import GoogleReviewsSyncService
+from integrations.models import GoogleLocation, GoogleReview, GoogleReviewsConfig
+from integrations.tasks import (
+    GOOGLE_REVIEWS_ACCOUNT_LOCK_KEY,
+    analyze_pending_reviews,
+    sync_all_google_reviews,
+    sync_google_reviews_account_data,
+)
+
+STAR_RATINGS = {1: 'ONE', 2: 'TWO', 3: 'THREE', 4: 'FOUR', 5: 'FIVE'}
+
+
+class GoogleReviewsSyncTestCase(TestCase):
+    """Shared fixtures for Google Reviews sync tests"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="testpass123",
+            role=User.Role.OWNER
+        )
+        self.brand = Brand.objects.create(name="Test Brand")
+        self.account = Account.objects.create(name="Test Account", brand=self.brand, owner=self.owner)
+        self.config = GoogleReviewsConfig.objects.create(
+            account=self.account,
+            access_token_encrypted=GoogleReviewsClient.encrypt_token("access").encode(),
+            refresh_token_encrypted=GoogleReviewsClient.encrypt_token("refresh").encode(),
+            token_expires_at=timezone.now() + timedelta(hours=1),
+            google_account_id="accounts/1",
+        )
+        self.location = GoogleLocation.objects.create(
+            account=self.account, google_location_id="loc_1", google_location_name="Downtown"
+        )
+        self.service = GoogleReviewsSyncService(self.config)
+        self.now = timezone.now().replace(microsecond=0)
+
+    def _review(self, review_id, rating=5, comment='Great food', name='Alice', days_ago=1, reply=None,
+                updated_days_ago=None, location_id='loc_1'):
+        data = {
+            'name': f'accounts/1/locations/{location_id}/reviews/{review_id}',
+            'reviewer': {'displayName': name},
+            'starRating': STAR_RATINGS[rating],
+            'comment': comment,
+            'createTime': (self.now - timedelta(days=days_ago)).isoformat(),
+        }
+        if updated_days_ago is not None:
+            data['updateTime'] = (self.now - timedelta(days=updated_days_ago)).isoformat()
+        if reply:
+            data['reviewReply'] = {'comment': reply}
+        return data
+
+    def _sync(self, reviews):
+        with patch.object(self.service, '_generate_analysis_for_location'), \
+                patch.object(self.service.client, 'list_reviews', return_value=reviews):
+            return self.service.sync_reviews()
+
+
+class BulkReviewSyncTest(GoogleReviewsSyncTestCase):
+    """Test bulk review upsert, scraped-review upgrade and stats recompute"""
+
+    def test_creates_reviews_and_recomputes_stats(self):
+        result = self._sync([self._review('r1', 5), self._review('r2', 4), self._review('r3', 2, days_ago=200)])
+
+        self.assertEqual(result['reviews_created'], 2)
+        self.assertEqual(GoogleReview.objects.count(), 2)
+        review = GoogleReview.objects.get(google_review_id='r1')
+        self.assertEqual(review.source, 'oauth')
+        self.assertTrue(review.is_verified)
+        self.assertTrue(review.needs_analysis)
+
+        self.location.refresh_from_db()
+        self.assertEqual(self.location.average_rating, Decimal('4.50'))
+        self.assertEqual(self.location.total_review_count, 2)
+
+    def test_query_count_does_not_grow_with_reviews(self):
+        def sync_queries(reviews):
+            with CaptureQueriesContext(connection) as ctx:
+                self._sync(reviews)
+            return len(ctx.captured_queries)
+
+        small = sync_queries([self._review(f'a{i}') for i in range(3)])
+        GoogleReview.objects.all().delete()
+        GoogleLocation.objects.update(reviews_updated_through=None)
+        large = sync_queries([self._review(f'b{i}') for i in range(60)])
+
+        self.assertEqual(small, large)
+
+    def test_unchanged_reviews_are_not_rewritten_and_pending_analysis_is_kept(self):
+        self._sync([self._review('r1'), self._review('r2')])
+        GoogleReview.objects.filter(google_review_id='r1').update(needs_analysis=False)
+
+        result = self._sync([
+            self._review('r1', reply='Thanks!'),
+            self._review('r2'),
+        ])
+
+        self.assertEqual(result['reviews_updated'], 1)
+        self.assertEqual(result['reviews_unchanged'], 1)
+        r1 = GoogleReview.objects.get(google_review_id='r1')
+        self.assertEqual(r1.review_reply, 'Thanks!')
+        # Only the reply changed, so no re-analysis
+        self.assertFalse(r1.needs_analysis)
+        self.assertTrue(GoogleReview.objects.get(google_review_id='r2').needs_analysis)
+
+    def test_changed_text_flags_review_for_analysis(self):
+        self._sync([self._review('r1')])
+        GoogleReview.objects.update(needs_analysis=False)
+
+        self._sync([self._review('r1', comment='Actually it was cold')])
+
+        review = GoogleReview.objects.get(google_review_id='r1')
+        self.assertEqual(review.review_text, 'Actually it was cold')
+        self.assertTrue(review.needs_analysis)
+
+    def test_matching_scraped_review_is_upgraded_in_place(self):
+        scraped = GoogleReview.objects.create(
+            location=self.location, account=self.account, google_review_id='scraped_1',
+            reviewer_name='Alice', rating=5, review_text='Great food and friendly staff',
+            review_created_at=timezone.now() - timedelta(days=1),
+            source='scraped', is_verified=False, needs_analysis=False
+        )
+
+        result = self._sync([
+            self._review('r1', comment='Great food and friendly staff'),
+            self._review('r2', name='Bob'),
+        ])
+
+        self.assertEqual(result['reviews_upgraded'], 1)
+        self.assertEqual(result['reviews_created'], 1)
+        self.assertEqual(GoogleReview.objects.count(), 2)
+        scraped.refresh_from_db()
+        self.assertEqual(scraped.google_review_id, 'r1')
+        self.assertEqual(scraped.source, 'oauth')
+        self.assertTrue(scraped.is_verified)
+        self.assertFalse(scraped.needs_analysis)
+
+
+class IncrementalReviewFetchTest(GoogleReviewsSyncTestCase):
+    """Test paging stops at the high-water mark and the mark is persisted"""
+
+    def _page(self, reviews, next_token=None):
+        response = MagicMock()
+        response.json.return_value = {'reviews': reviews, 'nextPageToken': next_token}
+        return response
+
+    def test_paging_stops_after_first_fully_known_page(self):
+        client = GoogleReviewsClient('token')
+        pages = [
+            self._page([self._review('r1', updated_days_ago=1), self._review('r2', updated_days_ago=3)], 'p2'),
+            self._page([self._review('r3', updated_days_ago=4), self._review('r4', updated_days_ago=5)], 'p3'),
+            self._page([self._review('r5', updated_days_ago=6)]),
+        ]
+
+        with patch.object(client.session, 'get', side_effect=pages) as get:
+            reviews = client.list_reviews('accounts/1/locations/loc_1', updated_after=self.now - timedelta(days=2))
+
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(len(reviews), 4)
+        self.assertEqual(get.call_args.kwargs['params']['orderBy'], 'updateTime desc')
+
+    def test_full_listing_pages_through_everything(self):
+        client = GoogleReviewsClient('token')
+        pages = [self._page([self._review('r1', updated_days_ago=9)], 'p2'), self._page([self._review('r2')])]
+
+        with patch.object(client.session, 'get', side_effect=pages) as get:
+            reviews = client.list_reviews('accounts/1/locations/loc_1')
+
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(len(reviews), 2)
+        self.assertNotIn('orderBy', get.call_args.kwargs['params'])
+
+    def test_sync_persists_and_uses_high_water_mark(self):
+        self._sync([self._review('r1', updated_days_ago=2), self._review('r2', updated_days_ago=1)])
+
+        self.location.refresh_from_db()
+        self.assertEqual(self.location.reviews_updated_through, self.now - timedelta(days=1))
+
+        with patch.object(self.service, '_generate_analysis_for_location'), \
+                patch.object(self.service.client, 'list_reviews', return_value=[]) as list_reviews:
+            self.service.sync_reviews()
+            self.assertEqual(list_reviews.call_args.kwargs['updated_after'], self.now - timedelta(days=1))
+
+            self.service.sync_reviews(days_back=90, full=True)
+            self.assertLess(list_reviews.call_args.kwargs['updated_after'], self.now - timedelta(days=89))
+
+    def test_mark_is_not_advanced_when_storing_fails(self):
+        with patch.object(self.service, '_bulk_sync_location_reviews', side_effect=RuntimeError('db down')):
+            self._sync([self._review('r1', updated_days_ago=1)])
+
+        self.location.refresh_from_db()
+        self.assertIsNone(self.location.reviews_updated_through)
+
+
+class FakeClock:
+    """Stand-in for the time module whose sleep() advances time()"""
+
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ConcurrentReviewSyncTest(GoogleReviewsSyncTestCase):
+    """Test concurrent location fetches, the shared quota and one token refresh"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.second_location = GoogleLocation.objects.create(
+            account=self.account, google_location_id="loc_2", google_location_name="Uptown"
+        )
+
+    def _reviews_by_location(self, location_name, **kwargs):
+        location_id = location_name.rsplit('/', 1)[-1]
+        return [self._review(f'{location_id}_r{i}', location_id=location_id) for i in range(3)]
+
+    def _sync_with(self, list_reviews):
+        with patch.object(self.service, '_generate_analysis_for_location'), \
+                patch.object(self.service.client, 'list_reviews', side_effect=list_reviews):
+            return self.service.sync_reviews()
+
+    @override_settings(GOOGLE_REVIEWS_FETCH_WORKERS=2)
+    def test_locations_are_fetched_concurrently_and_stored(self):
+        # Both fetches must be in flight at once to pass the barrier
+        barrier = threading.Barrier(2, timeout=5)
+
+        def list_reviews(location_name, **kwargs):
+            barrier.wait()
+            return self._reviews_by_location(location_name)
+
+        result = self._sync_with(list_reviews)
+
+        self.assertEqual(result['reviews_created'], 6)
+        for location in (self.location, self.second_location):
+            location.refresh_from_db()
+            self.assertEqual(location.total_review_count, 3)
+
+    @override_settings(GOOGLE_OAUTH_CLIENT_ID='id', GOOGLE_OAUTH_CLIENT_SECRET='secret',
+                       GOOGLE_REVIEWS_FETCH_WORKERS=2)
+    def test_rejected_token_is_refreshed_once_per_account(self):
+        client = self.service.client
+
+        def list_reviews(location_name, **kwargs):
+            if client.access_token == 'access':
+                response = MagicMock(status_code=401)
+                raise requests.HTTPError(response=response)
+            return self._reviews_by_location(location_name)
+
+        def refresh_access_token(client_id, client_secret):
+            client.access_token = 'fresh'
+            return {'access_token': 'fresh', 'expires_in': 3600}
+
+        with patch.object(client, 'refresh_access_token', side_effect=refresh_access_token) as refresh:
+            result = self._sync_with(list_reviews)
+
+        self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(result['reviews_created'], 6)
+        self.config.refresh_from_db()
+        self.assertEqual(GoogleReviewsClient.decrypt_token(self.config.access_token_encrypted), 'fresh')
+
+    @override_settings(GOOGLE_REVIEWS_REQUESTS_PER_MINUTE=2)
+    def test_quota_limiter_waits_for_next_window(self):
+        clock = FakeClock(600.0)
+
+        with patch('integrations.google_reviews_client.time', clock):
+            for _ in range(3):
+                wait_for_quota()
+
+        self.assertEqual(clock.sleeps, [60.0])
+
+    def test_nightly_task_dispatches_one_subtask_per_account(self):
+        with patch('integrations.tasks.sync_google_reviews_account_data.delay') as delay:
+            result = sync_all_google_reviews()
+
+        delay.assert_called_once_with(self.account.id)
+        self.assertEqual(result['accounts_dispatched'], 1)
+
+    def test_account_subtask_skips_while_locked(self):
+        cache.add(GOOGLE_REVIEWS_ACCOUNT_LOCK_KEY.format(account_id=self.account.id), True)
+
+        with patch('integrations.google_reviews_sync.GoogleReviewsSyncService.sync_all') as sync_all:
+            result = sync_google_reviews_account_data(self.account.id)
+
+        sync_all.assert_not_called()
+        self.assertEqual(result['reason'], 'already_running')
+
+    def test_sync_outliving_its_lock_leaves_the_new_holder_lock(self):
+        key = GOOGLE_REVIEWS_ACCOUNT_LOCK_KEY.format(account_id=self.account.id)
+
+        def expire_and_retake():
+            # Our lock times out mid-sync and another worker claims it
+            cache.delete(key)
+            cache.add(key, 'other-worker')
+            return {}
+
+        with patch('integrations.google_reviews_sync.GoogleReviewsSyncService.sync_all',
+                   side_effect=expire_and_retake):
+            sync_google_reviews_account_data(self.account.id)
+
+        self.assertEqual(cache.get(key), 'other-worker')
+
+    def test_beat_schedule_only_references_registered_tasks(self):
+        from django.conf import settings
+        from peakops.celery import app
+
+        app.loader.import_default_modules()
+        for entry in settings.CELERY_BEAT_SCHEDULE.values():
+            self.assertIn(entry['task'], app.tasks)
+
+    def test_pending_review_analysis_marks_high_rated_reviews_done(self):
+        self.config.min_rating_for_analysis = 3
+        self.config.save()
+        self._sync([self._review('r1', rating=5)])
+
+        with patch('integrations.review_analysis_helper.analyze_google_review') as analyze:
+            result = analyze_pending_reviews()
+
+        analyze.assert_not_called()
+        self.assertEqual(result, {'analyzed': 0, 'failed': 0})
+        self.assertFalse(GoogleReview.objects.get().needs_analysis)
@@ -0,0 +1,133 @@
+"""
+Tests for review topic counters and the insights snapshots/trends read from them
+"""
+
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from integrations.insights_service import ReviewInsightsService
+from integrations.models import GoogleReview, ReviewTopicCounter, ReviewTopicSnapshot, TopicTrend
+from integrations.review_analysis_helper import create_or_update_analysis
+from integrations.test_google_reviews_sync import GoogleReviewsSyncTestCase
+from integrations.topic_counters import rebuild_topic_counters
+
+
+class ReviewInsightsTestCase(GoogleReviewsSyncTestCase):
+    """Shared helpers for analyzed-review fixtures"""
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        self.week_start = self.today - timedelta(days=self.today.weekday())
+
+    def _analyzed_review(self, review_id, topics, sentiment=0.5, rating=5, posted=None):
+        posted = posted or self.week_start
+        review = GoogleReview.objects.create(
+            location=self.location, account=self.account, google_review_id=review_id,
+            reviewer_name='Alice', rating=rating, review_text='text',
+            review_created_at=timezone.make_aware(datetime(posted.year, posted.month, posted.day, 12)),
+        )
+        create_or_update_analysis(
+            review, {'topics': topics, 'sentiment_score': sentiment, 'suggested_category': 'Service'},
+            model_used='test', processing_time_ms=0
+        )
+        return review
+
+    def _counter(self, topic, window_type='weekly', period_start=None):
+        return ReviewTopicCounter.objects.get(
+            location=self.location, topic=topic, window_type=window_type,
+            period_start=period_start or self.week_start
+        )
+
+
+class TopicCounterTest(ReviewInsightsTestCase):
+    """Test analyses bump and re-analysis moves the running counters"""
+
+    def test_analysis_bumps_every_window(self):
+        self._analyzed_review('r1', ['service', 'food'], sentiment=0.8)
+        self._analyzed_review('r2', ['service'], sentiment=-0.4, rating=2)
+
+        weekly = self._counter('service')
+        self.assertEqual(weekly.mention_count, 2)
+        self.assertEqual(weekly.positive_mentions, 1)
+        self.assertEqual(weekly.negative_mentions, 1)
+        self.assertAlmostEqual(weekly.sentiment_sum, 0.4)
+
+        self.assertEqual(self._counter('service', 'daily').mention_count, 2)
+        self.assertEqual(self._counter('food', 'monthly', self.week_start.replace(day=1)).mention_count, 1)
+
+    def test_reanalysis_replaces_previous_contribution(self):
+        review = self._analyzed_review('r1', ['service', 'food'], sentiment=0.8)
+
+        create_or_update_analysis(
+            review, {'topics': ['food', 'price'], 'sentiment_score': 0.2},
+            model_used='test', processing_time_ms=0
+        )
+
+        self.assertEqual(self._counter('service').mention_count, 0)
+        self.assertEqual(self._counter('food').mention_count, 1)
+        self.assertAlmostEqual(self._counter('food').sentiment_sum, 0.2)
+        self.assertEqual(self._counter('price').mention_count, 1)
+
+    def test_rebuild_matches_incremental_counters(self):
+        self._analyzed_review('r1', ['service', 'food'], sentiment=0.8)
+        self._analyzed_review('r2', ['service'], sentiment=-0.4, rating=2)
+        incremental = set(ReviewTopicCounter.objects.values_list(
+            'topic', 'window_type', 'period_start', 'mention_count', 'positive_mentions', 'negative_mentions'
+        ))
+
+        self.assertEqual(rebuild_topic_counters(self.account.id), len(incremental))
+        rebuilt = set(ReviewTopicCounter.objects.values_list(
+            'topic', 'window_type', 'period_start', 'mention_count', 'positive_mentions', 'negative_mentions'
+        ))
+        self.assertEqual(rebuilt, incremental)
+
+
+class InsightsFromCountersTest(ReviewInsightsTestCase):
+    """Test snapshots and trends are read from counters and upserted in bulk"""
+
+    def setUp(self):
+        super().setUp()
+        self.service = ReviewInsightsService()
+        previous_week = self.week_start - timedelta(days=7)
+        self._analyzed_review('p1', ['service'], posted=previous_week)
+        self._analyzed_review('p2', ['service'], posted=previous_week)
+        self._analyzed_review('c1', ['service', 'food'], sentiment=-0.6, rating=1)
+
+    def test_snapshots_are_upserted_from_counters(self):
+        snapshots = self.service.generate_topic_snapshots(self.account.id, snapshot_date=self.today)
+        by_topic = {snapshot.topic: snapshot for snapshot in snapshots}
+
+        self.assertEqual(set(by_topic), {'service', 'food'})
+        self.assertEqual(by_topic['service'].mention_count, 1)
+        self.assertEqual(by_topic['service'].negative_mentions, 1)
+        self.assertEqual(by_topic['service'].snapshot_date, self.week_start)
+        self.assertAlmostEqual(by_topic['food'].avg_sentiment, -0.6)
+
+        # Regenerating updates the account-wide (null location) rows in place
+        self._analyzed_review('c2', ['food'], sentiment=0.0)
+        self.service.generate_topic_snapshots(self.account.id, snapshot_date=self.today)
+        self.assertEqual(ReviewTopicSnapshot.objects.filter(topic='food').count(), 1)
+        self.assertEqual(ReviewTopicSnapshot.objects.get(topic='food').mention_count, 2)
+
+    def test_snapshot_query_count_does_not_grow_with_reviews(self):
+        for i in range(20):
+            self._analyzed_review(f'extra{i}', [f'topic{i}'])
+
+        with self.assertNumQueries(5):
+            self.service.generate_topic_snapshots(self.account.id, snapshot_date=self.today)
+
+    def test_trends_compare_weekly_counters(self):
+        trends = {trend.topic: trend for trend in self.service.calculate_trends(self.account.id)}
+
+        self.assertEqual(trends['service'].trend_direction, TopicTrend.TrendDirection.DECREASING)
+        self.assertEqual(trends['service'].percent_change, -50.0)
+        self.assertEqual(trends['service'].overall_sentiment, TopicTrend.Sentiment.NEGATIVE)
+        self.assertEqual(trends['food'].trend_direction, TopicTrend.TrendDirection.NEW)
+
+        self._analyzed_review('c2', ['service'])
+        self.service.calculate_trends(self.account.id)
+        trend = TopicTrend.objects.get(topic='service')
+        self.assertEqual(trend.trend_direction, TopicTrend.TrendDirection.STABLE)
+        self.assertEqual(TopicTrend.objects.count(), 2)
@@ -0,0 +1,537 @@
+"""
+Tests for the 7shifts sync service
+
+Covers the bulk shift upsert path used by SevenShiftsSyncService.sync_shifts
+incremental (modified-since) sync with periodic full reconciliation, and the
+per-account Celery orchestration with day-chunked shift prefetch, and the
+compact sync-log audit storage and set-based user provisioning.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from django.utils import timezone
+
+from accounts.models import Account, User
+from brands.models import Brand, Store
+from integrations.models import (
+    SevenShiftsConfig,
+    SevenShiftsEmployee,
+    SevenShiftsLocationMapping,
+    SevenShiftsShift,
+    SevenShiftsSyncLog,
+    SevenShiftsSyncPayload,
+)
+from integrations.seven_shifts_client import SevenShiftsClient
+from integrations.sync_audit import cleanup_expired_payloads, load_payload, store_payload
+from integrations.sync_service import SevenShiftsSyncService
+from integrations.tasks import (
+    SEVEN_SHIFTS_ACCOUNT_LOCK_KEY,
+    SEVEN_SHIFTS_SLOT_LOCK_KEY,
+    sync_seven_shifts_account_data,
+    sync_seven_shifts_shifts,
+)
+
+
+class SevenShiftsSyncTestCase(TestCase):
+    """Shared fixtures for 7shifts sync tests"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            username="owner", email="owner@example.com", password="testpass123",
+            role=User.Role.OWNER
+        )
+        self.brand = Brand.objects.create(name="Test Brand")
+        self.account = Account.objects.create(name="Test Account", brand=self.brand, owner=self.owner)
+        self.store = Store.objects.create(
+            brand=self.brand, account=self.account, name="Downtown", code="DT001",
+            address="1 Main St", city="Town", state="TS", zip_code="12345"
+        )
+        self.other_store = Store.objects.create(
+            brand=self.brand, account=self.account, name="Uptown", code="UT001",
+            address="2 Main St", city="Town", state="TS", zip_code="12345"
+        )
+        self.config = SevenShiftsConfig.objects.create(
+            account=self.account,
+            access_token_encrypted=SevenShiftsClient.encrypt_token("test_token"),
+            company_id="company_1",
+        )
+        self.employee = SevenShiftsEmployee.objects.create(
+            account=self.account, store=self.store, seven_shifts_id="u1",
+            email="alice@example.com", first_name="Alice", last_name="Smith"
+        )
+        self.storeless_employee = SevenShiftsEmployee.objects.create(
+            account=self.account, seven_shifts_id="u2",
+            email="bob@example.com", first_name="Bob", last_name="Jones"
+        )
+        SevenShiftsLocationMapping.objects.create(
+            account=self.account, seven_shifts_location_id="loc_2", store=self.other_store
+        )
+        self.start = (timezone.now() + timedelta(days=1)).replace(microsecond=0)
+
+    def _shift(self, shift_id, user_id, hours=8, offset_hours=0, **extra):
+        start = self.start + timedelta(hours=offset_hours)
+        return {
+            'id': shift_id,
+            'user_id': user_id,
+            'start': start.isoformat(),
+            'end': (start + timedelta(hours=hours)).isoformat(),
+            'role': {'name': 'Server'},
+            **extra,
+        }
+
+
+class BulkShiftSyncTest(SevenShiftsSyncTestCase):
+    """Test the bulk upsert path for shift sync"""
+
+    def test_sync_shifts_reports_inserted_updated_unchanged(self):
+        service = SevenShiftsSyncService(self.config)
+        existing_unchanged = self._shift(100, 'u1')
+        existing_changed = self._shift(101, 'u1', offset_hours=9)
+
+        with patch.object(service.client, 'list_shifts', return_value=[existing_unchanged, existing_changed]):
+            first = service.sync_shifts()
+        self.assertEqual(first['inserted'], 2)
+
+        new_shift = self._shift(102, 'u2', location_id='loc_2')
+        existing_changed['end'] = (self.start + timedelta(hours=20)).isoformat()
+
+        with patch.object(service.client, 'list_shifts',
+                          return_value=[existing_unchanged, existing_changed, new_shift]):
+            second = service.sync_shifts()
+
+        self.assertEqual(second['inserted'], 1)
+        self.assertEqual(second['updated'], 1)
+        self.assertEqual(second['unchanged'], 1)
+        self.assertEqual(second['shifts_synced'], 3)
+        self.assertEqual(SevenShiftsShift.objects.count(), 3)
+
+        changed = SevenShiftsShift.objects.get(seven_shifts_shift_id='101')
+        self.assertEqual(changed.end_time, self.start + timedelta(hours=20))
+        mapped = SevenShiftsShift.objects.get(seven_shifts_shift_id='102')
+        self.assertEqual(mapped.store, self.other_store)
+
+        log = SevenShiftsSyncLog.objects.filter(sync_type=SevenShiftsSyncLog.SyncType.SHIFTS).latest('started_at')
+        self.assertEqual(log.error_details['summary']['updated'], 1)
+
+    def test_bulk_sync_skips_unknown_employees_and_unmapped_locations(self):
+        service = SevenShiftsSyncService(self.config)
+        shifts = [
+            self._shift(200, 'unknown'),
+            self._shift(201, 'u2', location_id='loc_unmapped'),
+            self._shift(202, 'u2'),
+            {'id': 203, 'start': self.start.isoformat(), 'end': self.start.isoformat()},
+        ]
+
+        result = service._bulk_sync_shifts(shifts)
+
+        self.assertEqual(result['skipped'], 4)
+        self.assertEqual(result['inserted'], 0)
+        self.assertFalse(SevenShiftsShift.objects.exists())
+
+    def test_bulk_sync_uses_constant_queries(self):
+        service = SevenShiftsSyncService(self.config)
+        shifts = [self._shift(300 + i, 'u1', offset_hours=i) for i in range(50)]
+
+        # Employees, location mappings, existing shifts, then savepoint/insert/release
+        with self.assertNumQueries(6):
+            result = service._bulk_sync_shifts(shifts)
+
+        self.assertEqual(result['inserted'], 50)
+
+
+class IncrementalSyncTest(SevenShiftsSyncTestCase):
+    """Test high-water marks, change detection and full reconciliation"""
+
+    def _user(self, user_id, first_name='Alice', **extra):
+        return {'id': user_id, 'first_name': first_name, 'last_name': 'Smith',
+                'email': f'{user_id}@example.com', 'active': True, **extra}
+
+    def _sync_employees(self, service, users, **kwargs):
+        with patch.object(service.client, 'list_users', return_value=users) as list_users, \
+                patch.object(service.client, 'list_locations', return_value=[]), \
+                patch.object(service.client, 'get_user_assignments',
+                             return_value={'locations': [], 'roles': []}) as assignments, \
+                patch.object(service, 'map_or_create_users', return_value={}):
+            result = service.sync_employees(**kwargs)
+        return result, list_users, assignments
+
+    def test_shift_sync_uses_high_water_mark_after_full_sync(self):
+        service = SevenShiftsSyncService(self.config)
+
+        with patch.object(service.client, 'list_shifts', return_value=[self._shift(400, 'u1')]) as list_shifts:
+            first = service.sync_shifts()
+        self.assertEqual(first['mode'], 'full')
+        self.assertIsNone(list_shifts.call_args.kwargs['modified_since'])
+
+        self.config.refresh_from_db()
+        self.assertIsNotNone(self.config.last_full_shift_sync_at)
+        mark = self.config.shifts_modified_since
+        self.assertLess(mark, self.config.last_full_shift_sync_at)
+
+        with patch.object(service.client, 'list_shifts', return_value=[]) as list_shifts:
+            second = service.sync_shifts()
+        self.assertEqual(second['mode'], 'incremental')
+        self.assertEqual(list_shifts.call_args.kwargs['modified_since'], mark)
+        # Incremental syncs never delete shifts missing from the response
+        self.assertEqual(SevenShiftsShift.objects.count(), 1)
+
+    def test_full_shift_sync_deletes_shifts_missing_from_window(self):
+        service = SevenShiftsSyncService(self.config)
+        kept = self._shift(500, 'u1')
+        removed = self._shift(501, 'u1', offset_hours=10)
+
+        with patch.object(service.client, 'list_shifts', return_value=[kept, removed]):
+            service.sync_shifts(full=True)
+        with patch.object(service.client, 'list_shifts', return_value=[kept]):
+            result = service.sync_shifts(full=True)
+
+        self.assertEqual(result['deleted'], 1)
+        self.assertEqual(
+            list(SevenShiftsShift.objects.values_list('seven_shifts_shift_id', flat=True)), ['500']
+        )
+
+    def test_full_sync_is_due_after_interval(self):
+        service = SevenShiftsSyncService(self.config)
+        self.config.shifts_modified_since = timezone.now() - timedelta(hours=1)
+        self.config.last_full_shift_sync_at = timezone.now() - timedelta(days=2)
+        self.config.save()
+
+        with self.settings(SEVEN_SHIFTS_FULL_SHIFT_SYNC_DAYS=1), \
+                patch.object(service.client, 'list_shifts', return_value=[]):
+            result = service.sync_shifts()
+
+        self.assertEqual(result['mode'], 'full')
+
+    def test_failed_sync_keeps_high_water_mark(self):
+        mark = timezone.now() - timedelta(hours=3)
+        self.config.shifts_modified_since = mark
+        self.config.last_full_shift_sync_at = timezone.now()
+        self.config.save()
+        service = SevenShiftsSyncService(self.config)
+
+        with patch.object(service.client, 'list_shifts', side_effect=Exception('rate limited')):
+            with self.assertRaises(Exception):
+                service.sync_shifts()
+
+        self.config.refresh_from_db()
+        self.assertEqual(self.config.shifts_modified_since, mark)
+
+    def test_incremental_employee_sync_skips_unchanged_payloads(self):
+        service = SevenShiftsSyncService(self.config)
+        users = [self._user('u1'), self._user('u2', first_name='Bob')]
+
+        first, _, assignments = self._sync_employees(service, users)
+        self.assertEqual(first['mode'], 'full')
+        self.assertEqual(assignments.call_count, 2)
+
+        users[1]['first_name'] = 'Robert'
+        second, list_users, assignments = self._sync_employees(service, users)
+
+        self.assertEqual(second['mode'], 'incremental')
+        self.assertIsNotNone(list_users.call_args.kwargs['modified_since'])
+        self.assertEqual(second['unchanged'], 1)
+        self.assertEqual(second['employees_synced'], 1)
+        # Unchanged payloads still get their assignments checked
+        self.assertEqual(assignments.call_count, 2)
+        self.assertEqual(SevenShiftsEmployee.objects.get(seven_shifts_id='u2').first_name, 'Robert')
+
+    def test_incremental_employee_sync_applies_assignment_changes(self):
+        service = SevenShiftsSyncService(self.config)
+        users = [self._user('u1')]
+        self._sync_employees(service, users)
+
+        with patch.object(service.client, 'list_users', return_value=users), \
+                patch.object(service.client, 'list_locations', return_value=[{'id': 'loc_2', 'name': 'Uptown'}]), \
+                patch.object(service.client, 'get_user_assignments',
+                             return_value={'locations': [{'id': 'loc_2'}], 'roles': [{'name': 'Server'}]}), \
+                patch.object(service, 'map_or_create_users', return_value={}):
+            result = service.sync_employees()
+
+        self.assertEqual(result['mode'], 'incremental')
+        self.assertEqual(result['unchanged'], 0)
+        self.assertEqual(result['employees_synced'], 1)
+        employee = SevenShiftsEmployee.objects.get(seven_shifts_id='u1')
+        self.assertEqual(employee.store, self.other_store)
+        self.assertEqual(employee.roles, ['Server'])
+
+    def test_employee_sync_failures_keep_high_water_mark(self):
+        service = SevenShiftsSyncService(self.config)
+        self._sync_employees(service, [self._user('u1')])
+        self.config.refresh_from_db()
+        mark = self.config.employees_modified_since
+
+        with patch.object(service, '_sync_employee', side_effect=Exception('db error')):
+            result, _, _ = self._sync_employees(service, [self._user('u1', first_name='Alicia')])
+
+        self.assertEqual(result['errors_count'], 1)
+        self.config.refresh_from_db()
+        self.assertEqual(self.config.employees_modified_since, mark)
+
+    def test_role_filtered_employees_do_not_block_high_water_mark(self):
+        self.config.sync_role_names = ['Manager']
+        self.config.save()
+        service = SevenShiftsSyncService(self.config)
+
+        result, _, _ = self._sync_employees(service, [self._user('u1')])
+
+        self.assertEqual(result['errors_count'], 1)
+        self.config.refresh_from_db()
+        self.assertIsNotNone(self.config.employees_modified_since)
+
+    def test_only_full_employee_sync_removes_missing_employees(self):
+        service = SevenShiftsSyncService(self.config)
+        self._sync_employees(service, [self._user('u1'), self._user('u2')])
+
+        incremental, _, _ = self._sync_employees(service, [])
+        self.assertEqual(incremental['removed'], 0)
+        self.assertEqual(SevenShiftsEmployee.objects.count(), 2)
+
+        full, _, assignments = self._sync_employees(service, [self._user('u1')], full=True)
+        # Full syncs bypass change detection
+        assignments.assert_called_once_with('u1')
+        self.assertEqual(full['removed'], 1)
+        self.assertFalse(SevenShiftsEmployee.objects.filter(seven_shifts_id='u2').exists())
+
+
+class SyncOrchestrationTest(SevenShiftsSyncTestCase):
+    """Test per-account dispatch, locking and the global concurrency cap"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_beat_task_dispatches_one_subtask_per_account(self):
+        with patch('integrations.tasks.sync_seven_shifts_account_data.delay') as delay:
+            result = sync_seven_shifts_shifts(days_ahead=7)
+
+        self.assertEqual(result['accounts_dispatched'], 1)
+        delay.assert_called_once_with(self.account.id, 'shifts', 7)
+
+    def test_subtask_skips_account_already_syncing(self):
+        cache.add(SEVEN_SHIFTS_ACCOUNT_LOCK_KEY.format(account_id=self.account.id), True)
+
+        with patch('integrations.tasks._run_account_sync') as run_sync:
+            result = sync_seven_shifts_account_data(self.account.id, 'shifts')
+
+        self.assertTrue(result['skipped'])
+        run_sync.assert_not_called()
+
+    @override_settings(SEVEN_SHIFTS_SYNC_CONCURRENCY=1)
+    def test_subtask_retries_when_all_slots_busy(self):
+        cache.add(SEVEN_SHIFTS_SLOT_LOCK_KEY.format(slot=0), 'other')
+
+        with patch('integrations.tasks._run_account_sync') as run_sync:
+            with self.assertRaises(Retry):
+                sync_seven_shifts_account_data(self.account.id, 'shifts')
+
+        run_sync.assert_not_called()
+        # The account lock is released so the retry can claim it again
+        self.assertIsNone(cache.get(SEVEN_SHIFTS_ACCOUNT_LOCK_KEY.format(account_id=self.account.id)))
+
+    def test_subtask_releases_locks_after_sync(self):
+        with patch('integrations.tasks._run_account_sync', return_value={'shifts_synced': 3}) as run_sync:
+            result = sync_seven_shifts_account_data(self.account.id, 'shifts', 7)
+
+        run_sync.assert_called_once()
+        self.assertEqual(result['result'], {'shifts_synced': 3})
+        self.assertIsNone(cache.get(SEVEN_SHIFTS_ACCOUNT_LOCK_KEY.format(account_id=self.account.id)))
+        self.assertIsNone(cache.get(SEVEN_SHIFTS_SLOT_LOCK_KEY.format(slot=0)))
+
+    @override_settings(SEVEN_SHIFTS_SYNC_CONCURRENCY=1, SEVEN_SHIFTS_SYNC_RETRY_DELAY=20,
+                       SEVEN_SHIFTS_SYNC_RETRY_MAX_DELAY=600)
+    def test_busy_slot_retries_back_off_without_a_cap(self):
+        cache.add(SEVEN_SHIFTS_SLOT_LOCK_KEY.format(slot=0), 'other')
+
+        with patch.object(sync_seven_shifts_account_data, 'retry', side_effect=Retry()) as retry:
+            sync_seven_shifts_account_data.request.retries = 50
+            try:
+                with self.assertRaises(Retry):
+                    sync_seven_shifts_account_data(self.account.id, 'shifts')
+            finally:
+                sync_seven_shifts_account_data.request.retries = 0
+
+        self.assertIsNone(sync_seven_shifts_account_data.max_retries)
+        countdown = retry.call_args.kwargs['countdown']
+        self.assertGreaterEqual(countdown, 600)
+        self.assertLessEqual(countdown, 620)
+
+    def test_expired_slot_retaken_by_another_sync_is_not_released(self):
+        slot_key = SEVEN_SHIFTS_SLOT_LOCK_KEY.format(slot=0)
+
+        def slot_expires_and_is_retaken(*args):
+            cache.set(slot_key, 'other-holder')
+            return {}
+
+        with patch('integrations.tasks._run_account_sync', side_effect=slot_expires_and_is_retaken):
+            sync_seven_shifts_account_data(self.account.id, 'shifts')
+
+        self.assertEqual(cache.get(slot_key), 'other-holder')
+        self.assertIsNone(cache.get(SEVEN_SHIFTS_ACCOUNT_LOCK_KEY.format(account_id=self.account.id)))
+
+
+class ShiftPrefetchTest(SevenShiftsSyncTestCase):
+    """Test day-chunked concurrent shift fetching in SevenShiftsClient"""
+
+    def test_list_shifts_fetches_day_chunks_in_date_order(self):
+        client = SevenShiftsClient("test_token", company_id="company_1")
+        requested_days = []
+
+        def fake_request(method, endpoint, params=None):
+            day = params['start[gte]'][:10]
+            requested_days.append((day, params['start[lte]'][:10]))
+            if 'cursor' not in params:
+                return {'data': [{'id': f'{day}-1'}], 'meta': {'cursor': {'next': 'page2'}}}
+            return {'data': [{'id': f'{day}-2'}], 'meta': {'cursor': {'next': None}}}
+
+        start = timezone.now()
+        with patch.object(client, '_request', side_effect=fake_request):
+            shifts = client.list_shifts(start, start + timedelta(days=2), max_workers=3)
+
+        days = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(3)]
+        self.assertEqual([shift['id'] for shift in shifts],
+                         [f'{day}-{page}' for day in days for page in (1, 2)])
+        # Two pages per single-day chunk
+        self.assertEqual(sorted(requested_days), sorted([(day, day) for day in days] * 2))
+
+
+@override_settings(SEVEN_SHIFTS_SYNC_LOG_SAMPLE_SIZE=3)
+class SyncAuditStorageTest(SevenShiftsSyncTestCase):
+    """Test inline samples and compressed payload blobs for sync logs"""
+
+    def _sync_shift_log(self, count=5):
+        service = SevenShiftsSyncService(self.config)
+        shifts = [self._shift(600 + i, 'u1', offset_hours=i) for i in range(count)]
+        with patch.object(service.client, 'list_shifts', return_value=shifts):
+            service.sync_shifts()
+        return SevenShiftsSyncLog.objects.filter(sync_type=SevenShiftsSyncLog.SyncType.SHIFTS).latest('started_at')
+
+    def test_sync_log_keeps_counts_and_samples_inline(self):
+        log = self._sync_shift_log(count=5)
+
+        details = log.error_details
+        self.assertEqual(details['synced_shifts_count'], 5)
+        self.assertEqual(len(details['synced_shifts']), 3)
+        self.assertNotIn('data', details['synced_shifts'][0])
+        self.assertEqual(details['failed_shifts_count'], 0)
+        self.assertNotIn('failed_shifts', details['payload_refs'])
+
+        full = load_payload(details['payload_refs']['synced_shifts'])
+        self.assertEqual(len(full), 5)
+        self.assertEqual(full[0]['data']['id'], 600)
+
+    def test_identical_payloads_are_stored_once(self):
+        first = store_payload([{'id': 1}])
+        second = store_payload([{'id': 1}])
+
+        self.assertEqual(first, second)
+        self.assertEqual(SevenShiftsSyncPayload.objects.count(), 1)
+        blob = SevenShiftsSyncPayload.objects.get()
+        self.assertLessEqual(blob.compressed_size_bytes, blob.size_bytes + 16)
+
+    def test_payload_endpoint_returns_full_payload_then_gone_after_expiry(self):
+        self.owner.account = self.account
+        self.owner.save()
+        api = APIClient()
+        api.force_authenticate(user=self.owner)
+        log = self._sync_shift_log(count=4)
+        url = f'/api/integrations/7shifts/sync-logs/{log.id}/payload/synced_shifts/'
+
+        response = api.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 4)
+
+        self.assertEqual(api.get(f'/api/integrations/7shifts/sync-logs/{log.id}/payload/failed_shifts/').status_code, 404)
+
+        SevenShiftsSyncPayload.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(api.get(url).status_code, 410)
+        self.assertEqual(cleanup_expired_payloads(), 1)
+        self.assertFalse(SevenShiftsSyncPayload.objects.exists())
+
+
+class UserProvisioningTest(SevenShiftsSyncTestCase):
+    """Test set-based mapping/creation of users for 7shifts employees"""
+
+    def _employee(self, seven_shifts_id, email='', phone='', **extra):
+        return SevenShiftsEmployee.objects.create(
+            account=self.account, seven_shifts_id=seven_shifts_id, email=email, phone=phone,
+            first_name='Emp', last_name=seven_shifts_id, **extra
+        )
+
+    def test_maps_existing_users_and_creates_missing_ones(self):
+        existing = User.objects.create_user(
+            username='alice', email='alice@example.com', password='x', account=self.account
+        )
+        by_phone = User.objects.create_user(
+            username='carol', email='carol@example.com', password='x', account=self.account, phone='5550001'
+        )
+        User.objects.create_user(username='taken@example.com', email='taken@example.com', password='x')
+        phone_employee = self._employee('u3', phone='5550001')
+        temp_employee = self._employee('u4', roles=['Manager'])
+        taken_employee = self._employee('u5', email='taken@example.com')
+
+        result = SevenShiftsSyncService(self.config).map_or_create_users()
+
+        self.assertEqual(result['total_unmapped'], 5)
+        self.assertEqual(result['mapped'], 2)
+        self.assertEqual(result['created'], 2)
+        self.assertEqual(result['temp_email_count'], 1)
+        self.assertEqual(result['skipped'], 1)
+        self.assertEqual(result['skipped_details'][0]['employee_id'], str(taken_employee.id))
+
+        self.employee.refresh_from_db()
+        phone_employee.refresh_from_db()
+        temp_employee.refresh_from_db()
+        self.storeless_employee.refresh_from_db()
+        self.assertEqual(self.employee.user, existing)
+        self.assertEqual(phone_employee.user, by_phone)
+
+        created = self.storeless_employee.user
+        self.assertEqual(created.username, 'bob@example.com')
+        self.assertEqual(created.account, self.account)
+        self.assertFalse(created.has_usable_password())
+        self.assertEqual(temp_employee.user.username, '7shifts_u4')
+        self.assertEqual(temp_employee.user.role, User.Role.GM)
+
+    def test_does_not_relink_user_already_mapped_to_another_employee(self):
+        user = User.objects.create_user(
+            username='alice', email='alice@example.com', password='x', account=self.account
+        )
+        self._employee('u9', email='other@example.com', user=user)
+
+        result = SevenShiftsSyncService(self.config).map_or_create_users()
+
+        self.employee.refresh_from_db()
+        self.assertIsNone(self.employee.user)
+        self.assertIn('already linked', result['skipped_details'][0]['reason'])
+
+    def test_assigns_most_common_shift_store_to_storeless_employees(self):
+        for i, store in enumerate([self.other_store, self.other_store, self.store]):
+            SevenShiftsShift.objects.create(
+                employee=self.storeless_employee, account=self.account, store=store,
+                seven_shifts_shift_id=f'70{i}', start_time=self.start,
+                end_time=self.start + timedelta(hours=4)
+            )
+
+        SevenShiftsSyncService(self.config).map_or_create_users()
+
+        self.storeless_employee.refresh_from_db()
+        self.assertEqual(self.storeless_employee.store, self.other_store)
+        self.assertEqual(self.storeless_employee.user.store, self.other_store)
+
+    def test_query_count_does_not_grow_with_employees(self):
+        def provisioning_queries(count, prefix):
+            for i in range(count):
+                self._employee(f'{prefix}{i}', email=f'{prefix}{i}@example.com', store=self.store)
+            with CaptureQueriesContext(connection) as queries:
+                SevenShiftsSyncService(self.config).map_or_create_users()
+            return len(queries)
+
+        self.assertEqual(provisioning_queries(2, 'a'), provisioning_queries(25, 'b'))
@@ -0,0 +1,161 @@
+"""
+Tests for the shift interval index and the ShiftChecker lookups it serves
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from integrations.models import SevenShiftsShift
+from integrations.shift_checker import ShiftChecker
+from integrations.shift_index import (
+    SHIFT_INDEX_CACHE_KEY,
+    SHIFT_INDEX_VERSION_KEY,
+    SHIFT_ID,
+    ShiftIntervalIndex,
+    build_shift_index,
+    get_shift_index,
+)
+from integrations.sync_service import SevenShiftsSyncService
+from integrations.test_seven_shifts_sync import SevenShiftsSyncTestCase
+
+
+class ShiftIntervalIndexTest(SevenShiftsSyncTestCase):
+    """Test point-in-time and window queries against the index"""
+
+    def _entry(self, shift_id, start_hours, end_hours, store='s1', employee='e1'):
+        base = self.start.timestamp()
+        return (base + start_hours * 3600, base + end_hours * 3600, shift_id, employee,
+                f'{employee}@example.com', 'Name', 'Server', store)
+
+    def test_point_query_finds_long_shift_that_started_early(self):
+        index = ShiftIntervalIndex(1, 0, [
+            self._entry('long', 0, 12),
+            self._entry('short', 5, 6),
+            self._entry('later', 13, 20),
+            self._entry('other_store', 0, 12, store='s2'),
+        ])
+
+        at = self.start + timedelta(hours=10)
+        self.assertEqual([i[SHIFT_ID] for i in index.shifts_at_store('s1', at)], ['long'])
+        self.assertEqual(index.shifts_at_store('s3', at), [])
+
+    def test_window_query_returns_overlapping_shifts_in_start_order(self):
+        index = ShiftIntervalIndex(1, 0, [
+            self._entry('c', 13, 20),
+            self._entry('a', 0, 12),
+            self._entry('b', 5, 6, employee='e2'),
+            self._entry('d', 21, 22),
+        ])
+
+        window = index.shifts_at_store('s1', self.start + timedelta(hours=11),
+                                       self.start + timedelta(hours=14))
+        self.assertEqual([i[SHIFT_ID] for i in window], ['a', 'c'])
+        self.assertEqual(
+            [i[SHIFT_ID] for i in index.shifts_for_employee('e2', self.start + timedelta(hours=5, minutes=30))],
+            ['b']
+        )
+
+    def test_index_round_trips_through_cache_format(self):
+        index = ShiftIntervalIndex(1, 100.0, [self._entry('a', 0, 8)])
+        restored = ShiftIntervalIndex.from_cache(index.to_cache())
+
+        self.assertEqual(restored.coverage_start, 100.0)
+        self.assertEqual(
+            restored.shifts_at_store('s1', self.start + timedelta(hours=1)),
+            index.shifts_at_store('s1', self.start + timedelta(hours=1)),
+        )
+
+
+class ShiftCheckerIndexTest(SevenShiftsSyncTestCase):
+    """Test ShiftChecker answers from the cached index with a DB fallback"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.shift = SevenShiftsShift.objects.create(
+            employee=self.employee, account=self.account, store=self.store,
+            seven_shifts_shift_id='900', start_time=self.start,
+            end_time=self.start + timedelta(hours=8), role='Server'
+        )
+        self.off_shift = self.start + timedelta(hours=12)
+        self.on_shift = self.start + timedelta(hours=2)
+
+    def test_on_shift_emails_served_from_cached_index(self):
+        build_shift_index(self.account.id)
+
+        with self.assertNumQueries(0):
+            on_shift = ShiftChecker.get_on_shift_emails(self.store, self.on_shift)
+            off_shift = ShiftChecker.get_on_shift_emails(self.store, self.off_shift)
+
+        self.assertEqual(on_shift, {'alice@example.com'})
+        self.assertEqual(off_shift, set())
+
+    def test_employee_lookups_only_query_for_matching_shift(self):
+        build_shift_index(self.account.id)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(ShiftChecker.is_employee_on_shift(self.employee, self.on_shift))
+            self.assertIsNone(ShiftChecker.get_current_shift(self.employee, self.off_shift))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(ShiftChecker.get_current_shift(self.employee, self.on_shift), self.shift)
+
+        on_shift = ShiftChecker.get_employees_on_shift_at_store(self.store, self.on_shift)
+        self.assertEqual([entry['shift'] for entry in on_shift], [self.shift])
+
+    def test_falls_back_to_database_without_index(self):
+        with patch('integrations.shift_checker.get_shift_index', return_value=None):
+            self.assertEqual(ShiftChecker.get_on_shift_emails(self.store, self.on_shift), {'alice@example.com'})
+            self.assertTrue(ShiftChecker.is_employee_on_shift(self.employee, self.on_shift))
+            self.assertEqual(
+                [entry['email'] for entry in ShiftChecker.get_employees_on_shift_at_store(self.store, self.on_shift)],
+                ['alice@example.com']
+            )
+
+    def test_queries_before_coverage_use_database(self):
+        build_shift_index(self.account.id)
+        past = timezone.now() - timedelta(days=3)
+        SevenShiftsShift.objects.create(
+            employee=self.employee, account=self.account, store=self.store,
+            seven_shifts_shift_id='901', start_time=past, end_time=past + timedelta(hours=8)
+        )
+
+        self.assertEqual(
+            ShiftChecker.get_on_shift_emails(self.store, past + timedelta(hours=1)), {'alice@example.com'}
+        )
+
+    def test_built_index_is_reused_until_version_changes(self):
+        built = build_shift_index(self.account.id)
+
+        with patch.object(ShiftIntervalIndex, 'from_cache') as from_cache:
+            self.assertIs(get_shift_index(self.account.id), built)
+            self.assertIs(get_shift_index(self.account.id), built)
+        from_cache.assert_not_called()
+
+        # Another process rebuilt the index
+        rebuilt = ShiftIntervalIndex(self.account.id, 0, [], version='other-build')
+        cache.set(SHIFT_INDEX_CACHE_KEY.format(account_id=self.account.id), rebuilt.to_cache())
+        cache.set(SHIFT_INDEX_VERSION_KEY.format(account_id=self.account.id), rebuilt.version)
+
+        current = get_shift_index(self.account.id)
+        self.assertEqual(current.version, 'other-build')
+        self.assertIs(get_shift_index(self.account.id), current)
+        self.assertEqual(current.shifts_at_store(self.store.id, self.on_shift), [])
+
+    def test_shift_sync_rebuilds_index(self):
+        cache.set(SHIFT_INDEX_CACHE_KEY.format(account_id=self.account.id),
+                  ShiftIntervalIndex(self.account.id, 0, []).to_cache())
+        service = SevenShiftsSyncService(self.config)
+
+        with patch.object(service.client, 'list_shifts', return_value=[self._shift(902, 'u1')]):
+            service.sync_shifts()
+
+        self.assertEqual(ShiftChecker.get_on_shift_emails(self.store, self.on_shift), {'alice@example.com'})
+        # The full sync also removed shift 900, which 7shifts no longer returns
+        synced = SevenShiftsShift.objects.get(seven_shifts_shift_id='902')
+        entries = cache.get(SHIFT_INDEX_CACHE_KEY.format(account_id=self.account.id))['entries']
+        self.assertEqual([entry[SHIFT_ID] for entry in entries], [str(synced.id)])
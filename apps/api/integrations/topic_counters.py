@@ -0,0 +1,147 @@
+"""
+Review topic counters
+
+Running per-(location, topic, window, period) mention counters behind the
+review insights snapshots and trends (see ReviewInsightsService). Each time a
+review's AI analysis is saved its topics are added to the daily, weekly and
+monthly counters for the day the review was posted, with F() increments so
+concurrent analysis workers never lose an update. Re-analysis first takes
+the previous analysis back out.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import GoogleReviewAnalysis, ReviewTopicCounter
+
+logger = logging.getLogger(__name__)
+
+WINDOW_TYPES = ('daily', 'weekly', 'monthly')
+
+TOPIC_MAX_LENGTH = ReviewTopicCounter._meta.get_field('topic').max_length
+
+
+def window_range(window_type: str, day: date) -> Tuple[date, date]:
+    """First day of the window containing ``day`` and the first day after it"""
+    if window_type == 'daily':
+        return day, day + timedelta(days=1)
+    if window_type == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+    # monthly
+    start = day.replace(day=1)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+def _clean_topics(topics: Optional[Iterable]) -> list:
+    return sorted({str(topic)[:TOPIC_MAX_LENGTH] for topic in topics or [] if topic})
+
+
+def _bump(review, topics: list, sentiment: Optional[float], sign: int):
+    """Add (sign=1) or remove (sign=-1) one review's mentions in every window"""
+    day = timezone.localdate(review.review_created_at)
+    periods = {window_type: window_range(window_type, day)[0] for window_type in WINDOW_TYPES}
+
+    if sign > 0:
+        ReviewTopicCounter.objects.bulk_create(
+            [
+                ReviewTopicCounter(
+                    account_id=review.account_id,
+                    location_id=review.location_id,
+                    topic=topic,
+                    window_type=window_type,
+                    period_start=period_start,
+                )
+                for window_type, period_start in periods.items()
+                for topic in topics
+            ],
+            ignore_conflicts=True,
+        )
+
+    in_periods = Q()
+    for window_type, period_start in periods.items():
+        in_periods |= Q(window_type=window_type, period_start=period_start)
+
+    is_positive = review.rating >= 4
+    ReviewTopicCounter.objects.filter(
+        in_periods, location_id=review.location_id, topic__in=topics
+    ).update(
+        mention_count=F('mention_count') + sign,
+        positive_mentions=F('positive_mentions') + (sign if is_positive else 0),
+        negative_mentions=F('negative_mentions') + (0 if is_positive else sign),
+        sentiment_sum=F('sentiment_sum') + sign * (sentiment or 0),
+        updated_at=timezone.now(),
+    )
+
+
+def apply_analysis_to_counters(review, previous: Optional[Tuple] = None, current: Optional[Tuple] = None):
+    """
+    Move a review's contribution from its previous analysis to its current one.
+
+    Args:
+        review: GoogleReview the analysis belongs to
+        previous: (topics, sentiment_score) of the analysis being replaced, if any
+        current: (topics, sentiment_score) of the analysis just saved, if any
+    """
+    with transaction.atomic():
+        if previous is not None:
+            topics = _clean_topics(previous[0])
+            if topics:
+                _bump(review, topics, previous[1], -1)
+        if current is not None:
+            topics = _clean_topics(current[0])
+            if topics:
+                _bump(review, topics, current[1], 1)
+
+
+def rebuild_topic_counters(account_id: int) -> int:
+    """
+    Recompute an account's counters from its stored analyses (backfill/repair).
+
+    Returns:
+        Number of counter rows written
+    """
+    totals = defaultdict(lambda: [0, 0, 0, 0.0])
+
+    analyses = GoogleReviewAnalysis.objects.filter(review__account_id=account_id).values_list(
+        'review__location_id', 'review__rating', 'review__review_created_at', 'topics', 'sentiment_score'
+    )
+    for location_id, rating, created_at, topics, sentiment in analyses.iterator():
+        day = timezone.localdate(created_at)
+        for window_type in WINDOW_TYPES:
+            period_start = window_range(window_type, day)[0]
+            for topic in _clean_topics(topics):
+                counter = totals[(location_id, topic, window_type, period_start)]
+                counter[0] += 1
+                counter[1 if rating >= 4 else 2] += 1
+                counter[3] += sentiment or 0
+
+    with transaction.atomic():
+        ReviewTopicCounter.objects.filter(account_id=account_id).delete()
+        ReviewTopicCounter.objects.bulk_create(
+            [
+                ReviewTopicCounter(
+                    account_id=account_id,
+                    location_id=location_id,
+                    topic=topic,
+                    window_type=window_type,
+                    period_start=period_start,
+                    mention_count=mentions,
+                    positive_mentions=positive,
+                    negative_mentions=negative,
+                    sentiment_sum=sentiment_sum,
+                )
+                for (location_id, topic, window_type, period_start), (mentions, positive, negative, sentiment_sum)
+                in totals.items()
+            ],
+            batch_size=500,
+        )
+
+    logger.info(f"Rebuilt {len(totals)} topic counters for account {account_id}")
+    return len(totals)
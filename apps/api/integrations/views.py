@@ -23,6 +23,7 @@ from .serializers import (
 )
 from .seven_shifts_client import SevenShiftsClient
 from .sync_service import SevenShiftsSyncService
+from .sync_audit import load_payload
 
 
 logger = logging.getLogger(__name__)
@@ -167,10 +168,10 @@ class SevenShiftsIntegrationViewSet(ScopedQuerysetMixin, viewsets.GenericViewSet
             defaults=defaults
         )
 
-        # Trigger initial sync
+        # Trigger initial sync (full, since credentials or role filters may have changed)
         try:
             sync_service = SevenShiftsSyncService(config)
-            sync_service.sync_all()
+            sync_service.sync_all(full=True)
         except Exception as e:
             logger.error(f"Initial sync failed: {str(e)}")
             # Don't fail the configuration if sync fails
@@ -257,12 +258,13 @@ class SevenShiftsIntegrationViewSet(ScopedQuerysetMixin, viewsets.GenericViewSet
         sync_service = SevenShiftsSyncService(config)
 
         try:
+            # Manual syncs always reconcile fully; scheduled syncs are incremental
             if sync_type == 'employees':
-                result = sync_service.sync_employees()
+                result = sync_service.sync_employees(full=True)
             elif sync_type == 'shifts':
-                result = sync_service.sync_shifts()
+                result = sync_service.sync_shifts(full=True)
             else:  # full
-                result = sync_service.sync_all()
+                result = sync_service.sync_all(full=True)
 
             return Response({
                 'success': True,
@@ -401,6 +403,39 @@ class SevenShiftsIntegrationViewSet(ScopedQuerysetMixin, viewsets.GenericViewSet
         serializer = SevenShiftsSyncLogSerializer(logs, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'],
+            url_path='sync-logs/(?P<log_id>[0-9a-f-]{36})/payload/(?P<payload_key>[a-z_]+)')
+    def sync_log_payload(self, request, log_id=None, payload_key=None):
+        """
+        GET /api/integrations/7shifts/sync-logs/{log_id}/payload/{payload_key}
+
+        Get the full raw payload (e.g. synced_shifts) behind a sync log's
+        inline sample. Returns 410 once the payload has expired.
+        """
+        if not request.user.account:
+            return Response(
+                {'error': 'User not associated with an account'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        sync_log = get_object_or_404(SevenShiftsSyncLog, id=log_id, account=request.user.account)
+
+        digest = (sync_log.error_details or {}).get('payload_refs', {}).get(payload_key)
+        if not digest:
+            return Response(
+                {'error': f'No {payload_key} payload recorded for this sync log'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        payload = load_payload(digest)
+        if payload is None:
+            return Response(
+                {'error': 'Payload has expired'},
+                status=status.HTTP_410_GONE
+            )
+
+        return Response({'key': payload_key, 'count': len(payload), 'items': payload})
+
     @action(detail=False, methods=['get'], url_path='locations')
     def list_locations(self, request):
         """
@@ -5,9 +5,10 @@ Provides engagement metrics and insights across all stores
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import BasePermission
-from django.db.models import Count, Q, Avg, F, Max, Min, Sum
-from django.db.models.functions import TruncHour, TruncDate
+from django.db.models import Count, Q, Avg, F, Max, Min, Sum, Case, When, Value, FloatField, CharField
+from django.db.models.functions import TruncDate, Cast
 from django.utils import timezone
 from datetime import timedelta, datetime
 
@@ -19,13 +20,74 @@ from .models import (
     MicroCheckStreak,
     CorrectiveAction,
     MicroCheckAssignment,
-    MediaAsset
+    MediaAsset,
+    StoreDailyRollup,
+    CategoryDailyRollup,
+    HourlyActivityRollup
 )
+from .streaks import effective_current_streak_expression, get_store_streak
 from brands.models import Store, Brand
 from accounts.models import User
 from insights.models import ReviewAnalysis
 
 
+STORE_GRID_STATUSES = ('active', 'sporadic', 'inactive')
+
+STORE_GRID_ORDERING = (
+    'name', 'current_streak', 'last_completion_date', 'completion_rate_7d', 'total_runs_7d'
+)
+
+
+class StoreGridPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+def _store_engagement_queryset(now=None):
+    """
+    Active-brand stores annotated with their engagement grid columns.
+
+    - current_streak: StoreStreak streak, 0 once broken (see streaks.py)
+    - total_runs_7d / completed_runs_7d / completion_rate_7d: runs created in
+      the last 7 days
+    - engagement_status: active (7+ day streak), sporadic (3+ day streak or
+      50%+ completion) or inactive
+    """
+    now = now or timezone.now()
+    week_start = now - timedelta(days=7)
+
+    stores = Store.objects.filter(brand__is_active=True)
+    timezones = stores.order_by().values_list('timezone', flat=True).distinct()
+
+    recent_runs = Q(micro_check_runs__created_at__gte=week_start)
+    return stores.annotate(
+        brand_name=F('brand__name'),
+        last_completion_date=F('streak__last_completion_date'),
+        current_streak=effective_current_streak_expression(timezones, now=now),
+        total_runs_7d=Count('micro_check_runs', filter=recent_runs),
+        completed_runs_7d=Count(
+            'micro_check_runs', filter=recent_runs & Q(micro_check_runs__status='COMPLETED')
+        ),
+    ).annotate(
+        completion_rate_7d=Case(
+            When(
+                total_runs_7d__gt=0,
+                then=Cast('completed_runs_7d', FloatField()) * 100 / F('total_runs_7d'),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    ).annotate(
+        engagement_status=Case(
+            When(current_streak__gte=7, then=Value('active')),
+            When(Q(current_streak__gte=3) | Q(completion_rate_7d__gte=50), then=Value('sporadic')),
+            default=Value('inactive'),
+            output_field=CharField(),
+        ),
+    )
+
+
 class IsSuperAdmin(BasePermission):
     """
     Permission class that only allows SUPER_ADMIN users.
@@ -49,6 +111,9 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
     - Per-store performance and trends
     - Template usage and effectiveness
     - Engagement funnel analysis
+
+    Overview, template and time-of-day metrics are read from the analytics
+    rollups (see rollups.py), which trail live data by up to 15 minutes.
     """
     permission_classes = [IsSuperAdmin]
 
@@ -66,68 +131,60 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
         - Photo/proof rate
         """
         now = timezone.now()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_start = today_start - timedelta(days=7)
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        week_start = today - timedelta(days=7)
 
         # Total stores count
         total_stores = Store.objects.filter(brand__is_active=True).count()
 
-        # Active stores today (at least 1 completed run)
-        stores_active_today = MicroCheckRun.objects.filter(
-            completed_at__gte=today_start,
-            status='COMPLETED'
-        ).values('store').distinct().count()
+        # Active stores today / this week (at least 1 completed run)
+        completed_days = StoreDailyRollup.objects.filter(runs_completed__gt=0)
+        stores_active_today = completed_days.filter(day=today).count()
+        stores_active_week = completed_days.filter(day__gte=week_start).values('store').distinct().count()
 
         active_stores_pct_today = (stores_active_today / total_stores * 100) if total_stores > 0 else 0
-
-        # Active stores this week
-        stores_active_week = MicroCheckRun.objects.filter(
-            completed_at__gte=week_start,
-            status='COMPLETED'
-        ).values('store').distinct().count()
-
         active_stores_pct_week = (stores_active_week / total_stores * 100) if total_stores > 0 else 0
 
-        # Daily Active Managers (unique users completing checks today)
-        dau = MicroCheckResponse.objects.filter(
-            completed_at__gte=today_start
-        ).values('completed_by').distinct().count()
-
-        # DAU yesterday for comparison
-        yesterday_start = today_start - timedelta(days=1)
-        dau_yesterday = MicroCheckResponse.objects.filter(
-            completed_at__gte=yesterday_start,
-            completed_at__lt=today_start
-        ).values('completed_by').distinct().count()
+        # Daily Active Managers (unique users completing checks today vs yesterday)
+        responders = HourlyActivityRollup.objects.filter(user__isnull=False)
+        dau = responders.filter(day=today).values('user').distinct().count()
+        dau_yesterday = responders.filter(day=yesterday).values('user').distinct().count()
 
         dau_change = dau - dau_yesterday
 
-        # Average streak across all stores
-        avg_streak = StoreStreak.objects.aggregate(
-            avg_current=Avg('current_streak'),
-            avg_longest=Avg('longest_streak')
+        # Average streak across all stores (current streaks broken since
+        # their last completion count as 0)
+        streak_stores = Store.objects.filter(streak__isnull=False)
+        streak_timezones = streak_stores.order_by().values_list('timezone', flat=True).distinct()
+        avg_streak = streak_stores.aggregate(
+            avg_current=Avg(effective_current_streak_expression(streak_timezones, now=now)),
+            avg_longest=Avg('streak__longest_streak'),
         )
 
         # Completion rate (completed runs / total runs in last 7 days)
-        runs_week = MicroCheckRun.objects.filter(created_at__gte=week_start)
-        total_runs = runs_week.count()
-        completed_runs = runs_week.filter(status='COMPLETED').count()
+        run_totals = StoreDailyRollup.objects.filter(day__gte=week_start).aggregate(
+            total=Sum('runs_created'),
+            completed=Sum('runs_created_completed'),
+        )
+        total_runs = run_totals['total'] or 0
+        completed_runs = run_totals['completed'] or 0
         completion_rate = (completed_runs / total_runs * 100) if total_runs > 0 else 0
 
+        week_categories = CategoryDailyRollup.objects.filter(day__gte=week_start)
+
         # Top failing categories (last 7 days)
-        category_stats = MicroCheckResponse.objects.filter(
-            completed_at__gte=week_start
-        ).values('category').annotate(
-            total=Count('id'),
-            failed=Count('id', filter=Q(status='FAIL'))
+        category_stats = week_categories.values('category').annotate(
+            total=Sum('responses'),
+            failed=Sum('failed')
         ).annotate(
             fail_rate=F('failed') * 100.0 / F('total')
         ).order_by('-fail_rate')[:5]
 
         # Photo/proof rate (% of responses with media)
-        responses_week = MicroCheckResponse.objects.filter(completed_at__gte=week_start)
-        total_responses = responses_week.count()
-        responses_with_media = responses_week.filter(media__isnull=False).count()
+        response_totals = week_categories.aggregate(total=Sum('responses'), with_media=Sum('with_media'))
+        total_responses = response_totals['total'] or 0
+        responses_with_media = response_totals['with_media'] or 0
         photo_rate = (responses_with_media / total_responses * 100) if total_responses > 0 else 0
 
         # Engagement funnel
@@ -144,9 +201,9 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
         ).values('sent_to').distinct().count()
 
         # Stage 3: Completed 1st check
-        completed_first = MicroCheckResponse.objects.filter(
-            completed_at__gte=thirty_days_ago
-        ).values('completed_by').distinct().count()
+        completed_first = responders.filter(
+            day__gte=thirty_days_ago.date()
+        ).values('user').distinct().count()
 
         # Stage 4: 3-day streak (users with streak >= 3)
         three_day_streak = MicroCheckStreak.objects.filter(
@@ -213,55 +270,58 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
         - Last activity date
         - Completion rate (7 days)
         - Status (active/sporadic/inactive)
+
+        Query params:
+        - status: Only stores with this status (active/sporadic/inactive)
+        - ordering: One of STORE_GRID_ORDERING, optionally prefixed with '-'
+          (default: -current_streak)
+        - page, page_size: Paginate the grid ({count, next, previous, results});
+          without them the full list is returned
+
+        Streaks, completion rates and status are computed in the database in
+        one query regardless of the number of stores.
         """
-        week_start = timezone.now() - timedelta(days=7)
-
-        stores = Store.objects.filter(brand__is_active=True).select_related('brand')
-
-        store_data = []
-        for store in stores:
-            # Get store streak
-            try:
-                streak = StoreStreak.objects.get(store=store)
-                current_streak = streak.current_streak
-                last_completion = streak.last_completion_date
-            except StoreStreak.DoesNotExist:
-                current_streak = 0
-                last_completion = None
-
-            # Get 7-day completion stats
-            runs_week = MicroCheckRun.objects.filter(
-                store=store,
-                created_at__gte=week_start
+        status_filter = request.query_params.get('status')
+        if status_filter and status_filter not in STORE_GRID_STATUSES:
+            return Response(
+                {'error': f"status must be one of: {', '.join(STORE_GRID_STATUSES)}"},
+                status=400
+            )
+
+        ordering = request.query_params.get('ordering', '-current_streak')
+        if ordering.lstrip('-') not in STORE_GRID_ORDERING:
+            return Response(
+                {'error': f"ordering must be one of: {', '.join(STORE_GRID_ORDERING)}"},
+                status=400
             )
-            total_runs = runs_week.count()
-            completed_runs = runs_week.filter(status='COMPLETED').count()
-            completion_rate = (completed_runs / total_runs * 100) if total_runs > 0 else 0
-
-            # Determine status
-            if current_streak >= 7:
-                engagement_status = 'active'  # 🟢
-            elif current_streak >= 3 or completion_rate >= 50:
-                engagement_status = 'sporadic'  # 🟡
-            else:
-                engagement_status = 'inactive'  # 🔴
-
-            store_data.append({
+
+        stores = _store_engagement_queryset().order_by(ordering, 'name', 'id')
+        if status_filter:
+            stores = stores.filter(engagement_status=status_filter)
+
+        paginate = 'page' in request.query_params or 'page_size' in request.query_params
+        if paginate:
+            paginator = StoreGridPagination()
+            stores = paginator.paginate_queryset(stores, request, view=self)
+
+        store_data = [
+            {
                 'id': store.id,
                 'name': store.name,
                 'region': store.region,
-                'brand_name': store.brand.name,
-                'current_streak': current_streak,
-                'last_completion_date': last_completion,
-                'completion_rate_7d': round(completion_rate, 1),
-                'status': engagement_status,
-                'total_runs_7d': total_runs,
-                'completed_runs_7d': completed_runs
-            })
-
-        # Sort by streak descending
-        store_data.sort(key=lambda x: x['current_streak'], reverse=True)
+                'brand_name': store.brand_name,
+                'current_streak': store.current_streak,
+                'last_completion_date': store.last_completion_date,
+                'completion_rate_7d': round(store.completion_rate_7d, 1),
+                'status': store.engagement_status,
+                'total_runs_7d': store.total_runs_7d,
+                'completed_runs_7d': store.completed_runs_7d
+            }
+            for store in stores
+        ]
 
+        if paginate:
+            return paginator.get_paginated_response(store_data)
         return Response(store_data)
 
     @action(detail=False, methods=['get'])
@@ -350,13 +410,9 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
         ).order_by('-fail_count')[:10]
 
         # Store stats
-        try:
-            streak = StoreStreak.objects.get(store=store)
-            current_streak = streak.current_streak
-            total_completions = streak.total_completions
-        except StoreStreak.DoesNotExist:
-            current_streak = 0
-            total_completions = 0
+        streak = get_store_streak(store)
+        current_streak = streak['current_streak']
+        total_completions = streak['total_completions']
 
         # Photo rate (all time)
         all_responses = MicroCheckResponse.objects.filter(store=store)
@@ -410,28 +466,25 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
         - Template performance data for scatter plot
         - Category distribution
         """
-        week_start = timezone.now() - timedelta(days=7)
+        week_start = timezone.localdate() - timedelta(days=7)
+        week_categories = CategoryDailyRollup.objects.filter(day__gte=week_start)
 
         # Template usage stats (last 7 days)
-        template_stats = MicroCheckResponse.objects.filter(
-            completed_at__gte=week_start
-        ).values(
+        template_stats = week_categories.values(
             'template__id',
             'template__title',
             'template__category'
         ).annotate(
-            usage_count=Count('id'),
-            fail_count=Count('id', filter=Q(status='FAIL')),
-            last_used=Max('completed_at')
+            usage_count=Sum('responses'),
+            fail_count=Sum('failed'),
+            last_used=Max('last_completed_at')
         ).annotate(
             fail_rate=F('fail_count') * 100.0 / F('usage_count')
         ).order_by('-usage_count')
 
         # Category distribution
-        category_distribution = MicroCheckResponse.objects.filter(
-            completed_at__gte=week_start
-        ).values('category').annotate(
-            count=Count('id')
+        category_distribution = week_categories.values('category').annotate(
+            count=Sum('responses')
         ).order_by('-count')
 
         return Response({
@@ -462,24 +515,19 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
         """
         Get time-of-day activity patterns.
 
-        Returns hourly completion counts for the last 7 days.
-        """
-        week_start = timezone.now() - timedelta(days=7)
+        Returns hourly completion counts for the last 7 days, bucketed by
+        each store's local hour.
 
-        # Group by hour of day
-        hourly_data = MicroCheckResponse.objects.filter(
-            completed_at__gte=week_start
-        ).annotate(
-            hour=TruncHour('completed_at')
-        ).values('hour').annotate(
-            count=Count('id')
+        Query params:
+        - brand_id: Only stores of this brand (optional)
+        """
+        hourly_data = self._activity_rollups(request).values('hour').annotate(
+            count=Sum('responses')
         ).order_by('hour')
 
-        # Aggregate by hour (0-23)
         hourly_counts = [0] * 24
         for item in hourly_data:
-            hour = item['hour'].hour
-            hourly_counts[hour] += item['count']
+            hourly_counts[item['hour']] = item['count']
 
         # Format for chart
         hourly_chart_data = [
@@ -503,6 +551,36 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
             }
         })
 
+    @action(detail=False, methods=['get'])
+    def activity_heatmap(self, request):
+        """
+        Get a day-of-week x hour-of-day activity heatmap (store local time).
+
+        Query params:
+        - brand_id: Only stores of this brand (optional)
+
+        Returns completion counts for the last 7 days per ISO weekday
+        (1=Monday) and hour, omitting empty cells.
+        """
+        cells = list(self._activity_rollups(request).values('weekday', 'hour').annotate(
+            completions=Sum('responses')
+        ).order_by('weekday', 'hour'))
+
+        return Response({
+            'cells': cells,
+            'peak': max(cells, key=lambda cell: cell['completions'], default=None),
+        })
+
+    def _activity_rollups(self, request):
+        """Last 7 days of hourly activity rollups, optionally for one brand"""
+        week_start = timezone.localdate() - timedelta(days=7)
+        rollups = HourlyActivityRollup.objects.filter(day__gte=week_start)
+
+        brand_id = request.query_params.get('brand_id')
+        if brand_id:
+            rollups = rollups.filter(store__brand_id=brand_id)
+        return rollups
+
     @action(detail=False, methods=['get'])
     def review_analysis_overview(self, request):
         """
@@ -0,0 +1,100 @@
+"""
+Store dashboard statistics
+
+Store-level numbers behind MicroCheckRunViewSet.dashboard_stats, which every
+manager's home screen polls. They are computed with one conditional
+aggregate per table and cached per store for
+MICRO_CHECK_DASHBOARD_STATS_TTL_SECONDS; submitting a response invalidates
+the store's entry so the next poll sees it.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import CorrectiveAction, MicroCheckResponse, MicroCheckRun, StoreStreak
+
+DASHBOARD_STATS_KEY = 'micro_checks:dashboard-stats:{store_id}'
+
+EMPTY_STREAK = {
+    'current_streak': 0,
+    'longest_streak': 0,
+    'total_completions': 0,
+    'last_completion_date': None,
+}
+
+
+def _score(passed, total):
+    """Pass rate as a percentage; None when there is nothing (or nothing passed) to show"""
+    score = (passed / total * 100) if total > 0 else None
+    return round(score, 1) if score else None
+
+
+def compute_store_dashboard_stats(store_id) -> dict:
+    """Store-level dashboard numbers, uncached"""
+    from .serializers import StoreStreakSerializer
+
+    now = timezone.now()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday_start = today_start - timedelta(days=1)
+    week_start = today_start - timedelta(days=7)
+    last_week_start = week_start - timedelta(days=7)
+
+    runs = MicroCheckRun.objects.filter(
+        store_id=store_id,
+        status='COMPLETED',
+        completed_at__gte=last_week_start,
+    ).aggregate(
+        this_week=Count('id', filter=Q(completed_at__gte=week_start)),
+        last_week=Count('id', filter=Q(completed_at__lt=week_start)),
+    )
+
+    responses = MicroCheckResponse.objects.filter(
+        store_id=store_id,
+        completed_at__gte=week_start,
+    ).aggregate(
+        today_total=Count('id', filter=Q(completed_at__gte=today_start)),
+        today_passed=Count('id', filter=Q(completed_at__gte=today_start, status='PASS')),
+        yesterday_total=Count('id', filter=Q(completed_at__gte=yesterday_start, completed_at__lt=today_start)),
+        yesterday_passed=Count(
+            'id', filter=Q(completed_at__gte=yesterday_start, completed_at__lt=today_start, status='PASS')
+        ),
+        week_total=Count('id'),
+        week_passed=Count('id', filter=Q(status='PASS')),
+    )
+
+    issues_resolved = CorrectiveAction.objects.filter(
+        store_id=store_id,
+        status='RESOLVED',
+        resolved_at__gte=week_start
+    ).count()
+
+    store_streak = StoreStreak.objects.select_related('store').filter(store_id=store_id).first()
+
+    return {
+        'store_streak': StoreStreakSerializer(store_streak).data if store_streak else dict(EMPTY_STREAK),
+        'runs_this_week': runs['this_week'],
+        'runs_last_week': runs['last_week'],
+        'today_score': _score(responses['today_passed'], responses['today_total']),
+        'yesterday_score': _score(responses['yesterday_passed'], responses['yesterday_total']),
+        'average_score': _score(responses['week_passed'], responses['week_total']),
+        'issues_resolved_this_week': issues_resolved,
+    }
+
+
+def get_store_dashboard_stats(store_id) -> dict:
+    """Store-level dashboard numbers, served from the per-store cache"""
+    key = DASHBOARD_STATS_KEY.format(store_id=store_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_store_dashboard_stats(store_id)
+        cache.set(key, stats, timeout=settings.MICRO_CHECK_DASHBOARD_STATS_TTL_SECONDS)
+    return stats
+
+
+def invalidate_store_dashboard_stats(store_id):
+    """Drop a store's cached dashboard numbers (call after responses change)"""
+    cache.delete(DASHBOARD_STATS_KEY.format(store_id=store_id))
@@ -7,7 +7,9 @@ Usage:
 """
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from brands.models import Store
 from micro_checks.models import MicroCheckRun, MicroCheckStreak, StoreStreak
+from micro_checks.streaks import compute_store_streaks
 from micro_checks.utils import get_store_local_date, all_run_items_passed
 import logging
 
@@ -117,64 +119,35 @@ class Command(BaseCommand):
 
                     user_streak_count += 1
 
-        # Process store streaks
-        store_streak_count = 0
-        for store_id, runs_with_dates in store_runs.items():
-            # Process runs in chronological order
-            for run, local_date in runs_with_dates:
-                if dry_run:
-                    self.stdout.write(
-                        f'  Would update store streak: store={run.store.name}, date={local_date}'
-                    )
-                else:
-                    # Get or create streak
-                    streak, created = StoreStreak.objects.get_or_create(
-                        store=run.store,
-                        defaults={
-                            'current_streak': 0,
-                            'longest_streak': 0,
-                            'total_completions': 0,
-                        }
-                    )
-
-                    # Update total completions
-                    streak.total_completions += 1
-
-                    # Update streak logic
-                    if streak.last_completion_date:
-                        days_since_last = (local_date - streak.last_completion_date).days
-
-                        if days_since_last == 1:
-                            # Consecutive day - increment streak
-                            streak.current_streak += 1
-                        elif days_since_last == 0:
-                            # Same day - don't change streak
-                            pass
-                        else:
-                            # Streak broken
-                            streak.current_streak = 1
-                    else:
-                        # First completion
-                        streak.current_streak = 1
-
-                    # Update longest streak
-                    if streak.current_streak > streak.longest_streak:
-                        streak.longest_streak = streak.current_streak
+        # Store streaks are recomputed from scratch (gaps-and-islands over
+        # local completion days) and replace any existing rows
+        stores = Store.objects.filter(id__in=store_runs.keys())
+        computed = compute_store_streaks(stores)
+        store_streak_count = len(computed)
 
-                    streak.last_completion_date = local_date
-                    streak.save()
-
-                    store_streak_count += 1
+        if dry_run:
+            for streak in computed.values():
+                self.stdout.write(
+                    f'  Would set store streak: store={streak.store_id}, current={streak.current_streak}, '
+                    f'longest={streak.longest_streak}, last={streak.last_completion_date}'
+                )
+        else:
+            StoreStreak.objects.bulk_create(
+                list(computed.values()),
+                update_conflicts=True,
+                unique_fields=['store'],
+                update_fields=['current_streak', 'longest_streak', 'total_completions', 'last_completion_date'],
+            )
 
         if dry_run:
             self.stdout.write(self.style.SUCCESS(
                 f'DRY RUN: Would process {user_streak_count} user streak updates '
-                f'and {store_streak_count} store streak updates'
+                f'and {store_streak_count} store streaks'
             ))
         else:
             self.stdout.write(self.style.SUCCESS(
                 f'Successfully backfilled streaks: {user_streak_count} user streak updates, '
-                f'{store_streak_count} store streak updates'
+                f'{store_streak_count} store streaks'
             ))
 
             # Show final streak stats
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('brands', '0010_add_store_template_stats'),
+        ('micro_checks', '0009_add_ml_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('runs_created', models.IntegerField(default=0, help_text='Runs created on this day')),
+                ('runs_created_completed', models.IntegerField(default=0, help_text='Runs created on this day that are now completed')),
+                ('runs_completed', models.IntegerField(default=0, help_text='Runs completed on this day')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='brands.store')),
+            ],
+            options={
+                'db_table': 'micro_check_store_daily_rollups',
+                'indexes': [models.Index(fields=['day', 'runs_completed'], name='micro_check_day_a91141_idx')],
+                'unique_together': {('day', 'store')},
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Platform (settings.TIME_ZONE) day, as in the other rollups')),
+                ('weekday', models.PositiveSmallIntegerField(help_text='ISO weekday in store local time (1=Monday)')),
+                ('hour', models.PositiveSmallIntegerField(help_text='Hour of day in store local time (0-23)')),
+                ('responses', models.IntegerField(default=0)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_activity_rollups', to='brands.store')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='micro_check_hourly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'micro_check_hourly_activity_rollups',
+                'indexes': [models.Index(fields=['day', 'hour'], name='micro_check_day_2f0e37_idx')],
+                'unique_together': {('day', 'store', 'user', 'weekday', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category', models.CharField(choices=[('PPE', 'Personal Protective Equipment'), ('SAFETY', 'Safety'), ('CLEANLINESS', 'Cleanliness'), ('UNIFORM', 'Uniform Compliance'), ('MENU_BOARD', 'Menu Board'), ('FOOD_SAFETY', 'Food Safety & Hygiene'), ('EQUIPMENT', 'Equipment & Maintenance'), ('OPERATIONAL', 'Operational Compliance'), ('FOOD_QUALITY', 'Food Quality & Presentation'), ('STAFF_BEHAVIOR', 'Staff Behavior'), ('OTHER', 'Other')], max_length=20)),
+                ('responses', models.IntegerField(default=0)),
+                ('passed', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('with_media', models.IntegerField(default=0)),
+                ('last_completed_at', models.DateTimeField(blank=True, null=True)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_daily_rollups', to='brands.store')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='micro_checks.microchecktemplate')),
+            ],
+            options={
+                'db_table': 'micro_check_category_daily_rollups',
+                'indexes': [models.Index(fields=['day', 'category'], name='micro_check_day_f7d8eb_idx')],
+                'unique_together': {('day', 'store', 'category', 'template')},
+            },
+        ),
+    ]
@@ -804,3 +804,75 @@ class MicroCheckMLMetrics(models.Model):
 
     def __str__(self):
         return f"{self.run_item} - {self.selection_method} (score={self.final_score:.2f})"
+
+
+class StoreDailyRollup(models.Model):
+    """Per-(day, store) run counts for platform analytics (see rollups.py)"""
+
+    day = models.DateField()
+    store = models.ForeignKey('brands.Store', on_delete=models.CASCADE, related_name='daily_rollups')
+
+    runs_created = models.IntegerField(default=0, help_text="Runs created on this day")
+    runs_created_completed = models.IntegerField(
+        default=0, help_text="Runs created on this day that are now completed"
+    )
+    runs_completed = models.IntegerField(default=0, help_text="Runs completed on this day")
+
+    class Meta:
+        db_table = 'micro_check_store_daily_rollups'
+        unique_together = [('day', 'store')]
+        indexes = [
+            models.Index(fields=['day', 'runs_completed']),
+        ]
+
+    def __str__(self):
+        return f"{self.store} {self.day}: {self.runs_completed} completed"
+
+
+class CategoryDailyRollup(models.Model):
+    """Per-(day, store, category, template) response counts for platform analytics"""
+
+    day = models.DateField()
+    store = models.ForeignKey('brands.Store', on_delete=models.CASCADE, related_name='category_daily_rollups')
+    from inspections.models import Finding
+    category = models.CharField(max_length=20, choices=Finding.Category.choices)
+    template = models.ForeignKey(MicroCheckTemplate, on_delete=models.CASCADE, related_name='daily_rollups')
+
+    responses = models.IntegerField(default=0)
+    passed = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    with_media = models.IntegerField(default=0)
+    last_completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'micro_check_category_daily_rollups'
+        unique_together = [('day', 'store', 'category', 'template')]
+        indexes = [
+            models.Index(fields=['day', 'category']),
+        ]
+
+    def __str__(self):
+        return f"{self.store} {self.day} {self.category}: {self.failed}/{self.responses} failed"
+
+
+class HourlyActivityRollup(models.Model):
+    """Per-(day, store, responder, local weekday/hour) response counts for platform analytics"""
+
+    day = models.DateField(help_text="Platform (settings.TIME_ZONE) day, as in the other rollups")
+    store = models.ForeignKey('brands.Store', on_delete=models.CASCADE, related_name='hourly_activity_rollups')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+                             related_name='micro_check_hourly_rollups')
+    weekday = models.PositiveSmallIntegerField(help_text="ISO weekday in store local time (1=Monday)")
+    hour = models.PositiveSmallIntegerField(help_text="Hour of day in store local time (0-23)")
+
+    responses = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'micro_check_hourly_activity_rollups'
+        unique_together = [('day', 'store', 'user', 'weekday', 'hour')]
+        indexes = [
+            models.Index(fields=['day', 'hour']),
+        ]
+
+    def __str__(self):
+        return f"{self.store} {self.day} {self.hour}:00 local - {self.responses} responses"
@@ -0,0 +1,149 @@
+"""
+Micro-check analytics rollups
+
+Daily and hourly fact tables behind the super admin analytics endpoints, so
+dashboards read a few rows per day instead of scanning MicroCheckRun and
+MicroCheckResponse over sliding windows:
+
+- StoreDailyRollup: per (day, store) runs created / completed
+- CategoryDailyRollup: per (day, store, category, template) response counts
+- HourlyActivityRollup: per (day, store, responder, local weekday, local
+  hour) response counts
+
+Days are calendar days in settings.TIME_ZONE; activity weekday and hour are
+in each store's own timezone (see core.analytics). Each refresh recomputes
+whole days from the raw tables (one grouped query per table) and replaces
+their rows, so it is idempotent and picks up late edits such as status
+overrides. refresh_micro_check_rollups runs intra-day for the most recent
+days and nightly over a wider window, since a run created days ago can
+complete today.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.analytics import local_time_histogram
+
+from .models import (
+    CategoryDailyRollup,
+    HourlyActivityRollup,
+    MicroCheckResponse,
+    MicroCheckRun,
+    StoreDailyRollup,
+)
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 500
+
+# core.analytics.rollup_rebuild_lock name held while these tables are rebuilt
+MICRO_CHECK_ROLLUP_LOCK = 'micro_checks'
+
+
+def day_bounds(first_day: date, last_day: date):
+    """Aware datetimes spanning first_day 00:00 to the midnight after last_day"""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def _store_rollups(start, end):
+    rows = defaultdict(lambda: {'runs_created': 0, 'runs_created_completed': 0, 'runs_completed': 0})
+
+    created = MicroCheckRun.objects.filter(
+        created_at__gte=start, created_at__lt=end
+    ).annotate(day=TruncDate('created_at')).values('day', 'store_id').annotate(
+        runs_created=Count('id'),
+        runs_created_completed=Count('id', filter=Q(status='COMPLETED')),
+    ).order_by()
+    for row in created:
+        counts = rows[(row['day'], row['store_id'])]
+        counts['runs_created'] = row['runs_created']
+        counts['runs_created_completed'] = row['runs_created_completed']
+
+    completed = MicroCheckRun.objects.filter(
+        status='COMPLETED', completed_at__gte=start, completed_at__lt=end
+    ).annotate(day=TruncDate('completed_at')).values('day', 'store_id').annotate(
+        runs_completed=Count('id'),
+    ).order_by()
+    for row in completed:
+        rows[(row['day'], row['store_id'])]['runs_completed'] = row['runs_completed']
+
+    return [
+        StoreDailyRollup(day=day, store_id=store_id, **counts)
+        for (day, store_id), counts in rows.items()
+    ]
+
+
+def _category_rollups(start, end):
+    rows = MicroCheckResponse.objects.filter(
+        completed_at__gte=start, completed_at__lt=end
+    ).annotate(day=TruncDate('completed_at')).values(
+        'day', 'store_id', 'category', 'template_id'
+    ).annotate(
+        responses=Count('id'),
+        passed=Count('id', filter=Q(status='PASS')),
+        failed=Count('id', filter=Q(status='FAIL')),
+        with_media=Count('id', filter=Q(media__isnull=False)),
+        last_completed_at=Max('completed_at'),
+    ).order_by()
+
+    return [CategoryDailyRollup(**row) for row in rows]
+
+
+def _hourly_rollups(start, end):
+    rows = local_time_histogram(
+        MicroCheckResponse.objects.filter(
+            completed_at__gte=start, completed_at__lt=end
+        ).annotate(day=TruncDate('completed_at')),
+        'completed_at',
+        parts=('weekday', 'hour'),
+        group_by=('day', 'store_id', 'completed_by_id'),
+    )
+
+    return [
+        HourlyActivityRollup(
+            day=row['day'], store_id=row['store_id'], user_id=row['completed_by_id'],
+            weekday=row['weekday'], hour=row['hour'], responses=row['count']
+        )
+        for row in rows
+    ]
+
+
+def rebuild_micro_check_rollups(first_day: date, last_day: date) -> dict:
+    """
+    Recompute the micro-check rollups for an inclusive range of days.
+
+    Returns:
+        Dict with the number of rows written per rollup table
+    """
+    start, end = day_bounds(first_day, last_day)
+
+    store_rows = _store_rollups(start, end)
+    category_rows = _category_rollups(start, end)
+    hourly_rows = _hourly_rollups(start, end)
+
+    days = Q(day__gte=first_day, day__lte=last_day)
+    with transaction.atomic():
+        for model, rows in (
+            (StoreDailyRollup, store_rows),
+            (CategoryDailyRollup, category_rows),
+            (HourlyActivityRollup, hourly_rows),
+        ):
+            model.objects.filter(days).delete()
+            model.objects.bulk_create(rows, batch_size=BULK_CHUNK_SIZE)
+
+    counts = {
+        'store_days': len(store_rows),
+        'category_days': len(category_rows),
+        'activity_hours': len(hourly_rows),
+    }
+    logger.info(f"Rebuilt micro-check rollups for {first_day}..{last_day}: {counts}")
+    return counts
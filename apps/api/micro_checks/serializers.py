@@ -299,23 +299,8 @@ class MicroCheckStreakSerializer(serializers.ModelSerializer):
         Calculate real-time streak status.
         If last completion was more than 1 day ago, streak is broken (return 0).
         """
-        if not obj.last_completion_date:
-            return 0
-
-        from django.utils import timezone
-        from .utils import get_store_local_date
-
-        # Get today's date in the store's timezone
-        today = get_store_local_date(obj.store)
-
-        # Calculate days since last completion
-        days_since_last = (today - obj.last_completion_date).days
-
-        # If more than 1 day has passed, streak is broken
-        if days_since_last > 1:
-            return 0
-
-        return obj.current_streak
+        from .streaks import effective_current_streak
+        return effective_current_streak(obj)
 
 
 class StoreStreakSerializer(serializers.ModelSerializer):
@@ -342,23 +327,8 @@ class StoreStreakSerializer(serializers.ModelSerializer):
         Calculate real-time streak status.
         If last completion was more than 1 day ago, streak is broken (return 0).
         """
-        if not obj.last_completion_date:
-            return 0
-
-        from django.utils import timezone
-        from .utils import get_store_local_date
-
-        # Get today's date in the store's timezone
-        today = get_store_local_date(obj.store)
-
-        # Calculate days since last completion
-        days_since_last = (today - obj.last_completion_date).days
-
-        # If more than 1 day has passed, streak is broken
-        if days_since_last > 1:
-            return 0
-
-        return obj.current_streak
+        from .streaks import effective_current_streak
+        return effective_current_streak(obj)
 
 
 class CorrectiveActionSerializer(serializers.ModelSerializer):
@@ -0,0 +1,196 @@
+"""
+Store streak service
+
+Single place to read store completion streaks. StoreStreak rows are kept
+current incrementally by update_store_streak as runs complete, so a lookup is
+one indexed read. Stores without a row (e.g. runs completed before streak
+tracking) are computed from their completed runs with one query per store
+timezone and saved, so the fallback runs once per store.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+import pytz
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import MicroCheckRun, StoreStreak
+from .utils import get_store_local_date
+
+logger = logging.getLogger(__name__)
+
+
+def effective_current_streak(streak, today=None) -> int:
+    """
+    Current streak as of today in the store's timezone.
+
+    A streak stays alive through the day after its last completion and is
+    broken (0) once a whole local day passes without one.
+    """
+    if streak is None or not streak.last_completion_date:
+        return 0
+
+    if today is None:
+        today = get_store_local_date(streak.store)
+
+    if (today - streak.last_completion_date).days > 1:
+        return 0
+    return streak.current_streak
+
+
+def effective_current_streak_expression(timezones, streak_path='streak', now=None):
+    """
+    SQL counterpart of effective_current_streak for annotating Store querysets.
+
+    Stores are grouped by their current local date (at most a few distinct
+    dates at any instant), so the expression has one When per group.
+
+    Args:
+        timezones: Store timezone names present in the queryset
+        streak_path: Lookup path from the annotated model to its StoreStreak
+        now: Instant to evaluate at (defaults to now)
+
+    Returns:
+        Case expression yielding the current streak, or 0 if it is broken
+    """
+    now = now or timezone.now()
+    by_local_date = defaultdict(list)
+    for tz_name in set(timezones):
+        by_local_date[now.astimezone(pytz.timezone(tz_name)).date()].append(tz_name)
+
+    return Case(
+        *[
+            When(
+                Q(timezone__in=tz_names)
+                & Q(**{f'{streak_path}__last_completion_date__gte': local_date - timedelta(days=1)}),
+                then=F(f'{streak_path}__current_streak'),
+            )
+            for local_date, tz_names in by_local_date.items()
+        ],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _serialize(streak, store) -> dict:
+    if streak is None:
+        return {
+            'current_streak': 0,
+            'longest_streak': 0,
+            'total_completions': 0,
+            'last_completion_date': None,
+        }
+    return {
+        'current_streak': effective_current_streak(streak, get_store_local_date(store)),
+        'longest_streak': streak.longest_streak,
+        'total_completions': streak.total_completions,
+        'last_completion_date': streak.last_completion_date,
+    }
+
+
+def get_store_streaks(stores) -> dict:
+    """
+    Streak stats for several stores.
+
+    Args:
+        stores: Iterable of Store instances
+
+    Returns:
+        Dict of store id -> dict with current_streak, longest_streak,
+        total_completions and last_completion_date
+    """
+    stores = list(stores)
+    streaks = {streak.store_id: streak for streak in StoreStreak.objects.filter(store__in=stores)}
+
+    missing = [store for store in stores if store.id not in streaks]
+    if missing:
+        streaks.update(backfill_store_streaks(missing))
+
+    return {store.id: _serialize(streaks.get(store.id), store) for store in stores}
+
+
+def get_store_streak(store) -> dict:
+    """Streak stats for one store (see get_store_streaks)"""
+    return get_store_streaks([store])[store.id]
+
+
+def compute_store_streaks(stores) -> dict:
+    """
+    Recompute streaks from completed runs (gaps-and-islands over local days).
+
+    Completed runs are grouped by store-local completion day in one query per
+    distinct store timezone; consecutive days then form islands whose lengths
+    give the current and longest streaks.
+
+    Args:
+        stores: Iterable of Store instances
+
+    Returns:
+        Dict of store id -> unsaved StoreStreak for stores with completed runs
+    """
+    stores_by_tz = defaultdict(list)
+    for store in stores:
+        stores_by_tz[store.timezone].append(store)
+
+    streaks = {}
+    for tz_name, tz_stores in stores_by_tz.items():
+        tzinfo = pytz.timezone(tz_name)
+        days = (
+            MicroCheckRun.objects.filter(
+                store__in=tz_stores,
+                status='COMPLETED',
+                completed_at__isnull=False,
+            )
+            .annotate(day=TruncDate('completed_at', tzinfo=tzinfo))
+            .values('store_id', 'day')
+            .annotate(runs=Count('id'))
+            .order_by('store_id', 'day')
+        )
+
+        islands = {}
+        for row in days:
+            store_id, day = row['store_id'], row['day']
+            state = islands.get(store_id)
+            if state is None:
+                islands[store_id] = {'start': day, 'last': day, 'longest': 1, 'total': row['runs']}
+                continue
+            if day - state['last'] != timedelta(days=1):
+                state['start'] = day
+            state['last'] = day
+            state['longest'] = max(state['longest'], (day - state['start']).days + 1)
+            state['total'] += row['runs']
+
+        for store_id, state in islands.items():
+            streaks[store_id] = StoreStreak(
+                store_id=store_id,
+                current_streak=(state['last'] - state['start']).days + 1,
+                longest_streak=state['longest'],
+                total_completions=state['total'],
+                last_completion_date=state['last'],
+            )
+
+    return streaks
+
+
+def backfill_store_streaks(stores) -> dict:
+    """
+    Compute and save StoreStreak rows for stores that have none.
+
+    Rows created concurrently by update_store_streak are left untouched.
+
+    Returns:
+        Dict of store id -> StoreStreak for the stores given
+    """
+    stores = list(stores)
+    computed = compute_store_streaks(stores)
+    if computed:
+        StoreStreak.objects.bulk_create(list(computed.values()), ignore_conflicts=True)
+        logger.info(f"Backfilled streaks for {len(computed)} store(s)")
+
+    store_map = {store.id: store for store in stores}
+    for store_id, streak in computed.items():
+        streak.store = store_map[store_id]
+    return computed
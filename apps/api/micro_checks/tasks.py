@@ -25,6 +25,7 @@ from .utils import (
     create_corrective_action_for_failure,
     all_run_items_passed
 )
+from .dashboard import invalidate_store_dashboard_stats
 
 # Import shift checker for 7shifts integration
 try:
@@ -320,12 +321,10 @@ def _send_run_to_managers(run, store):
             )
             if shifts_config.enforce_shift_schedule:
                 # Filter to only employees currently on shift
-                shift_checker = ShiftChecker()
-                on_shift_employees = shift_checker.get_employees_on_shift_at_store(
+                on_shift_emails = ShiftChecker.get_on_shift_emails(
                     store=store,
                     check_time=timezone.now()
                 )
-                on_shift_emails = {emp['email'].lower() for emp in on_shift_employees}
 
                 # Filter recipients to those on shift
                 recipients_list = [
@@ -641,6 +640,13 @@ def process_micro_check_response(self, response_id):
 
         logger.info(f"Run {run.id} completed")
 
+    # Run completion moves the dashboard counts and streaks
+    invalidate_store_dashboard_stats(store.id)
+
+    # Completion rate, score and streak feed the store's operational voice
+    from insights.snapshots import schedule_snapshot_refresh
+    schedule_snapshot_refresh(store.id)
+
     cache.delete(cache_key)
     return {'success': True, 'run_complete': all_items_complete}
 
@@ -851,6 +857,30 @@ def refresh_store_template_stats():
     }
 
 
+@shared_task(bind=True, queue='maintenance', max_retries=10, default_retry_delay=60)
+def refresh_micro_check_rollups(self, days=None):
+    """
+    Recompute the micro-check analytics rollups for today and the previous
+    days - 1 days (see rollups.py).
+
+    Scheduled intra-day over ANALYTICS_ROLLUP_INTRADAY_DAYS and nightly over
+    ANALYTICS_ROLLUP_NIGHTLY_DAYS. Retries later while another rebuild of the
+    same tables is running.
+    """
+    from datetime import timedelta
+    from django.conf import settings
+    from core.analytics import rollup_rebuild_lock
+    from .rollups import MICRO_CHECK_ROLLUP_LOCK, rebuild_micro_check_rollups
+
+    days = days or settings.ANALYTICS_ROLLUP_INTRADAY_DAYS
+    today = timezone.localdate()
+    with rollup_rebuild_lock(MICRO_CHECK_ROLLUP_LOCK) as acquired:
+        if not acquired:
+            logger.info("Micro-check rollup rebuild already running, retrying later")
+            raise self.retry()
+        return rebuild_micro_check_rollups(today - timedelta(days=days - 1), today)
+
+
 @shared_task(queue='ml')
 def train_micro_check_ml_models(dry_run=False):
     """
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+
 from django.test import TestCase
 from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
@@ -6,8 +8,9 @@ from accounts.models import User, Account
 from brands.models import Brand, Store
 from micro_checks.models import (
     MicroCheckTemplate, MicroCheckRun, MicroCheckRunItem,
-    MicroCheckAssignment, MicroCheckResponse
+    MicroCheckAssignment, MicroCheckResponse, StoreStreak
 )
+from micro_checks.streaks import get_store_streak
 from micro_checks.utils import seed_default_templates, select_templates_for_run
 
 
@@ -672,3 +675,368 @@ class FirstTrialRunCreationTests(APITestCase):
         # This tests the core functionality that magic link tokens are generated
         self.assertIsNotNone(token)
         self.assertGreater(len(token), 10)
+
+
+class StoreStreakServiceTests(TestCase):
+    """Test streak lookups read StoreStreak and backfill it from runs once"""
+
+    def setUp(self):
+        self.brand = Brand.objects.create(name='Streak Brand', is_trial=True)
+        self.store = Store.objects.create(
+            brand=self.brand, name='Streak Store', code='STRK-001', timezone='UTC'
+        )
+        self.today = timezone.now().date()
+
+    def _complete_run(self, days_ago, sequence=1):
+        day = self.today - timedelta(days=days_ago)
+        return MicroCheckRun.objects.create(
+            store=self.store, scheduled_for=day, sequence=sequence, store_timezone='UTC',
+            created_via='MANUAL', status='COMPLETED',
+            completed_at=timezone.make_aware(datetime(day.year, day.month, day.day, 12)),
+        )
+
+    def test_lookup_reads_tracked_streak_in_one_query(self):
+        StoreStreak.objects.create(
+            store=self.store, current_streak=40, longest_streak=50, total_completions=90,
+            last_completion_date=self.today - timedelta(days=1)
+        )
+
+        with self.assertNumQueries(1):
+            streak = get_store_streak(self.store)
+
+        self.assertEqual(streak['current_streak'], 40)
+        self.assertEqual(streak['longest_streak'], 50)
+
+    def test_broken_tracked_streak_reads_as_zero(self):
+        StoreStreak.objects.create(
+            store=self.store, current_streak=40, longest_streak=50,
+            last_completion_date=self.today - timedelta(days=2)
+        )
+
+        self.assertEqual(get_store_streak(self.store)['current_streak'], 0)
+
+    def test_untracked_store_is_backfilled_from_runs(self):
+        for days_ago in (0, 1, 2, 5, 6, 7, 8):
+            self._complete_run(days_ago)
+        self._complete_run(0, sequence=2)
+
+        streak = get_store_streak(self.store)
+
+        self.assertEqual(streak['current_streak'], 3)
+        self.assertEqual(streak['longest_streak'], 4)
+        self.assertEqual(streak['total_completions'], 8)
+        saved = StoreStreak.objects.get(store=self.store)
+        self.assertEqual(saved.last_completion_date, self.today)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_store_streak(self.store)['current_streak'], 3)
+
+    def test_store_without_runs_has_no_streak(self):
+        self.assertEqual(get_store_streak(self.store)['current_streak'], 0)
+        self.assertFalse(StoreStreak.objects.filter(store=self.store).exists())
+
+
+class DashboardStatsTests(APITestCase):
+    """Test dashboard_stats aggregates per table and caches store numbers"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        self.brand = Brand.objects.create(name='Dashboard Brand')
+        self.store = Store.objects.create(
+            brand=self.brand, name='Dashboard Store', code='DASH-001', timezone='UTC'
+        )
+        self.other_store = Store.objects.create(
+            brand=self.brand, name='Other Store', code='DASH-002', timezone='UTC'
+        )
+        self.gm = User.objects.create_user(
+            username='dash_gm', email='dash_gm@test.com', password='testpass123', role='GM', store=self.store
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.gm)
+        self.url = '/api/micro-checks/runs/dashboard_stats/'
+
+    def _completed_run(self, days_ago, sequence=1):
+        completed_at = timezone.now() - timedelta(days=days_ago)
+        return MicroCheckRun.objects.create(
+            store=self.store, scheduled_for=completed_at.date(), sequence=sequence, store_timezone='UTC',
+            created_via='MANUAL', status='COMPLETED', completed_at=completed_at,
+        )
+
+    def test_store_numbers_come_from_conditional_aggregates(self):
+        self._completed_run(1)
+        self._completed_run(2)
+        self._completed_run(10)
+
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url, {'store_id': self.store.id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['runs_this_week'], 2)
+        self.assertEqual(response.data['runs_last_week'], 1)
+        self.assertIsNone(response.data['today_score'])
+        self.assertEqual(response.data['issues_resolved_this_week'], 0)
+        self.assertEqual(response.data['user_streak']['current_streak'], 0)
+
+    def test_store_numbers_are_cached_until_invalidated(self):
+        from micro_checks.dashboard import invalidate_store_dashboard_stats
+
+        self._completed_run(1)
+        self.client.get(self.url, {'store_id': self.store.id})
+        self._completed_run(2)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'store_id': self.store.id})
+        self.assertEqual(response.data['runs_this_week'], 1)
+
+        invalidate_store_dashboard_stats(self.store.id)
+        response = self.client.get(self.url, {'store_id': self.store.id})
+        self.assertEqual(response.data['runs_this_week'], 2)
+
+    def test_inaccessible_store_is_not_found(self):
+        response = self.client.get(self.url, {'store_id': self.other_store.id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AdminStoreGridTests(APITestCase):
+    """Test the admin store engagement grid is annotated in SQL"""
+
+    def setUp(self):
+        self.brand = Brand.objects.create(name='Grid Brand')
+        self.admin = User.objects.create_user(
+            username='grid_admin', email='grid_admin@test.com', password='testpass123', role='SUPER_ADMIN'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = '/api/micro-checks/admin/analytics/stores/'
+        self.today = timezone.now().date()
+
+    def _store(self, code, streak=0, last_completion_days_ago=0, runs=0, completed=0, tz='UTC'):
+        store = Store.objects.create(brand=self.brand, name=f'Store {code}', code=code, timezone=tz)
+        if streak:
+            StoreStreak.objects.create(
+                store=store, current_streak=streak, longest_streak=streak,
+                last_completion_date=self.today - timedelta(days=last_completion_days_ago)
+            )
+        for sequence in range(1, runs + 1):
+            MicroCheckRun.objects.create(
+                store=store, scheduled_for=self.today, sequence=sequence, store_timezone=tz,
+                created_via='MANUAL', status='COMPLETED' if sequence <= completed else 'PENDING',
+            )
+        return store
+
+    def test_grid_is_one_query_regardless_of_store_count(self):
+        active = self._store('G-1', streak=9)
+        sporadic = self._store('G-2', runs=4, completed=2)
+        broken = self._store('G-3', streak=12, last_completion_days_ago=3, runs=4, completed=1)
+        for i in range(5):
+            self._store(f'G-X{i}', runs=1)
+
+        # Distinct store timezones + the annotated grid
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = {row['id']: row for row in response.data}
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(response.data[0]['id'], active.id)
+        self.assertEqual(rows[active.id]['status'], 'active')
+        self.assertEqual(rows[sporadic.id]['status'], 'sporadic')
+        self.assertEqual(rows[sporadic.id]['completion_rate_7d'], 50.0)
+        self.assertEqual(rows[broken.id]['current_streak'], 0)
+        self.assertEqual(rows[broken.id]['status'], 'inactive')
+        self.assertEqual(rows[broken.id]['completion_rate_7d'], 25.0)
+
+    def test_grid_filters_sorts_and_paginates(self):
+        for i in range(3):
+            self._store(f'P-{i}', runs=2, completed=2)
+        self._store('P-I', runs=2)
+
+        response = self.client.get(self.url, {
+            'status': 'sporadic', 'ordering': 'name', 'page': 1, 'page_size': 2
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([row['name'] for row in response.data['results']], ['Store P-0', 'Store P-1'])
+
+    def test_grid_rejects_unknown_status_and_ordering(self):
+        self.assertEqual(self.client.get(self.url, {'status': 'dormant'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'ordering': 'brand__owner'}).status_code, 400)
+
+
+class AnalyticsRollupTests(APITestCase):
+    """Test rollups rebuild from raw runs/responses and back the admin analytics"""
+
+    def setUp(self):
+        import hashlib
+
+        self.brand = Brand.objects.create(name='Rollup Brand')
+        self.store = Store.objects.create(brand=self.brand, name='Rollup Store', code='ROLL-001', timezone='UTC')
+        self.manager = User.objects.create_user(
+            username='rollup_gm', email='rollup_gm@test.com', password='testpass123', role='GM', store=self.store
+        )
+        self.admin = User.objects.create_user(
+            username='rollup_admin', email='rollup_admin@test.com', password='testpass123', role='SUPER_ADMIN'
+        )
+        self.today = timezone.localdate()
+
+        self.run = MicroCheckRun.objects.create(
+            store=self.store, scheduled_for=self.today, sequence=1, store_timezone='UTC',
+            created_via='MANUAL', status='COMPLETED', completed_at=timezone.now(),
+        )
+        MicroCheckRun.objects.create(
+            store=self.store, scheduled_for=self.today, sequence=2, store_timezone='UTC',
+            created_via='MANUAL', status='PENDING',
+        )
+        assignment = MicroCheckAssignment.objects.create(
+            run=self.run, store=self.store, sent_to=self.manager,
+            access_token_hash=hashlib.sha256(b'rollup_token').hexdigest(),
+            token_expires_at=timezone.now() + timedelta(days=7)
+        )
+        for i, (category, result) in enumerate([('EQUIPMENT', 'FAIL'), ('EQUIPMENT', 'PASS'), ('SAFETY', 'PASS')]):
+            template = MicroCheckTemplate.objects.create(
+                brand=self.brand, title=f'Rollup Check {i}', category=category,
+                success_criteria='Looks right', created_by=self.admin
+            )
+            run_item = MicroCheckRunItem.objects.create(
+                run=self.run, template=template, order=i + 1, template_version=template.version,
+                title_snapshot=template.title, success_criteria_snapshot=template.success_criteria,
+                category_snapshot=template.category, severity_snapshot=template.severity
+            )
+            MicroCheckResponse.objects.create(
+                run_item=run_item, run=self.run, assignment=assignment, template=template, store=self.store,
+                category=category, severity_snapshot=template.severity, status=result,
+                completed_by=self.manager, local_completed_date=self.today
+            )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _rebuild(self):
+        from micro_checks.rollups import rebuild_micro_check_rollups
+        return rebuild_micro_check_rollups(self.today - timedelta(days=1), self.today)
+
+    def test_rebuild_is_idempotent(self):
+        from micro_checks.models import CategoryDailyRollup, HourlyActivityRollup, StoreDailyRollup
+
+        self.assertEqual(self._rebuild(), {'store_days': 1, 'category_days': 3, 'activity_hours': 1})
+        self._rebuild()
+
+        store_day = StoreDailyRollup.objects.get()
+        self.assertEqual((store_day.runs_created, store_day.runs_created_completed, store_day.runs_completed), (2, 1, 1))
+        self.assertEqual(CategoryDailyRollup.objects.filter(category='EQUIPMENT').count(), 2)
+        self.assertEqual(HourlyActivityRollup.objects.get().responses, 3)
+
+    def test_overview_reads_rollups(self):
+        self._rebuild()
+
+        response = self.client.get('/api/micro-checks/admin/analytics/overview/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['active_stores']['today']['count'], 1)
+        self.assertEqual(response.data['dau']['today'], 1)
+        self.assertEqual(response.data['completion_rate'], 50.0)
+        self.assertEqual(response.data['top_failing_categories'][0]['category'], 'EQUIPMENT')
+        self.assertEqual(response.data['top_failing_categories'][0]['fail_rate'], 50.0)
+
+    def test_overview_averages_effective_streaks_in_sql(self):
+        from micro_checks.models import StoreStreak
+
+        broken_store = Store.objects.create(brand=self.brand, name='Broken Store', code='ROLL-002', timezone='UTC')
+        StoreStreak.objects.update_or_create(store=self.store, defaults={
+            'current_streak': 4, 'longest_streak': 6, 'last_completion_date': self.today,
+        })
+        StoreStreak.objects.update_or_create(store=broken_store, defaults={
+            'current_streak': 9, 'longest_streak': 10, 'last_completion_date': self.today - timedelta(days=3),
+        })
+
+        response = self.client.get('/api/micro-checks/admin/analytics/overview/')
+
+        # The broken streak counts as 0 towards the current average
+        self.assertEqual(response.data['average_streak'], {'current': 2.0, 'longest': 8.0})
+
+    def test_templates_and_time_of_day_read_rollups(self):
+        self._rebuild()
+
+        templates = self.client.get('/api/micro-checks/admin/analytics/templates/').data
+        self.assertEqual(len(templates['template_ranking']), 3)
+        self.assertEqual({c['category']: c['count'] for c in templates['category_distribution']},
+                         {'EQUIPMENT': 2, 'SAFETY': 1})
+
+        hours = self.client.get('/api/micro-checks/admin/analytics/time_of_day/').data
+        self.assertEqual(hours['peak_activity']['count'], 3)
+        self.assertEqual(sum(h['completions'] for h in hours['hourly_data']), 3)
+
+    def _move_responses(self, tz, completed_at):
+        Store.objects.filter(id=self.store.id).update(timezone=tz)
+        MicroCheckResponse.objects.filter(store=self.store).update(completed_at=completed_at)
+
+    def test_activity_is_bucketed_by_store_local_time(self):
+        # 2024-01-01 23:30 UTC is Tuesday 08:30 in Tokyo
+        self._move_responses('Asia/Tokyo', timezone.make_aware(datetime(2024, 1, 1, 23, 30)))
+        from micro_checks.rollups import rebuild_micro_check_rollups
+        rebuild_micro_check_rollups(datetime(2024, 1, 1).date(), datetime(2024, 1, 1).date())
+
+        from micro_checks.models import HourlyActivityRollup
+        rollup = HourlyActivityRollup.objects.get()
+        self.assertEqual((rollup.weekday, rollup.hour, rollup.responses), (2, 8, 3))
+
+    def test_heatmap_filters_by_brand(self):
+        self._rebuild()
+        other_brand = Brand.objects.create(name='Other Rollup Brand')
+
+        heatmap = self.client.get('/api/micro-checks/admin/analytics/activity_heatmap/',
+                                  {'brand_id': self.brand.id}).data
+        self.assertEqual(sum(cell['completions'] for cell in heatmap['cells']), 3)
+        self.assertEqual(heatmap['peak']['completions'], 3)
+
+        heatmap = self.client.get('/api/micro-checks/admin/analytics/activity_heatmap/',
+                                  {'brand_id': other_brand.id}).data
+        self.assertEqual(heatmap, {'cells': [], 'peak': None})
+
+    def test_refresh_retries_while_another_rebuild_holds_the_lock(self):
+        from celery.exceptions import Retry
+        from core.analytics import rollup_rebuild_lock
+        from micro_checks.models import StoreDailyRollup
+        from micro_checks.rollups import MICRO_CHECK_ROLLUP_LOCK
+        from micro_checks.tasks import refresh_micro_check_rollups
+
+        with rollup_rebuild_lock(MICRO_CHECK_ROLLUP_LOCK) as acquired:
+            self.assertTrue(acquired)
+            with self.assertRaises(Retry):
+                refresh_micro_check_rollups.apply(throw=True)
+        self.assertFalse(StoreDailyRollup.objects.exists())
+
+        refresh_micro_check_rollups.apply(throw=True)
+        self.assertEqual(StoreDailyRollup.objects.count(), 1)
+
+    def test_backfill_command_rebuilds_older_days(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from micro_checks.models import StoreDailyRollup
+
+        old_day = self.today - timedelta(days=20)
+        MicroCheckRun.objects.filter(id=self.run.id).update(created_at=timezone.now() - timedelta(days=20))
+
+        out = StringIO()
+        call_command('rebuild_analytics_rollups', '--days', '30', '--only', 'micro_checks', stdout=out)
+
+        self.assertIn('Rebuilt analytics rollups', out.getvalue())
+        self.assertEqual(StoreDailyRollup.objects.get(day=old_day).runs_created, 1)
+
+    def test_local_time_histogram_groups_in_the_database(self):
+        from core.analytics import local_time_histogram
+
+        self._move_responses('America/Los_Angeles', timezone.make_aware(datetime(2024, 1, 2, 3, 0)))
+
+        with self.assertNumQueries(2):
+            rows = local_time_histogram(
+                MicroCheckResponse.objects.all(), 'completed_at',
+                parts=('weekday', 'hour'), group_by=('store__brand_id',)
+            )
+
+        # 03:00 UTC Tuesday is 19:00 Monday in Los Angeles
+        self.assertEqual(rows, [{'store__brand_id': self.brand.id, 'weekday': 1, 'hour': 19, 'count': 3}])
@@ -46,6 +46,7 @@ from .utils import (
     create_corrective_action_for_failure
 )
 from .tasks import process_micro_check_response
+from .dashboard import EMPTY_STREAK, get_store_dashboard_stats, invalidate_store_dashboard_stats
 
 
 class MicroCheckTemplateViewSet(ScopedQuerysetMixin, ScopedCreateMixin, viewsets.ModelViewSet):
@@ -614,107 +615,27 @@ class MicroCheckRunViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def dashboard_stats(self, request):
         """Get comprehensive dashboard statistics for a store including user and store metrics"""
-        from datetime import datetime, timedelta
-        from django.db.models import Count, Q, Avg
-        from django.utils import timezone as tz
-
         store_id = request.query_params.get('store_id')
         if not store_id:
             return Response({'error': 'store_id parameter required'}, status=400)
 
         user = request.user
-        now = tz.now()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        yesterday_start = today_start - timedelta(days=1)
-        week_start = today_start - timedelta(days=7)
-        last_week_start = week_start - timedelta(days=7)
-
-        # Get runs for this store
-        runs = self.get_queryset().filter(store_id=store_id)
+        if not user.get_accessible_stores().filter(id=store_id).exists():
+            return Response({'error': 'Store not found'}, status=404)
 
         # User-specific streak (using serializer for real-time calculation)
-        user_streak = None
-        try:
-            user_streak_obj = MicroCheckStreak.objects.get(user=user, store_id=store_id)
-            from .serializers import MicroCheckStreakSerializer
-            serializer = MicroCheckStreakSerializer(user_streak_obj)
-            user_streak = serializer.data
-        except MicroCheckStreak.DoesNotExist:
-            user_streak = {
-                'current_streak': 0,
-                'longest_streak': 0,
-                'total_completions': 0,
-                'last_completion_date': None,
-            }
-
-        # Store-level streak (using serializer for real-time calculation)
-        store_streak = None
-        try:
-            store_streak_obj = StoreStreak.objects.get(store_id=store_id)
-            from .serializers import StoreStreakSerializer
-            serializer = StoreStreakSerializer(store_streak_obj)
-            store_streak = serializer.data
-        except StoreStreak.DoesNotExist:
-            store_streak = {
-                'current_streak': 0,
-                'longest_streak': 0,
-                'total_completions': 0,
-                'last_completion_date': None,
-            }
-
-        # Runs this week and last week
-        runs_this_week = runs.filter(completed_at__gte=week_start, status='COMPLETED').count()
-        runs_last_week = runs.filter(
-            completed_at__gte=last_week_start,
-            completed_at__lt=week_start,
-            status='COMPLETED'
-        ).count()
-
-        # Get responses for score calculations
-        responses_today = MicroCheckResponse.objects.filter(
-            store_id=store_id,
-            completed_at__gte=today_start
-        )
-        responses_yesterday = MicroCheckResponse.objects.filter(
-            store_id=store_id,
-            completed_at__gte=yesterday_start,
-            completed_at__lt=today_start
-        )
-
-        # Calculate today's and yesterday's scores (pass rate)
-        today_total = responses_today.count()
-        today_passed = responses_today.filter(status='PASS').count()
-        today_score = (today_passed / today_total * 100) if today_total > 0 else None
-
-        yesterday_total = responses_yesterday.count()
-        yesterday_passed = responses_yesterday.filter(status='PASS').count()
-        yesterday_score = (yesterday_passed / yesterday_total * 100) if yesterday_total > 0 else None
-
-        # Issues resolved this week (corrective actions marked as resolved)
-        issues_resolved = CorrectiveAction.objects.filter(
-            store_id=store_id,
-            status='RESOLVED',
-            resolved_at__gte=week_start
-        ).count()
-
-        # Average score (7 days)
-        responses_week = MicroCheckResponse.objects.filter(
-            store_id=store_id,
-            completed_at__gte=week_start
-        )
-        week_total = responses_week.count()
-        week_passed = responses_week.filter(status='PASS').count()
-        avg_score = (week_passed / week_total * 100) if week_total > 0 else None
+        user_streak_obj = MicroCheckStreak.objects.select_related('store', 'user').filter(
+            user=user, store_id=store_id
+        ).first()
+        if user_streak_obj:
+            user_streak = MicroCheckStreakSerializer(user_streak_obj).data
+        else:
+            user_streak = dict(EMPTY_STREAK)
 
+        # Store-level numbers are shared by every manager polling this store
         return Response({
             'user_streak': user_streak,
-            'store_streak': store_streak,
-            'runs_this_week': runs_this_week,
-            'runs_last_week': runs_last_week,
-            'today_score': round(today_score, 1) if today_score else None,
-            'yesterday_score': round(yesterday_score, 1) if yesterday_score else None,
-            'average_score': round(avg_score, 1) if avg_score else None,
-            'issues_resolved_this_week': issues_resolved,
+            **get_store_dashboard_stats(store_id),
         })
 
     @extend_schema(
@@ -1166,6 +1087,7 @@ class MicroCheckResponseViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
             create_corrective_action_for_failure(response)
 
         # Trigger async processing for other stats/streaks
+        invalidate_store_dashboard_stats(response.store_id)
         process_micro_check_response.delay(str(response.id))
 
     @extend_schema(
@@ -1289,6 +1211,7 @@ class MicroCheckResponseViewSet(ScopedQuerysetMixin, viewsets.ModelViewSet):
         # Note: CorrectiveAction is auto-created by MicroCheckResponse.save() for FAIL status
 
         # Trigger async processing for other stats/streaks
+        invalidate_store_dashboard_stats(response.store_id)
         process_micro_check_response.delay(str(response.id))
 
         # Check if all run items have responses - if so, mark run as COMPLETED
@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 from decouple import config
@@ -232,6 +233,24 @@ CORS_ALLOW_CREDENTIALS = True
 # Redis configuration
 REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 
+# Shared cache (sync locks, cached aggregates). Must be shared across web and
+# worker processes, so it defaults to the Celery Redis; test runs (and an
+# explicitly empty CACHE_REDIS_URL) use per-process memory instead.
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default=REDIS_URL)
+if CACHE_REDIS_URL and sys.argv[1:2] != ['test']:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
@@ -242,6 +261,11 @@ CELERY_TIMEZONE = TIME_ZONE
 # Micro-check scheduling settings
 MICRO_CHECK_SEND_HOUR = config('MICRO_CHECK_SEND_HOUR', default=8, cast=int)  # 8 AM UTC by default
 MICRO_CHECK_SEND_MINUTE = config('MICRO_CHECK_SEND_MINUTE', default=0, cast=int)
+# Analytics rollups: days (including today) recomputed by the intra-day and nightly jobs
+ANALYTICS_ROLLUP_INTRADAY_DAYS = config('ANALYTICS_ROLLUP_INTRADAY_DAYS', default=2, cast=int)
+ANALYTICS_ROLLUP_NIGHTLY_DAYS = config('ANALYTICS_ROLLUP_NIGHTLY_DAYS', default=8, cast=int)
+# Per-store cache for the polled dashboard_stats endpoint (cleared on response submission)
+MICRO_CHECK_DASHBOARD_STATS_TTL_SECONDS = config('MICRO_CHECK_DASHBOARD_STATS_TTL_SECONDS', default=60, cast=int)
 
 # Celery Beat Schedule for automated tasks
 from celery.schedules import crontab
@@ -288,6 +312,12 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(day_of_week=0, hour=4, minute=0),  # Sundays at 4 AM
         'options': {'queue': 'maintenance'}
     },
+    # 7shifts integration - Daily cleanup of expired raw sync payloads
+    'cleanup-expired-sync-payloads': {
+        'task': 'integrations.cleanup_expired_sync_payloads',
+        'schedule': crontab(hour=4, minute=30),  # 4:30 AM UTC daily
+        'options': {'queue': 'maintenance'}
+    },
     # 7shifts integration - Monthly cleanup of old sync logs (1st of month at 5 AM UTC)
     'cleanup-old-sync-logs': {
         'task': 'integrations.cleanup_old_sync_logs',
@@ -299,6 +329,30 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(hour=2, minute=0),  # 2:00 AM UTC daily
         'options': {'queue': 'maintenance'}
     },
+    # Analytics rollups - intra-day refresh of the most recent days
+    'refresh-micro-check-rollups-intraday': {
+        'task': 'micro_checks.tasks.refresh_micro_check_rollups',
+        'schedule': crontab(minute='*/15'),  # Every 15 minutes
+        'options': {'queue': 'maintenance'}
+    },
+    'refresh-user-event-rollups-intraday': {
+        'task': 'accounts.tasks.refresh_user_event_rollups',
+        'schedule': crontab(minute='*/15'),  # Every 15 minutes
+        'options': {'queue': 'maintenance'}
+    },
+    # Analytics rollups - nightly recompute over a wider window (late completions, overrides)
+    'refresh-micro-check-rollups-nightly': {
+        'task': 'micro_checks.tasks.refresh_micro_check_rollups',
+        'schedule': crontab(hour=2, minute=40),  # 2:40 AM UTC daily, between intra-day runs
+        'kwargs': {'days': ANALYTICS_ROLLUP_NIGHTLY_DAYS},
+        'options': {'queue': 'maintenance'}
+    },
+    'refresh-user-event-rollups-nightly': {
+        'task': 'accounts.tasks.refresh_user_event_rollups',
+        'schedule': crontab(hour=2, minute=40),  # 2:40 AM UTC daily, between intra-day runs
+        'kwargs': {'days': ANALYTICS_ROLLUP_NIGHTLY_DAYS},
+        'options': {'queue': 'maintenance'}
+    },
     'train-ml-models-weekly': {
         'task': 'micro_checks.tasks.train_micro_check_ml_models',
         'schedule': crontab(day_of_week=0, hour=3, minute=0),  # Sundays at 3 AM
@@ -373,12 +427,58 @@ COACHING_MODE_RETENTION_DAYS = config('COACHING_MODE_RETENTION_DAYS', default=7,
 
 ENABLE_AWS_REKOGNITION = config('ENABLE_AWS_REKOGNITION', default=True, cast=bool)
 ENABLE_YOLO_DETECTION = config('ENABLE_YOLO_DETECTION', default=False, cast=bool)
+# YOLO inference backend: 'ultralytics' (PyTorch) or 'onnx' (ONNX Runtime on CPU, no torch)
+YOLO_INFERENCE_BACKEND = config('YOLO_INFERENCE_BACKEND', default='ultralytics')
+YOLO_ONNX_MODEL_PATH = config('YOLO_ONNX_MODEL_PATH', default='yolov8n.onnx')
+YOLO_ONNX_PROVIDERS = config('YOLO_ONNX_PROVIDERS', default='CPUExecutionProvider').split(',')
+YOLO_ONNX_THREADS = config('YOLO_ONNX_THREADS', default=0, cast=int)  # 0 = let ONNX Runtime decide
+YOLO_INPUT_SIZE = config('YOLO_INPUT_SIZE', default=640, cast=int)
+YOLO_BATCH_SIZE = config('YOLO_BATCH_SIZE', default=8, cast=int)  # Frames per batched YOLO call during analysis
+YOLO_CONFIDENCE_THRESHOLD = config('YOLO_CONFIDENCE_THRESHOLD', default=0.25, cast=float)
+YOLO_IOU_THRESHOLD = config('YOLO_IOU_THRESHOLD', default=0.45, cast=float)
 ENABLE_OCR_DETECTION = config('ENABLE_OCR_DETECTION', default=True, cast=bool)
+# OCR text gating: skip EasyOCR on frames where Rekognition found little text,
+# otherwise crop to the text-dense regions (ratios are fractions of the frame area)
+OCR_MIN_TEXT_LINES = config('OCR_MIN_TEXT_LINES', default=3, cast=int)
+OCR_MIN_TEXT_AREA_RATIO = config('OCR_MIN_TEXT_AREA_RATIO', default=0.01, cast=float)
+OCR_REGION_PADDING = config('OCR_REGION_PADDING', default=0.02, cast=float)
+OCR_MAX_CROP_AREA_RATIO = config('OCR_MAX_CROP_AREA_RATIO', default=0.6, cast=float)
 
 # Twilio SMS Configuration
 TWILIO_ACCOUNT_SID = config('TWILIO_ACCOUNT_SID', default='')
 TWILIO_AUTH_TOKEN = config('TWILIO_AUTH_TOKEN', default='')
 TWILIO_PHONE_NUMBER = config('TWILIO_PHONE_NUMBER', default='')
+# Employee voice invitation dispatch: concurrent Twilio requests per worker and the
+# send rate per worker (match TWILIO_PHONE_NUMBER's throughput: 1/s long code,
+# 3/s toll-free, higher for short codes; divide across workers running the task)
+EMPLOYEE_VOICE_SMS_CONCURRENCY = config('EMPLOYEE_VOICE_SMS_CONCURRENCY', default=4, cast=int)
+EMPLOYEE_VOICE_SMS_PER_SECOND = config('EMPLOYEE_VOICE_SMS_PER_SECOND', default=1.0, cast=float)
+# Invitations claimed per batch, and how long a claim holds them before another
+# worker may take them over (must cover sending a batch at the rate above)
+EMPLOYEE_VOICE_SMS_BATCH_SIZE = config('EMPLOYEE_VOICE_SMS_BATCH_SIZE', default=100, cast=int)
+EMPLOYEE_VOICE_SMS_LEASE_SECONDS = config('EMPLOYEE_VOICE_SMS_LEASE_SECONDS', default=600, cast=int)
+
+# 7shifts incremental sync: scheduled syncs only fetch records modified since the
+# last successful sync and run a full reconciliation (which also catches deletes)
+# once the interval has elapsed. Manual syncs from the UI are always full.
+SEVEN_SHIFTS_FULL_EMPLOYEE_SYNC_DAYS = config('SEVEN_SHIFTS_FULL_EMPLOYEE_SYNC_DAYS', default=7, cast=int)
+SEVEN_SHIFTS_FULL_SHIFT_SYNC_DAYS = config('SEVEN_SHIFTS_FULL_SHIFT_SYNC_DAYS', default=1, cast=int)
+SEVEN_SHIFTS_SYNC_OVERLAP_MINUTES = config('SEVEN_SHIFTS_SYNC_OVERLAP_MINUTES', default=5, cast=int)
+# Scheduled syncs run one Celery subtask per account, at most this many at once
+SEVEN_SHIFTS_SYNC_CONCURRENCY = config('SEVEN_SHIFTS_SYNC_CONCURRENCY', default=4, cast=int)
+SEVEN_SHIFTS_SYNC_LOCK_TIMEOUT = config('SEVEN_SHIFTS_SYNC_LOCK_TIMEOUT', default=1800, cast=int)  # seconds
+# Backoff while every sync slot is busy: RETRY_DELAY doubling up to RETRY_MAX_DELAY (seconds)
+SEVEN_SHIFTS_SYNC_RETRY_DELAY = config('SEVEN_SHIFTS_SYNC_RETRY_DELAY', default=20, cast=int)
+SEVEN_SHIFTS_SYNC_RETRY_MAX_DELAY = config('SEVEN_SHIFTS_SYNC_RETRY_MAX_DELAY', default=600, cast=int)
+# Day chunks of the shift window fetched concurrently per account
+SEVEN_SHIFTS_FETCH_WORKERS = config('SEVEN_SHIFTS_FETCH_WORKERS', default=4, cast=int)
+# Sync logs keep this many sample items inline; full payloads are compressed
+# blobs retained for SEVEN_SHIFTS_SYNC_PAYLOAD_RETENTION_DAYS
+SEVEN_SHIFTS_SYNC_LOG_SAMPLE_SIZE = config('SEVEN_SHIFTS_SYNC_LOG_SAMPLE_SIZE', default=10, cast=int)
+SEVEN_SHIFTS_SYNC_PAYLOAD_RETENTION_DAYS = config('SEVEN_SHIFTS_SYNC_PAYLOAD_RETENTION_DAYS', default=7, cast=int)
+# Cached per-account shift interval index used by ShiftChecker
+SHIFT_INDEX_TTL_SECONDS = config('SHIFT_INDEX_TTL_SECONDS', default=43200, cast=int)
+SHIFT_INDEX_LOOKBACK_HOURS = config('SHIFT_INDEX_LOOKBACK_HOURS', default=24, cast=int)
 
 # Google Places API (for review analysis fallback)
 GOOGLE_PLACES_API_KEY = config('GOOGLE_PLACES_API_KEY', default='')
@@ -387,6 +487,16 @@ GOOGLE_PLACES_API_KEY = config('GOOGLE_PLACES_API_KEY', default='')
 GOOGLE_OAUTH_CLIENT_ID = config('GOOGLE_OAUTH_CLIENT_ID', default='')
 GOOGLE_OAUTH_CLIENT_SECRET = config('GOOGLE_OAUTH_CLIENT_SECRET', default='')
 GOOGLE_OAUTH_REDIRECT_URI = config('GOOGLE_OAUTH_REDIRECT_URI', default='http://localhost:3000/integrations/google-reviews')
+# Google review sync: one Celery subtask per account, each fetching its
+# locations concurrently. The request budget is shared through the cache.
+GOOGLE_REVIEWS_FETCH_WORKERS = config('GOOGLE_REVIEWS_FETCH_WORKERS', default=4, cast=int)
+GOOGLE_REVIEWS_REQUESTS_PER_MINUTE = config('GOOGLE_REVIEWS_REQUESTS_PER_MINUTE', default=300, cast=int)
+GOOGLE_REVIEWS_SYNC_LOCK_TIMEOUT = config('GOOGLE_REVIEWS_SYNC_LOCK_TIMEOUT', default=1800, cast=int)  # seconds
+
+# Store 360° insights snapshots: rebuilds are debounced per store and reads
+# older than the max age trigger a background refresh
+INSIGHTS_SNAPSHOT_DEBOUNCE_SECONDS = config('INSIGHTS_SNAPSHOT_DEBOUNCE_SECONDS', default=30, cast=int)
+INSIGHTS_SNAPSHOT_MAX_AGE_SECONDS = config('INSIGHTS_SNAPSHOT_MAX_AGE_SECONDS', default=3600, cast=int)
 
 # Micro-check magic link base URL
 MICRO_CHECK_BASE_URL = config('MICRO_CHECK_BASE_URL', default='http://localhost:3000')
@@ -432,6 +542,9 @@ if DEMO_MODE:
 # Frame sampling settings (for FFmpeg)
 FRAME_SAMPLING_FPS = config('FRAME_SAMPLING_FPS', default=2.5, cast=float)
 MAX_FRAMES_PER_VIDEO = config('MAX_FRAMES_PER_VIDEO', default=20, cast=int)
+# Frame variants stored alongside the original (longest side, in pixels)
+FRAME_DETECTOR_MAX_SIZE = config('FRAME_DETECTOR_MAX_SIZE', default=1280, cast=int)
+FRAME_THUMBNAIL_MAX_SIZE = config('FRAME_THUMBNAIL_MAX_SIZE', default=320, cast=int)
 
 # Webhook settings
 WEBHOOK_TIMEOUT_SECONDS = config('WEBHOOK_TIMEOUT_SECONDS', default=30, cast=int)
@@ -450,6 +450,50 @@ class TenantUtilsTestCase(TestCase):
         expected = Q(account=self.account.id)
         self.assertEqual(filter_q, expected)
 
+    def test_tenant_context_loaded_in_one_query_and_memoized(self):
+        """Tenant context resolves store, account and brand once per user instance"""
+        from core.tenancy.context import get_tenant_context
+        from core.tenancy.utils import build_tenant_filter, tenant_ids
+
+        gm = User.objects.get(pk=self.gm.pk)
+        with self.assertNumQueries(1):
+            context = get_tenant_context(gm)
+        self.assertEqual(context.scope, 'store')
+        self.assertEqual(context.ids(), {
+            'brand_id': self.brand.id, 'account_id': self.account.id, 'store_id': self.store.id
+        })
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_tenant_context(gm), context)
+            tenant_ids(gm)
+            build_tenant_filter(gm, 'store', {'store': 'store'})
+
+    def test_tenant_context_reloads_when_user_tenant_changes(self):
+        """Changing the user's store on the same instance invalidates the memo"""
+        from core.tenancy.context import get_tenant_context
+
+        other_store = Store.objects.create(
+            name="Other Store", code="TEST-002", account=self.account, brand=self.brand
+        )
+        gm = User.objects.get(pk=self.gm.pk)
+        get_tenant_context(gm)
+
+        gm.store = other_store
+        self.assertEqual(get_tenant_context(gm).store_id, other_store.id)
+
+    def test_tenant_context_for_account_user_without_store(self):
+        """Users without a store resolve account and brand from their account"""
+        from core.tenancy.context import get_tenant_context
+
+        owner = User.objects.create_user(
+            username="storeless", email="storeless@test.com", role=User.Role.OWNER, account=self.account
+        )
+        context = get_tenant_context(owner)
+        self.assertEqual(context.ids(), {
+            'brand_id': self.brand.id, 'account_id': self.account.id, 'store_id': None
+        })
+        self.assertEqual(context.scope, 'account')
+
 
 class InspectionTenantIsolationTests(TenantIsolationTestCase):
     """Tests for inspection, finding, and action item tenant isolation"""
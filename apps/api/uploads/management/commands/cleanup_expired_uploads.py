@@ -126,13 +126,14 @@ class Command(BaseCommand):
                 if not dry_run:
                     # Delete frame image files
                     for frame in frames:
-                        try:
-                            if frame.image and hasattr(frame.image, 'path'):
-                                import os
-                                if os.path.exists(frame.image.path):
-                                    os.remove(frame.image.path)
-                        except:
-                            pass
+                        for image in (frame.image, frame.detector_image, frame.thumbnail):
+                            try:
+                                if image and hasattr(image, 'path'):
+                                    import os
+                                    if os.path.exists(image.path):
+                                        os.remove(image.path)
+                            except:
+                                pass
                     frames.delete()
                 
                 deleted_count += frame_count
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0004_video_one_video_per_inspection_v1'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoframe',
+            name='detector_image',
+            field=models.ImageField(blank=True, help_text='Downscaled variant for Rekognition/YOLO', upload_to='frames/detector/'),
+        ),
+        migrations.AddField(
+            model_name='videoframe',
+            name='thumbnail',
+            field=models.ImageField(blank=True, help_text='Small variant for UI previews', upload_to='frames/thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='videoframe',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Dimensions and byte sizes per variant'),
+        ),
+    ]
@@ -75,6 +75,12 @@ class VideoFrame(models.Model):
     image = models.ImageField(upload_to='frames/')
     width = models.IntegerField()
     height = models.IntegerField()
+
+    # Downscaled variants produced once at extraction time
+    detector_image = models.ImageField(upload_to='frames/detector/', blank=True, help_text="Downscaled variant for Rekognition/YOLO")
+    thumbnail = models.ImageField(upload_to='frames/thumbnails/', blank=True, help_text="Small variant for UI previews")
+    variants = models.JSONField(default=dict, blank=True, help_text="Dimensions and byte sizes per variant")
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -83,4 +89,12 @@ class VideoFrame(models.Model):
         unique_together = ['video', 'frame_number']
 
     def __str__(self):
-        return f"{self.video.title} - Frame {self.frame_number}"
\ No newline at end of file
+        return f"{self.video.title} - Frame {self.frame_number}"
+
+    def get_variant(self, name):
+        """Return the image file for a variant ('detector', 'thumbnail' or 'original')
+
+        Falls back to the original for frames extracted before variants existed.
+        """
+        variant = {'detector': self.detector_image, 'thumbnail': self.thumbnail}.get(name)
+        return variant if variant else self.image
@@ -308,14 +308,21 @@ def extract_frames_from_s3_video(video, video_path):
                 s3_path = f"frames/{frame_filename}"
                 saved_path = default_storage.save(s3_path, ContentFile(frame_data))
 
-                # Create VideoFrame record with S3 path
+                # Produce and upload the downscaled variants once, up front
+                variant_paths, variants = save_frame_variants(temp_frame_path, frame_filename)
+                variants['original'] = {'width': width, 'height': height, 'bytes': len(frame_data)}
+
+                # Create VideoFrame record with S3 paths
                 frame = VideoFrame.objects.create(
                     video=video,
                     timestamp=timestamp,
                     frame_number=frame_count,
                     image=saved_path,
                     width=width,
-                    height=height
+                    height=height,
+                    detector_image=variant_paths.get('detector', ''),
+                    thumbnail=variant_paths.get('thumbnail', ''),
+                    variants=variants
                 )
                 frames.append(frame)
                 frame_count += 1
@@ -332,6 +339,42 @@ def extract_frames_from_s3_video(video, video_path):
         return []
 
 
+def build_frame_variant(image_path, max_size, quality):
+    """Downscale a frame so its longest side is at most max_size, returning JPEG bytes"""
+    import io
+
+    with Image.open(image_path) as img:
+        img = img.convert('RGB')
+        img.thumbnail((max_size, max_size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=quality, optimize=True)
+        return buffer.getvalue(), img.size
+
+
+def save_frame_variants(image_path, frame_filename):
+    """Upload detector-sized and thumbnail variants of an extracted frame
+
+    Returns the storage paths and a summary of each variant's size. Failures
+    are logged and leave the variant out, so consumers fall back to the original.
+    """
+    variant_specs = {
+        'detector': ('frames/detector', settings.FRAME_DETECTOR_MAX_SIZE, 85),
+        'thumbnail': ('frames/thumbnails', settings.FRAME_THUMBNAIL_MAX_SIZE, 75),
+    }
+
+    paths = {}
+    variants = {}
+    for name, (prefix, max_size, quality) in variant_specs.items():
+        try:
+            data, (width, height) = build_frame_variant(image_path, max_size, quality)
+            paths[name] = default_storage.save(f"{prefix}/{frame_filename}", ContentFile(data))
+            variants[name] = {'width': width, 'height': height, 'bytes': len(data)}
+        except Exception as e:
+            logger.error(f"Error creating {name} variant for {frame_filename}: {e}")
+
+    return paths, variants
+
+
 def apply_inspection_rules(video, frames):
     """Apply inspection mode rules with compliance checks"""
     try:
@@ -401,23 +444,19 @@ def apply_rule_to_frames(rule, frames, coaching_mode=False):
 
     try:
         from ai_services.analyzer import VideoAnalyzer
+        from inspections.tasks import analyze_frame_batch
         analyzer = VideoAnalyzer()
 
         rule_config = rule.config_json
         rule_type = rule_config.get('type', 'unknown')
 
-        for frame in frames:
-            try:
-                # Get frame path and read as bytes for analysis
-                frame_path = frame.image.path if frame.image else None
-                frame_bytes = None
-
-                if frame_path and os.path.exists(frame_path):
-                    with open(frame_path, 'rb') as f:
-                        frame_bytes = f.read()
-
-                    frame_analysis = analyzer.analyze_frame(frame_path, frame_bytes)
-
+        # Analyze frames in batches so YOLO runs once per batch
+        frames = list(frames)
+        batch_size = max(getattr(settings, 'YOLO_BATCH_SIZE', 8), 1)
+        for start in range(0, len(frames), batch_size):
+            # Detector variants are downloaded per batch; originals only if OCR runs
+            for frame, frame_analysis in analyze_frame_batch(analyzer, frames[start:start + batch_size]):
+                try:
                     # Generate findings from analysis
                     findings = analyzer.generate_findings(frame_analysis, frame)
 
@@ -457,10 +496,10 @@ def apply_rule_to_frames(rule, frames, coaching_mode=False):
                                 'bounding_box': finding.get('bounding_box'),
                                 'recommended_action': finding.get('recommended_action', '')
                             })
-                
-            except Exception as frame_error:
-                logger.error(f"Error analyzing frame {frame.frame_number}: {frame_error}")
-                continue
+
+                except Exception as frame_error:
+                    logger.error(f"Error analyzing frame {frame.frame_number}: {frame_error}")
+                    continue
 
         return violations
 
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
@@ -6,7 +6,7 @@ from rest_framework import status
 from unittest.mock import patch, MagicMock, mock_open
 from brands.models import Brand, Store
 from .models import Video, VideoFrame
-from .tasks import extract_video_metadata, generate_thumbnail
+from .tasks import extract_video_metadata, generate_thumbnail, save_frame_variants
 
 User = get_user_model()
 
@@ -58,6 +58,27 @@ class VideoModelTest(TestCase):
         self.assertEqual(frame.timestamp, 5.0)
         self.assertEqual(str(frame), "Test Video - Frame 1")
 
+    def test_video_frame_variant_fallback(self):
+        video = Video.objects.create(
+            uploaded_by=self.user,
+            store=self.store,
+            title="Test Video",
+            file="test_video.mp4"
+        )
+        frame = VideoFrame.objects.create(
+            video=video,
+            timestamp=5.0,
+            frame_number=1,
+            image="frames/test_frame.jpg",
+            thumbnail="frames/thumbnails/test_frame.jpg",
+            width=1920,
+            height=1080
+        )
+        self.assertEqual(frame.get_variant('thumbnail').name, "frames/thumbnails/test_frame.jpg")
+        # No detector variant stored: fall back to the original
+        self.assertEqual(frame.get_variant('detector').name, "frames/test_frame.jpg")
+        self.assertEqual(frame.get_variant('original').name, "frames/test_frame.jpg")
+
 
 class VideoTasksTest(TestCase):
     @patch('videos.tasks.subprocess.run')
@@ -97,6 +118,28 @@ class VideoTasksTest(TestCase):
         mock_remove.assert_called_once()
 
 
+    @override_settings(FRAME_DETECTOR_MAX_SIZE=1280, FRAME_THUMBNAIL_MAX_SIZE=320)
+    @patch('videos.tasks.default_storage.save')
+    def test_save_frame_variants(self, mock_storage_save):
+        import os
+        import tempfile
+        from PIL import Image
+
+        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
+            Image.new('RGB', (1920, 1080), (200, 100, 50)).save(tmp_file, format='JPEG')
+            frame_path = tmp_file.name
+        self.addCleanup(os.remove, frame_path)
+        mock_storage_save.side_effect = lambda path, content: path
+
+        paths, variants = save_frame_variants(frame_path, "video_1_frame_0.jpg")
+
+        self.assertEqual(paths['detector'], "frames/detector/video_1_frame_0.jpg")
+        self.assertEqual(paths['thumbnail'], "frames/thumbnails/video_1_frame_0.jpg")
+        self.assertEqual((variants['detector']['width'], variants['detector']['height']), (1280, 720))
+        self.assertEqual((variants['thumbnail']['width'], variants['thumbnail']['height']), (320, 180))
+        self.assertLess(variants['thumbnail']['bytes'], variants['detector']['bytes'])
+
+
 class VideoAPITest(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -68,7 +68,7 @@ function QuickFixCard({ finding, onTimestampClick }: QuickFixCardProps) {
       {finding.frame_image && (
         <div className="mb-3">
           <img 
-            src={finding.frame_image} 
+            src={finding.frame_thumbnail || finding.frame_image} 
             alt="Issue frame"
             className="w-full h-20 object-cover rounded border"
           />
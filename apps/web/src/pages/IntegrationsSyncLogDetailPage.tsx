@@ -27,7 +27,7 @@ interface SyncedEmployee {
   location_name?: string;
   store_name?: string;
   roles?: any[];
-  data: any;
+  data?: any;
 }
 
 interface SyncedShift {
@@ -36,7 +36,7 @@ interface SyncedShift {
   start: string;
   end: string;
   role: string;
-  data: any;
+  data?: any;
 }
 
 interface SevenShiftsSyncLog {
@@ -48,10 +48,16 @@ interface SevenShiftsSyncLog {
   error_details: {
     errors?: string[];
     error?: string;
+    // Inline lists are samples; full lists are fetched via payload_refs
     synced_employees?: SyncedEmployee[];
+    synced_employees_count?: number;
     failed_employees?: Array<SyncedEmployee & { error: string }>;
+    failed_employees_count?: number;
     synced_shifts?: SyncedShift[];
+    synced_shifts_count?: number;
     failed_shifts?: Array<SyncedShift & { error: string }>;
+    failed_shifts_count?: number;
+    payload_refs?: Record<string, string>;
     locations?: any[];
     location_map?: Record<string, string>;
     date_range?: { start: string; end: string };
@@ -93,6 +99,18 @@ const getSyncLog = async (id: string): Promise<SevenShiftsSyncLog> => {
   return log;
 };
 
+const getSyncLogPayload = async (id: string, key: string): Promise<any[]> => {
+  const response = await fetch(`${API_BASE_URL}/api/integrations/7shifts/sync-logs/${id}/payload/${key}/`, {
+    headers: {
+      'Authorization': `Bearer ${localStorage.getItem('access_token')}`,
+    },
+  });
+  if (response.status === 410) throw new Error('Full payload has expired');
+  if (!response.ok) throw new Error('Failed to fetch sync payload');
+  const payload = await response.json();
+  return payload.items;
+};
+
 const retrySync = async (syncType: string) => {
   const response = await fetch(`${API_BASE_URL}/api/integrations/7shifts/sync/`, {
     method: 'POST',
@@ -114,6 +132,7 @@ export default function IntegrationsSyncLogDetailPage() {
   const [searchQuery, setSearchQuery] = useState('');
   const [selectedEmployee, setSelectedEmployee] = useState<SyncedEmployee | null>(null);
   const [selectedShift, setSelectedShift] = useState<SyncedShift | null>(null);
+  const [showFullPayload, setShowFullPayload] = useState(false);
 
   const { data: log, isLoading, error } = useQuery<SevenShiftsSyncLog>(
     ['7shifts-sync-log', id],
@@ -123,6 +142,15 @@ export default function IntegrationsSyncLogDetailPage() {
     }
   );
 
+  const payloadKey = log?.sync_type === 'SHIFTS' ? 'synced_shifts' : 'synced_employees';
+  const { data: fullPayload, isLoading: isLoadingPayload, error: payloadError } = useQuery<any[]>(
+    ['7shifts-sync-log-payload', id, payloadKey],
+    () => getSyncLogPayload(id!, payloadKey),
+    {
+      enabled: !!id && showFullPayload && !!log?.error_details?.payload_refs?.[payloadKey],
+    }
+  );
+
   const retryMutation = useMutation(retrySync, {
     onSuccess: () => {
       queryClient.invalidateQueries('7shifts-sync-logs');
@@ -197,6 +225,35 @@ export default function IntegrationsSyncLogDetailPage() {
   const statusColor = getStatusColor(log.status);
   const errors = log.error_details?.errors || (log.error_details?.error ? [log.error_details.error] : []);
 
+  const syncedEmployees: SyncedEmployee[] =
+    (log.sync_type === 'EMPLOYEES' && fullPayload) || log.error_details.synced_employees || [];
+  const syncedShifts: SyncedShift[] =
+    (log.sync_type === 'SHIFTS' && fullPayload) || log.error_details.synced_shifts || [];
+  const syncedTotal = log.sync_type === 'SHIFTS'
+    ? log.error_details.synced_shifts_count ?? syncedShifts.length
+    : log.error_details.synced_employees_count ?? syncedEmployees.length;
+
+  const renderFullPayloadToggle = (shownCount: number) => {
+    if (fullPayload || shownCount >= syncedTotal || !log.error_details.payload_refs?.[payloadKey]) {
+      return null;
+    }
+    return (
+      <div className="mb-4 flex items-center justify-between text-sm text-gray-600">
+        <span>
+          Showing {shownCount} of {syncedTotal}
+          {payloadError ? ` — ${(payloadError as Error).message}` : ''}
+        </span>
+        <button
+          onClick={() => setShowFullPayload(true)}
+          disabled={isLoadingPayload}
+          className="text-indigo-600 hover:text-indigo-900 font-medium disabled:opacity-50"
+        >
+          {isLoadingPayload ? 'Loading...' : 'Load all with raw data'}
+        </button>
+      </div>
+    );
+  };
+
   return (
     <div className="min-h-screen bg-gray-50">
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
@@ -534,12 +591,13 @@ export default function IntegrationsSyncLogDetailPage() {
         )}
 
         {/* Synced Data Explorer - Employees */}
-        {log.sync_type === 'EMPLOYEES' && log.error_details.synced_employees && log.error_details.synced_employees.length > 0 && (
+        {log.sync_type === 'EMPLOYEES' && syncedEmployees.length > 0 && (
           <div className="bg-white shadow-sm rounded-lg p-6 mt-6">
             <h2 className="text-lg font-semibold text-gray-900 mb-4 flex items-center">
               <Users className="w-5 h-5 mr-2 text-indigo-600" />
-              Synced Employees Data ({log.error_details.synced_employees.length})
+              Synced Employees Data ({syncedTotal})
             </h2>
+            {renderFullPayloadToggle(syncedEmployees.length)}
             <div className="mb-4">
               <div className="relative">
                 <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 text-gray-400 w-5 h-5" />
@@ -566,7 +624,7 @@ export default function IntegrationsSyncLogDetailPage() {
                   </tr>
                 </thead>
                 <tbody className="bg-white divide-y divide-gray-200">
-                  {log.error_details.synced_employees
+                  {syncedEmployees
                     .filter(emp =>
                       !searchQuery ||
                       emp.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
@@ -631,12 +689,13 @@ export default function IntegrationsSyncLogDetailPage() {
         )}
 
         {/* Synced Data Explorer - Shifts */}
-        {log.sync_type === 'SHIFTS' && log.error_details.synced_shifts && log.error_details.synced_shifts.length > 0 && (
+        {log.sync_type === 'SHIFTS' && syncedShifts.length > 0 && (
           <div className="bg-white shadow-sm rounded-lg p-6 mt-6">
             <h2 className="text-lg font-semibold text-gray-900 mb-4 flex items-center">
               <Calendar className="w-5 h-5 mr-2 text-indigo-600" />
-              Synced Shifts Data ({log.error_details.synced_shifts.length})
+              Synced Shifts Data ({syncedTotal})
             </h2>
+            {renderFullPayloadToggle(syncedShifts.length)}
             <div className="mb-4">
               <div className="relative">
                 <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 text-gray-400 w-5 h-5" />
@@ -662,7 +721,7 @@ export default function IntegrationsSyncLogDetailPage() {
                   </tr>
                 </thead>
                 <tbody className="bg-white divide-y divide-gray-200">
-                  {log.error_details.synced_shifts
+                  {syncedShifts
                     .filter(shift =>
                       !searchQuery ||
                       shift.id.toString().includes(searchQuery) ||
@@ -709,7 +768,7 @@ export default function IntegrationsSyncLogDetailPage() {
               <div className="p-6 overflow-y-auto">
                 <div className="bg-gray-900 rounded-lg p-4">
                   <pre className="text-sm text-green-400 font-mono overflow-x-auto">
-                    {JSON.stringify(selectedEmployee.data, null, 2)}
+                    {JSON.stringify(selectedEmployee.data ?? selectedEmployee, null, 2)}
                   </pre>
                 </div>
               </div>
@@ -735,7 +794,7 @@ export default function IntegrationsSyncLogDetailPage() {
               <div className="p-6 overflow-y-auto">
                 <div className="bg-gray-900 rounded-lg p-4">
                   <pre className="text-sm text-green-400 font-mono overflow-x-auto">
-                    {JSON.stringify(selectedShift.data, null, 2)}
+                    {JSON.stringify(selectedShift.data ?? selectedShift, null, 2)}
                   </pre>
                 </div>
               </div>
@@ -175,6 +175,7 @@ export interface Finding {
   inspection: number;
   frame: number | null;
   frame_image: string | null;
+  frame_thumbnail: string | null;
   frame_timestamp: number | null;
   category: 'PPE' | 'SAFETY' | 'CLEANLINESS' | 'UNIFORM' | 'MENU_BOARD' | 'FOOD_SAFETY' | 'EQUIPMENT' | 'OPERATIONAL' | 'FOOD_QUALITY' | 'STAFF_BEHAVIOR' | 'OTHER';
   severity: 'LOW' | 'MEDIUM' | 'HIGH' | 'CRITICAL';